@@ -1,10 +1,12 @@
 import configparser
+import importlib
+import importlib.util
 import os
 import re
 import folder_paths
 import sys
 import nodes
-from typing import Dict, Type, Any
+from typing import Dict, Type, Any, Tuple
 
 # WEB directory settings
 WEB_DIR_NAME = "ComfyUI-JakeUpgrade"
@@ -75,11 +77,13 @@ def load_config():
         load_deprecated = config.getboolean('JakeUpgrade', 'LOAD_DEPRECATED_NODES', fallback=False)
         enabled_modules_str = config.get('JakeUpgrade', 'ENABLED_MODULES', fallback='')
         random_prompter_abc = config.getboolean('JakeUpgrade', 'RANDOM_PROMPTER_ABC', fallback=False)
+        hash_cache_warmup = config.getboolean('JakeUpgrade', 'HASH_CACHE_WARMUP', fallback=False)
     except Exception as e:
         print(f"❌ Config parsing error: {e}")
         load_deprecated = False
         enabled_modules_str = ''
         random_prompter_abc = False
+        hash_cache_warmup = False
     
     # 处理启用的模块列表
     if enabled_modules_str.strip().lower() == 'all':
@@ -92,7 +96,7 @@ def load_config():
         # 如果为空，也启用所有模块
         enabled_modules = []
     
-    return load_deprecated, enabled_modules, random_prompter_abc
+    return load_deprecated, enabled_modules, random_prompter_abc, hash_cache_warmup
 
 def create_default_config(config_path):
     """创建默认配置文件 / Create default config file"""
@@ -114,6 +118,10 @@ ENABLED_MODULES = all
 ; Should we use the ABC Stratagy architecture's RandomPrompter node? True indicates use, False indicates not use.
 RANDOM_PROMPTER_ABC = false
 
+; True表示启动后在后台为模型文件预先计算SHA256哈希并写入缓存，False不预计算。
+; Set to True to pre-hash model files into the SHA256 cache in the background after startup, False to hash on demand only.
+HASH_CACHE_WARMUP = False
+
 [RandomPrompterConfig]
 ; 提示词数据目录
 ; Prompt data directory
@@ -158,7 +166,7 @@ EXCLUSION_MARK = 900
         print(f"❌ Failed to create config file: {e}")
 
 # 获取配置
-LOAD_DEPRECATED_NODES, ENABLED_MODULES, RANDOM_PROMPTER_ABC = load_config()
+LOAD_DEPRECATED_NODES, ENABLED_MODULES, RANDOM_PROMPTER_ABC, HASH_CACHE_WARMUP = load_config()
 
 BASE_PROMPT_FILE = "jake_node_prompt"
 
@@ -191,362 +199,368 @@ MODULE_MAPPING = {
     'video': ('jake_node_video', 'Video Nodes')
 }
 
-def load_modules():
-    """根据配置动态加载模块"""
-    loaded_modules = []
+# 首次使用时才导入的重量级模块 -> 其第三方依赖 (注册时检查依赖是否已安装)
+# 3D Viewer 在导入时注册服务器路由，必须在启动时导入
+# 注意: 前端首次请求 /object_info 时会读取所有节点的 INPUT_TYPES，届时导入这些模块
+LAZY_MODULES: Dict[str, Tuple[str, ...]] = {
+    'jake_node_image': ('cv2',),
+    'jake_node_3d_sam3dseq': ('einops',),
+    'jake_node_deprecated': ('piexif', 'PIL'),
+}
+
+# 节点注册表: 模块键 -> {节点名称: (模块文件, 类名)}
+NODE_REGISTRY: Dict[str, Dict[str, Tuple[str, str]]] = {
+    ### 3D Nodes
+    '3d': {
+        "Adv3DViewer_JK": ('jake_node_3d_viewer', "Adv3DViewer_JK"),
+        "SAM3D From Video JK": ('jake_node_3d_sam3dseq', "SAM3DMeshSequenceFromVideo_JK"),
+        "Orbit Poses JK": ('jake_node_3d', "OrbitPoses_JK"),
+        "OrbitLists to OrbitPoses JK": ('jake_node_3d', "OrbitLists_to_OrbitPoses_JK"),
+        "OrbitPoses to OrbitLists JK": ('jake_node_3d', "OrbitPoses_to_OrbitLists_JK"),
+        "Get OrbitPoses From List JK": ('jake_node_3d', "Get_OrbitPoses_From_List_JK"),
+    },
+    ### Audio Nodes
+    'audio': {
+        "Cut Audio JK": ('jake_node_audio', "CutAudio_JK"),
+        "Cut Audio Index JK": ('jake_node_audio', "CutAudioIndex_JK"),
+        "Cut Audio Cuts JK": ('jake_node_audio', "CutAudioCuts_JK"),
+        "Cut Audio Loop JK": ('jake_node_audio', "CutAudioLoop_JK"),
+    },
+    ### ControlNet Nodes
+    'controlnet': {
+        "CR ControlNet Loader JK": ('jake_node_controlnet', "CR_ControlNetLoader_JK"),
+        "CR Multi-ControlNet Param Stack JK": ('jake_node_controlnet', "CR_ControlNetParamStack_JK"),
+        "CR Apply ControlNet JK": ('jake_node_controlnet', "CR_ApplyControlNet_JK"),
+        "CR Apply Multi-ControlNet Adv JK": ('jake_node_controlnet', "CR_ApplyControlNetStackAdv_JK"),
+    },
+    ### LoRA Nodes
+    'lora': {
+        "CR LoRA Stack JK": ('jake_node_lora', "CR_LoRAStack_JK"),
+        "CR Apply LoRA Stack JK": ('jake_node_lora', "CR_ApplyLoRAStack_JK"),
+        "CR LoRA Stack Model Only JK": ('jake_node_lora', "CR_LoRAStack_ModelOnly_JK"),
+        "CR Apply LoRA Stack Model Only JK": ('jake_node_lora', "CR_ApplyLoRAStack_ModelOnly_JK"),
+    },
+    ### Experimental Nodes
+    'experimental': {
+        "Random Beats JK": ('jake_node_experimental', "RandomBeats_JK"),
+    },
+    ### Image Nodes
+    'image': {
+        "Rough Outline JK": ('jake_node_image', "RoughOutline_JK"),
+        "OpenDWPose_JK": ('jake_node_image', "OpenDWPose_JK"),
+        "Make Image Grid JK": ('jake_node_image', "MakeImageGrid_JK"),
+        "Split Image Grid JK": ('jake_node_image', "SplitImageGrid_JK"),
+        "Image Remove Alpha JK": ('jake_node_image', "ImageRemoveAlpha_JK"),
+        "Color Grading JK": ('jake_node_image', "ColorGrading_JK"),
+        "Get Size JK": ('jake_node_image', "GetSize_JK"),
+        "Image Crop By Mask Resolution Grp JK": ('jake_node_image', "ImageCropByMaskResolutionGrp_JK"),
+        "Image Crop by Mask Params JK": ('jake_node_image', "ImageCropByMaskParams_JK"),
+        "Scale To Resolution JK": ('jake_node_image', "ScaleToResolution_JK"),
+        "HintImageEnchance JK": ('jake_node_image', "HintImageEnchance_JK"),
+    },
+    ### Latent Nodes
+    'latent': {
+        "Empty Latent Color JK": ('jake_node_latent', "EmptyLatentColor_JK"),
+        "Latent Crop Offset JK": ('jake_node_latent', "LatentCropOffset_JK"),
+    },
+    ### Mask Nodes
+    'mask': {
+        "Is Mask Empty JK": ('jake_node_mask', "IsMaskEmpty_JK"),
+    },
+    ### Math Nodes
+    'math': {
+        "CM_BoolToInt JK": ('jake_node_math', "BoolToInt_JK"),
+        "CM_IntToBool JK": ('jake_node_math', "IntToBool_JK"),
+        "CM_BoolUnaryOperation JK": ('jake_node_math', "BoolUnaryOperation_JK"),
+        "CM_BoolBinaryOperation JK": ('jake_node_math', "BoolBinaryOperation_JK"),
+        "Bool Binary And JK": ('jake_node_math', "BoolBinaryAnd_JK"),
+        "Bool Binary OR JK": ('jake_node_math', "BoolBinaryOR_JK"),
+        "CM_StringBinaryCondition_JK": ('jake_node_math', "StringBinaryCondition_JK"),
+        "CM_FloatUnaryCondition JK": ('jake_node_math', "FloatUnaryCondition_JK"),
+        "CM_FloatBinaryCondition JK": ('jake_node_math', "FloatBinaryCondition_JK"),
+        "CM_IntUnaryCondition JK": ('jake_node_math', "IntUnaryCondition_JK"),
+        "CM_IntBinaryCondition JK": ('jake_node_math', "IntBinaryCondition_JK"),
+        "CM_FloatToInt JK": ('jake_node_math', "FloatToInt_JK"),
+        "CM_IntToFloat JK": ('jake_node_math', "IntToFloat_JK"),
+        "CM_FloatUnaryOperation JK": ('jake_node_math', "FloatUnaryOperation_JK"),
+        "CM_FloatBinaryOperation JK": ('jake_node_math', "FloatBinaryOperation_JK"),
+        "CM_IntUnaryOperation JK": ('jake_node_math', "IntUnaryOperation_JK"),
+        "CM_IntBinaryOperation JK": ('jake_node_math', "IntBinaryOperation_JK"),
+        "Int Sub Operation JK": ('jake_node_math', "IntSubOperation_JK"),
+        "Evaluate Ints JK": ('jake_node_math', "EvaluateInts_JK"),
+        "Evaluate Floats JK": ('jake_node_math', "EvaluateFloats_JK"),
+        "Evaluate Strings JK": ('jake_node_math', "EvaluateStrs_JK"),
+        "Evaluate Examples JK": ('jake_node_math', "EvalExamples_JK"),
+    },
+    ### Misc Nodes
+    'misc': {
+        "Project Setting JK": ('jake_node_misc', "ProjectSetting_JK"),
+        "Ksampler Parameters Default JK": ('jake_node_misc', "KsamplerParametersDefault_JK"),
+        "Ksampler Adv Parameters Default JK": ('jake_node_misc', "KsamplerAdvParametersDefault_JK"),
+        "Base Model Parameters SD3API JK": ('jake_node_misc', "BaseModelParametersSD3API_JK"),
+        "Inject Noise Params JK": ('jake_node_misc', "Inject_Noise_Params_JK"),
+        "SD3 Prompts Switch JK": ('jake_node_misc', "SD3_Prompts_Switch_JK"),
+        "SDXL Target Res JK": ('jake_node_misc', "SDXL_TargetRes_JK"),
+        "Guidance Default JK": ('jake_node_misc', "GuidanceDefault_JK"),
+        "Image Resize Mode JK": ('jake_node_misc', "ImageResizeMode_JK"),
+        "Sampler Loader JK": ('jake_node_misc', "SamplerLoader_JK"),
+        "Upscale Method JK": ('jake_node_misc', "UpscaleMethod_JK"),
+        "CR Aspect Ratio JK": ('jake_node_misc', "CR_AspectRatio_JK"),
+        "String To Combo JK": ('jake_node_misc', "StringToCombo_JK"),
+        "Get Nth String JK": ('jake_node_misc', "GetNthString_JK"),
+        "Save String List To JSON JK": ('jake_node_misc', "SaveStringListToJSON_JK"),
+        "Load String List From JSON JK": ('jake_node_misc', "LoadStringListFromJSON_JK"),
+        "Tiling Mode JK": ('jake_node_misc', "TilingMode_JK"),
+        "Remove Input JK": ('jake_node_misc', "RemoveInput_JK"),
+    },
+    ### Prompt Nodes
+    'prompt': {
+        "RandomPrompter_JK": (PROMPT_NODE_FILE, "RandomPrompter_JK"),
+        "RandomPrompterGeek_JK": (PROMPT_NODE_FILE, "RandomPrompterGeek_JK"),
+        "SystemPrompter_JK": (BASE_PROMPT_FILE, "SystemPrompter_JK"),
+        "ShotScriptCombiner_JK": (BASE_PROMPT_FILE, "ShotScriptCombiner_JK"),
+        "ShotScriptExtractor_JK": (BASE_PROMPT_FILE, "ShotScriptExtractor_JK"),
+        "CM_PromptCombine_JK": (BASE_PROMPT_FILE, "PromptCombine_JK"),
+    },
+    ### Switch Nodes
+    'switch': {
+        "CR Boolean JK": ('jake_node_switch', "CR_Boolean_JK"),
+        "CR Int Input Switch JK": ('jake_node_switch', "CR_IntInputSwitch_JK"),
+        "CR Float Input Switch JK": ('jake_node_switch', "CR_FloatInputSwitch_JK"),
+        "CR Image Input Switch JK": ('jake_node_switch', "CR_ImageInputSwitch_JK"),
+        "CR Mask Input Switch JK": ('jake_node_switch', "CR_MaskInputSwitch_JK"),
+        "CR Audio Input Switch JK": ('jake_node_switch', "CR_AudioInputSwitch_JK"),
+        "CR Latent Input Switch JK": ('jake_node_switch', "CR_LatentInputSwitch_JK"),
+        "CR Conditioning Input Switch JK": ('jake_node_switch', "CR_ConditioningInputSwitch_JK"),
+        "CR Clip Input Switch JK": ('jake_node_switch', "CR_ClipInputSwitch_JK"),
+        "CR Model Input Switch JK": ('jake_node_switch', "CR_ModelInputSwitch_JK"),
+        "CR ControlNet Input Switch JK": ('jake_node_switch', "CR_ControlNetInputSwitch_JK"),
+        "CR ControlNet Stack Input Switch JK": ('jake_node_switch', "CR_ControlNetStackInputSwitch_JK"),
+        "CR Text Input Switch JK": ('jake_node_switch', "CR_TextInputSwitch_JK"),
+        "CR VAE Input Switch JK": ('jake_node_switch', "CR_VAEInputSwitch_JK"),
+        "CR Noise Input Switch JK": ('jake_node_switch', "CR_NoiseInputSwitch_JK"),
+        "CR Guider Input Switch JK": ('jake_node_switch', "CR_GuiderInputSwitch_JK"),
+        "CR Sampler Input Switch JK": ('jake_node_switch', "CR_SamplerInputSwitch_JK"),
+        "CR Sigmas Input Switch JK": ('jake_node_switch', "CR_SigmasInputSwitch_JK"),
+        "CR Mesh Input Switch JK": ('jake_node_switch', "CR_MeshInputSwitch_JK"),
+        "CR Ply Input Switch JK": ('jake_node_switch', "CR_PlyInputSwitch_JK"),
+        "CR Orbit Pose Input Switch JK": ('jake_node_switch', "CR_OrbitPoseInputSwitch_JK"),
+        "CR TriMesh Input Switch JK": ('jake_node_switch', "CR_TriMeshInputSwitch_JK"),
+        "CR Impact Pipe Input Switch JK": ('jake_node_switch', "CR_ImpactPipeInputSwitch_JK"),
+    },
+    ### Video Nodes
+    'video': {
+        "Scene Cuts JK": ('jake_node_video', "SceneCuts_JK"),
+        "Create Loop Schedule List": ('jake_node_video', "CreateLoopScheduleList"),
+        "Wan Frame Count JK": ('jake_node_video', "WanFrameCount_JK"),
+        "LTXV2 Frame Count JK": ('jake_node_video', "LtxV2FrameCount_JK"),
+        "Wan22 cfg Scheduler List JK": ('jake_node_video', "Wan22cfgSchedulerList_JK"),
+        "Wan Wrapper Sampler Default JK": ('jake_node_video', "WanWrapperSamplerDefault_JK"),
+    },
+}
+
+# 已弃用节点注册表: {节点名称: 类名}，全部位于 jake_node_deprecated
+DEPRECATED_NODE_MODULE = 'jake_node_deprecated'
+DEPRECATED_NODE_REGISTRY: Dict[str, str] = {
+    ### 3D Nodes [Deprecated]
+    "Hy3D Cam Config 20to21 JK": "Hy3DCamConfig20to21_JK",
+    ### Animation Nodes [Deprecated]
+    "Animation Prompt JK": "AnimPrompt_JK",
+    "Animation Value JK": "AnimValue_JK",
+    ### ControlNet Nodes [Deprecated]
+    "CR Multi-ControlNet Stack JK": "CR_ControlNetStack_JK",
+    "CR Apply Multi-ControlNet JK": "CR_ApplyControlNetStack_JK",
+    ### Embedding Nodes [Deprecated]
+    "Embedding Picker JK": "EmbeddingPicker_JK",
+    "Embedding Picker Multi JK": "EmbeddingPicker_Multi_JK",
+    ### Image Nodes [Deprecated]
+    "Image Crop by Mask Resolution JK": "ImageCropByMaskResolution_JK",
+    ### Loader Nodes [Deprecated]
+    "Ckpt Loader JK": "CkptLoader_JK",
+    "Vae Loader JK": "VaeLoader_JK",
+    "Upscale Model Loader JK": "UpscaleModelLoader_JK",
+    ### LoRA Nodes [Deprecated]
+    "CR Load LoRA JK": "CR_LoraLoader_JK",
+    ### Math Nodes [Deprecated]
+    "CM_NumberUnaryCondition JK": "NumberUnaryCondition_JK",
+    "CM_NumberBinaryCondition JK": "NumberBinaryCondition_JK",
+    "CM_Vec2UnaryCondition JK": "Vec2UnaryCondition_JK",
+    "CM_Vec2BinaryCondition JK": "Vec2BinaryCondition_JK",
+    "CM_Vec2ToFloatUnaryOperation JK": "Vec2ToFloatUnaryOperation_JK",
+    "CM_Vec2ToFloatBinaryOperation JK": "Vec2ToFloatBinaryOperation_JK",
+    "CM_Vec2FloatOperation_JK": "Vec2FloatOperation_JK",
+    "CM_Vec3UnaryCondition JK": "Vec3UnaryCondition_JK",
+    "CM_Vec3BinaryCondition JK": "Vec3BinaryCondition_JK",
+    "CM_Vec3ToFloatUnaryOperation JK": "Vec3ToFloatUnaryOperation_JK",
+    "CM_Vec3ToFloatBinaryOperation JK": "Vec3ToFloatBinaryOperation_JK",
+    "CM_Vec3FloatOperation_JK": "Vec3FloatOperation_JK",
+    "CM_Vec4UnaryCondition JK": "Vec4UnaryCondition_JK",
+    "CM_Vec4BinaryCondition JK": "Vec4BinaryCondition_JK",
+    "CM_Vec4ToFloatUnaryOperation JK": "Vec4ToFloatUnaryOperation_JK",
+    "CM_Vec4ToFloatBinaryOperation JK": "Vec4ToFloatBinaryOperation_JK",
+    "CM_Vec4FloatOperation_JK": "Vec4FloatOperation_JK",
+    "CM_IntToNumber JK": "IntToNumber_JK",
+    "CM_NumberToInt JK": "NumberToInt_JK",
+    "CM_FloatToNumber JK": "FloatToNumber_JK",
+    "CM_NumberToFloat JK": "NumberToFloat_JK",
+    "CM_NumberUnaryOperation JK": "NumberUnaryOperation_JK",
+    "CM_NumberBinaryOperation JK": "NumberBinaryOperation_JK",
+    "CM_ComposeVec2 JK": "ComposeVec2_JK",
+    "CM_ComposeVec3 JK": "ComposeVec3_JK",
+    "CM_ComposeVec4 JK": "ComposeVec4_JK",
+    "CM_BreakoutVec2 JK": "BreakoutVec2_JK",
+    "CM_BreakoutVec3 JK": "BreakoutVec3_JK",
+    "CM_BreakoutVec4 JK": "BreakoutVec4_JK",
+    "CM_FillVec2 JK": "FillVec2_JK",
+    "CM_FillVec3 JK": "FillVec3_JK",
+    "CM_FillVec4 JK": "FillVec4_JK",
+    "CM_Vec2UnaryOperation JK": "Vec2UnaryOperation_JK",
+    "CM_Vec2BinaryOperation JK": "Vec2BinaryOperation_JK",
+    "CM_Vec3UnaryOperation JK": "Vec3UnaryOperation_JK",
+    "CM_Vec3BinaryOperation JK": "Vec3BinaryOperation_JK",
+    "CM_Vec4UnaryOperation JK": "Vec4UnaryOperation_JK",
+    "CM_Vec4BinaryOperation JK": "Vec4BinaryOperation_JK",
+    ### Misc Nodes [Deprecated]
+    "CR SD1.5 Aspect Ratio JK": "CR_AspectRatioSD15_JK",
+    "CR SDXL Aspect Ratio JK": "CR_AspectRatioSDXL_JK",
+    "CR SD3 Aspect Ratio JK": "CR_AspectRatioSD3_JK",
+    ### Pipe Nodes [Deprecated]
+    "Pipe End JK": "PipeEnd_JK",
+    "NodesState JK": "NodesState_JK",
+    "Ksampler Parameters JK": "KsamplerParameters_JK",
+    "Base Model Parameters JK": "BaseModelParameters_JK",
+    "Base Model Parameters Extract JK": "BaseModelParametersExtract_JK",
+    "Base Image Parameters Extract JK": "BaseImageParametersExtract_JK",
+    "Base Model Pipe JK": "BaseModelPipe_JK",
+    "Base Model Pipe Extract JK": "BaseModelPipeExtract_JK",
+    "Noise Injection Parameters JK": "NoiseInjectionParameters_JK",
+    "Noise Injection Pipe Extract JK": "NoiseInjectionPipeExtract_JK",
+    "Refine Model Parameters JK": "RefineModelParameters_JK",
+    "Refine 1 Parameters Extract JK": "Refine1ParametersExtract_JK",
+    "Refine 2 Parameters Extract JK": "Refine2ParametersExtract_JK",
+    "Refine Pipe JK": "RefinePipe_JK",
+    "Refine Pipe Extract JK": "RefinePipeExtract_JK",
+    "Upscale Model Parameters JK": "UpscaleModelParameters_JK",
+    "Image Upscale Parameters Extract JK": "ImageUpscaleParametersExtract_JK",
+    "Latent Upscale Parameters Extract JK": "LatentUpscaleParametersExtract_JK",
+    "Upscale Model Parameters Extract JK": "UpscaleModelParametersExtract_JK",
+    "Detailer Parameters JK": "DetailerParameters_JK",
+    "Metadata Pipe JK": "MetadataPipe_JK",
+    "Metadata Pipe Extract JK": "MetadataPipeExtract_JK",
+    "Save Image with Metadata JK": "ImageSaveWithMetadata_JK",
+    "Save Image with Metadata Flow JK": "ImageSaveWithMetadata_Flow_JK",
+    "Load Image With Metadata JK": "LoadImageWithMetadata_JK",
+    "Load Image With Alpha JK": "LoadImageWithAlpha_JK",
+    ### Reroute Nodes [Deprecated]
+    "Reroute List JK": "RerouteList_JK",
+    "Reroute Ckpt JK": "RerouteCkpt_JK",
+    "Reroute Vae JK": "RerouteVae_JK",
+    "Reroute Sampler JK": "RerouteSampler_JK",
+    "Reroute Upscale JK": "RerouteUpscale_JK",
+    "Reroute Resize JK": "RerouteResize_JK",
+    "Reroute String JK": "RerouteString_JK",
+    ### Switch Nodes [Deprecated]
+    "CR Pipe Input Switch JK": "CR_PipeInputSwitch_JK",
+}
+
+class LazyNodeMeta(type):
+    """
+    Metaclass for node stand-ins whose module is imported on first use.
     
-    # 构建导入命令字符串
-    import_commands = []
+    Attribute lookups (INPUT_TYPES, RETURN_TYPES, FUNCTION...) and instantiation
+    are forwarded to the real node class, which is resolved once and cached.
+    """
     
-    # 如果没有指定模块，默认加载所有
-    if not ENABLED_MODULES:
-        # print("🔶 Loading all main modules.")
-        for module_key, (module_file, module_name) in MODULE_MAPPING.items():
-            import_commands.append(f"from .nodes.{module_file} import *")
-        
-        import_commands.append(f"from .nodes.{BASE_PROMPT_FILE} import *")
-        import_commands.append(f"from .nodes.jake_node_3d_viewer import *")
-        import_commands.append(f"from .nodes.jake_node_3d_sam3dseq import *")
-        loaded_modules.append(module_key)
-    else:
-        # 加载指定的模块
-        # print("🔶 Loading specified main modules.")
-        for module_key in ENABLED_MODULES:
-            if module_key in MODULE_MAPPING:
-                module_file, module_name = MODULE_MAPPING[module_key]
-
-                # 特殊处理3d模块：先加载基础文件（不记录到loaded_modules）
-                if module_key == '3d':
-                    import_commands.append(f"from .nodes.jake_node_3d_viewer import *")
-                    import_commands.append(f"from .nodes.jake_node_3d_sam3dseq import *")
-                
-                # 特殊处理prompt模块：先加载基础文件（不记录到loaded_modules）
-                if module_key == 'prompt':
-                    import_commands.append(f"from .nodes.{BASE_PROMPT_FILE} import *")
-                
-                # print(f"🔶 Attempting to import: {module_file}") 
-                import_commands.append(f"from .nodes.{module_file} import *")
-                loaded_modules.append(module_key)
-            else:
-                print(f"⚠️ Unknown module: {module_key}")
+    def _resolve(cls) -> Type[Any]:
+        if cls._node_class is None:
+            module = import_node_module(cls._node_module_file)
+            if module is None:
+                raise ImportError(f"JakeUpgrade module {cls._node_module_file} failed to import, "
+                                  f"node {cls._node_class_name} is unavailable (see the error logged above)")
+            cls._node_class = getattr(module, cls._node_class_name)
+        return cls._node_class
+    
+    def __getattr__(cls, name):
+        return getattr(cls._resolve(), name)
     
-    # 一次性执行所有导入命令
-    if import_commands:
+    def __call__(cls, *args, **kwargs):
+        return cls._resolve()(*args, **kwargs)
+
+def make_lazy_node_class(module_file: str, class_name: str) -> Type[Any]:
+    """创建延迟导入的节点类"""
+    return LazyNodeMeta(class_name, (), {
+        "__module__": f"{__name__}.nodes.{module_file}",
+        "_node_module_file": module_file,
+        "_node_class_name": class_name,
+        "_node_class": None,
+    })
+
+# 已导入模块缓存 (导入失败记为 None)
+_imported_modules: Dict[str, Any] = {}
+
+# 延迟模块的可用性检查结果
+_lazy_module_status: Dict[str, bool] = {}
+
+def import_node_module(module_file: str) -> Any:
+    """导入节点模块并缓存结果，失败时只报告一次错误并返回 None"""
+    if module_file not in _imported_modules:
         try:
-            import_statement = "\n".join(import_commands)
-            exec(import_statement, globals())
-            if not ENABLED_MODULES:
-                print("🔶 All main modules loaded")
-            else:
-                print(f"🔶 Loaded modules: {', '.join(loaded_modules) if loaded_modules else 'None'}")
+            _imported_modules[module_file] = importlib.import_module(f".nodes.{module_file}", __name__)
         except ImportError as e:
-            print(f"❌ Failed to load modules: {e}")
+            print(f"❌ Failed to load module {module_file}: {e}")
+            _imported_modules[module_file] = None
+    return _imported_modules[module_file]
+
+def lazy_module_available(module_file: str) -> bool:
+    """不导入模块，检查延迟模块文件及其依赖是否存在；缺失时只报告一次错误"""
+    if module_file not in _lazy_module_status:
+        missing = [name for name in LAZY_MODULES[module_file] if importlib.util.find_spec(name) is None]
+        if importlib.util.find_spec(f"{__name__}.nodes.{module_file}") is None:
+            missing.insert(0, module_file)
+        if missing:
+            print(f"❌ Failed to load module {module_file}: missing {', '.join(missing)}")
+        _lazy_module_status[module_file] = not missing
+    return _lazy_module_status[module_file]
+
+def load_node_class(module_file: str, class_name: str) -> Type[Any]:
+    """按注册表解析节点类：轻量模块立即导入，重量级模块延迟导入"""
+    if module_file in LAZY_MODULES:
+        return make_lazy_node_class(module_file, class_name) if lazy_module_available(module_file) else None
     
-    return loaded_modules
+    module = import_node_module(module_file)
+    return getattr(module, class_name, None) if module is not None else None
 
-# 加载模块
-loaded_modules = load_modules()
-
-if LOAD_DEPRECATED_NODES:
-    try:
-        from .nodes.jake_node_deprecated import *
-        print("🔶 All deprecated nodes loaded")
-    except ImportError as e:
-        print(f"❌ Failed to load deprecated nodes: {e}")
-else:
-    print("🔶 No deprecated nodes loaded")
-
-# 根据实际加载的模块动态创建节点映射
+# 根据配置创建节点映射
 def create_node_mappings() -> Dict[str, Type[Any]]:
     """创建节点映射字典"""
     node_mappings = {}
     
-    # 使用全局符号表来检查已导入的类
-    global_symbols = globals()
+    # 如果没有指定模块，默认加载所有
+    module_keys = ENABLED_MODULES if ENABLED_MODULES else list(NODE_REGISTRY.keys())
     
-    # 使用lambda函数延迟求值
-    module_mappings = {    
-        ### 3D Nodes
-        '3d': lambda: {
-            "Adv3DViewer_JK": lambda: global_symbols.get("Adv3DViewer_JK"),
-            "SAM3D From Video JK": lambda: global_symbols.get("SAM3DMeshSequenceFromVideo_JK"),
-            "Orbit Poses JK": lambda: global_symbols.get("OrbitPoses_JK"),
-            "OrbitLists to OrbitPoses JK": lambda: global_symbols.get("OrbitLists_to_OrbitPoses_JK"),
-            "OrbitPoses to OrbitLists JK": lambda: global_symbols.get("OrbitPoses_to_OrbitLists_JK"),
-            "Get OrbitPoses From List JK": lambda: global_symbols.get("Get_OrbitPoses_From_List_JK"),
-        },
-        ### Audio Nodes
-        'audio': lambda: {
-            "Cut Audio JK": lambda: global_symbols.get("CutAudio_JK"),
-            "Cut Audio Index JK": lambda: global_symbols.get("CutAudioIndex_JK"),
-            "Cut Audio Cuts JK": lambda: global_symbols.get("CutAudioCuts_JK"),
-            "Cut Audio Loop JK": lambda: global_symbols.get("CutAudioLoop_JK"),
-        },
-        ### ControlNet Nodes
-        'controlnet': lambda: {
-            "CR ControlNet Loader JK": lambda: global_symbols.get("CR_ControlNetLoader_JK"),
-            "CR Multi-ControlNet Param Stack JK": lambda: global_symbols.get("CR_ControlNetParamStack_JK"),
-            "CR Apply ControlNet JK": lambda: global_symbols.get("CR_ApplyControlNet_JK"),
-            "CR Apply Multi-ControlNet Adv JK": lambda: global_symbols.get("CR_ApplyControlNetStackAdv_JK"),
-        },
-        ### LoRA Nodes
-        'lora': lambda: {
-            "CR LoRA Stack JK": lambda: global_symbols.get("CR_LoRAStack_JK"),
-            "CR Apply LoRA Stack JK": lambda: global_symbols.get("CR_ApplyLoRAStack_JK"),
-            "CR LoRA Stack Model Only JK": lambda: global_symbols.get("CR_LoRAStack_ModelOnly_JK"),
-            "CR Apply LoRA Stack Model Only JK": lambda: global_symbols.get("CR_ApplyLoRAStack_ModelOnly_JK"),
-        },
-        ### Experimental Nodes
-        'experimental': lambda: {
-            "Random Beats JK": lambda: global_symbols.get("RandomBeats_JK"),
-        },
-        ### Image Nodes
-        'image': lambda: {
-            "Rough Outline JK": lambda: global_symbols.get("RoughOutline_JK"),
-            "OpenDWPose_JK": lambda: global_symbols.get("OpenDWPose_JK"),
-            "Make Image Grid JK": lambda: global_symbols.get("MakeImageGrid_JK"),
-            "Split Image Grid JK": lambda: global_symbols.get("SplitImageGrid_JK"),
-            "Image Remove Alpha JK": lambda: global_symbols.get("ImageRemoveAlpha_JK"),
-            "Color Grading JK": lambda: global_symbols.get("ColorGrading_JK"),
-            "Get Size JK": lambda: global_symbols.get("GetSize_JK"),
-            "Image Crop By Mask Resolution Grp JK": lambda: global_symbols.get("ImageCropByMaskResolutionGrp_JK"),
-            "Image Crop by Mask Params JK": lambda: global_symbols.get("ImageCropByMaskParams_JK"),
-            "Scale To Resolution JK": lambda: global_symbols.get("ScaleToResolution_JK"),
-            "HintImageEnchance JK": lambda: global_symbols.get("HintImageEnchance_JK"),
-        },
-        ### Latent Nodes
-        'latent': lambda: {
-            "Empty Latent Color JK": lambda: global_symbols.get("EmptyLatentColor_JK"),
-            "Latent Crop Offset JK": lambda: global_symbols.get("LatentCropOffset_JK"),
-        },
-        ### Mask Nodes
-        'mask': lambda: {
-            "Is Mask Empty JK": lambda: global_symbols.get("IsMaskEmpty_JK"),
-        },
-        ### Math Nodes
-        'math': lambda: {
-            "CM_BoolToInt JK": lambda: global_symbols.get("BoolToInt_JK"),
-            "CM_IntToBool JK": lambda: global_symbols.get("IntToBool_JK"),
-            "CM_BoolUnaryOperation JK": lambda: global_symbols.get("BoolUnaryOperation_JK"),
-            "CM_BoolBinaryOperation JK": lambda: global_symbols.get("BoolBinaryOperation_JK"),
-            "Bool Binary And JK": lambda: global_symbols.get("BoolBinaryAnd_JK"),
-            "Bool Binary OR JK": lambda: global_symbols.get("BoolBinaryOR_JK"),
-            "CM_StringBinaryCondition_JK": lambda: global_symbols.get("StringBinaryCondition_JK"),
-            "CM_FloatUnaryCondition JK": lambda: global_symbols.get("FloatUnaryCondition_JK"),
-            "CM_FloatBinaryCondition JK": lambda: global_symbols.get("FloatBinaryCondition_JK"),
-            "CM_IntUnaryCondition JK": lambda: global_symbols.get("IntUnaryCondition_JK"),
-            "CM_IntBinaryCondition JK": lambda: global_symbols.get("IntBinaryCondition_JK"),
-            "CM_FloatToInt JK": lambda: global_symbols.get("FloatToInt_JK"),
-            "CM_IntToFloat JK": lambda: global_symbols.get("IntToFloat_JK"),
-            "CM_FloatUnaryOperation JK": lambda: global_symbols.get("FloatUnaryOperation_JK"),
-            "CM_FloatBinaryOperation JK": lambda: global_symbols.get("FloatBinaryOperation_JK"),
-            "CM_IntUnaryOperation JK": lambda: global_symbols.get("IntUnaryOperation_JK"),
-            "CM_IntBinaryOperation JK": lambda: global_symbols.get("IntBinaryOperation_JK"),
-            "Int Sub Operation JK": lambda: global_symbols.get("IntSubOperation_JK"),
-            "Evaluate Ints JK": lambda: global_symbols.get("EvaluateInts_JK"),
-            "Evaluate Floats JK": lambda: global_symbols.get("EvaluateFloats_JK"),
-            "Evaluate Strings JK": lambda: global_symbols.get("EvaluateStrs_JK"),
-            "Evaluate Examples JK": lambda: global_symbols.get("EvalExamples_JK"),
-        },
-        ### Misc Nodes
-        'misc': lambda: {
-            "Project Setting JK": lambda: global_symbols.get("ProjectSetting_JK"),
-            "Ksampler Parameters Default JK": lambda: global_symbols.get("KsamplerParametersDefault_JK"),
-            "Ksampler Adv Parameters Default JK": lambda: global_symbols.get("KsamplerAdvParametersDefault_JK"),
-            "Base Model Parameters SD3API JK": lambda: global_symbols.get("BaseModelParametersSD3API_JK"),
-            "Inject Noise Params JK": lambda: global_symbols.get("Inject_Noise_Params_JK"),
-            "SD3 Prompts Switch JK": lambda: global_symbols.get("SD3_Prompts_Switch_JK"),
-            "SDXL Target Res JK": lambda: global_symbols.get("SDXL_TargetRes_JK"),
-            "Guidance Default JK": lambda: global_symbols.get("GuidanceDefault_JK"),
-            "Image Resize Mode JK": lambda: global_symbols.get("ImageResizeMode_JK"),
-            "Sampler Loader JK": lambda: global_symbols.get("SamplerLoader_JK"),
-            "Upscale Method JK": lambda: global_symbols.get("UpscaleMethod_JK"),
-            "CR Aspect Ratio JK": lambda: global_symbols.get("CR_AspectRatio_JK"),
-            "String To Combo JK": lambda: global_symbols.get("StringToCombo_JK"),
-            "Get Nth String JK": lambda: global_symbols.get("GetNthString_JK"),
-            "Save String List To JSON JK": lambda: global_symbols.get("SaveStringListToJSON_JK"),
-            "Load String List From JSON JK": lambda: global_symbols.get("LoadStringListFromJSON_JK"),
-            "Tiling Mode JK": lambda: global_symbols.get("TilingMode_JK"),
-            "Remove Input JK": lambda: global_symbols.get("RemoveInput_JK"),
-        },
-        ### Prompt Nodes
-        'prompt': lambda: {
-            "RandomPrompter_JK": lambda: global_symbols.get("RandomPrompter_JK"),
-            "RandomPrompterGeek_JK": lambda: global_symbols.get("RandomPrompterGeek_JK"),
-            "SystemPrompter_JK": lambda: global_symbols.get("SystemPrompter_JK"),
-            "ShotScriptCombiner_JK": lambda: global_symbols.get("ShotScriptCombiner_JK"),
-            "ShotScriptExtractor_JK": lambda: global_symbols.get("ShotScriptExtractor_JK"),
-            "CM_PromptCombine_JK": lambda: global_symbols.get("PromptCombine_JK"),
-        },
-        ### Switch Nodes
-        'switch': lambda: {
-            "CR Boolean JK": lambda: global_symbols.get("CR_Boolean_JK"),
-            "CR Int Input Switch JK": lambda: global_symbols.get("CR_IntInputSwitch_JK"),
-            "CR Float Input Switch JK": lambda: global_symbols.get("CR_FloatInputSwitch_JK"),
-            "CR Image Input Switch JK": lambda: global_symbols.get("CR_ImageInputSwitch_JK"),
-            "CR Mask Input Switch JK": lambda: global_symbols.get("CR_MaskInputSwitch_JK"),
-            "CR Audio Input Switch JK": lambda: global_symbols.get("CR_AudioInputSwitch_JK"),
-            "CR Latent Input Switch JK": lambda: global_symbols.get("CR_LatentInputSwitch_JK"),
-            "CR Conditioning Input Switch JK": lambda: global_symbols.get("CR_ConditioningInputSwitch_JK"),
-            "CR Clip Input Switch JK": lambda: global_symbols.get("CR_ClipInputSwitch_JK"),
-            "CR Model Input Switch JK": lambda: global_symbols.get("CR_ModelInputSwitch_JK"),
-            "CR ControlNet Input Switch JK": lambda: global_symbols.get("CR_ControlNetInputSwitch_JK"),
-            "CR ControlNet Stack Input Switch JK": lambda: global_symbols.get("CR_ControlNetStackInputSwitch_JK"),
-            "CR Text Input Switch JK": lambda: global_symbols.get("CR_TextInputSwitch_JK"),
-            "CR VAE Input Switch JK": lambda: global_symbols.get("CR_VAEInputSwitch_JK"),
-            "CR Noise Input Switch JK": lambda: global_symbols.get("CR_NoiseInputSwitch_JK"),
-            "CR Guider Input Switch JK": lambda: global_symbols.get("CR_GuiderInputSwitch_JK"),
-            "CR Sampler Input Switch JK": lambda: global_symbols.get("CR_SamplerInputSwitch_JK"),
-            "CR Sigmas Input Switch JK": lambda: global_symbols.get("CR_SigmasInputSwitch_JK"),
-            "CR Mesh Input Switch JK": lambda: global_symbols.get("CR_MeshInputSwitch_JK"),
-            "CR Ply Input Switch JK": lambda: global_symbols.get("CR_PlyInputSwitch_JK"),
-            "CR Orbit Pose Input Switch JK": lambda: global_symbols.get("CR_OrbitPoseInputSwitch_JK"),
-            "CR TriMesh Input Switch JK": lambda: global_symbols.get("CR_TriMeshInputSwitch_JK"),
-            "CR Impact Pipe Input Switch JK": lambda: global_symbols.get("CR_ImpactPipeInputSwitch_JK"),
-        },
-        ### Video Nodes
-        'video': lambda: {
-            "Scene Cuts JK": lambda: global_symbols.get("SceneCuts_JK"),
-            "Create Loop Schedule List": lambda: global_symbols.get("CreateLoopScheduleList"),
-            "Wan Frame Count JK": lambda: global_symbols.get("WanFrameCount_JK"),
-            "LTXV2 Frame Count JK": lambda: global_symbols.get("LtxV2FrameCount_JK"),
-            "Wan22 cfg Scheduler List JK": lambda: global_symbols.get("Wan22cfgSchedulerList_JK"),
-            "Wan Wrapper Sampler Default JK": lambda: global_symbols.get("WanWrapperSamplerDefault_JK"),
-        }
-    }
+    for module_key in module_keys:
+        if module_key not in NODE_REGISTRY:
+            print(f"⚠️ Unknown module: {module_key}")
+            continue
+        for display_name, (module_file, class_name) in NODE_REGISTRY[module_key].items():
+            node_class = load_node_class(module_file, class_name)
+            if node_class is not None and isinstance(node_class, type):
+                node_mappings[display_name] = node_class
+            else:
+                print(f"⚠️ Node class not found: {display_name}")
     
-    # 高效处理：根据是否指定模块选择不同策略
     if not ENABLED_MODULES:
-        # 加载所有模块
-        for module_key, node_dict_func in module_mappings.items():
-            node_dict = node_dict_func()  # 调用lambda函数获取字典
-            for display_name, class_func in node_dict.items():
-                node_class = class_func()  # 调用lambda函数获取类
-                if node_class is not None and isinstance(node_class, type):
-                    node_mappings[display_name] = node_class
-                    # print(f"✅ Found node: {display_name}")
-                else:
-                    print(f"⚠️ Node class not found: {display_name}")
+        print("🔶 All main modules loaded")
     else:
-        # 只加载指定模块
-        for module_key in ENABLED_MODULES:
-            if module_key in module_mappings:
-                node_dict_func = module_mappings[module_key]
-                node_dict = node_dict_func()  # 调用lambda函数获取字典
-                for display_name, class_func in node_dict.items():
-                    node_class = class_func()  # 调用lambda函数获取类
-                    if node_class is not None and isinstance(node_class, type):
-                        node_mappings[display_name] = node_class
-                        # print(f"✅ Found node: {display_name}")
-                    else:
-                        print(f"⚠️ Node class not found: {display_name}")
-            else:
-                print(f"⚠️ Module mapping not found for: {module_key}")
+        print(f"🔶 Loaded modules: {', '.join(k for k in module_keys if k in NODE_REGISTRY) or 'None'}")
     
     return node_mappings
 
 def create_deprecated_node_mappings() -> Dict[str, Type[Any]]:
     """创建已弃用节点映射字典"""
     return {
-        ### 3D Nodes [Deprecated]
-        "Hy3D Cam Config 20to21 JK": Hy3DCamConfig20to21_JK,
-        ### Animation Nodes [Deprecated]
-        "Animation Prompt JK": AnimPrompt_JK,
-        "Animation Value JK": AnimValue_JK,
-        ### ControlNet Nodes [Deprecated]
-        "CR Multi-ControlNet Stack JK": CR_ControlNetStack_JK,
-        "CR Apply Multi-ControlNet JK": CR_ApplyControlNetStack_JK,
-        ### Embedding Nodes [Deprecated]
-        "Embedding Picker JK": EmbeddingPicker_JK,
-        "Embedding Picker Multi JK": EmbeddingPicker_Multi_JK,
-        ### Image Nodes [Deprecated]
-        "Image Crop by Mask Resolution JK": ImageCropByMaskResolution_JK,
-        ### Loader Nodes [Deprecated]
-        "Ckpt Loader JK": CkptLoader_JK,
-        "Vae Loader JK": VaeLoader_JK,
-        "Upscale Model Loader JK": UpscaleModelLoader_JK,
-        ### LoRA Nodes [Deprecated]
-        "CR Load LoRA JK": CR_LoraLoader_JK,
-        ### Math Nodes [Deprecated]
-        "CM_NumberUnaryCondition JK": NumberUnaryCondition_JK,
-        "CM_NumberBinaryCondition JK": NumberBinaryCondition_JK,
-        "CM_Vec2UnaryCondition JK": Vec2UnaryCondition_JK,
-        "CM_Vec2BinaryCondition JK": Vec2BinaryCondition_JK,
-        "CM_Vec2ToFloatUnaryOperation JK": Vec2ToFloatUnaryOperation_JK,
-        "CM_Vec2ToFloatBinaryOperation JK": Vec2ToFloatBinaryOperation_JK,
-        "CM_Vec2FloatOperation_JK": Vec2FloatOperation_JK,
-        "CM_Vec3UnaryCondition JK": Vec3UnaryCondition_JK,
-        "CM_Vec3BinaryCondition JK": Vec3BinaryCondition_JK,
-        "CM_Vec3ToFloatUnaryOperation JK": Vec3ToFloatUnaryOperation_JK,
-        "CM_Vec3ToFloatBinaryOperation JK": Vec3ToFloatBinaryOperation_JK,
-        "CM_Vec3FloatOperation_JK": Vec3FloatOperation_JK,
-        "CM_Vec4UnaryCondition JK": Vec4UnaryCondition_JK,
-        "CM_Vec4BinaryCondition JK": Vec4BinaryCondition_JK,
-        "CM_Vec4ToFloatUnaryOperation JK": Vec4ToFloatUnaryOperation_JK,
-        "CM_Vec4ToFloatBinaryOperation JK": Vec4ToFloatBinaryOperation_JK,
-        "CM_Vec4FloatOperation_JK": Vec4FloatOperation_JK,
-        "CM_IntToNumber JK": IntToNumber_JK,
-        "CM_NumberToInt JK": NumberToInt_JK,
-        "CM_FloatToNumber JK": FloatToNumber_JK,
-        "CM_NumberToFloat JK": NumberToFloat_JK,
-        "CM_NumberUnaryOperation JK": NumberUnaryOperation_JK,
-        "CM_NumberBinaryOperation JK": NumberBinaryOperation_JK,
-        "CM_ComposeVec2 JK": ComposeVec2_JK,
-        "CM_ComposeVec3 JK": ComposeVec3_JK,
-        "CM_ComposeVec4 JK": ComposeVec4_JK,
-        "CM_BreakoutVec2 JK": BreakoutVec2_JK,
-        "CM_BreakoutVec3 JK": BreakoutVec3_JK,
-        "CM_BreakoutVec4 JK": BreakoutVec4_JK,
-        "CM_FillVec2 JK": FillVec2_JK,
-        "CM_FillVec3 JK": FillVec3_JK,
-        "CM_FillVec4 JK": FillVec4_JK,
-        "CM_Vec2UnaryOperation JK": Vec2UnaryOperation_JK,
-        "CM_Vec2BinaryOperation JK": Vec2BinaryOperation_JK,
-        "CM_Vec3UnaryOperation JK": Vec3UnaryOperation_JK,
-        "CM_Vec3BinaryOperation JK": Vec3BinaryOperation_JK,
-        "CM_Vec4UnaryOperation JK": Vec4UnaryOperation_JK,
-        "CM_Vec4BinaryOperation JK": Vec4BinaryOperation_JK,
-        ### Misc Nodes [Deprecated]
-        "CR SD1.5 Aspect Ratio JK": CR_AspectRatioSD15_JK,
-        "CR SDXL Aspect Ratio JK": CR_AspectRatioSDXL_JK,
-        "CR SD3 Aspect Ratio JK": CR_AspectRatioSD3_JK,
-        ### Pipe Nodes [Deprecated]
-        "Pipe End JK": PipeEnd_JK,
-        "NodesState JK": NodesState_JK,
-        "Ksampler Parameters JK": KsamplerParameters_JK,
-        "Base Model Parameters JK": BaseModelParameters_JK,
-        "Base Model Parameters Extract JK": BaseModelParametersExtract_JK,
-        "Base Image Parameters Extract JK": BaseImageParametersExtract_JK,
-        "Base Model Pipe JK": BaseModelPipe_JK,
-        "Base Model Pipe Extract JK": BaseModelPipeExtract_JK,
-        "Noise Injection Parameters JK": NoiseInjectionParameters_JK,
-        "Noise Injection Pipe Extract JK": NoiseInjectionPipeExtract_JK,
-        "Refine Model Parameters JK": RefineModelParameters_JK,
-        "Refine 1 Parameters Extract JK": Refine1ParametersExtract_JK,
-        "Refine 2 Parameters Extract JK": Refine2ParametersExtract_JK,
-        "Refine Pipe JK": RefinePipe_JK,
-        "Refine Pipe Extract JK": RefinePipeExtract_JK,
-        "Upscale Model Parameters JK": UpscaleModelParameters_JK,
-        "Image Upscale Parameters Extract JK": ImageUpscaleParametersExtract_JK,
-        "Latent Upscale Parameters Extract JK": LatentUpscaleParametersExtract_JK,
-        "Upscale Model Parameters Extract JK": UpscaleModelParametersExtract_JK,
-        "Detailer Parameters JK": DetailerParameters_JK,
-        "Metadata Pipe JK": MetadataPipe_JK,
-        "Metadata Pipe Extract JK": MetadataPipeExtract_JK,
-        "Save Image with Metadata JK": ImageSaveWithMetadata_JK,
-        "Save Image with Metadata Flow JK": ImageSaveWithMetadata_Flow_JK,
-        "Load Image With Metadata JK": LoadImageWithMetadata_JK,
-        "Load Image With Alpha JK": LoadImageWithAlpha_JK,
-        ### Reroute Nodes [Deprecated]
-        "Reroute List JK": RerouteList_JK,
-        "Reroute Ckpt JK": RerouteCkpt_JK,
-        "Reroute Vae JK": RerouteVae_JK,
-        "Reroute Sampler JK": RerouteSampler_JK,
-        "Reroute Upscale JK": RerouteUpscale_JK,
-        "Reroute Resize JK": RerouteResize_JK,
-        "Reroute String JK": RerouteString_JK,
-        ### Switch Nodes [Deprecated]
-        "CR Pipe Input Switch JK": CR_PipeInputSwitch_JK,
+        display_name: load_node_class(DEPRECATED_NODE_MODULE, class_name)
+        for display_name, class_name in DEPRECATED_NODE_REGISTRY.items()
     }
 
 def filter_valid_mappings(mappings: Dict[str, Type[Any]]) -> Dict[str, Type[Any]]:
@@ -577,6 +591,15 @@ if LOAD_DEPRECATED_NODES:
     
     NODE_CLASS_MAPPINGS.update(valid_deprecated_node_mappings)
     NODE_DISPLAY_NAME_MAPPINGS.update({k: add_dragon_emoji(k) for k in valid_deprecated_node_mappings.keys()})
+    print("🔶 All deprecated nodes registered")
+else:
+    print("🔶 No deprecated nodes loaded")
+
+# 后台预热哈希缓存
+if HASH_CACHE_WARMUP:
+    from .nodes.jake_tools import warmup_hash_cache
+    warmup_hash_cache()
+    print("🔶 Hash cache warm-up scheduled")
 
 # 导出配置
 __all__ = ['NODE_CLASS_MAPPINGS', 'NODE_DISPLAY_NAME_MAPPINGS']
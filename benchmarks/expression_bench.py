@@ -0,0 +1,102 @@
+#---------------------------------------------------------------------------------------------------------------------#
+# Expression evaluation benchmark for JK Custom Workflow of ComfyUI
+#---------------------------------------------------------------------------------------------------------------------#
+"""
+表达式求值微基准测试，无需运行 ComfyUI
+
+用法:
+    python benchmarks/expression_bench.py
+    python benchmarks/expression_bench.py --iterations 20000 --batch-size 4096
+
+对每个表达式比较单次求值的耗时：
+    legacy    每次调用 simpleeval.simple_eval（重新创建求值器并解析表达式，即缓存前的实现）
+    compiled  compile_expression(...).evaluate（复用缓存的语法树与求值器）
+    node      节点的 evaluate 方法（包含 int/float/str 转换与异常包装）
+另外比较批量模式：逐元素循环调用 compiled 与 evaluate_batch 一次求值整个向量。
+"""
+import argparse
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import simpleeval
+
+from prompt_engine_bench import install_comfy_stubs, load_node_module
+
+# (节点, 表达式, 变量) ；节点默认表达式在前
+NUMERIC_CASES = [
+    ("EvaluateFloats_JK", "((a + b) - c) / 2", {"a": 1.5, "b": 2.25, "c": 0.75}),
+    ("EvaluateFloats_JK", "a * 0.5 + b ** 2 - c", {"a": 1.5, "b": 2.25, "c": 0.75}),
+    ("EvaluateInts_JK", "((a + b) - c) / 2", {"a": 7, "b": 5, "c": 3}),
+    ("EvaluateInts_JK", "a if a > b else b + c % 3", {"a": 7, "b": 5, "c": 3}),
+]
+
+STRING_CASES = [
+    ("EvaluateStrs_JK", "a + b + c", {"a": "Hello", "b": " World", "c": "!"}),
+    ("EvaluateStrs_JK", "str(len(a)) + b", {"a": "Hello", "b": " World", "c": "!"}),
+]
+
+def legacy_eval(expression: str, names: Dict[str, Any], string_functions: bool) -> Any:
+    """缓存前节点使用的求值方式"""
+    if string_functions:
+        functions = simpleeval.DEFAULT_FUNCTIONS.copy()
+        functions.update({"len": len})
+        return simpleeval.simple_eval(expression, names=names, functions=functions)
+    return simpleeval.simple_eval(expression, names=names)
+
+def per_call_us(func: Callable[[], Any], iterations: int, repeat: int) -> float:
+    """repeat 轮中最快一轮的单次调用耗时（微秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e6
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-evaluation cost of the JK expression nodes.")
+    parser.add_argument("--iterations", type=int, default=5000, help="Evaluations per timing run.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per case; the fastest is reported.")
+    parser.add_argument("--batch-size", type=int, default=1024, help="Schedule length for the batch comparison.")
+    args = parser.parse_args(argv)
+
+    install_comfy_stubs()
+    math_nodes = load_node_module("jake_node_math")
+
+    print(f"per evaluation, best of {args.repeat} x {args.iterations}")
+    print(f"  {'node':<18} {'expression':<28} {'legacy':>9} {'compiled':>9} {'node':>9} {'speedup':>8}")
+    for node_name, expression, names in NUMERIC_CASES + STRING_CASES:
+        string_functions = node_name == "EvaluateStrs_JK"
+        function_set = "string" if string_functions else "default"
+        compiled = math_nodes.compile_expression(expression, function_set)
+        node = getattr(math_nodes, node_name)()
+
+        if compiled.evaluate(dict(names)) != legacy_eval(expression, dict(names), string_functions):
+            print(f"Result mismatch for {expression!r}", file=sys.stderr)
+            return 1
+
+        legacy_us = per_call_us(lambda: legacy_eval(expression, dict(names), string_functions), args.iterations, args.repeat)
+        compiled_us = per_call_us(lambda: compiled.evaluate(dict(names)), args.iterations, args.repeat)
+        node_us = per_call_us(lambda: node.evaluate(expression, **names), args.iterations, args.repeat)
+        print(f"  {node_name:<18} {expression:<28} {legacy_us:7.2f}us {compiled_us:7.2f}us {node_us:7.2f}us {legacy_us / compiled_us:7.1f}x")
+
+    # 批量模式：整段调度表逐元素求值 vs 向量化求值一次
+    size = args.batch_size
+    schedule = {"a": [float(i) for i in range(size)], "b": [0.5] * size, "c": [float(size - i) for i in range(size)]}
+    print(f"batch of {size}, per schedule")
+    print(f"  {'expression':<28} {'loop':>10} {'batch':>10} {'speedup':>8}")
+    for _, expression, _ in NUMERIC_CASES[:2]:
+        compiled = math_nodes.compile_expression(expression)
+        def loop():
+            return [compiled.evaluate({"a": a, "b": b, "c": c}) for a, b, c in zip(schedule["a"], schedule["b"], schedule["c"])]
+        def batch():
+            return math_nodes.evaluate_batch(expression, schedule, math_nodes.numpy.float64)
+        loop_us = per_call_us(loop, 1, args.repeat)
+        batch_us = per_call_us(batch, 1, args.repeat)
+        print(f"  {expression:<28} {loop_us / 1000:8.2f}ms {batch_us / 1000:8.2f}ms {loop_us / batch_us:7.1f}x")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#---------------------------------------------------------------------------------------------------------------------#
+# Model file hashing benchmark for JK Custom Workflow of ComfyUI
+#---------------------------------------------------------------------------------------------------------------------#
+"""
+Hashing throughput benchmark, runs without ComfyUI.
+
+Usage:
+    python benchmarks/hash_bench.py
+    python benchmarks/hash_bench.py --files 8 --size-mb 512 --workers 4
+
+Writes synthetic model files to a temporary directory and reports MB/s for the
+old 8 KB read loop, the buffered reader used by calculate_sha256, and
+calculate_file_hashes with cold and warm hash caches. Freshly written files are
+usually still in the page cache, so the numbers measure hashing and memory
+copies rather than the disk; point --dir at a cold mount to include I/O.
+"""
+import argparse
+import contextlib
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+from prompt_engine_bench import install_comfy_stubs, load_node_module
+
+def legacy_sha256(file_path: str) -> str:
+    """The hashing loop calculate_sha256 used before the buffered reader."""
+    sha256_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for byte_block in iter(lambda: f.read(8192), b""):
+            sha256_hash.update(byte_block)
+    return sha256_hash.hexdigest()
+
+def write_files(directory: str, count: int, size_mb: int) -> List[str]:
+    """Write count files of random-looking data, size_mb each."""
+    block = os.urandom(1024 * 1024)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"model_{i}.safetensors")
+        with open(path, "wb") as f:
+            for j in range(size_mb):
+                # Vary each block so files do not share content
+                f.write(j.to_bytes(8, "little") + block[8:])
+        paths.append(path)
+    return paths
+
+def timed(func: Callable[[], object], repeat: int) -> float:
+    """Best wall time of repeat runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark model file hashing without a running ComfyUI server.")
+    parser.add_argument("--files", type=int, default=4, help="Number of synthetic model files.")
+    parser.add_argument("--size-mb", type=int, default=128, help="Size of each file in MB.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker threads for calculate_file_hashes (default: HASH_MAX_WORKERS).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario; the best is reported.")
+    parser.add_argument("--dir", help="Directory for the synthetic files (default: a new temporary directory).")
+    args = parser.parse_args(argv)
+
+    install_comfy_stubs()
+    jake_tools = load_node_module("jake_tools")
+    workers = args.workers or jake_tools.HASH_MAX_WORKERS
+
+    directory = tempfile.mkdtemp(prefix="jk_hash_bench_", dir=args.dir)
+    try:
+        paths = write_files(directory, args.files, args.size_mb)
+        total_mb = args.files * args.size_mb
+        db_path = os.path.join(directory, "sha256_cache.db")
+
+        def cold_cache():
+            # A new cache object and database per run, so every file is a miss
+            if os.path.exists(db_path):
+                os.remove(db_path)
+            jake_tools.hash_cache = jake_tools.HashCache(db_path)
+
+        def hash_batch(max_workers: int):
+            cold_cache()
+            return jake_tools.calculate_file_hashes(paths, max_workers=max_workers)
+
+        expected = [legacy_sha256(path) for path in paths]
+        with contextlib.redirect_stdout(sys.stderr):
+            results = hash_batch(workers)
+        if [results[path].sha256 for path in paths] != expected:
+            print("Hash mismatch between legacy and buffered readers", file=sys.stderr)
+            return 1
+
+        scenarios = {
+            "legacy_8k_sequential": lambda: [legacy_sha256(path) for path in paths],
+            "buffered_sequential": lambda: [jake_tools._hash_file(path) for path in paths],
+            "batch_1_workers_cold": lambda: hash_batch(1),
+            f"batch_{workers}_workers_cold": lambda: hash_batch(workers),
+        }
+
+        print(f"{args.files} files x {args.size_mb} MB, best of {args.repeat}")
+        for name, func in scenarios.items():
+            seconds = timed(func, args.repeat)
+            print(f"  {name:<28} {seconds * 1000:9.1f} ms  {total_mb / seconds:8.1f} MB/s")
+
+        # Warm cache: the database already holds every file
+        hash_batch(workers)
+        seconds = timed(lambda: jake_tools.calculate_file_hashes(paths, max_workers=workers), args.repeat)
+        print(f"  {'batch_warm_cache':<28} {seconds * 1000:9.1f} ms")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+#---------------------------------------------------------------------------------------------------------------------#
+# Image node benchmark for JK Custom Workflow of ComfyUI
+#---------------------------------------------------------------------------------------------------------------------#
+"""
+Image node benchmark, runs without ComfyUI.
+
+Usage:
+    python benchmarks/image_bench.py
+    python benchmarks/image_bench.py --scenario open_dwpose --legacy
+    python benchmarks/image_bench.py --scenario color_grading --grading-frames 4
+    python benchmarks/image_bench.py --scenario grid_memory --grid-count 64 --grid-size 1024 --legacy
+    python benchmarks/image_bench.py --scenario rough_outline --workers 1 --workers 8
+    python benchmarks/image_bench.py --scenario unique_colors --legacy
+
+Scenarios:
+    color_grading ColorGrading_JK in ms per megapixel on --grading-frames 1920x1080 frames with every adjustment on,
+                  for color_grading_tensor and for the old per-frame ImageEnhance path (always timed, it is fast enough)
+    open_dwpose   OpenDWPose_JK on a synthetic 3840x2160 pose render (--legacy also times the old per-color numpy code)
+    grid_memory   MakeImageGrid_JK / SplitImageGrid_JK on --grid-count frames of --grid-size pixels, with the peak
+                  memory above the input, one run per fresh process (--legacy also runs the old PIL round trip)
+    rough_outline RoughOutline_JK frames per second on --outline-frames synthetic 640x480 frames for each --workers
+                  count (default 1 and every CPU core)
+    unique_colors count_unique_colors as HintImageEnchance_JK calls it on 3840x2160 lineart, segmentation and photo-like
+                  hints (--legacy also times the sort-based get_unique_axis0 count)
+
+Each scenario reports the best wall time of --repeat runs. Pass --scenario more
+than once to run several; by default all scenarios run.
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+import cv2
+import numpy
+import torch
+
+import legacy
+from prompt_engine_bench import load_node_module
+from startup_bench import install_host_stubs
+
+def timed(func: Callable[[], object], repeat: int) -> float:
+    """Best wall time of repeat runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+#---------------------------------------------------------------------------------------------------------------------#
+# ColorGrading_JK
+#---------------------------------------------------------------------------------------------------------------------#
+def bench_color_grading(args) -> None:
+    utils = load_node_module("jake_utils")
+    tools = load_node_module("jake_tools")
+    generator = torch.Generator().manual_seed(0)
+    images = torch.randint(0, 256, (args.grading_frames, 1080, 1920, 3), generator=generator).float() / 255.0
+    settings = (1.2, 1.4, 0.7, (10, 0, -10))
+    megapixels = args.grading_frames * 1080 * 1920 / 1e6
+
+    # PIL rounds to uint8 after every step, so the two paths differ by a few 8-bit steps at most
+    difference = (utils.color_grading_tensor(images, *settings) - legacy.color_grading(utils, tools, images, *settings)).abs()
+    if difference.max().item() > 4 / 255 + 1e-6:
+        raise RuntimeError("color_grading_tensor output differs from the PIL path by more than 4/255")
+
+    runs = {
+        "color_grading": lambda: utils.color_grading_tensor(images, *settings),
+        "color_grading_pil": lambda: legacy.color_grading(utils, tools, images, *settings),
+    }
+    for name, run in runs.items():
+        seconds = timed(run, args.repeat)
+        print(f"  {name:<24} {args.grading_frames}x1920x1080  {seconds * 1000:9.1f} ms  {seconds * 1000 / megapixels:7.1f} ms/MP")
+
+#---------------------------------------------------------------------------------------------------------------------#
+# OpenDWPose_JK
+#---------------------------------------------------------------------------------------------------------------------#
+def synthetic_pose(node, height: int, width: int, seed: int) -> torch.Tensor:
+    """Thick limb-like bars in pose colors with jittered, anti-aliasing-like edges."""
+    generator = torch.Generator().manual_seed(seed)
+    colors = sorted(set(node.DWPOSE_REMOVE_COLORS) | set(node.OPENPOSE_RESERVE_COLORS))
+    palette = torch.tensor([node.hex_to_rgb(c) for c in colors], dtype=torch.float32) / 255.0
+    image = torch.zeros(1, height, width, 3)
+    bar_h, bar_w = height // 40, width // 8
+    for _ in range(60):
+        y = torch.randint(0, height - bar_h, (1,), generator=generator).item()
+        x = torch.randint(0, width - bar_w, (1,), generator=generator).item()
+        image[0, y:y + bar_h, x:x + bar_w] = palette[torch.randint(0, len(colors), (1,), generator=generator)]
+    jitter = (torch.rand(image.shape, generator=generator) - 0.5) * (5.0 / 255.0)
+    return (image + jitter * (image > 0)).clamp(0, 1)
+
+def bench_open_dwpose(args) -> None:
+    image_nodes = load_node_module("jake_node_image")
+    node = image_nodes.OpenDWPose_JK()
+    dwpose = synthetic_pose(node, args.height, args.width, 0)
+    openpose = synthetic_pose(node, args.height, args.width, 1)
+
+    node.add_images(dwpose, openpose)  # builds and caches the lookup tables
+    seconds = timed(lambda: node.add_images(dwpose, openpose), args.repeat)
+    print(f"  {'open_dwpose':<24} {args.width}x{args.height}  {seconds * 1000:9.1f} ms")
+
+    if args.legacy:
+        (result,) = node.add_images(dwpose, openpose)
+        if not torch.equal(result, torch.from_numpy(legacy.open_dwpose_add_images(node, dwpose, openpose))):
+            raise RuntimeError("OpenDWPose_JK output differs from the legacy implementation")
+        seconds = timed(lambda: legacy.open_dwpose_add_images(node, dwpose, openpose), 1)
+        print(f"  {'open_dwpose_legacy':<24} {args.width}x{args.height}  {seconds * 1000:9.1f} ms")
+
+#---------------------------------------------------------------------------------------------------------------------#
+# MakeImageGrid_JK / SplitImageGrid_JK
+#---------------------------------------------------------------------------------------------------------------------#
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process; ru_maxrss is in bytes on macOS and in KB elsewhere."""
+    import resource  # POSIX only, bench_grid_memory checks for it
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def measure_grid(operation: str, count: int, size: int):
+    """
+    Runs in a fresh process: builds the input, then returns (seconds, peak MB above the input).
+    
+    ru_maxrss only ever grows, so each measurement needs its own process.
+    """
+    install_host_stubs()
+    utils = load_node_module("jake_utils")
+    cols = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / cols)
+    if operation.startswith("make"):
+        data = torch.rand(count, size, size, 3)
+    else:
+        data = torch.rand(1, rows * size, cols * size, 3)
+    runs = {
+        "make": lambda: utils.tensor_make_image_grid(data, None, cols),
+        "split": lambda: utils.tensor_split_image(data, rows, cols),
+        "make_legacy": lambda: legacy.make_image_grid(utils, data, None, cols),
+        "split_legacy": lambda: legacy.split_image_grid(utils, data, rows, cols),
+    }
+
+    baseline_mb = peak_rss_mb()
+    start = time.perf_counter()
+    runs[operation]()
+    seconds = time.perf_counter() - start
+    return seconds, peak_rss_mb() - baseline_mb
+
+def bench_grid_memory(args) -> None:
+    try:
+        import resource  # noqa: F401
+    except ImportError:
+        print("  grid_memory skipped: the resource module is not available on this platform")
+        return
+    operations = ["make", "split"] + (["make_legacy", "split_legacy"] if args.legacy else [])
+    input_mb = args.grid_count * args.grid_size * args.grid_size * 3 * 4 / (1024 * 1024)
+    context = multiprocessing.get_context("spawn")
+    for operation in operations:
+        with context.Pool(1) as pool:
+            seconds, peak_mb = pool.apply(measure_grid, (operation, args.grid_count, args.grid_size))
+        label = f"grid_{operation}"
+        print(f"  {label:<24} {args.grid_count}x{args.grid_size}^2  {seconds * 1000:9.1f} ms  "
+              f"+{peak_mb:7.0f} MB peak ({input_mb:.0f} MB input)")
+
+#---------------------------------------------------------------------------------------------------------------------#
+# RoughOutline_JK
+#---------------------------------------------------------------------------------------------------------------------#
+def synthetic_frames(count: int, height: int, width: int, seed: int) -> torch.Tensor:
+    """Filled ellipses on a noisy background, different on every frame."""
+    rng = numpy.random.default_rng(seed)
+    frames = numpy.empty((count, height, width, 3), dtype=numpy.uint8)
+    for frame in frames:
+        frame[:] = rng.integers(0, 40, (height, width, 3), dtype=numpy.uint8)
+        for _ in range(12):
+            center = (int(rng.integers(0, width)), int(rng.integers(0, height)))
+            axes = (int(rng.integers(10, width // 4)), int(rng.integers(10, height // 4)))
+            color = tuple(int(c) for c in rng.integers(80, 256, 3))
+            cv2.ellipse(frame, center, axes, float(rng.integers(0, 180)), 0, 360, color, -1)
+    return torch.from_numpy(frames).float() / 255.0
+
+def bench_rough_outline(args) -> None:
+    image_nodes = load_node_module("jake_node_image")
+    node = image_nodes.RoughOutline_JK()
+    images = synthetic_frames(args.outline_frames, 480, 640, 0)
+    settings = dict(blur_size=5, canny_low=50, canny_high=150, simplify_mode="dynamic",
+                    simplify_tolerance=0.5, morph_kernel=9, thickness=4)
+
+    expected = node.rough_outline(images, workers=1, **settings)
+    for workers in args.workers or sorted({1, os.cpu_count() or 1}):
+        result = node.rough_outline(images, workers=workers, **settings)
+        if not all(torch.equal(a, b) for a, b in zip(result, expected)):
+            raise RuntimeError(f"RoughOutline_JK output with {workers} workers differs from 1 worker")
+        seconds = timed(lambda: node.rough_outline(images, workers=workers, **settings), args.repeat)
+        label = f"rough_outline_w{workers}"
+        print(f"  {label:<24} {args.outline_frames}x640x480  {seconds * 1000:9.1f} ms  {args.outline_frames / seconds:7.1f} fps")
+
+#---------------------------------------------------------------------------------------------------------------------#
+# HintImageEnchance_JK color count
+#---------------------------------------------------------------------------------------------------------------------#
+def synthetic_hints(height: int, width: int, seed: int) -> Dict[str, numpy.ndarray]:
+    """The three kinds of hint high_quality_resize tells apart: binary, few colors and many colors."""
+    rng = numpy.random.default_rng(seed)
+    lineart = (rng.random((height, width)) < 0.05).astype(numpy.uint8)[..., None].repeat(3, 2) * 255
+    palette = rng.integers(0, 256, (150, 3), dtype=numpy.uint8)
+    segmentation = palette[rng.integers(0, 150, (height // 16 + 1, width // 16 + 1))].repeat(16, 0).repeat(16, 1)
+    photo = rng.integers(0, 256, (height, width, 3), dtype=numpy.uint8)
+    return {"lineart": lineart, "seg_150": segmentation[:height, :width], "photo": photo}
+
+def bench_unique_colors(args) -> None:
+    image_nodes = load_node_module("jake_node_image")
+    for name, hint in synthetic_hints(args.height, args.width, 0).items():
+        pixels = hint.reshape(-1, 3)
+        count = image_nodes.count_unique_colors(pixels, limit=200)
+        seconds = timed(lambda: image_nodes.count_unique_colors(pixels, limit=200), args.repeat)
+        label = f"colors_{name}"
+        print(f"  {label:<24} {args.width}x{args.height}  {seconds * 1000:9.1f} ms  ({count} colors, limit 200)")
+
+        if args.legacy:
+            exact = len(image_nodes.get_unique_axis0(pixels))
+            if count != min(exact, 201):
+                raise RuntimeError(f"count_unique_colors gives {count} for {name}, get_unique_axis0 gives {exact}")
+            seconds = timed(lambda: len(image_nodes.get_unique_axis0(pixels)), 1)
+            label = f"colors_{name}_legacy"
+            print(f"  {label:<24} {args.width}x{args.height}  {seconds * 1000:9.1f} ms  ({exact} colors)")
+
+SCENARIOS: Dict[str, Callable] = {
+    "color_grading": bench_color_grading,
+    "open_dwpose": bench_open_dwpose,
+    "grid_memory": bench_grid_memory,
+    "rough_outline": bench_rough_outline,
+    "unique_colors": bench_unique_colors,
+}
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JakeUpgrade image nodes without a running ComfyUI server.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Run only the named scenario (repeatable).")
+    parser.add_argument("--width", type=int, default=3840, help="Image width.")
+    parser.add_argument("--height", type=int, default=2160, help="Image height.")
+    parser.add_argument("--grading-frames", type=int, default=4, help="Frames in the color_grading scenario.")
+    parser.add_argument("--grid-count", type=int, default=64, help="Frames in the grid_memory scenario.")
+    parser.add_argument("--grid-size", type=int, default=1024, help="Frame width and height in the grid_memory scenario.")
+    parser.add_argument("--outline-frames", type=int, default=40, help="Frames in the rough_outline scenario.")
+    parser.add_argument("--workers", type=int, action="append", help="RoughOutline_JK workers to time (repeatable).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario; the best is reported.")
+    parser.add_argument("--legacy", action="store_true", help="Also time the previous implementations (slow).")
+    args = parser.parse_args(argv)
+
+    install_host_stubs()
+    print(f"torch {torch.__version__}, {torch.get_num_threads()} threads, cv2 {cv2.__version__}, {cv2.getNumThreads()} threads, "
+          f"{os.cpu_count()} CPUs, best of {args.repeat}")
+    for name in args.scenario or SCENARIOS:
+        SCENARIOS[name](args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
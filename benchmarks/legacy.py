@@ -0,0 +1,367 @@
+#---------------------------------------------------------------------------------------------------------------------#
+# Reference implementations for JK Custom Workflow of ComfyUI
+#---------------------------------------------------------------------------------------------------------------------#
+"""
+Previous implementations of optimized code paths, kept verbatim as the reference.
+
+The benchmarks time them against the current code, and the tests in tests/ check
+that the current code still gives the same output. Both import them from here, so
+there is a single copy of each baseline. Functions that need a node or module take
+it as an argument, so this module itself does not import the repo.
+"""
+import re
+
+import numpy
+import torch
+from PIL import ImageEnhance
+
+#---------------------------------------------------------------------------------------------------------------------#
+# DataCleaner.clean_prompt_string
+#---------------------------------------------------------------------------------------------------------------------#
+def clean_prompt_string(text, language="english"):
+    """clean_prompt_string before the single-pass rewrite."""
+    if not text:
+        return ""
+    use_chinese = language in ["chinese", "japanese", "korean"]
+    comma = "，" if use_chinese else ", "
+    period = "。" if use_chinese else ". "
+    semicolon = "；" if use_chinese else "; "
+    question_mark = "？" if use_chinese else "? "
+    exclamation_mark = "！" if use_chinese else "! "
+
+    text = re.sub(r'\s+', ' ', text)
+
+    for _ in range(5):
+        old_text = text
+        patterns = [
+            (r'[,，]\s*[。，；？！.,;?!]', comma),
+            (r'[.。]\s*[。，；？！.,;?!]', period),
+            (r'[;；]\s*[。，；？！.,;?!]', semicolon),
+            (r'[?？]\s*[。，；？！.,;?!]', question_mark),
+            (r'[!！]\s*[。，；？！.,;?!]', exclamation_mark)
+        ]
+        for pattern, replacement in patterns:
+            text = re.sub(pattern, replacement, text)
+        if text == old_text:
+            break
+
+    if use_chinese:
+        text = re.sub(r'\s*，\s*', comma, text)
+        text = re.sub(r'\s*。\s*', period, text)
+        text = re.sub(r'\s*；\s*', semicolon, text)
+        text = re.sub(r'\s*？\s*', question_mark, text)
+        text = re.sub(r'\s*！\s*', exclamation_mark, text)
+    else:
+        text = re.sub(r'\s*,\s*', comma, text)
+        text = re.sub(r'\s*\.\s*', period, text)
+        text = re.sub(r'\s*;\s*', semicolon, text)
+        text = re.sub(r'\s*\?\s*', question_mark, text)
+        text = re.sub(r'\s*!\s*', exclamation_mark, text)
+        text = re.sub(r' +', ' ', text)
+
+    all_punctuation = ',.，。;；?？!！'
+    text = text.strip(all_punctuation + ' ')
+    return text.strip()
+
+#---------------------------------------------------------------------------------------------------------------------#
+# PromptComponentGenerator.generate_description
+#---------------------------------------------------------------------------------------------------------------------#
+def generate_description(generator, custom_description_value, PromptConfig, DataCleaner):
+    """generate_description before DESCRIPTION_BUCKETS: the options are regrouped by sub-category on every call."""
+    # 几率为空
+    if generator.rng.random() < PromptConfig.RANDOM_EMPTY_PROB:
+        return ""
+
+    # 几率使用custom_description的内容
+    if custom_description_value and custom_description_value.strip() and generator.rng.random() < PromptConfig.CUSTOM_FIELD_PROB:
+        return DataCleaner.clean_prompt_string(custom_description_value)
+
+    if not generator.data_cache['DESCRIPTION_STRUCTURED_OPTIONS']:
+        return ""
+
+    # 按子类别分组
+    description_parts = {
+        'sensory': [],
+        'detail': [],
+        'quality': [],
+        'composition': [],
+        'color': [],
+        'creativity': []
+    }
+
+    # 将选项按子类别分组
+    for category in generator.data_cache['DESCRIPTION_STRUCTURED_OPTIONS']:
+        category_name = category['category']
+        if category_name in description_parts:
+            for option in category['options']:
+                # 如果该类别不需要添加前缀，那么option已经是原始值
+                if category.get('should_add_prefix', True):
+                    clean_value = DataCleaner.remove_category_prefix(option)
+                else:
+                    clean_value = option
+                description_parts[category_name].append(clean_value)
+
+    # 从每个子类别中随机选择一条
+    selected_parts = {}
+    for category, options in description_parts.items():
+        if options:
+            selected_parts[category] = generator.rng.choice(options)
+
+    # 按规定的格式组合
+    sensory = selected_parts.get('sensory', 'masterpiece')
+    detail = selected_parts.get('detail', 'insane detail')
+    quality = selected_parts.get('quality', 'best quality')
+    composition = selected_parts.get('composition', 'masterfully balanced composition')
+    color = selected_parts.get('color', 'harmonious colors')
+    creativity = selected_parts.get('creativity', 'groundbreaking concept')
+
+    return f"a {sensory} of work with {detail} and {quality}, featuring a {composition} and {color}, presenting a {creativity}"
+
+#---------------------------------------------------------------------------------------------------------------------#
+# PromptGenerator.generate_prompt (ABC)
+#---------------------------------------------------------------------------------------------------------------------#
+def abc_generate_prompt(generator, abc, **kwargs):
+    """
+    The ABC PromptGenerator.generate_prompt before PromptPlanCache: file paths are collected and every
+    strategy is created and run per call, loading and cleaning file options through FileLoader.
+    abc is the jake_node_prompt_random_ABC module the generator comes from.
+    """
+    DataCleaner, PromptUtils, get_data_cache = abc.DataCleaner, abc.PromptUtils, abc.get_data_cache
+
+    def process_category_with_strategy(choice, custom_value, category_name, file_paths, strategy_type):
+        """使用策略处理分类选项 - 修复版本"""
+        if choice.lower() == "disable":
+            return ""
+        elif choice.lower() == "enable":
+            if custom_value and custom_value.strip():
+                cleaned_value = DataCleaner.clean_prompt_string(custom_value)
+                if cleaned_value:
+                    return cleaned_value
+        elif choice.lower() == "random":
+            # 修复：使用传入的 file_paths（来自 category_mapping）
+            if file_paths:
+                return generator.context_manager.generate_with_strategy(
+                    strategy_type,
+                    {
+                        "category_name": category_name,
+                        "file_paths": file_paths,
+                        "custom_value": custom_value,
+                    }
+                )
+
+            # 回退到组件生成器
+            return getattr(generator.component_generator, f'generate_{category_name}')(custom_value)
+
+        elif choice.lower().startswith("use image "):
+            if custom_value and custom_value.strip():
+                cleaned_value = DataCleaner.clean_prompt_string(custom_value)
+                if cleaned_value:
+                    return cleaned_value
+            else:
+                image_ref = generator._get_image_ref_string(choice, category_name)
+                if image_ref:
+                    return image_ref
+        elif choice.lower() not in ["disable", "random", "enable"]:
+            if custom_value and custom_value.strip():
+                cleaned_value = DataCleaner.clean_prompt_string(custom_value)
+                if cleaned_value:
+                    return cleaned_value
+            else:
+                clean_value = DataCleaner.remove_category_prefix(choice)
+                if clean_value:
+                    return clean_value
+
+        return ""
+
+    prompt_priority = kwargs.get("prompt_priority", "subject + scene")
+
+    # 收集所有组件
+    components_dict = {}
+
+    # custom_subject - 总是使用
+    custom_subject = kwargs.get("custom_subject", "")
+    if custom_subject:
+        cleaned_value = DataCleaner.clean_prompt_string(custom_subject)
+        if cleaned_value:
+            components_dict["subject"] = cleaned_value
+
+    # 处理各个分类 - 使用策略模式
+    categories_config = [
+        ("scene", "custom_scene", "multiple_files_random"),
+        ("motion", "custom_motion", "single_file_random"),
+        ("facial_action", "custom_facial_action", "multiple_files_random"),
+        ("audio", "custom_audio", "multiple_files_random"),
+        ("lighting", "custom_lighting", "single_file_random"),
+        ("camera", "custom_camera", "multiple_files_random"),
+        ("style", "custom_style", "single_file_random"),
+    ]
+
+    for category_name, custom_field, strategy_type in categories_config:
+        choice = kwargs.get(category_name, "disable")
+        custom_value = kwargs.get(custom_field, "")
+
+        # 修复：直接从数据缓存的结构化选项中获取文件路径
+        data_cache = get_data_cache()
+        structured_options_key = f"{category_name.upper()}_STRUCTURED_OPTIONS"
+
+        file_paths = []
+        if structured_options_key in data_cache:
+            structured_options = data_cache[structured_options_key]
+            # 直接使用存储的完整相对路径
+            for category_data in structured_options:
+                file_relative_path = category_data.get('file_relative_path', '')
+                if file_relative_path:
+                    file_paths.append(file_relative_path)
+
+        result = process_category_with_strategy(
+            choice, custom_value, category_name, file_paths, strategy_type
+        )
+        if result:
+            components_dict[category_name] = result
+
+    # 特殊处理 expression（使用 ExpressionUtils）
+    expression_choice = kwargs.get("expression", "disable")
+    custom_expression_value = kwargs.get("custom_expression", "")
+    exp_str_value = kwargs.get("exp_str", "quite")
+
+    expression_result = generator._get_expression_combination(
+        exp_str_value, expression_choice, custom_expression_value
+    )
+    if expression_result:
+        components_dict["expression"] = expression_result
+
+    # 特殊处理 description（保持原有逻辑）
+    description_choice = kwargs.get("description", "disable")
+    custom_description_value = kwargs.get("custom_description", "")
+
+    if description_choice.lower() == "disable":
+        pass
+    elif description_choice.lower() == "enable":
+        if custom_description_value and custom_description_value.strip():
+            cleaned_value = DataCleaner.clean_prompt_string(custom_description_value)
+            if cleaned_value:
+                components_dict["description"] = cleaned_value
+    elif description_choice.lower() == "random":
+        random_description = generator.component_generator.generate_description("")
+        if random_description:
+            components_dict["description"] = random_description
+    else:
+        if custom_description_value and custom_description_value.strip():
+            cleaned_value = DataCleaner.clean_prompt_string(custom_description_value)
+            if cleaned_value:
+                components_dict["description"] = cleaned_value
+        else:
+            clean_value = DataCleaner.remove_category_prefix(description_choice)
+            if clean_value:
+                components_dict["description"] = clean_value
+
+    # 根据优先级设置组合组件
+    components = generator._arrange_components_by_priority(components_dict, prompt_priority)
+    full_prompt_string = PromptUtils.smart_join(components, separator=", ")
+
+    return full_prompt_string
+
+#---------------------------------------------------------------------------------------------------------------------#
+# ColorGrading_JK
+#---------------------------------------------------------------------------------------------------------------------#
+def color_grading(utils, tools, images, brightness, contrast, saturation, rgb_offset):
+    """ColorGrading_JK before color_grading_tensor: ImageEnhance steps and image_gray_offset per frame."""
+    frames = []
+    for image in images:
+        original_image = tools.tensor2pil(image.unsqueeze(0))
+        ret_image = original_image.convert('RGB')
+        if brightness != 1:
+            ret_image = ImageEnhance.Brightness(ret_image).enhance(factor=brightness)
+        if contrast != 1:
+            ret_image = ImageEnhance.Contrast(ret_image).enhance(factor=contrast)
+        if saturation != 1:
+            ret_image = ImageEnhance.Color(ret_image).enhance(factor=saturation)
+        if any(rgb_offset):
+            channels = [utils.image_gray_offset(channel, offset) if offset else channel
+                        for channel, offset in zip(ret_image.split(), rgb_offset)]
+            ret_image = utils.image_channel_merge(channels, 'RGB')
+        if original_image.mode == 'RGBA':
+            ret_image = utils.RGB2RGBA(ret_image, original_image.split()[-1])
+        frames.append(tools.pil2tensor(ret_image))
+    return torch.cat(frames, dim=0)
+
+#---------------------------------------------------------------------------------------------------------------------#
+# OpenDWPose_JK
+#---------------------------------------------------------------------------------------------------------------------#
+def open_dwpose_add_images(node, DWPose, OpenPose):
+    """OpenDWPose_JK.add_images before the lookup table: one numpy mask per color, minus its debug prints."""
+    def remove_color(image, hex_color):
+        image = image.cpu().numpy() if isinstance(image, torch.Tensor) else image
+        target = [c / 255.0 for c in node.hex_to_rgb(hex_color)]
+        image[numpy.all(numpy.abs(image - target) < 0.01, axis=-1)] = 0
+        return torch.from_numpy(image)
+
+    def reserve_color(image, reserved_colors):
+        image = image.cpu().numpy() if isinstance(image, torch.Tensor) else image
+        mask = None
+        for each in reserved_colors:
+            target = [c / 255.0 for c in node.hex_to_rgb(each)]
+            color_mask = numpy.all(numpy.abs(image - target) < 0.01, axis=-1)
+            mask = color_mask if mask is None else mask | color_mask
+        image[~mask] = 0
+        return torch.from_numpy(image)
+
+    DWPose, OpenPose = DWPose.clone(), OpenPose.clone()
+    for each in node.DWPOSE_REMOVE_COLORS:
+        DWPose = remove_color(DWPose, each)
+    OpenPose = reserve_color(OpenPose, node.OPENPOSE_RESERVE_COLORS)
+    return numpy.add(DWPose.numpy(), OpenPose.numpy())
+
+#---------------------------------------------------------------------------------------------------------------------#
+# MakeImageGrid_JK / SplitImageGrid_JK
+#---------------------------------------------------------------------------------------------------------------------#
+def make_image_grid(utils, images, rows, cols):
+    """MakeImageGrid_JK before the tensor path: 8-bit PIL frames pasted onto a PIL grid."""
+    grid = utils.pil_make_image_grid(utils.torch_imgs_to_pils(images), rows, cols)
+    return utils.TF.to_tensor(grid).permute(1, 2, 0).unsqueeze(0)
+
+def split_image_grid(utils, image, rows, cols):
+    """SplitImageGrid_JK before the tensor path: PIL crops converted back one by one."""
+    cells = []
+    for image_pil in utils.torch_imgs_to_pils(image):
+        cells.append(utils.pils_to_torch_imgs(utils.pil_split_image(image_pil, rows, cols), image.dtype, image.device))
+    return torch.cat(cells)
+
+#---------------------------------------------------------------------------------------------------------------------#
+# RoughOutline_JK.connect_breakpoints
+#---------------------------------------------------------------------------------------------------------------------#
+def connect_breakpoints(contour, max_gap=5):
+    """Connect breakpoints in contours to maintain shape consistency"""
+    new_contour = []
+    if len(contour) == 0:
+        return contour
+    
+    # Ensure correct initial point shape
+    last_point = numpy.array(contour[0], dtype=numpy.int32).reshape(1,1,2)
+    new_contour.append(last_point)
+    
+    for point in contour[1:]:
+        current_point = numpy.array(point, dtype=numpy.int32).reshape(1,1,2)
+        distance = numpy.linalg.norm(current_point - last_point)
+        
+        if distance > max_gap:
+            # Generate intermediate points and maintain 3D shape (N,1,2)
+            num_intermediate = int(distance // max_gap) + 1
+            intermediate = numpy.linspace(
+                last_point[0,0], 
+                current_point[0,0], 
+                num=num_intermediate+2,
+                dtype=numpy.int32
+            )
+            # Reshape to (N,1,2) format
+            intermediate = intermediate.reshape(-1,1,2)
+            
+            # Skip first and last points (already included)
+            for p in intermediate[1:-1]:
+                new_contour.append(p.reshape(1,1,2))
+        
+        new_contour.append(current_point)
+        last_point = current_point
+    
+    # Concatenate after unifying shapes
+    return numpy.concatenate(new_contour, axis=0)
@@ -0,0 +1,99 @@
+#---------------------------------------------------------------------------------------------------------------------#
+# Prompt cleaner benchmark for JK Custom Workflow of ComfyUI
+#---------------------------------------------------------------------------------------------------------------------#
+"""
+DataCleaner.clean_prompt_string 吞吐量基准测试（MB/s），无需运行 ComfyUI
+
+用法:
+    python benchmarks/prompt_cleaner_bench.py
+    python benchmarks/prompt_cleaner_bench.py --prompts 5000 --repeat 5
+
+语料分两部分：标准版 RandomPrompter_JK 生成的真实提示词（清理前的拼接文本），以及混有连续标点、
+制表符、换行和全角空格的随机文本。分别测量旧的多轮正则实现、当前实现（标点片段缓存为空）与当前实现
+（缓存已预热）在英文和中文规则下的吞吐量，并先确认两种实现的输出完全一致。
+"""
+import argparse
+import contextlib
+import random
+import sys
+import time
+from typing import Callable, List
+
+import legacy
+from prompt_engine_bench import default_inputs, install_comfy_stubs, load_node_module
+
+def build_corpus(count: int) -> List[str]:
+    """生成提示词语料：一半来自标准版生成器的拼接文本，一半为带噪声的随机文本"""
+    shared = load_node_module("jake_node_prompt_shared")
+    standard = load_node_module("jake_node_prompt_random")
+    rng = random.Random(0)
+
+    # 记录生成过程中传给清理函数的原始文本
+    captured = []
+    clean = shared.DataCleaner.clean_prompt_string
+    def capture(text, language="english"):
+        if text and len(captured) < count // 2:
+            captured.append(text)
+        return clean(text, language)
+
+    inputs = default_inputs(standard.RandomPrompter_JK)
+    inputs["custom_subject"] = "a cat sitting on a windowsill, soft light ,, 8k"
+    shared.DataCleaner.clean_prompt_string = staticmethod(capture)
+    try:
+        seed = 0
+        while len(captured) < count // 2:
+            standard.RandomPrompter_JK().execute(**dict(inputs, seed=seed))
+            seed += 1
+    finally:
+        shared.DataCleaner.clean_prompt_string = staticmethod(clean)
+
+    words = ["a cat", "red dress", "soft light", "8k", "猫", "柔光", "(word:1.2)"]
+    noise = [" ", "  ", "\t", "\n", "　", ",", ", ,", ",.", "。，", "!!", " ; ", "?"]
+    noisy = ["".join(rng.choice(words if j % 2 == 0 else noise) for j in range(rng.randint(4, 40)))
+             for _ in range(count - len(captured))]
+    return captured + noisy
+
+def throughput(func: Callable[[str], str], corpus: List[str], repeat: int, setup: Callable[[], None] = None) -> float:
+    """repeat 轮中最快一轮的吞吐量（MB/s，按 UTF-8 字节计）"""
+    size_mb = sum(len(text.encode("utf-8")) for text in corpus) / (1024 * 1024)
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for text in corpus:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return size_mb / best
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark DataCleaner.clean_prompt_string throughput in MB/s.")
+    parser.add_argument("--prompts", type=int, default=4000, help="Number of texts in the corpus.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario; the best is reported.")
+    args = parser.parse_args(argv)
+
+    install_comfy_stubs()
+    with contextlib.redirect_stdout(sys.stderr):
+        corpus = build_corpus(args.prompts)
+    cleaner = load_node_module("jake_node_prompt_shared").DataCleaner
+    size_mb = sum(len(text.encode("utf-8")) for text in corpus) / (1024 * 1024)
+
+    print(f"{len(corpus)} texts, {size_mb:.2f} MB, best of {args.repeat}")
+    for language in ("english", "chinese"):
+        for text in corpus:
+            if cleaner.clean_prompt_string(text, language) != legacy.clean_prompt_string(text, language):
+                print(f"Output mismatch ({language}): {text!r}", file=sys.stderr)
+                return 1
+
+        scenarios = {
+            "legacy": (lambda text: legacy.clean_prompt_string(text, language), None),
+            "current_cold_cache": (lambda text: cleaner.clean_prompt_string(text, language), cleaner._clean_punctuation_cluster.cache_clear),
+            "current_warm_cache": (lambda text: cleaner.clean_prompt_string(text, language), None),
+        }
+        for name, (func, setup) in scenarios.items():
+            print(f"  {language:<8} {name:<20} {throughput(func, corpus, args.repeat, setup):8.2f} MB/s")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,360 @@
+#---------------------------------------------------------------------------------------------------------------------#
+# Prompt engine benchmark for JK Custom Workflow of ComfyUI
+#---------------------------------------------------------------------------------------------------------------------#
+"""
+提示词引擎基准测试，无需运行 ComfyUI
+
+用法:
+    python benchmarks/prompt_engine_bench.py --output report.json
+    python benchmarks/prompt_engine_bench.py --baseline report.json --tolerance 0.5
+
+使用仓库中真实的 prompt_data，分别测量冷加载（解析全部数据文件、读取编译快照、构建分类映射）、
+热加载（读取内存中的数据、轮询文件修改时间）与热生成（标准版、Geek 版、ABC 版、SysPromptBuilder）
+的 p50/p95 延迟和内存分配，输出 JSON 报告。
+standard_batch_1000 与 standard_single_x1000 比较 batch_count=1000 与逐条调用 1000 次单次生成，
+运行前先确认两者输出完全一致。
+geek_generate_60_tags 与 geek_compile_60_tags 分别测量 60 个标签模板的热生成与首次编译。
+description_10k 与 description_10k_legacy 比较连续生成 10000 条 description 时预分组与逐次分组（旧实现）的耗时，
+运行前先确认两者输出完全一致。
+指定 --baseline 时，任一场景的指标超过基线 (1 + tolerance) 倍即以非零状态码退出；
+绝对差值不超过 --min-delta（与 --metric 同单位，默认按指标取值）的变化视为噪声。
+"""
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from typing import Any, Callable, Dict, List
+
+import legacy
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = "jake_upgrade_bench"
+
+REPORT_VERSION = 1
+
+# 各指标的默认噪声阈值（与指标同单位），绝对差值在阈值以内不视为回归
+DEFAULT_MIN_DELTA = {
+    "p50_ms": 0.05,
+    "p95_ms": 0.05,
+    "mean_ms": 0.05,
+    "alloc_peak_kb": 16.0,
+}
+
+#---------------------------------------------------------------------------------------------------------------------#
+# 环境准备
+#---------------------------------------------------------------------------------------------------------------------#
+def install_comfy_stubs():
+    """注册 folder_paths / server 的最小替身模块，已存在真实模块时保持不变"""
+    if "folder_paths" not in sys.modules:
+        folder_paths = types.ModuleType("folder_paths")
+        folder_paths.models_dir = os.path.join(REPO_ROOT, "models")
+        folder_paths.folder_names_and_paths = {}
+        folder_paths.get_filename_list = lambda folder_name: []
+        folder_paths.get_full_path = lambda folder_name, filename: None
+        folder_paths.get_input_directory = lambda: tempfile.gettempdir()
+        folder_paths.get_output_directory = lambda: tempfile.gettempdir()
+        folder_paths.get_temp_directory = lambda: tempfile.gettempdir()
+        sys.modules["folder_paths"] = folder_paths
+
+    if "server" not in sys.modules:
+        server = types.ModuleType("server")
+
+        class _Routes:
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: (lambda handler: handler)
+
+        class PromptServer:
+            instance = types.SimpleNamespace(routes=_Routes(), send_sync=lambda *args, **kwargs: None)
+
+        server.PromptServer = PromptServer
+        sys.modules["server"] = server
+
+def load_node_module(name: str) -> types.ModuleType:
+    """以包内模块方式导入 nodes 下的模块，不执行仓库根目录的 __init__.py（其依赖 ComfyUI）"""
+    for package, path in ((PACKAGE_NAME, REPO_ROOT), (f"{PACKAGE_NAME}.nodes", os.path.join(REPO_ROOT, "nodes"))):
+        if package not in sys.modules:
+            module = types.ModuleType(package)
+            module.__path__ = [path]
+            sys.modules[package] = module
+    return importlib.import_module(f"{PACKAGE_NAME}.nodes.{name}")
+
+def default_inputs(node_class, random_choice: bool = True) -> Dict[str, Any]:
+    """从节点的 INPUT_TYPES 取默认值，含 random 的下拉框选择 random"""
+    inputs = {}
+    for key, spec in node_class.INPUT_TYPES()["required"].items():
+        widget = spec[0]
+        options = spec[1] if len(spec) > 1 else {}
+        if isinstance(widget, list):
+            if random_choice and "random" in widget:
+                inputs[key] = "random"
+            else:
+                inputs[key] = options.get("default", widget[0] if widget else None)
+        else:
+            inputs[key] = options.get("default")
+    return inputs
+
+#---------------------------------------------------------------------------------------------------------------------#
+# 测量
+#---------------------------------------------------------------------------------------------------------------------#
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """线性插值百分位数"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def measure(func: Callable[[int], Any], iterations: int, warmup: int, setup: Callable[[], None] = None,
+            trace_iterations: int = 5) -> Dict[str, Any]:
+    """
+    测量单个场景：func(i) 为第 i 次调用，setup 在每次调用前执行且不计时
+    计时与内存分配分开测量，避免 tracemalloc 影响延迟数据
+    """
+    for i in range(warmup):
+        if setup:
+            setup()
+        func(i)
+
+    durations = []
+    for i in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter_ns()
+        func(i)
+        durations.append((time.perf_counter_ns() - start) / 1e6)
+
+    peaks = []
+    retained = []
+    tracemalloc.start()
+    try:
+        for i in range(min(trace_iterations, iterations)):
+            if setup:
+                setup()
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            func(i)
+            after, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(after - before)
+    finally:
+        tracemalloc.stop()
+
+    durations.sort()
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(durations, 0.50), 4),
+        "p95_ms": round(percentile(durations, 0.95), 4),
+        "mean_ms": round(sum(durations) / len(durations), 4),
+        "min_ms": round(durations[0], 4),
+        "alloc_peak_kb": round(max(peaks) / 1024, 1) if peaks else 0.0,
+        "alloc_retained_kb": round(max(retained) / 1024, 1) if retained else 0.0,
+    }
+
+#---------------------------------------------------------------------------------------------------------------------#
+# 场景
+#---------------------------------------------------------------------------------------------------------------------#
+def run_scenarios(iterations: int, cold_iterations: int, selected: List[str] = None) -> Dict[str, Dict[str, Any]]:
+    """运行全部（或指定的）场景，返回 {场景名: 测量结果}"""
+    shared = load_node_module("jake_node_prompt_shared")
+    standard = load_node_module("jake_node_prompt_random")
+    abc = load_node_module("jake_node_prompt_random_ABC")
+    sys_prompt = load_node_module("jake_node_prompt")
+
+    # 快照写入临时目录，不改动仓库中的快照文件
+    snapshot_dir = tempfile.mkdtemp(prefix="jk_prompt_bench_")
+    shared.DataSnapshot.SNAPSHOT_PATH = os.path.join(snapshot_dir, "prompt_data_snapshot.pkl")
+
+    def reset_loaded_data():
+        shared.DataSnapshot.FILES = {}
+        shared.DataSnapshot.MANIFEST = None
+        shared._DATA_CACHE = None
+        shared.DataCleaner._clean_punctuation_cluster.cache_clear()
+
+    def remove_snapshot():
+        reset_loaded_data()
+        if os.path.exists(shared.DataSnapshot.SNAPSHOT_PATH):
+            os.remove(shared.DataSnapshot.SNAPSHOT_PATH)
+
+    scenarios = {}
+
+    # 冷加载：无快照，解析全部数据文件并写入快照
+    scenarios["cold_load_parse"] = (lambda i: shared.load_all_data(), cold_iterations, 0, remove_snapshot)
+    # 冷加载：读取已有快照
+    scenarios["cold_load_snapshot"] = (lambda i: shared.load_all_data(), cold_iterations, 1, reset_loaded_data)
+    # 分类映射（遍历 prompt_data 目录）
+    scenarios["build_category_mapping"] = (lambda i: shared.DataManager.build_category_mapping(), cold_iterations, 1, None)
+
+    # 热生成前加载一次数据
+    def warm_scenarios():
+        data_cache = shared.get_data_cache()
+
+        standard_inputs = default_inputs(standard.RandomPrompter_JK)
+        standard_inputs["custom_subject"] = "a cat sitting on a windowsill"
+        standard_node = standard.RandomPrompter_JK()
+
+        batch_inputs = dict(standard_inputs, batch_count=100)
+        unique_inputs = dict(batch_inputs, unique_combinations=True)
+        large_batch_inputs = dict(standard_inputs, batch_count=1000)
+
+        def single_calls(seed: int, count: int) -> List[str]:
+            return [standard_node.execute(**dict(standard_inputs, seed=seed + j))[0][0] for j in range(count)]
+
+        # 批量结果必须与逐条调用单次生成完全一致
+        if standard_node.execute(**dict(large_batch_inputs, seed=0))[0] != single_calls(0, 1000):
+            raise RuntimeError("batch_count=1000 output differs from 1000 single-prompt calls")
+
+        # Geek 模板：从分类映射中均匀取 40 个标签
+        tag_names = sorted(data_cache['CATEGORY_MAPPING'].keys())
+        tag_names = tag_names[::max(1, len(tag_names) // 40)][:40]
+        geek_template = ", ".join(f"[{name}]" for name in tag_names)
+        # 60 个标签的长模板：覆盖全部分类类型，标签可重复
+        all_tag_names = sorted(data_cache['CATEGORY_MAPPING'].keys())
+        long_geek_template = ", ".join(f"[{all_tag_names[j * 7 % len(all_tag_names)]}]" for j in range(60))
+
+        def clear_tag_templates():
+            standard.TagTemplate._cache.clear()
+
+        # 连续生成 10000 条 description，预分组的结果必须与逐次分组的旧实现完全一致
+        def descriptions(seed: int, generate_legacy: bool = False) -> List[str]:
+            generator = standard.PromptComponentGenerator(random.Random(seed))
+            if generate_legacy:
+                return [legacy.generate_description(generator, "", shared.PromptConfig, shared.DataCleaner) for _ in range(10000)]
+            return [generator.generate_description("") for _ in range(10000)]
+
+        if descriptions(0) != descriptions(0, generate_legacy=True):
+            raise RuntimeError("generate_description output differs from the per-call grouping")
+
+        abc_inputs = default_inputs(abc.RandomPrompter_JK)
+        abc_inputs["custom_subject"] = standard_inputs["custom_subject"]
+        abc_node = abc.RandomPrompter_JK()
+
+        sys_prompt_builder = sys_prompt.SysPromptBuilder()
+        sys_prompt_modes = ["single image", "shot script", "shot paragraph"]
+
+        def force_reload_check():
+            # 使下一次 get_data_cache 立即轮询文件修改时间
+            shared._LAST_RELOAD_CHECK = float("-inf")
+
+        return {
+            # 热加载：数据已在内存中，以及轮询清单发现无变化
+            "warm_get_data_cache": (lambda i: shared.get_data_cache(), iterations, 20, None),
+            "warm_reload_check": (lambda i: shared.get_data_cache(), max(1, iterations // 10), 2, force_reload_check),
+            "standard_generate": (lambda i: standard_node.execute(**dict(standard_inputs, seed=i)), iterations, 20, None),
+            "standard_batch_100": (lambda i: standard_node.execute(**dict(batch_inputs, seed=i)), max(1, iterations // 50), 2, None),
+            "standard_batch_1000": (lambda i: standard_node.execute(**dict(large_batch_inputs, seed=i)), max(1, iterations // 250), 1, None),
+            "standard_single_x1000": (lambda i: single_calls(i, 1000), max(1, iterations // 250), 1, None),
+            "standard_unique_batch_100": (lambda i: standard_node.execute(**dict(unique_inputs, seed=i)), max(1, iterations // 50), 2, None),
+            "geek_generate": (lambda i: standard.PromptGeneratorGeek(i).generate_prompt(geek_template, "a cat"), iterations, 20, None),
+            "geek_generate_60_tags": (lambda i: standard.PromptGeneratorGeek(i).generate_prompt(long_geek_template, "a cat"), iterations, 20, None),
+            "geek_compile_60_tags": (lambda i: standard.PromptGeneratorGeek(i).generate_prompt(long_geek_template, "a cat"),
+                                     max(1, iterations // 10), 2, clear_tag_templates),
+            "description_10k": (lambda i: descriptions(i), max(1, iterations // 100), 1, None),
+            "description_10k_legacy": (lambda i: descriptions(i, generate_legacy=True), max(1, iterations // 100), 1, None),
+            "abc_generate": (lambda i: abc_node.execute(**dict(abc_inputs, seed=i)), iterations, 20, None),
+            "sys_prompt_build": (lambda i: sys_prompt_builder.build_prompt(
+                model="Text" if i % 2 else "Image", mode=sys_prompt_modes[i % 3], shot_continuity=True, shot_for=bool(i % 2),
+                detail="detailed", shot_detail=False, shot_count=3, input_as_1st_shot=False,
+                system_language="English", output_language="English"), iterations, 20, None),
+        }
+
+    results = {}
+    try:
+        for name, (func, count, warmup, setup) in scenarios.items():
+            if selected is None or name in selected:
+                results[name] = measure(func, count, warmup, setup)
+
+        reset_loaded_data()
+        for name, (func, count, warmup, setup) in warm_scenarios().items():
+            if selected is None or name in selected:
+                results[name] = measure(func, count, warmup, setup)
+    finally:
+        if os.path.exists(shared.DataSnapshot.SNAPSHOT_PATH):
+            os.remove(shared.DataSnapshot.SNAPSHOT_PATH)
+        os.rmdir(snapshot_dir)
+
+    return results
+
+#---------------------------------------------------------------------------------------------------------------------#
+# 报告与基线比较
+#---------------------------------------------------------------------------------------------------------------------#
+def compare_with_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], metric: str,
+                          tolerance: float, min_delta: float) -> List[Dict[str, Any]]:
+    """返回超过基线的场景列表；极小的绝对差值（min_delta 以内，与 metric 同单位）视为噪声"""
+    regressions = []
+    for name, result in results.items():
+        baseline_result = baseline.get("scenarios", {}).get(name)
+        if not baseline_result or metric not in baseline_result:
+            continue
+        current, previous = result[metric], baseline_result[metric]
+        if current > previous * (1 + tolerance) and current - previous > min_delta:
+            regressions.append({
+                "scenario": name,
+                "metric": metric,
+                "baseline": previous,
+                "current": current,
+                "ratio": round(current / previous, 3) if previous else None,
+            })
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the JK prompt engine without a running ComfyUI server.")
+    parser.add_argument("--iterations", type=int, default=500, help="Timed iterations for warm generation scenarios.")
+    parser.add_argument("--cold-iterations", type=int, default=5, help="Timed iterations for cold load scenarios.")
+    parser.add_argument("--scenario", action="append", help="Run only the named scenario (repeatable).")
+    parser.add_argument("--output", help="Write the JSON report to this path instead of stdout.")
+    parser.add_argument("--baseline", help="Baseline JSON report; exit with status 1 when a scenario regresses past it.")
+    parser.add_argument("--metric", choices=["p50_ms", "p95_ms", "mean_ms", "alloc_peak_kb"], default="p50_ms",
+                        help="Metric compared against the baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown before failing (0.5 = 50%%).")
+    parser.add_argument("--min-delta", type=float, default=None,
+                        help="Ignore regressions smaller than this absolute difference, in the unit of --metric "
+                             "(default: 0.05 for the *_ms metrics, 16 for alloc_peak_kb).")
+    args = parser.parse_args(argv)
+
+    install_comfy_stubs()
+    random.seed(0)
+
+    # 节点模块的日志输出到 stderr，保证 stdout 只有 JSON 报告
+    with contextlib.redirect_stdout(sys.stderr):
+        results = run_scenarios(args.iterations, args.cold_iterations, args.scenario)
+
+    report = {
+        "version": REPORT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": results,
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        min_delta = DEFAULT_MIN_DELTA[args.metric] if args.min_delta is None else args.min_delta
+        regressions = compare_with_baseline(results, baseline, args.metric, args.tolerance, min_delta)
+        report["baseline"] = {"path": args.baseline, "metric": args.metric, "tolerance": args.tolerance,
+                              "min_delta": min_delta, "regressions": regressions}
+        for regression in regressions:
+            print(f"REGRESSION {regression['scenario']}: {regression['metric']} {regression['baseline']} -> {regression['current']}", file=sys.stderr)
+        exit_code = 1 if regressions else 0
+
+    report_text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report_text + "\n")
+    else:
+        print(report_text)
+
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#---------------------------------------------------------------------------------------------------------------------#
+# Startup benchmark for JK Custom Workflow of ComfyUI
+#---------------------------------------------------------------------------------------------------------------------#
+"""
+节点包启动基准测试，无需运行 ComfyUI
+
+用法:
+    python benchmarks/startup_bench.py
+    python benchmarks/startup_bench.py --runs 10 --deprecated
+
+每次测量在独立的子进程中导入整个节点包（comfy / server / nodes 等宿主模块用替身代替），
+记录导入耗时（不含 ComfyUI 已预先导入的 torch 等库）、注册的节点数量以及启动时已导入的延迟模块；
+随后模拟前端首次请求 /object_info，读取所有节点的 INPUT_TYPES，记录延迟模块在这一步的导入耗时。
+节点包通过临时目录中的符号链接导入，config.ini 写入临时目录，不改动仓库文件。
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from typing import Any, Dict, List
+from unittest import mock
+
+from prompt_engine_bench import REPO_ROOT, install_comfy_stubs
+
+PACKAGE_NAME = "jake_upgrade_startup"
+
+# 链接到临时目录的仓库文件
+PACKAGE_ENTRIES = ("__init__.py", "categories.py", "pyproject.toml", "nodes", "web")
+
+def install_host_stubs():
+    """在 folder_paths / server 之外，再注册 nodes / comfy / aiohttp 的替身模块"""
+    install_comfy_stubs()
+
+    if "nodes" not in sys.modules:
+        nodes = types.ModuleType("nodes")
+        nodes.EXTENSION_WEB_DIRS = {}
+        nodes.MAX_RESOLUTION = 16384
+        nodes.ControlNetApplyAdvanced = type("ControlNetApplyAdvanced", (), {})
+        sys.modules["nodes"] = nodes
+
+    for name in ("comfy", "comfy.sd", "comfy.utils", "comfy.samplers", "comfy.model_management", "comfy.controlnet"):
+        sys.modules.setdefault(name, mock.MagicMock(name=name))
+
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        aiohttp = types.ModuleType("aiohttp")
+        aiohttp.web = mock.MagicMock(name="aiohttp.web")
+        sys.modules["aiohttp"] = aiohttp
+        sys.modules["aiohttp.web"] = aiohttp.web
+
+def child(package_dir: str) -> Dict[str, Any]:
+    """子进程：导入节点包并读取所有节点的 INPUT_TYPES"""
+    import importlib.util
+
+    install_host_stubs()
+    # ComfyUI 在加载自定义节点之前已导入这些库，不计入节点包的启动耗时
+    import numpy, torch, torchvision, PIL.Image  # noqa: F401
+    baseline_modules = set(sys.modules)
+
+    start = time.perf_counter()
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE_NAME, os.path.join(package_dir, "__init__.py"), submodule_search_locations=[package_dir])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE_NAME] = package
+    spec.loader.exec_module(package)
+    import_ms = (time.perf_counter() - start) * 1000
+
+    def imported_lazy_modules():
+        return sorted(name for name in package.LAZY_MODULES if f"{PACKAGE_NAME}.nodes.{name}" in sys.modules)
+
+    lazy_at_startup = imported_lazy_modules()
+    startup_modules = len(set(sys.modules) - baseline_modules)
+
+    start = time.perf_counter()
+    failed = []
+    for name, node_class in package.NODE_CLASS_MAPPINGS.items():
+        try:
+            node_class.INPUT_TYPES()
+        except Exception:
+            failed.append(name)
+    object_info_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "import_ms": import_ms,
+        "object_info_ms": object_info_ms,
+        "nodes": len(package.NODE_CLASS_MAPPINGS),
+        "modules_imported_at_startup": startup_modules,
+        "lazy_modules_at_startup": lazy_at_startup,
+        "lazy_modules_after_object_info": imported_lazy_modules(),
+        "input_types_failed": failed,
+    }
+
+def make_package_dir(load_deprecated: bool) -> str:
+    """在临时目录中链接仓库文件并写入测试用 config.ini"""
+    package_dir = tempfile.mkdtemp(prefix="jk_startup_bench_")
+    for entry in PACKAGE_ENTRIES:
+        os.symlink(os.path.join(REPO_ROOT, entry), os.path.join(package_dir, entry))
+    with open(os.path.join(REPO_ROOT, "config.ini.exsample"), "r", encoding="utf-8") as f:
+        config = f.read()
+    config = config.replace("LOAD_DEPRECATED_NODES = False", f"LOAD_DEPRECATED_NODES = {load_deprecated}")
+    with open(os.path.join(package_dir, "config.ini"), "w", encoding="utf-8") as f:
+        f.write(config)
+    return package_dir
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JakeUpgrade startup without a running ComfyUI server.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreter runs.")
+    parser.add_argument("--deprecated", action="store_true", help="Also register the deprecated nodes.")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        # 节点包的日志输出到 stderr，stdout 只保留结果
+        stdout = sys.stdout
+        sys.stdout = sys.stderr
+        result = child(args.child)
+        stdout.write(json.dumps(result) + "\n")
+        return 0
+
+    package_dir = make_package_dir(args.deprecated)
+    runs = []
+    try:
+        for _ in range(args.runs):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", package_dir],
+                check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+            ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+    finally:
+        shutil.rmtree(package_dir, ignore_errors=True)
+
+    last = runs[-1]
+    report = {
+        "runs": args.runs,
+        "import_ms_median": round(statistics.median(r["import_ms"] for r in runs), 1),
+        "import_ms_min": round(min(r["import_ms"] for r in runs), 1),
+        "object_info_ms_median": round(statistics.median(r["object_info_ms"] for r in runs), 1),
+        "nodes": last["nodes"],
+        "modules_imported_at_startup": last["modules_imported_at_startup"],
+        "lazy_modules_at_startup": last["lazy_modules_at_startup"],
+        "lazy_modules_after_object_info": last["lazy_modules_after_object_info"],
+        "input_types_failed": last["input_types_failed"],
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
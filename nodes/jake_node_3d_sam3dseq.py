@@ -6,23 +6,36 @@ import sys
 import time
 import struct
 import json
-import tempfile
+import zlib
 import torch
 import torch.nn.functional as F
 from einops import rearrange
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Protocol
 import torch
 import numpy as np
-import cv2
 
 # =============================================================================
 # 配置常量
 # =============================================================================
 
 DEFAULT_FPS = 30.0  # 默认帧率
+DEFAULT_FRAME_BATCH_SIZE = 8  # 每批送入估计器的帧数
 BINARY_MAGIC = b"MESH"  # 魔数标识
 BINARY_VERSION = 2  # 版本号
+BINARY_HEADER_FORMAT = "<4sIIIIfII"  # V2 头部结构
+BINARY_HEADER_SIZE = struct.calcsize(BINARY_HEADER_FORMAT)  # 32 字节
+
+# V2 标志位
+FLAG_QUANTIZED = 1  # int16 顶点量化
+FLAG_DELTA = 2      # 相对上一帧的差分编码
+FLAG_ZLIB = 4       # zlib 压缩
+KNOWN_FLAGS = FLAG_QUANTIZED | FLAG_DELTA | FLAG_ZLIB  # 读取时拒绝其他标志位
+
+# 写入时可选的压缩方式；查看器 (fflate) 只能解码 zlib
+COMPRESSION_FLAGS = {"none": 0, "zlib": FLAG_ZLIB}
+QUANT_MAX = 32767  # int16 量化范围 [-32767, 32767]
+DEFAULT_KEYFRAME_INTERVAL = 30  # 差分编码的关键帧间隔
 
 # =============================================================================
 # SAM3D 模型顶点和关节索引定义（仅备案未使用）
@@ -125,20 +138,31 @@ class MeshSequenceBinaryFormat:
     """
     Binary Mesh sequence format V2
     
-    Header structure (28 bytes):
+    Header structure (32 bytes, little-endian):
     - magic: b"MESH" (4 bytes)
     - version: uint32 (4 bytes)  # Format version
     - num_frames: uint32 (4 bytes)
     - num_verts: uint32 (4 bytes)
     - num_faces: uint32 (4 bytes)
     - fps: float32 (4 bytes)
-    - flags: uint32 (4 bytes)     # Flags
+    - flags: uint32 (4 bytes)     # FLAG_QUANTIZED | FLAG_DELTA | FLAG_ZLIB, other bits are rejected
     - metadata_size: uint32 (4 bytes)  # Metadata size (bytes)
     
     Data section:
-    - Vertex sequence: num_frames * num_verts * 3 * float32
-    - Face data: num_faces * 3 * uint32
     - Metadata: metadata_size bytes of UTF-8 JSON string
+    - Face data: uint32 chunk size + chunk of num_faces * 3 * uint32
+    - Frame offset table: (num_frames + 1) * uint64 absolute offsets, the last one marks the end of data
+    - Frame chunks: one (optionally compressed) chunk per frame
+    
+    Frame chunk (planar layout: all x, then all y, then all z):
+    - Quantized: center float32[3] + scale float32[3] + int16[3 * num_verts], value = center + q * scale.
+      The int16 values are stored as a low byte plane followed by a high byte plane.
+    - Not quantized: float32[3 * num_verts]
+    
+    With FLAG_DELTA every frame except keyframes (index % keyframe_interval == 0) stores the
+    difference to the previously decoded frame, quantized with at least the keyframe step, so a
+    reader seeks to the nearest keyframe and decodes forward. Encoding is done against the
+    decoded frames, so errors do not accumulate.
     """
     
     @staticmethod
@@ -203,6 +227,298 @@ class MeshSequenceBinaryFormat:
             'coordinate_transform': coordinate_transform,
             'file_size_mb': file_size / 1024 / 1024
         }
+    
+    @staticmethod
+    def compress_chunk(data: bytes, flags: int) -> bytes:
+        """按标志位压缩数据块"""
+        if flags & FLAG_ZLIB:
+            return zlib.compress(data, 6)
+        return data
+    
+    @staticmethod
+    def decompress_chunk(data: bytes, flags: int) -> bytes:
+        """按标志位解压数据块"""
+        if flags & FLAG_ZLIB:
+            return zlib.decompress(data)
+        return data
+    
+    @staticmethod
+    def quantize_frame(values: np.ndarray, min_scale: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        将一帧顶点按其包围盒量化为 int16
+        min_scale: 最小量化步长，差分帧沿用关键帧步长，使小幅运动得到较小的整数
+        返回: (center float32[3], scale float32[3], q int16[V, 3])
+        """
+        lo = values.min(axis=0)
+        hi = values.max(axis=0)
+        center = ((lo + hi) * 0.5).astype(np.float32)
+        half_extent = ((hi - lo) * 0.5).astype(np.float32)
+        scale = np.where(half_extent > 0, half_extent / QUANT_MAX, 1.0).astype(np.float32)
+        if min_scale is not None:
+            scale = np.maximum(scale, min_scale)
+        q = np.clip(np.rint((values - center) / scale), -QUANT_MAX, QUANT_MAX).astype(np.int16)
+        return center, scale, q
+    
+    @staticmethod
+    def shuffle_int16(q: np.ndarray) -> bytes:
+        """int16 [V, 3] 转为平面布局并拆分为低字节平面和高字节平面，便于压缩"""
+        planar = np.ascontiguousarray(q.T, dtype='<i2').reshape(-1)
+        return np.ascontiguousarray(planar.view(np.uint8).reshape(-1, 2).T).tobytes()
+    
+    @staticmethod
+    def unshuffle_int16(data: bytes, num_verts: int, offset: int = 0) -> np.ndarray:
+        """shuffle_int16 的逆操作，返回 int16 [V, 3]"""
+        count = num_verts * 3
+        planes = np.frombuffer(data, dtype=np.uint8, count=count * 2, offset=offset).reshape(2, count)
+        return np.ascontiguousarray(planes.T).view('<i2').reshape(3, num_verts).T
+    
+    @staticmethod
+    def dequantize_frame(center: np.ndarray, scale: np.ndarray, q: np.ndarray) -> np.ndarray:
+        """int16 量化值还原为 float32 顶点"""
+        return center + q.astype(np.float32) * scale
+    
+    @staticmethod
+    def encode_frames(vertices_sequence: np.ndarray, flags: int,
+                      keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        """
+        逐帧编码顶点序列，生成每帧的数据块（未压缩）
+        差分帧基于上一帧的解码结果，保证编码端与读取端一致
+        """
+        previous = None
+        key_scale = None
+        
+        for frame_idx, frame in enumerate(vertices_sequence):
+            is_keyframe = not (flags & FLAG_DELTA) or frame_idx % keyframe_interval == 0
+            target = frame if is_keyframe else frame - previous
+            
+            if flags & FLAG_QUANTIZED:
+                center, scale, q = MeshSequenceBinaryFormat.quantize_frame(target, None if is_keyframe else key_scale)
+                if is_keyframe:
+                    key_scale = scale
+                payload = center.tobytes() + scale.tobytes() + MeshSequenceBinaryFormat.shuffle_int16(q)
+                decoded = MeshSequenceBinaryFormat.dequantize_frame(center, scale, q)
+            else:
+                payload = np.ascontiguousarray(target.T).tobytes()
+                decoded = target
+            
+            previous = decoded if is_keyframe else previous + decoded
+            
+            yield payload
+    
+    @staticmethod
+    def save_v2(vertices_sequence: np.ndarray, faces: np.ndarray,
+                output_path: Path, fps: float = DEFAULT_FPS,
+                coordinate_transform: str = "rotate_z_180",
+                quantize: bool = True, delta: bool = True, compression: str = "zlib",
+                keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+                metadata: Optional[Dict] = None) -> Dict:
+        """
+        保存为 MESH V2 格式（量化、差分、压缩，支持按帧随机读取）
+        """
+        if compression not in COMPRESSION_FLAGS:
+            raise ValueError(f"[MeshSequence] Unknown compression: {compression}")
+        
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # 应用坐标变换
+        if coordinate_transform != "none":
+            vertices_sequence = apply_coordinate_transform(vertices_sequence, coordinate_transform)
+        
+        vertices_sequence = np.ascontiguousarray(vertices_sequence, dtype=np.float32)
+        num_frames, num_verts = vertices_sequence.shape[0], vertices_sequence.shape[1]
+        num_faces = faces.shape[0]
+        keyframe_interval = max(1, int(keyframe_interval))
+        
+        flags = COMPRESSION_FLAGS[compression]
+        if quantize:
+            flags |= FLAG_QUANTIZED
+        if delta:
+            flags |= FLAG_DELTA
+        
+        print(f"[MeshSequence] Saving MESH V2 sequence: {num_frames}frames, {num_verts}vertices, {num_faces}faces, {fps}FPS "
+              f"(quantize: {quantize}, delta: {delta}, compression: {compression})")
+        
+        meta = dict(metadata or {})
+        meta.update({
+            "coordinate_transform": coordinate_transform,
+            "keyframe_interval": keyframe_interval,
+            "compression": compression,
+            "layout": "planar",
+        })
+        meta_bytes = json.dumps(meta).encode("utf-8")
+        
+        faces_chunk = MeshSequenceBinaryFormat.compress_chunk(
+            np.ascontiguousarray(faces, dtype=np.uint32).tobytes(), flags
+        )
+        
+        with open(output_path, 'wb') as f:
+            f.write(struct.pack(BINARY_HEADER_FORMAT, BINARY_MAGIC, BINARY_VERSION,
+                                num_frames, num_verts, num_faces, fps, flags, len(meta_bytes)))
+            f.write(meta_bytes)
+            f.write(struct.pack('<I', len(faces_chunk)))
+            f.write(faces_chunk)
+            
+            # 预留帧偏移表，写完帧数据后回填
+            table_pos = f.tell()
+            f.write(b"\0" * 8 * (num_frames + 1))
+            
+            offsets = []
+            for payload in MeshSequenceBinaryFormat.encode_frames(vertices_sequence, flags, keyframe_interval):
+                offsets.append(f.tell())
+                f.write(MeshSequenceBinaryFormat.compress_chunk(payload, flags))
+            offsets.append(f.tell())
+            
+            f.seek(table_pos)
+            f.write(np.asarray(offsets, dtype='<u8').tobytes())
+        
+        file_size = output_path.stat().st_size
+        raw_size = num_frames * num_verts * 3 * 4 + num_faces * 3 * 4
+        print(f"[MeshSequence] MESH V2 file saved: {output_path} ({file_size / 1024 / 1024:.2f} MB, "
+              f"{raw_size / max(file_size, 1):.1f}x smaller than raw float32)")
+        
+        return {
+            'path': str(output_path),
+            'num_frames': num_frames,
+            'num_verts': num_verts,
+            'num_faces': num_faces,
+            'fps': fps,
+            'coordinate_transform': coordinate_transform,
+            'file_size_mb': file_size / 1024 / 1024,
+            'compression_ratio': raw_size / max(file_size, 1)
+        }
+    
+    @staticmethod
+    def load(path: Path) -> Dict:
+        """
+        读取网格序列文件（自动识别 SMPL 兼容格式和 MESH V2 格式）
+        返回: 包含 vertices [F, V, 3] float32、faces [N, 3] uint32、fps、metadata 的字典
+        """
+        with open(path, 'rb') as f:
+            magic = f.read(4)
+        
+        if magic == b"SMPL":
+            with open(path, 'rb') as f:
+                data = f.read()
+            num_frames, num_verts, num_faces = struct.unpack_from('<III', data, 4)
+            fps = struct.unpack_from('<f', data, 16)[0]
+            vertex_count = num_frames * num_verts * 3
+            vertices = np.frombuffer(data, dtype='<f4', count=vertex_count, offset=20)
+            faces = np.frombuffer(data, dtype='<u4', count=num_faces * 3, offset=20 + vertex_count * 4)
+            return {
+                'vertices': vertices.reshape(num_frames, num_verts, 3).copy(),
+                'faces': faces.reshape(num_faces, 3).copy(),
+                'fps': fps,
+                'metadata': {}
+            }
+        
+        with MeshSequenceReader(path) as reader:
+            return {
+                'vertices': reader.read_all(),
+                'faces': reader.faces,
+                'fps': reader.fps,
+                'metadata': reader.metadata
+            }
+
+class MeshSequenceReader:
+    """
+    MESH V2 文件读取器
+    通过帧偏移表按需读取任意帧，差分编码时从最近的关键帧向后解码
+    """
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.file = open(self.path, 'rb')
+        
+        try:
+            header = self.file.read(BINARY_HEADER_SIZE)
+            if len(header) < BINARY_HEADER_SIZE:
+                raise ValueError(f"[MeshSequence] File too small: {self.path}")
+            
+            (magic, version, self.num_frames, self.num_verts, self.num_faces,
+             self.fps, self.flags, metadata_size) = struct.unpack(BINARY_HEADER_FORMAT, header)
+            
+            if magic != BINARY_MAGIC:
+                raise ValueError(f"[MeshSequence] Invalid magic {magic!r}: {self.path}")
+            if version != BINARY_VERSION:
+                raise ValueError(f"[MeshSequence] Unsupported version {version}: {self.path}")
+            if self.flags & ~KNOWN_FLAGS:
+                raise ValueError(f"[MeshSequence] Unsupported flags {self.flags:#x}: {self.path}")
+            
+            self.metadata = json.loads(self.file.read(metadata_size).decode("utf-8")) if metadata_size else {}
+            self.keyframe_interval = max(1, int(self.metadata.get("keyframe_interval", DEFAULT_KEYFRAME_INTERVAL)))
+            
+            faces_size = struct.unpack('<I', self.file.read(4))[0]
+            faces_bytes = MeshSequenceBinaryFormat.decompress_chunk(self.file.read(faces_size), self.flags)
+            self.faces = np.frombuffer(faces_bytes, dtype='<u4').reshape(self.num_faces, 3).copy()
+            
+            table_bytes = self.file.read(8 * (self.num_frames + 1))
+            self.offsets = np.frombuffer(table_bytes, dtype='<u8').astype(np.int64)
+        except Exception:
+            self.file.close()
+            raise
+        
+        # 最近一次解码的帧，顺序读取时避免重复解码
+        self._last_index = None
+        self._last_frame = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __len__(self):
+        return self.num_frames
+    
+    def close(self):
+        self.file.close()
+    
+    def read_chunk(self, frame_idx: int) -> np.ndarray:
+        """读取并解码一帧的原始数据块（关键帧为顶点，差分帧为差值）"""
+        start, end = int(self.offsets[frame_idx]), int(self.offsets[frame_idx + 1])
+        self.file.seek(start)
+        payload = MeshSequenceBinaryFormat.decompress_chunk(self.file.read(end - start), self.flags)
+        
+        if self.flags & FLAG_QUANTIZED:
+            center = np.frombuffer(payload, dtype='<f4', count=3, offset=0)
+            scale = np.frombuffer(payload, dtype='<f4', count=3, offset=12)
+            q = MeshSequenceBinaryFormat.unshuffle_int16(payload, self.num_verts, offset=24)
+            return MeshSequenceBinaryFormat.dequantize_frame(center, scale, q)
+        
+        return np.frombuffer(payload, dtype='<f4', count=self.num_verts * 3).reshape(3, self.num_verts).T
+    
+    def read_frame(self, frame_idx: int) -> np.ndarray:
+        """读取任意一帧的顶点 [V, 3] float32"""
+        if frame_idx < 0:
+            frame_idx += self.num_frames
+        if not 0 <= frame_idx < self.num_frames:
+            raise IndexError(f"[MeshSequence] Frame {frame_idx} out of range (0-{self.num_frames - 1})")
+        
+        if not self.flags & FLAG_DELTA:
+            frame = self.read_chunk(frame_idx)
+        else:
+            keyframe = frame_idx - frame_idx % self.keyframe_interval
+            
+            # 同一关键帧区间内向后读取时，从上一次解码的帧继续
+            if self._last_index is not None and keyframe <= self._last_index <= frame_idx:
+                start, frame = self._last_index + 1, self._last_frame
+            else:
+                start, frame = keyframe + 1, self.read_chunk(keyframe)
+            
+            for idx in range(start, frame_idx + 1):
+                frame = frame + self.read_chunk(idx)
+        
+        frame = np.ascontiguousarray(frame, dtype=np.float32)
+        self._last_index, self._last_frame = frame_idx, frame
+        return frame
+    
+    def read_all(self) -> np.ndarray:
+        """按顺序读取全部帧 [F, V, 3] float32"""
+        vertices = np.empty((self.num_frames, self.num_verts, 3), dtype=np.float32)
+        for frame_idx in range(self.num_frames):
+            vertices[frame_idx] = self.read_frame(frame_idx)
+        return vertices
 
 # 模块级缓存，复用 SAM3DBodyProcess 中的模型
 _MODEL_CACHE_PROCESS = {}
@@ -490,6 +806,191 @@ def align_models_to_fixed_camera(frames_data, faces, reference_frame=0):
         "reference_frame": reference_frame
     }
 
+# =============================================================================
+# 帧估计器接口
+# =============================================================================
+
+class FrameEstimator(Protocol):
+    """
+    按批处理视频帧的估计器接口
+    
+    参数:
+    - frames: RGB uint8 数组列表，每帧形状 [H, W, 3]
+    - bboxes: 每帧的边界框 (np.ndarray [1, 4]) 或 None
+    - masks: 每帧的掩码 (np.ndarray [H, W]) 或 None
+    
+    返回: 与 frames 等长的列表，每项为该帧的检测结果列表；处理失败的帧为 None
+    """
+    
+    def process_frames(self, frames: List[np.ndarray], bboxes: List[Optional[np.ndarray]],
+                       masks: List[Optional[np.ndarray]], bbox_thr: float,
+                       inference_type: str) -> List[Optional[List[Dict]]]:
+        ...
+
+class SAM3DFrameEstimator:
+    """
+    SAM3DBodyEstimator 适配器
+    直接传入内存中的 RGB 数组，不再写入临时 JPEG 文件
+    SAM3DBodyEstimator 只提供单张图像接口 process_one_image，批内各帧依次推理
+    """
+    
+    def __init__(self, estimator):
+        self.estimator = estimator
+    
+    def process_frames(self, frames, bboxes, masks, bbox_thr, inference_type):
+        results = []
+        for frame, bbox, mask_np in zip(frames, bboxes, masks):
+            try:
+                outputs = self.estimator.process_one_image(
+                    frame,
+                    bboxes=bbox,
+                    masks=mask_np,
+                    bbox_thr=bbox_thr,
+                    use_mask=(mask_np is not None),
+                    inference_type=inference_type,
+                )
+            except Exception as e:
+                print(f"[VideoFramesToMesh] Error: Processing frame failed - {e}")
+                outputs = None
+            results.append(outputs)
+        return results
+
+def mask_to_bbox(mask_np: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """根据掩码计算边界框 [[x_min, y_min, x_max, y_max]]，掩码为空时返回 None"""
+    if mask_np is None:
+        return None
+    
+    rows = np.any(mask_np > 0.5, axis=1)
+    cols = np.any(mask_np > 0.5, axis=0)
+    
+    if not (rows.any() and cols.any()):
+        return None
+    
+    rmin, rmax = np.where(rows)[0][[0, -1]]
+    cmin, cmax = np.where(cols)[0][[0, -1]]
+    return np.array([[cmin, rmin, cmax, rmax]], dtype=np.float32)
+
+def prepare_frame_batch(image: torch.Tensor, mask: Optional[torch.Tensor], start: int, end: int):
+    """
+    将一批 ComfyUI 图像转换为估计器输入
+    每批只做一次设备到 CPU 的拷贝，帧保持 RGB uint8 格式
+    
+    返回: (frames, bboxes, masks)
+    """
+    frames_np = (image[start:end, ..., :3].detach().cpu().numpy() * 255).clip(0, 255).astype(np.uint8)
+    frames = [np.ascontiguousarray(frame) for frame in frames_np]
+    
+    masks = [None] * len(frames)
+    if mask is not None:
+        mask_end = min(end, len(mask))
+        if mask_end > start:
+            masks_np = mask[start:mask_end].detach().cpu().numpy()
+            masks[:len(masks_np)] = list(masks_np)
+    
+    bboxes = [mask_to_bbox(mask_np) for mask_np in masks]
+    
+    return frames, bboxes, masks
+
+def parse_frame_outputs(outputs: Optional[List[Dict]], frame_idx: int) -> Dict:
+    """从估计器输出中提取第一个人体的顶点和相机参数"""
+    failed = {
+        "vertices": None,
+        "cam_t": None,
+        "focal_length": None,
+        "success": False
+    }
+    
+    if outputs is None:
+        return failed
+    
+    if len(outputs) == 0:
+        print(f"[VideoFramesToMesh] Warning: Frame {frame_idx} no human detected")
+        return failed
+    
+    # 取第一个检测到的人体
+    output = outputs[0]
+    
+    # 提取顶点和相机参数
+    pred_vertices = output.get("pred_vertices")
+    pred_cam_t = output.get("pred_cam_t")
+    focal_length = output.get("focal_length")
+    
+    if pred_vertices is None:
+        print(f"[VideoFramesToMesh] Warning: Frame {frame_idx} no vertex output, using blank frame")
+        return failed
+    
+    # 转换为 numpy 数组
+    if torch.is_tensor(pred_vertices):
+        vertices = pred_vertices.detach().cpu().numpy()
+    else:
+        vertices = pred_vertices
+    
+    if torch.is_tensor(pred_cam_t):
+        cam_t = pred_cam_t.detach().cpu().numpy()
+    else:
+        cam_t = pred_cam_t
+    
+    if focal_length is not None:
+        if hasattr(focal_length, 'item'):
+            focal_length = focal_length.item()
+        focal_length = float(focal_length)
+    
+    return {
+        "vertices": vertices,
+        "cam_t": cam_t,
+        "focal_length": focal_length,
+        "success": True
+    }
+
+def estimate_frame_sequence(estimator: FrameEstimator, image: torch.Tensor, mask: Optional[torch.Tensor] = None,
+                            batch_size: int = DEFAULT_FRAME_BATCH_SIZE, bbox_threshold: float = 0.8,
+                            inference_type: str = "full") -> Tuple[List[Dict], int]:
+    """
+    按批将视频帧送入估计器，收集每帧的顶点和相机数据
+    
+    返回: (frames_data, failed_frames)
+    """
+    if len(image.shape) == 3:
+        image = image.unsqueeze(0)
+    if mask is not None and len(mask.shape) == 2:
+        mask = mask.unsqueeze(0)
+    
+    num_frames = len(image)
+    batch_size = max(1, int(batch_size))
+    frames_data = []
+    failed_frames = 0
+    start_time = time.time()
+    
+    for start in range(0, num_frames, batch_size):
+        end = min(start + batch_size, num_frames)
+        
+        try:
+            frames, bboxes, masks = prepare_frame_batch(image, mask, start, end)
+            batch_outputs = estimator.process_frames(
+                frames, bboxes, masks,
+                bbox_thr=bbox_threshold,
+                inference_type=inference_type,
+            )
+        except Exception as e:
+            print(f"[VideoFramesToMesh] Error: Processing frames {start}-{end - 1} failed - {e}")
+            batch_outputs = [None] * (end - start)
+        
+        for offset, outputs in enumerate(batch_outputs):
+            frame_data = parse_frame_outputs(outputs, start + offset)
+            if not frame_data["success"]:
+                failed_frames += 1
+            frames_data.append(frame_data)
+        
+        # 每处理约30帧显示一次进度
+        if end // 30 != start // 30 or end == num_frames:
+            elapsed = time.time() - start_time
+            fps_rate = end / elapsed if elapsed > 0 else 0
+            print(f"[VideoFramesToMesh] Progress: {end}/{num_frames} frames, "
+                  f"Success: {end - failed_frames}, Failed: {failed_frames}, "
+                  f"Speed: {fps_rate:.1f} FPS")
+    
+    return frames_data, failed_frames
+
 # =============================================================================
 # 视频处理节点
 # =============================================================================
@@ -543,6 +1044,17 @@ class SAM3DMeshSequenceFromVideo_JK:
                     "step": 0.5,
                     "tooltip": "Gaussian smoothing kernel width (the higher the width, the smoother the surface)"
                 }),
+                "binary_format": (["smpl", "mesh_v2"], {
+                    "default": "smpl",
+                    "tooltip": "smpl: raw float32 SMPL compatible layout, readable by every SMPL consumer. mesh_v2: int16 quantized, delta encoded and zlib compressed, much smaller files, needs a viewer with MESH V2 support."
+                }),
+                "batch_size": ("INT", {
+                    "default": DEFAULT_FRAME_BATCH_SIZE,
+                    "min": 1,
+                    "max": 256,
+                    "step": 1,
+                    "tooltip": "Number of frames converted from the IMAGE batch and handed to the estimator at once. SAM3D Body still runs inference one frame at a time, so this bounds CPU copies and memory, not GPU batching"
+                }),
                 # "coordinate_transform": (["none", "rotate_z_180", "rotate_y_180", "rotate_x_180"], {
                     # "default": "rotate_z_180",
                     # "tooltip": "Coordinate transformation type. Rotate_z_180 is typically used to correct SAM3D Body orientation issues."
@@ -620,7 +1132,8 @@ class SAM3DMeshSequenceFromVideo_JK:
                                   bbox_threshold=0.8, inference_type="full", mask=None,
                                   coordinate_transform="rotate_z_180",
                                   smoothing_sigma=3.0, smoothing_method="gaussian",
-                                  align_to_reference_camera=True, reference_frame=0):
+                                  align_to_reference_camera=True, reference_frame=0,
+                                  batch_size=DEFAULT_FRAME_BATCH_SIZE, binary_format="smpl"):
         
         start_time_total = time.time()
         
@@ -694,145 +1207,18 @@ class SAM3DMeshSequenceFromVideo_JK:
         tmp_output_dir = self.get_tmp_output_dir()
         output_path = tmp_output_dir / unique_filename
         
-        # 5. 处理图像序列 - 收集顶点信息
-        frames_data = []  # 存储每帧的完整数据
-        processed_frames = 0
-        failed_frames = 0
-        
-        print(f"[VideoFramesToMesh] Start processing {num_frames} frames...")
+        # 5. 处理图像序列 - 按批在内存中收集顶点信息
+        print(f"[VideoFramesToMesh] Start processing {num_frames} frames (batch size: {batch_size})...")
         
-        # 临时目录用于保存帧图像
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_dir_path = Path(temp_dir)
-            
-            # 逐帧处理
-            for frame_idx in range(num_frames):
-                try:
-                    # 转换 ComfyUI 图像为 numpy
-                    img_tensor = image[frame_idx]
-                    if len(img_tensor.shape) == 4:  # [B, H, W, C]
-                        img_np = img_tensor[0].cpu().numpy()
-                    else:  # [H, W, C]
-                        img_np = img_tensor.cpu().numpy()
-                    
-                    # 转换为 BGR 和 uint8
-                    img_np = (img_np * 255).astype(np.uint8)
-                    img_bgr = img_np[..., ::-1].copy()  # RGB -> BGR
-                    
-                    # 保存到临时文件
-                    frame_path = temp_dir_path / f"frame_{frame_idx:06d}.jpg"
-                    cv2.imwrite(str(frame_path), img_bgr)
-                    
-                    # 准备掩码（如果有）
-                    mask_np = None
-                    if mask is not None and len(mask) > frame_idx:
-                        mask_tensor = mask[frame_idx]
-                        if len(mask_tensor.shape) == 3:  # [B, H, W]
-                            mask_np = mask_tensor[0].cpu().numpy()
-                        else:  # [H, W]
-                            mask_np = mask_tensor.cpu().numpy()
-                    
-                    # 计算边界框（如果有掩码）
-                    bboxes = None
-                    if mask_np is not None:
-                        rows = np.any(mask_np > 0.5, axis=1)
-                        cols = np.any(mask_np > 0.5, axis=0)
-                        
-                        if rows.any() and cols.any():
-                            rmin, rmax = np.where(rows)[0][[0, -1]]
-                            cmin, cmax = np.where(cols)[0][[0, -1]]
-                            bboxes = np.array([[cmin, rmin, cmax, rmax]], dtype=np.float32)
-                    
-                    # 处理单帧图像
-                    outputs = estimator.process_one_image(
-                        str(frame_path),
-                        bboxes=bboxes,
-                        masks=mask_np,
-                        bbox_thr=bbox_threshold,
-                        use_mask=(mask_np is not None),
-                        inference_type=inference_type,
-                    )
-                    
-                    if not outputs or len(outputs) == 0:
-                        print(f"[VideoFramesToMesh] Warning: Frame {frame_idx} no human detected")
-                        failed_frames += 1
-                        
-                        # 添加空白帧数据
-                        frames_data.append({
-                            "vertices": None,
-                            "cam_t": None,
-                            "focal_length": None,
-                            "success": False
-                        })
-                        processed_frames += 1
-                        continue
-                    
-                    # 取第一个检测到的人体
-                    output = outputs[0]
-                    
-                    # 提取顶点
-                    pred_vertices = output.get("pred_vertices")
-                    
-                    # 提取相机参数
-                    pred_cam_t = output.get("pred_cam_t")
-                    focal_length = output.get("focal_length")
-                    
-                    if pred_vertices is None:
-                        print(f"[VideoFramesToMesh] Warning: Frame {frame_idx} no vertex output, using blank frame")
-                        frames_data.append({
-                            "vertices": None,
-                            "cam_t": None,
-                            "focal_length": None,
-                            "success": False
-                        })
-                    else:
-                        # 转换为 numpy 数组
-                        if torch.is_tensor(pred_vertices):
-                            vertices = pred_vertices.detach().cpu().numpy()
-                        else:
-                            vertices = pred_vertices
-                        
-                        # 处理相机参数
-                        if torch.is_tensor(pred_cam_t):
-                            cam_t = pred_cam_t.detach().cpu().numpy()
-                        else:
-                            cam_t = pred_cam_t
-                        
-                        if focal_length is not None:
-                            if hasattr(focal_length, 'item'):
-                                focal_length = focal_length.item()
-                            focal_length = float(focal_length)
-                        
-                        # 保存帧数据
-                        frames_data.append({
-                            "vertices": vertices,
-                            "cam_t": cam_t,
-                            "focal_length": focal_length,
-                            "success": True
-                        })
-                    
-                    processed_frames += 1
-                    
-                except Exception as e:
-                    print(f"[VideoFramesToMesh] Error: Processing frame {frame_idx} failed - {e}")
-                    failed_frames += 1
-                    
-                    frames_data.append({
-                        "vertices": None,
-                        "cam_t": None,
-                        "focal_length": None,
-                        "success": False
-                    })
-                    
-                    processed_frames += 1
-                
-                # 每处理30帧显示一次进度
-                if (frame_idx + 1) % 30 == 0 or (frame_idx + 1) == num_frames:
-                    elapsed = time.time() - start_time_total
-                    fps_rate = processed_frames / elapsed if elapsed > 0 else 0
-                    print(f"[VideoFramesToMesh] Progress: {frame_idx + 1}/{num_frames} frames, "
-                          f"Success: {processed_frames - failed_frames}, Failed: {failed_frames}, "
-                          f"Speed: {fps_rate:.1f} FPS")
+        frames_data, failed_frames = estimate_frame_sequence(
+            SAM3DFrameEstimator(estimator),
+            image,
+            mask=mask,
+            batch_size=batch_size,
+            bbox_threshold=bbox_threshold,
+            inference_type=inference_type,
+        )
+        processed_frames = len(frames_data)
         
         if processed_frames == 0:
             return (f"[VideoFramesToMesh] Error: No frames were processed successfully.",)
@@ -888,14 +1274,24 @@ class SAM3DMeshSequenceFromVideo_JK:
             # 变换顶点序列
             aligned_vertices = apply_coordinate_transform(aligned_vertices, coordinate_transform)
         
-        # 9. 默认保存为 SMPL 兼容格式
-        MeshSequenceBinaryFormat.save_smpl_compatible(
-            vertices_sequence=aligned_vertices,
-            faces=faces,
-            output_path=output_path,
-            fps=DEFAULT_FPS,
-            coordinate_transform="none"  # 已经在前面应用了变换
-        )
+        # 9. 保存网格序列（默认 SMPL 兼容格式，MESH V2 需手动选择）
+        if binary_format == "smpl":
+            MeshSequenceBinaryFormat.save_smpl_compatible(
+                vertices_sequence=aligned_vertices,
+                faces=faces,
+                output_path=output_path,
+                fps=DEFAULT_FPS,
+                coordinate_transform="none"  # 已经在前面应用了变换
+            )
+        else:
+            MeshSequenceBinaryFormat.save_v2(
+                vertices_sequence=aligned_vertices,
+                faces=faces,
+                output_path=output_path,
+                fps=DEFAULT_FPS,
+                coordinate_transform="none",  # 已经在前面应用了变换
+                metadata={"source_coordinate_transform": coordinate_transform}
+            )
         
         print(f"[VideoFramesToMesh] Model alignment and generation completed!")
         print(f"[VideoFramesToMesh] Successfully processed: {processed_frames - failed_frames} frames, Failed: {failed_frames} frames")
@@ -3,12 +3,10 @@
 #---------------------------------------------------------------------------------------------------------------------#
 import torch
 import folder_paths
-import comfy.controlnet
-import comfy.sd
 import comfy.utils
 from nodes import ControlNetApplyAdvanced
 from typing import Any, Tuple, List, Dict
-from .jake_tools import UNION_CONTROLNET_TYPES
+from .jake_tools import UNION_CONTROLNET_TYPES, controlnet_cache, load_controlnet_cached
 from ..categories import icons
 
 class CR_ControlNetLoader_JK:
@@ -24,6 +22,12 @@ class CR_ControlNetLoader_JK:
                 "union_type": (["None"] + ["auto"] + list(UNION_CONTROLNET_TYPES.keys()), {
                     "tooltip": "Select union type for ControlNet compatibility"
                 })
+            },
+            "optional": {
+                "clear_cache": ("BOOLEAN", {
+                    "default": False,
+                    "tooltip": "Clear the shared ControlNet model cache before loading"
+                }),
             }
         }
 
@@ -32,16 +36,19 @@ class CR_ControlNetLoader_JK:
     CATEGORY = icons.get("JK/ControlNet")
     DESCRIPTION = "Load ControlNet models with configurable union types."
     
-    def load_controlnet(self, control_net_name, union_type):
+    def load_controlnet(self, control_net_name, union_type, clear_cache=False):
         """加载ControlNet模型，支持union类型配置"""
         
+        if clear_cache:
+            controlnet_cache.clear()
+        
         if control_net_name == "None":
             return ("",)
         
         else:
-            # 加载ControlNet模型
+            # 加载ControlNet模型（共享缓存）
             controlnet_path = folder_paths.get_full_path_or_raise("controlnet", control_net_name)
-            controlnet_load = comfy.controlnet.load_controlnet(controlnet_path)
+            controlnet_load = load_controlnet_cached(controlnet_path)
             
             # 获取union类型编号
             type_number = UNION_CONTROLNET_TYPES.get(union_type, -2)
@@ -194,6 +201,10 @@ class CR_ApplyControlNet_JK:
                 "mask": ("MASK", {"tooltip": "Mask for selective application"}),
                 "vae": ("VAE", {"tooltip": "VAE for image encoding"}),
                 "control_net": ("CONTROL_NET", {"tooltip": "ControlNet model to apply"}),
+                "clear_cache": ("BOOLEAN", {
+                    "default": False,
+                    "tooltip": "Clear the shared ControlNet model cache before loading"
+                }),
              }
         }
     
@@ -204,9 +215,12 @@ class CR_ApplyControlNet_JK:
     DESCRIPTION = "Apply single ControlNet to conditioning with mask support."
 
     def apply_controlnet(self, base_positive, base_negative, effective_mask, strength, start_percent, end_percent, 
-                        image=None, vae=None, mask=None, control_net=None):
+                        image=None, vae=None, mask=None, control_net=None, clear_cache=False):
         """应用单个ControlNet到条件输入，支持遮罩控制"""
         
+        if clear_cache:
+            controlnet_cache.clear()
+        
         if image is not None and control_net is not None and control_net != "" and strength != 0.0:
             
             from comfy_extras.nodes_compositing import SplitImageWithAlpha
@@ -214,7 +228,7 @@ class CR_ApplyControlNet_JK:
             # 加载ControlNet模型
             if type(control_net) == str:
                 controlnet_path = folder_paths.get_full_path("controlnet", control_net)
-                controlnet = comfy.sd.load_controlnet(controlnet_path)
+                controlnet = load_controlnet_cached(controlnet_path)
             else:
                 controlnet = control_net
             
@@ -228,7 +242,7 @@ class CR_ApplyControlNet_JK:
                 mask_cal = mask
             
             extra_concat = []
-            if control_net.concat_mask:
+            if controlnet.concat_mask:
                 # 处理遮罩连接
                 mask_cal = 1.0 - mask_cal.reshape((-1, 1, mask_cal.shape[-2], mask_cal.shape[-1]))
                 mask_apply = comfy.utils.common_upscale(mask_cal, image.shape[2], image.shape[1], "bilinear", "center").round()
@@ -277,6 +291,10 @@ class CR_ApplyControlNetStackAdv_JK:
                 "mask": ("MASK", {"tooltip": "Mask for selective application"}),
                 "vae": ("VAE", {"tooltip": "VAE for image encoding"}),
                 "controlnet_stack": ("CONTROL_NET_STACK", {"tooltip": "Stack of ControlNet parameters"}),
+                "clear_cache": ("BOOLEAN", {
+                    "default": False,
+                    "tooltip": "Clear the shared ControlNet model cache before loading"
+                }),
              }
         }                    
     
@@ -286,9 +304,12 @@ class CR_ApplyControlNetStackAdv_JK:
     CATEGORY = icons.get("JK/ControlNet")
     DESCRIPTION = "Apply multiple ControlNets from stack to conditioning."
 
-    def apply_controlnet_stack(self, base_positive, base_negative, effective_mask, vae=None, mask=None, controlnet_stack=None):
+    def apply_controlnet_stack(self, base_positive, base_negative, effective_mask, vae=None, mask=None, controlnet_stack=None, clear_cache=False):
         """应用堆叠的多个ControlNet到条件输入"""
         
+        if clear_cache:
+            controlnet_cache.clear()
+        
         from comfy_extras.nodes_compositing import SplitImageWithAlpha
         
         if controlnet_stack is not None and len(controlnet_stack) != 0:
@@ -298,7 +319,7 @@ class CR_ApplyControlNetStackAdv_JK:
                 # 加载ControlNet模型
                 if type(controlnet_name) == str:
                     controlnet_path = folder_paths.get_full_path("controlnet", controlnet_name)
-                    controlnet = comfy.sd.load_controlnet(controlnet_path)
+                    controlnet = load_controlnet_cached(controlnet_path)
                 else:
                     controlnet = controlnet_name
                 
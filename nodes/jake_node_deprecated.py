@@ -10,6 +10,7 @@ import numpy
 import json
 import hashlib
 import comfy.samplers
+import comfy.utils
 import folder_paths
 import piexif
 import piexif.helper
@@ -20,7 +21,9 @@ from PIL import Image, ImageOps
 from PIL.PngImagePlugin import PngInfo
 from .jake_tools import (
     any_type, get_resolution, get_sd3_resolution, 
-    UNION_CONTROLNET_TYPES
+    calculate_sha256, calculate_file_hashes, handle_whitespace, 
+    make_filename, make_pathname, UNION_CONTROLNET_TYPES,
+    load_controlnet_cached
 )
 from nodes import MAX_RESOLUTION, ControlNetApplyAdvanced
 from ..categories import icons
@@ -404,7 +407,7 @@ class CR_ControlNetStack_JK:
                     controlnet_path = folder_paths.get_full_path("controlnet", kwargs.get(f"controlnet_{i}"))
                     controlnet_name = Path(kwargs.get(f"controlnet_{i}")).stem
                     controlnet_hash = f" [{calculate_sha256(controlnet_path)[:8]}]" if save_hash == True else ""
-                    controlnet_load = comfy.controlnet.load_controlnet(controlnet_path)
+                    controlnet_load = load_controlnet_cached(controlnet_path)
                     
                     type_number = UNION_CONTROLNET_TYPES.get(kwargs.get(f"union_type_{i}"), -2)
                     
@@ -468,7 +471,7 @@ class CR_ApplyControlNetStack_JK:
                 
                 if type(controlnet_name) == str:
                     controlnet_path = folder_paths.get_full_path("controlnet", controlnet_name)
-                    controlnet = comfy.sd.load_controlnet(controlnet_path)
+                    controlnet = load_controlnet_cached(controlnet_path)
                 else:
                     controlnet = controlnet_name
                 
@@ -1614,14 +1617,26 @@ class ImageSaveWithMetadata_JK:
         upscale_denoise_metadata = f"{upscale_denoise:.3f}"
         #
         baseckpt_path = f"{folder_paths.get_full_path('checkpoints', ckpt_name)}"
+        basevae_path = folder_paths.get_full_path("vae", vae_name) if specified_vae == True else None
+        refineckpt_path = f"{folder_paths.get_full_path('checkpoints', refine_ckpt_name)}"
+        upscaleckpt_path = f"{folder_paths.get_full_path('checkpoints', upscale_ckpt_name)}"
+        # 一次性并行计算所有模型的AutoV2哈希
+        if save_hash == True:
+            hash_paths = [baseckpt_path, basevae_path]
+            hash_paths += [refineckpt_path] if Enable_refine_ckpt == True else []
+            hash_paths += [upscaleckpt_path] if Enable_upscale_ckpt == True else []
+            pbar = comfy.utils.ProgressBar(len(hash_paths))
+            file_hashes = calculate_file_hashes(hash_paths, progress_callback=lambda completed, total: pbar.update_absolute(completed, total))
+        else:
+            file_hashes = {}
+        autov2 = lambda path: file_hashes[path].autov2 if file_hashes.get(path) is not None else ""
+        #
         baseckpt_name = Path(f"{ckpt_name}").stem
-        baseckpt_hash = f"Model hash: {calculate_sha256(baseckpt_path)[:10]}, " if save_hash == True else ""
-        baseckpt_hash_2 = f" [{calculate_sha256(baseckpt_path)[:10]}]" if save_hash == True else ""
+        baseckpt_hash = f"Model hash: {autov2(baseckpt_path)}, " if save_hash == True else ""
+        baseckpt_hash_2 = f" [{autov2(baseckpt_path)}]" if save_hash == True else ""
         if specified_vae == True:
-            basevae_path = folder_paths.get_full_path("vae", vae_name)
             basevae_name = Path(f"{vae_name}").stem
-            basevae_hash = calculate_sha256(basevae_path)[:10]
-            basevae_metadata = f"VAE hash: {basevae_hash}, VAE: {basevae_name}, " if save_hash == True else f"VAE: {basevae_name}, "
+            basevae_metadata = f"VAE hash: {autov2(basevae_path)}, VAE: {basevae_name}, " if save_hash == True else f"VAE: {basevae_name}, "
         else:
             basevae_metadata = ""
         base_metadata = f"{handle_whitespace(positive)}{handle_whitespace(variation)}{handle_whitespace(positive_embedding_prompt)}{handle_whitespace(lora_prompt)}\nNegative prompt: {handle_whitespace(negative)}{handle_whitespace(negative_embedding_prompt)}\nSteps: {steps}, Sampler: {sampler_name}{f' {scheduler}' if scheduler != 'normal' else ''}, CFG scale: {cfg}, Seed: {seed_value}, Size: {width}x{height}, {baseckpt_hash}Model: {baseckpt_name}, {basevae_metadata}{f'Denoising strength: {img2img_denoise_metadata}, ' if img2img == True else ''}Clip skip: {stop_at_clip_layer}, RNG: CPU, "
@@ -1631,9 +1646,8 @@ class ImageSaveWithMetadata_JK:
         #
         base_step_end = int(steps * refine_1_switch_at)
         refine_step_start = base_step_end #+ 1
-        refineckpt_path = f"{folder_paths.get_full_path('checkpoints', refine_ckpt_name)}"
         refineckpt_name = Path(f"{refine_ckpt_name}").stem
-        refineckpt_hash = f" [{calculate_sha256(refineckpt_path)[:10]}]" if save_hash == True else ""
+        refineckpt_hash = f" [{autov2(refineckpt_path)}]" if save_hash == True else ""
         refineckpt_metadata = f"Refiner: {refineckpt_name}{refineckpt_hash}" if Enable_refine_ckpt == True else f"Refiner: {baseckpt_name}{baseckpt_hash_2}"
         refineprompt_metadata = f"Refine prompt: \"{handle_whitespace(refine_1_positive)},{handle_whitespace(refine_1_variation)}\", Refine negative prompt: \"{handle_whitespace(refine_1_negative)}\", " if Enable_refine_1_prompt == True else ""
         refineprompt_metadata_2 = f"Refine 2 prompt: \"{handle_whitespace(refine_2_positive)},{handle_whitespace(refine_2_variation)}\", Refine 2 negative prompt: \"{handle_whitespace(refine_2_negative)}\", " if Enable_refine_2_prompt == True else ""
@@ -1641,9 +1655,8 @@ class ImageSaveWithMetadata_JK:
         refine_2_metadata = f"Refine 2 CFG scale: {refine_2_cfg}, Refine Denoising strength: {refine_2_denoise_metadata}, {f'Refiner Seed 2: {refine_2_seed}, ' if Enable_refine_2_seed == True else ''}{refineprompt_metadata_2}{f'IPAdapter 2: Enabled, ' if Enable_IPAdaptor_2 == True else ''}" if Enable_refine_2 == True else ""
         refine_metadata = f"{refine_1_metadata}{refine_2_metadata}"
         #
-        upscaleckpt_path = f"{folder_paths.get_full_path('checkpoints', upscale_ckpt_name)}"
         upscaleckpt_name = Path(f"{upscale_ckpt_name}").stem
-        upscaleckpt_hash = f" [{calculate_sha256(upscaleckpt_path)[:10]}]" if save_hash == True else ""
+        upscaleckpt_hash = f" [{autov2(upscaleckpt_path)}]" if save_hash == True else ""
         upscaleckpt_metadata = f"Hires checkpoint: {upscaleckpt_name}{upscaleckpt_hash}" if Enable_upscale_ckpt == True else f"Hires checkpoint: {baseckpt_name}{baseckpt_hash_2}"
         upscaleprompt_metadata = f"Hires prompt: \"{handle_whitespace(upscale_positive)}\", Hires negative prompt: \"{handle_whitespace(upscale_negative)}\", " if Enable_upscale_prompt == True else ""
         upscaleseed_metadata = f"Upscale Seed: {upscale_seed}, "
@@ -1,18 +1,16 @@
 #---------------------------------------------------------------------------------------------------------------------#
 # Jake Upgrade Image Nodes for JK Custom Workflow of ComfyUI
 #---------------------------------------------------------------------------------------------------------------------#
+import os
 import torch
 import cv2
 import numpy
 import math
-from PIL import ImageEnhance
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Tuple, List, Dict
-from .jake_tools import tensor2pil, pil2tensor
 from .jake_utils import (
-    torch_imgs_to_pils, pils_to_torch_imgs,
-    pil_split_image, pil_make_image_grid,
-    image_gray_offset, RGB2RGBA,
-    image_channel_merge
+    tensor_split_image, tensor_make_image_grid,
+    color_grading_tensor, composite_alpha_tensor, hex_to_rgb
 )
 from nodes import MAX_RESOLUTION
 from ..categories import icons
@@ -32,6 +30,7 @@ class RoughOutline_JK:
                 "simplify_tolerance": ("FLOAT", {"default": 0.5, "min": 0.1, "max": 20.0, "step": 0.1}),
                 "morph_kernel": ("INT", {"default": 9, "min": 0, "max": 20, "step": 2}),
                 "thickness": ("INT", {"default": 4, "min": 1, "max": 10, "step": 1}),
+                "workers": ("INT", {"default": 0, "min": 0, "max": 64, "step": 1, "tooltip": "Number of frames processed in parallel. 0 uses all CPU cores."}),
             },
         }
         
@@ -41,7 +40,7 @@ class RoughOutline_JK:
     CATEGORY = icons.get("JK/Image")
     DESCRIPTION = "Extract rough outlines from images using Canny edge detection and contour processing."
     
-    def rough_outline(self, images, blur_size, canny_low, canny_high, simplify_mode, simplify_tolerance, morph_kernel, thickness):
+    def rough_outline(self, images, blur_size, canny_low, canny_high, simplify_mode, simplify_tolerance, morph_kernel, thickness, workers=0):
         """
         Extract outlines from input images using Canny edge detection and contour processing
         Returns outline image, overlay image, and canny edges
@@ -50,64 +49,25 @@ class RoughOutline_JK:
         np_images = images.cpu().numpy() * 255.0
         np_images = np_images.astype(numpy.uint8)
         
-        overlay_list = []
-        contour_list = []
-        edges_list = []
+        def process(img):
+            return self.process_frame(img, blur_size, canny_low, canny_high, simplify_mode, simplify_tolerance, morph_kernel, thickness)
         
-        for i in range(batch_size):
-            img = np_images[i]
-            img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-            gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-            
-            # Apply Gaussian blur
-            if blur_size > 0:
-                blur_size_adj = blur_size + 1 if blur_size % 2 == 0 else blur_size
-                gray = cv2.GaussianBlur(gray, (blur_size_adj, blur_size_adj), 0)
-            
-            # Canny edge detection
-            edges = cv2.Canny(gray, canny_low, canny_high)
-            edges_rgb = cv2.cvtColor(edges, cv2.COLOR_GRAY2RGB)
-            
-            # Morphological closing operation
-            if morph_kernel > 0:
-                kernel = numpy.ones((morph_kernel, morph_kernel), numpy.uint8)
-                edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
-            
-            # Find and process contours
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            valid_contours = []
-            for contour in contours:
-                arc_len = cv2.arcLength(contour, True)
-                
-                # Dynamic simplification strategy
-                if simplify_mode == "dynamic":
-                    epsilon = max(1.0, (arc_len * 0.01) * simplify_tolerance)
-                else:
-                    epsilon = simplify_tolerance
-                
-                approx = cv2.approxPolyDP(contour, epsilon, True)
-                if len(approx) >= 2:
-                    approx = self.connect_breakpoints(approx, max_gap=5)
-                    valid_contours.append(approx)
-            
-            # Create output images
-            overlay_img = img_bgr.copy()
-            white_bg = numpy.ones_like(img_bgr) * 255
-            
-            if valid_contours:
-                # Draw red contours (BGR format)
-                cv2.drawContours(overlay_img, valid_contours, -1, (0, 0, 255), thickness)
-                cv2.drawContours(white_bg, valid_contours, -1, (0, 0, 0), thickness)
-            
-            # Convert and normalize
-            overlay_rgb = cv2.cvtColor(overlay_img, cv2.COLOR_BGR2RGB) / 255.0
-            contour_rgb = cv2.cvtColor(white_bg, cv2.COLOR_BGR2RGB) / 255.0
-            edges_rgb = edges_rgb / 255.0
-            
-            overlay_list.append(torch.from_numpy(overlay_rgb))
-            contour_list.append(torch.from_numpy(contour_rgb))
-            edges_list.append(torch.from_numpy(edges_rgb))
+        # cv2 releases the GIL, so frames run in parallel on threads; map keeps the frame order
+        workers = min(workers or os.cpu_count() or 1, batch_size)
+        if workers > 1:
+            # One cv2 thread per worker, otherwise every frame also fans out over all cores.
+            # The count is per thread with OpenMP builds and global otherwise, so set it in each worker and restore it after.
+            cv2_threads = cv2.getNumThreads()
+            try:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="JK-Outline",
+                                        initializer=cv2.setNumThreads, initargs=(1,)) as executor:
+                    results = list(executor.map(process, np_images))
+            finally:
+                cv2.setNumThreads(cv2_threads)
+        else:
+            results = [process(img) for img in np_images]
+        
+        contour_list, overlay_list, edges_list = zip(*results)
         
         return (
             torch.stack(contour_list),
@@ -115,41 +75,90 @@ class RoughOutline_JK:
             torch.stack(edges_list)
         )
 
+    def process_frame(self, img, blur_size, canny_low, canny_high, simplify_mode, simplify_tolerance, morph_kernel, thickness):
+        """Process a single uint8 RGB frame, returns (outline, overlay, canny) tensors"""
+        img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+        gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
+        
+        # Apply Gaussian blur
+        if blur_size > 0:
+            blur_size_adj = blur_size + 1 if blur_size % 2 == 0 else blur_size
+            gray = cv2.GaussianBlur(gray, (blur_size_adj, blur_size_adj), 0)
+        
+        # Canny edge detection
+        edges = cv2.Canny(gray, canny_low, canny_high)
+        edges_rgb = cv2.cvtColor(edges, cv2.COLOR_GRAY2RGB)
+        
+        # Morphological closing operation
+        if morph_kernel > 0:
+            kernel = numpy.ones((morph_kernel, morph_kernel), numpy.uint8)
+            edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
+        
+        # Find and process contours
+        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        valid_contours = []
+        for contour in contours:
+            arc_len = cv2.arcLength(contour, True)
+            
+            # Dynamic simplification strategy
+            if simplify_mode == "dynamic":
+                epsilon = max(1.0, (arc_len * 0.01) * simplify_tolerance)
+            else:
+                epsilon = simplify_tolerance
+            
+            approx = cv2.approxPolyDP(contour, epsilon, True)
+            if len(approx) >= 2:
+                approx = self.connect_breakpoints(approx, max_gap=5)
+                valid_contours.append(approx)
+        
+        # Create output images
+        overlay_img = img_bgr.copy()
+        white_bg = numpy.ones_like(img_bgr) * 255
+        
+        if valid_contours:
+            # Draw red contours (BGR format)
+            cv2.drawContours(overlay_img, valid_contours, -1, (0, 0, 255), thickness)
+            cv2.drawContours(white_bg, valid_contours, -1, (0, 0, 0), thickness)
+        
+        # Convert and normalize
+        overlay_rgb = cv2.cvtColor(overlay_img, cv2.COLOR_BGR2RGB) / 255.0
+        contour_rgb = cv2.cvtColor(white_bg, cv2.COLOR_BGR2RGB) / 255.0
+        edges_rgb = edges_rgb / 255.0
+        
+        return torch.from_numpy(contour_rgb), torch.from_numpy(overlay_rgb), torch.from_numpy(edges_rgb)
+
     def connect_breakpoints(self, contour, max_gap=5):
         """Connect breakpoints in contours to maintain shape consistency"""
-        new_contour = []
         if len(contour) == 0:
             return contour
         
-        # Ensure correct initial point shape
-        last_point = numpy.array(contour[0], dtype=numpy.int32).reshape(1,1,2)
-        new_contour.append(last_point)
+        points = numpy.asarray(contour, dtype=numpy.int32).reshape(-1, 2)
+        start, stop = points[:-1], points[1:]
         
-        for point in contour[1:]:
-            current_point = numpy.array(point, dtype=numpy.int32).reshape(1,1,2)
-            distance = numpy.linalg.norm(current_point - last_point)
-            
-            if distance > max_gap:
-                # Generate intermediate points and maintain 3D shape (N,1,2)
-                num_intermediate = int(distance // max_gap) + 1
-                intermediate = numpy.linspace(
-                    last_point[0,0], 
-                    current_point[0,0], 
-                    num=num_intermediate+2,
-                    dtype=numpy.int32
-                )
-                # Reshape to (N,1,2) format
-                intermediate = intermediate.reshape(-1,1,2)
-                
-                # Skip first and last points (already included)
-                for p in intermediate[1:-1]:
-                    new_contour.append(p.reshape(1,1,2))
-            
-            new_contour.append(current_point)
-            last_point = current_point
+        # Gap between consecutive points, segments longer than max_gap get intermediate points
+        delta = numpy.subtract(stop, start, dtype=numpy.float64)
+        distance = numpy.sqrt((delta * delta).sum(axis=1))
+        intermediate_count = numpy.where(distance > max_gap, (distance // max_gap).astype(numpy.int64) + 1, 0)
+        
+        # Each segment emits its intermediate points followed by its end point
+        counts = intermediate_count + 1
+        segment = numpy.repeat(numpy.arange(len(counts)), counts)
+        index = numpy.arange(len(segment)) - numpy.repeat(numpy.cumsum(counts) - counts, counts) + 1
+        
+        # Same arithmetic as numpy.linspace(start, stop, intermediate_count + 2) so the points match exactly
+        div = (intermediate_count + 1).astype(numpy.float64)[segment, None]
+        segment_delta = delta[segment]
+        step_zero = (segment_delta == 0).any(axis=1, keepdims=True)
+        position = index.astype(numpy.float64)[:, None]
+        interpolated = numpy.where(step_zero, position / div * segment_delta, position * (segment_delta / div))
+        interpolated += start[segment]
+        interpolated = numpy.floor(interpolated).astype(numpy.int32)
         
-        # Concatenate after unifying shapes
-        return numpy.concatenate(new_contour, axis=0)
+        is_end = index > intermediate_count[segment]
+        interpolated[is_end] = stop[segment[is_end]]
+        
+        return numpy.concatenate([points[:1], interpolated], axis=0).reshape(-1, 1, 2)
 
 class OpenDWPose_JK:
     """Combine DWPose and OpenPose images by removing and reserving specific colors"""
@@ -169,81 +178,107 @@ class OpenDWPose_JK:
     CATEGORY = icons.get("JK/Image")
     DESCRIPTION = "Combine DWPose and OpenPose images by removing and reserving specific colors."
 
+    # Colors removed from DWPose
+    DWPOSE_REMOVE_COLORS = ('#000099', '#990066', '#990099',  # Three lines
+                            '#aa00ff', '#ff0000', '#ff00aa', '#ff00ff', '#ff0055',
+                            '#660099', '#330099')
+    
+    # Colors reserved in OpenPose
+    OPENPOSE_RESERVE_COLORS = ('#ff0055', '#ff00aa',
+                               '#ffffff',
+                               '#000099', '#660099', '#330099', '#990099', '#990066',
+                               '#ff0000')
+    
+    # Color tolerance of the original float test |x - c/255| < 0.01, i.e. 2.55 in 8-bit values
+    COLOR_TOLERANCE = 0.01
+    
+    # Lookup table entries: 8-bit colors within 2 steps of a target always pass the float test (|x*255 - c| <= 2.5),
+    # colors 3 steps away may pass it and are confirmed with the exact test
+    LUT_NO_MATCH, LUT_MAYBE, LUT_MATCH = 0, 1, 2
+    
+    # Lookup table cache {(colors, device): uint8 table indexed by packed RGB}
+    _color_lut_cache = {}
+
     def hex_to_rgb(self, hex_color):
         """Convert hex color to RGB values"""
         hex_color = hex_color.lstrip("#")
         return [int(hex_color[i:i + 2], 16) for i in (0, 2, 4)]
 
-    def remove_color(self, image, hex_color="#000099"):
-        """Remove specific color from image"""
-        target_rgb = self.hex_to_rgb(hex_color)
-
-        # Convert PyTorch tensor to NumPy array
-        if isinstance(image, torch.Tensor):
-            image = image.cpu().numpy()
-
-        # Convert target color to same scale as image
-        target_rgb_normalized = [c / 255.0 for c in target_rgb]
-
-        # Apply color removal with tolerance for small differences
-        tolerance = 0.01
-        mask = numpy.all(numpy.abs(image - target_rgb_normalized) < tolerance, axis=-1)
-        image[mask] = 0
-
-        # Convert back to PyTorch tensor
-        image = torch.from_numpy(image)
+    def value_range(self, image):
+        """Smallest and largest value of the image in one reduction (NaN when any value is NaN)"""
+        if image.numel() == 0:
+            return 0.0, 0.0
+        low, high = torch.aminmax(image)
+        return low.item(), high.item()
+
+    def color_lut(self, hex_colors, device):
+        """Lookup table indexed by packed 24-bit RGB, LUT_MATCH / LUT_MAYBE for colors within 2 / 3 steps of any given color"""
+        key = (tuple(hex_colors), str(device))
+        lut = self._color_lut_cache.get(key)
+        if lut is None:
+            lut = torch.zeros(1 << 24, dtype=torch.uint8)
+            for radius, value in ((3, self.LUT_MAYBE), (2, self.LUT_MATCH)):
+                offsets = torch.arange(-radius, radius + 1)
+                for hex_color in hex_colors:
+                    r, g, b = ((c + offsets).clamp(0, 255) for c in self.hex_to_rgb(hex_color))
+                    packed = (r[:, None, None] << 16) | (g[None, :, None] << 8) | b[None, None, :]
+                    lut[packed.flatten()] = value
+            lut = lut.to(device)
+            self._color_lut_cache[key] = lut
+        return lut
+
+    def color_mask(self, image, hex_colors):
+        """Mask [B, H, W] of pixels within tolerance of any of the colors, in a single lookup over the whole batch"""
+        rgb = image[..., :3]
+        low, high = self.value_range(rgb)
+        in_range = low >= 0 and high <= 1
+        
+        # Quantize to 8-bit and pack into a 24-bit integer (exact in float32 below 2^24)
+        quantized = rgb.float().mul(255)
+        if not in_range:
+            quantized = quantized.nan_to_num_(0.0).clamp_(0, 255)
+        quantized = quantized.round_()
+        packed = (quantized @ quantized.new_tensor([65536.0, 256.0, 1.0])).to(torch.int32)
+        lut = self.color_lut(hex_colors, image.device)
+        codes = lut.index_select(0, packed.flatten()).view(packed.shape)
+        mask = codes == self.LUT_MATCH
+        
+        # Confirm uncertain hits with the exact float test. Quantization only bounds the error for values
+        # inside [0, 1], so any value outside it (or NaN) makes every hit uncertain
+        uncertain = codes == self.LUT_MAYBE if in_range else codes != self.LUT_NO_MATCH
+        candidates = uncertain.nonzero(as_tuple=True)
+        if candidates[0].numel():
+            targets = torch.tensor([self.hex_to_rgb(c) for c in hex_colors], dtype=torch.float64, device=image.device) / 255.0
+            differences = rgb[candidates].double()[:, None, :] - targets[None]
+            mask[candidates] = (differences.abs() < self.COLOR_TOLERANCE).all(dim=-1).any(dim=-1)
+        return mask
 
-        return image
+    def remove_color(self, image, hex_color="#000099"):
+        """Remove specific color(s) from image"""
+        hex_colors = (hex_color,) if isinstance(hex_color, str) else hex_color
+        mask = self.color_mask(image, hex_colors)
+        return image.masked_fill(mask.unsqueeze(-1), 0)
 
     def reserve_color(self, image, reserved_colors=["#000099", "#00FF00"]):
         """Reserve only specified colors in image"""
-        # Convert PyTorch tensor to NumPy array
-        if isinstance(image, torch.Tensor):
-            image = image.cpu().numpy()
-
-        # Convert reserved colors to same scale as image
-        reserved_colors_normalized = []
-        for each in reserved_colors:
-            target_rgb = self.hex_to_rgb(each)
-            reserved_colors_normalized.append([c / 255.0 for c in target_rgb])
-
-        # Create mask to reserve specified colors
-        mask = None
-        for color_normalized in reserved_colors_normalized:
-            color_mask = numpy.all(numpy.abs(image - color_normalized) < 0.01, axis=-1)
-            if mask is None:
-                mask = color_mask
-            else:
-                mask |= color_mask
-
-        # Set non-reserved colors to zero
-        image[~mask] = 0
-
-        # Convert back to PyTorch tensor
-        image = torch.from_numpy(image)
-
-        return image
+        mask = self.color_mask(image, reserved_colors)
+        return image.masked_fill(~mask.unsqueeze(-1), 0)
 
     def add_images(self, DWPose, OpenPose):
         """Combine DWPose and OpenPose images"""
-        print("type(DWPose)", type(DWPose))
-        print("DWPose shape", DWPose.shape)
-        
-        # Remove specific colors from DWPose
-        dwpose_color_to_remove = ['#000099', '#990066', '#990099',  # Three lines
-                                  '#aa00ff', '#ff0000', '#ff00aa', '#ff00ff', '#ff0055',
-                                  '#660099', '#330099']
-        for each in dwpose_color_to_remove:
-            DWPose = self.remove_color(DWPose, hex_color=each)
-
-        # Reserve only specified colors in OpenPose
-        OpenPose = self.reserve_color(OpenPose, reserved_colors=['#ff0055', '#ff00aa',
-                                                                 '#ffffff',
-                                                                 '#000099','#660099','#330099','#990099','#990066'
-                                                                 '#ff00aa','#ff0000','#ff0055'])
-
-        # Add the numpy arrays of input images
-        result_image = numpy.add(DWPose, OpenPose)
+        OpenPose = OpenPose.to(DWPose.device)
+        
+        # Remove specific colors from DWPose, reserve only specified colors in OpenPose
+        dwpose_keep = ~self.color_mask(DWPose, self.DWPOSE_REMOVE_COLORS)
+        openpose_keep = self.color_mask(OpenPose, self.OPENPOSE_RESERVE_COLORS)
+
+        if all(math.isfinite(low) and math.isfinite(high) for low, high in map(self.value_range, (DWPose, OpenPose))):
+            # Add the masked images in one pass
+            result_image = torch.addcmul(DWPose * dwpose_keep.unsqueeze(-1).to(DWPose.dtype),
+                                         OpenPose, openpose_keep.unsqueeze(-1).to(OpenPose.dtype))
+        else:
+            # Multiplying by the mask would keep NaN and turn inf into NaN, so zero the pixels explicitly
+            result_image = DWPose.masked_fill(~dwpose_keep.unsqueeze(-1), 0) + OpenPose.masked_fill(~openpose_keep.unsqueeze(-1), 0)
         return (result_image,)
 
 class MakeImageGrid_JK:
@@ -267,13 +302,6 @@ class MakeImageGrid_JK:
 
     def make_image_grid(self, images, grid_side_num, grid_side):
         """Create image grid from batch of images"""
-        try:
-            import torchvision.transforms.functional as TF
-        except ImportError:
-            raise ImportError("torchvision is required for MakeImageGrid_JK")
-            
-        pil_image_list = torch_imgs_to_pils(images)
-
         if grid_side:
             rows = grid_side_num
             cols = None
@@ -281,9 +309,7 @@ class MakeImageGrid_JK:
             cols = grid_side_num
             rows = None
 
-        image_grid = pil_make_image_grid(pil_image_list, rows, cols)
-
-        image_grid = TF.to_tensor(image_grid).permute(1, 2, 0).unsqueeze(0)  # [1, H, W, 3]
+        image_grid = tensor_make_image_grid(images, rows, cols)  # [1, H, W, C]
 
         return (image_grid,)
 
@@ -309,33 +335,23 @@ class SplitImageGrid_JK:
 
     def split_image_grid(self, image, grid_side_num, grid_side, crop_excess=True):
         """Split image grid into multiple images"""
-        images = []
-        for image_pil in torch_imgs_to_pils(image):
-            if grid_side:
-                rows = grid_side_num
-                cols = None
-            else:
-                cols = grid_side_num
-                rows = None
+        if grid_side:
+            rows = grid_side_num
+            cols = None
+        else:
+            cols = grid_side_num
+            rows = None
 
-            try:
-                image_pils = pil_split_image(image_pil, rows, cols, crop_excess)
-                if image_pils:  # Only process if we have images
-                    torch_imgs = pils_to_torch_imgs(image_pils, image.dtype, image.device)
-                    images.append(torch_imgs)
-            except Exception as e:
-                if not crop_excess:
-                    raise e
-                # In crop mode, try to handle the error more gracefully
-                print(f"Warning: {e}. Using fallback splitting.")
-                # Fallback: use single image
-                images.append(image)
-        
-        if not images:
-            # If no images were created, return the original
+        try:
+            images = tensor_split_image(image, rows, cols, crop_excess)
+        except Exception as e:
+            if not crop_excess:
+                raise e
+            # In crop mode, try to handle the error more gracefully
+            print(f"Warning: {e}. Using fallback splitting.")
+            # Fallback: return the original images
             return (image,)
-            
-        images = torch.cat(images, dim=0)
+        
         return (images,)
 
 class ImageRemoveAlpha_JK:
@@ -346,6 +362,17 @@ class ImageRemoveAlpha_JK:
         return {
             "required": {
                 "RGBA_image": ("IMAGE",),
+                "alpha_mode": (["discard", "straight", "premultiplied"], {
+                    "default": "discard",
+                    "tooltip": "discard: drop the alpha channel. straight / premultiplied: composite over background_color using straight or premultiplied alpha, taken from the alpha channel or from 1 - mask when a mask is connected."
+                }),
+                "background_color": ("STRING", {
+                    "default": "#000000",
+                    "tooltip": "Background color (#RRGGBB) used when compositing."
+                }),
+            },
+            "optional": {
+                "mask": ("MASK", {"tooltip": "Optional mask used instead of the alpha channel, following the ComfyUI convention alpha = 1 - mask (1 is transparent, as LoadImage outputs), resized to the image when the sizes differ. Ignored by discard."}),
             }
         }
     
@@ -353,17 +380,18 @@ class ImageRemoveAlpha_JK:
     RETURN_NAMES = ("RGB_image",)
     FUNCTION = "image_remove_alpha"
     CATEGORY = icons.get("JK/Image")
-    DESCRIPTION = "Remove alpha channel from RGBA images and convert to RGB."
-
-    def image_remove_alpha(self, RGBA_image):
-        """Convert RGBA images to RGB by removing alpha channel"""
-        ret_images = []
+    DESCRIPTION = "Remove alpha channel from RGBA images and convert to RGB, optionally compositing over a background color."
 
-        for index, img in enumerate(RGBA_image):
-            _image = tensor2pil(img)
-            ret_images.append(pil2tensor(tensor2pil(img).convert('RGB')))
+    def image_remove_alpha(self, RGBA_image, alpha_mode="discard", background_color="#000000", mask=None):
+        """Convert RGBA images to RGB by removing or compositing the alpha channel"""
+        if alpha_mode == "discard":
+            return (RGBA_image[..., :3].clone(),)
         
-        return (torch.cat(ret_images, dim=0),)
+        ret_images = composite_alpha_tensor(
+            RGBA_image, mask=mask, background=hex_to_rgb(background_color), premultiplied=(alpha_mode == "premultiplied")
+        )
+        
+        return (ret_images,)
 
 class ColorGrading_JK:
     """Apply color grading with brightness, contrast, saturation and RGB adjustments"""
@@ -389,47 +417,12 @@ class ColorGrading_JK:
     DESCRIPTION = "Apply color grading with brightness, contrast, saturation and RGB channel adjustments."
 
     def color_grading(self, image, brightness, contrast, saturation, R, G, B):
-        """Apply color grading adjustments to images"""
-        ret_images = []
-
-        for i in image:
-            i = torch.unsqueeze(i,0)
-            original_image = tensor2pil(i)
-            ret_image = original_image.convert('RGB')
-            
-            # Apply brightness adjustment
-            if brightness != 1:
-                brightness_image = ImageEnhance.Brightness(ret_image)
-                ret_image = brightness_image.enhance(factor=brightness)
-            
-            # Apply contrast adjustment
-            if contrast != 1:
-                contrast_image = ImageEnhance.Contrast(ret_image)
-                ret_image = contrast_image.enhance(factor=contrast)
-            
-            # Apply saturation adjustment
-            if saturation != 1:
-                color_image = ImageEnhance.Color(ret_image)
-                ret_image = color_image.enhance(factor=saturation)
-            
-            # Apply RGB channel adjustments
-            if R != 0 or G != 0 or B != 0:
-                red_channel, green_channel, blue_channel = ret_image.split()
-                if R != 0:
-                    red_channel = image_gray_offset(red_channel, R)
-                if G != 0:
-                    green_channel = image_gray_offset(green_channel, G)
-                if B != 0:
-                    blue_channel = image_gray_offset(blue_channel, B)
-                ret_image = image_channel_merge((red_channel, green_channel, blue_channel), 'RGB')
-            
-            # Preserve alpha channel if original image has it
-            if original_image.mode == 'RGBA':
-                ret_image = RGB2RGBA(ret_image, original_image.split()[-1])
-            
-            ret_images.append(pil2tensor(ret_image))
+        """Apply color grading adjustments to the whole image batch"""
+        ret_images = color_grading_tensor(
+            image, brightness=brightness, contrast=contrast, saturation=saturation, rgb_offset=(R, G, B)
+        )
         
-        return (torch.cat(ret_images, dim=0),)
+        return (ret_images,)
 
 class GetSize_JK:
     """Get dimensions from image, latent, or mask"""
@@ -788,6 +781,39 @@ def get_unique_axis0(data):
     unique_idxs[1:] = numpy.any(arr[:-1, :] != arr[1:, :], axis=-1)
     return arr[unique_idxs]
 
+def count_unique_colors(data, limit=None, sample_stride=16, chunk_size=1 << 20):
+    """
+    Count distinct rows of a uint8 [N, C] pixel array (C <= 3) with a packed-integer presence table
+    With limit set, returns limit + 1 as soon as more than limit colors are seen. A strided sample is
+    counted first; its colors are a lower bound of the full count, so busy images stop early while
+    counts up to limit stay exact.
+    """
+    arr = numpy.asanyarray(data)
+    if arr.dtype != numpy.uint8 or arr.ndim != 2 or not 1 <= arr.shape[1] <= 3:
+        count = len(get_unique_axis0(arr))
+        return count if limit is None else min(count, limit + 1)
+    
+    seen = numpy.zeros(1 << (8 * arr.shape[1]), dtype=numpy.bool_)
+    
+    def add_pixels(pixels):
+        packed = pixels[:, 0].astype(numpy.int32)
+        for channel in range(1, pixels.shape[1]):
+            packed <<= 8
+            packed |= pixels[:, channel]
+        seen[packed] = True
+        return numpy.count_nonzero(seen)
+    
+    if limit is not None and sample_stride > 1:
+        if add_pixels(arr[::sample_stride]) > limit:
+            return limit + 1
+    
+    count = 0
+    for start in range(0, len(arr), chunk_size):
+        count = add_pixels(arr[start:start + chunk_size])
+        if limit is not None and count > limit:
+            return limit + 1
+    return count
+
 
 class HintImageEnchance_JK:
     """Enhance hint images with high quality resizing and edge processing"""
@@ -893,7 +919,8 @@ class HintImageEnchance_JK:
         if x.shape[0] != size[1] or x.shape[1] != size[0]:
             new_size_is_smaller = (size[0] * size[1]) < (x.shape[0] * x.shape[1])
             new_size_is_bigger = (size[0] * size[1]) > (x.shape[0] * x.shape[1])
-            unique_color_count = len(get_unique_axis0(x.reshape(-1, x.shape[2])))
+            # Only the cases 2, 3-199 and 200+ matter below, so counting stops past 200 colors
+            unique_color_count = count_unique_colors(x.reshape(-1, x.shape[2]), limit=200)
             is_one_pixel_edge = False
             is_binary = False
             
@@ -5,9 +5,13 @@ import folder_paths
 import comfy.sd
 import comfy.utils
 from pathlib import Path
-from .jake_tools import calculate_sha256
+from .jake_tools import calculate_file_hashes, lora_cache
 from ..categories import icons
 
+def load_lora_file(lora_path):
+    """从磁盘加载LoRA权重（由lora_cache在未命中时调用）"""
+    return comfy.utils.load_torch_file(lora_path, safe_load=True)
+
 class CR_LoRAStack_JK:
     """Stack multiple LoRA models with prompt and metadata generation"""
     
@@ -78,7 +82,6 @@ class CR_LoRAStack_JK:
         
         # 初始化列表
         lora_list = list()
-        lora_enable_check = False
         lorapromptout = ""
         lorametaout = ""
         
@@ -86,63 +89,63 @@ class CR_LoRAStack_JK:
         if lora_stack is not None:
             lora_list.extend([l for l in lora_stack if l[0] != "None"])
         
-        j = 0
-        
+        # 根据模式检查LoRA是否启用
+        enabled_slots = []
         for i in range(1, 7):
-            
-            # 根据模式检查LoRA是否启用
             if input_mode == "model_only":
                 if (kwargs.get(f"lora_{i}") == True and 
                     kwargs.get(f"lora_name_{i}") != "None" and 
                     kwargs.get(f"model_weight_{i}") != 0):
-                    lora_enable_check = True
-                else:
-                    lora_enable_check = False
+                    enabled_slots.append(i)
             elif input_mode == "advanced": 
                 if (kwargs.get(f"lora_{i}") == True and 
                     kwargs.get(f"lora_name_{i}") != "None" and 
                     kwargs.get(f"model_weight_{i}") != 0 and 
                     kwargs.get(f"clip_weight_{i}") != 0):
-                    lora_enable_check = True
-                else:
-                    lora_enable_check = False
+                    enabled_slots.append(i)
+        
+        # 并行计算所有启用LoRA的哈希值
+        lora_paths = {i: folder_paths.get_full_path("loras", kwargs.get(f"lora_name_{i}")) for i in enabled_slots}
+        lora_hashes = calculate_file_hashes(lora_paths.values()) if save_hash == True else {}
+        
+        j = 0
+        
+        for i in enabled_slots:
             
-            if lora_enable_check:
-                
-                # 添加到LoRA堆栈
-                if input_mode == "model_only":
-                    lora_list.extend([(kwargs.get(f"lora_name_{i}"), kwargs.get(f"model_weight_{i}"), 0.0)])
-                elif input_mode == "advanced":
-                    lora_list.extend([(kwargs.get(f"lora_name_{i}"), kwargs.get(f"model_weight_{i}"), kwargs.get(f"clip_weight_{i}"))])
-                
-                # 生成LoRA提示词
-                lora_name = Path(kwargs.get(f"lora_name_{i}")).stem
-                loraprompt = f"lora:{lora_name}"
-                loraweight = f"{kwargs.get(f'model_weight_{i}'):.3f}"
-                loraprompt = f"<{loraprompt}:{loraweight}>"
-                
-                # 构建提示词输出
-                if (lora_prompt is None or lora_prompt == "") and j == 0:
-                    lorapromptout = f"{loraprompt}"
-                elif lora_prompt is not None and lora_prompt != "" and j == 0:
-                    lorapromptout = f"{lora_prompt},{loraprompt}"
-                else:
-                    lorapromptout = f"{lorapromptout},{loraprompt}"
-                
-                # 生成元数据（可选包含哈希值）
-                lora_path = folder_paths.get_full_path("loras", kwargs.get(f"lora_name_{i}"))
-                lora_hash = f": [{calculate_sha256(lora_path)[:12]}]" if save_hash == True else ""
-                lora_meta = f"{lora_name}{lora_hash}"
-                
-                # 构建元数据输出
-                if (lora_metadata is None or lora_metadata == "") and j == 0:
-                    lorametaout = f"{lora_meta}"
-                elif lora_metadata is not None and lora_metadata != "" and j == 0:
-                    lorametaout = f"{lora_metadata}, {lora_meta}"
-                else:
-                    lorametaout = f"{lorametaout}, {lora_meta}"
-                
-                j += 1
+            # 添加到LoRA堆栈
+            if input_mode == "model_only":
+                lora_list.extend([(kwargs.get(f"lora_name_{i}"), kwargs.get(f"model_weight_{i}"), 0.0)])
+            elif input_mode == "advanced":
+                lora_list.extend([(kwargs.get(f"lora_name_{i}"), kwargs.get(f"model_weight_{i}"), kwargs.get(f"clip_weight_{i}"))])
+            
+            # 生成LoRA提示词
+            lora_name = Path(kwargs.get(f"lora_name_{i}")).stem
+            loraprompt = f"lora:{lora_name}"
+            loraweight = f"{kwargs.get(f'model_weight_{i}'):.3f}"
+            loraprompt = f"<{loraprompt}:{loraweight}>"
+            
+            # 构建提示词输出
+            if (lora_prompt is None or lora_prompt == "") and j == 0:
+                lorapromptout = f"{loraprompt}"
+            elif lora_prompt is not None and lora_prompt != "" and j == 0:
+                lorapromptout = f"{lora_prompt},{loraprompt}"
+            else:
+                lorapromptout = f"{lorapromptout},{loraprompt}"
+            
+            # 生成元数据（可选包含哈希值）
+            lora_file_hash = lora_hashes.get(lora_paths[i])
+            lora_hash = f": [{lora_file_hash.sha256[:12]}]" if lora_file_hash is not None else ""
+            lora_meta = f"{lora_name}{lora_hash}"
+            
+            # 构建元数据输出
+            if (lora_metadata is None or lora_metadata == "") and j == 0:
+                lorametaout = f"{lora_meta}"
+            elif lora_metadata is not None and lora_metadata != "" and j == 0:
+                lorametaout = f"{lora_metadata}, {lora_meta}"
+            else:
+                lorametaout = f"{lorametaout}, {lora_meta}"
+            
+            j += 1
                 
         return (lora_list, lorapromptout, lorametaout,)
 
@@ -183,7 +186,7 @@ class CR_ApplyLoRAStack_JK:
             lora_name, strength_model, strength_clip = tup
             
             lora_path = folder_paths.get_full_path("loras", lora_name)
-            lora = comfy.utils.load_torch_file(lora_path, safe_load=True)
+            lora = lora_cache.get(lora_path, load_lora_file)
             
             model_lora, clip_lora = comfy.sd.load_lora_for_models(
                 model_lora, clip_lora, lora, strength_model, strength_clip
@@ -292,7 +295,7 @@ class CR_ApplyLoRAStack_ModelOnly_JK:
         for tup in lora_params:
             lora_name, strength_model, strength_clip = tup
             lora_path = folder_paths.get_full_path("loras", lora_name)
-            lora = comfy.utils.load_torch_file(lora_path, safe_load=True)
+            lora = lora_cache.get(lora_path, load_lora_file)
             model_lora = comfy.sd.load_lora_for_models(model_lora, None, lora, strength_model, 0)[0]
         
         return (model_lora,)
\ No newline at end of file
@@ -1,10 +1,17 @@
 #---------------------------------------------------------------------------------------------------------------------#
 # Jake Math Operations Nodes for JK Custom Workflow of ComfyUI
 #---------------------------------------------------------------------------------------------------------------------#
+import ast
 import math
+import operator
 import sys
 import os
-from typing import Any, Callable, Mapping, Tuple
+import threading
+import numpy
+import torch
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Tuple
+from .jake_tools import any_type
 from ..categories import icons
 
 try:
@@ -164,6 +171,337 @@ INT_BINARY_OPERATIONS: Mapping[str, Callable[[int, int], int]] = {
     "Min": lambda a, b: min(a, b),
 }
 
+#---------------------------------------------------------------------------------------------------------------------#
+# Expression Cache
+#---------------------------------------------------------------------------------------------------------------------#
+
+# 表达式可用的函数集合
+EVAL_FUNCTION_SETS: Mapping[str, Mapping[str, Callable]] = {
+    "default": simpleeval.DEFAULT_FUNCTIONS,
+    "string": {**simpleeval.DEFAULT_FUNCTIONS, "len": len},
+}
+
+# 缓存的已编译表达式数量上限
+EXPRESSION_CACHE_SIZE = 256
+
+class CompiledExpression:
+    """Pre-parsed and validated expression bound to a reusable evaluator"""
+    
+    def __init__(self, expression: str, function_set: str = "default"):
+        self.expression = expression
+        self.evaluator = self.create_evaluator(function_set)
+        self.tree = self.evaluator.parse(expression)
+        self._lock = threading.Lock()
+        self.validate()
+    
+    def create_evaluator(self, function_set: str) -> simpleeval.SimpleEval:
+        """Build the evaluator bound to the named function set"""
+        return simpleeval.SimpleEval(functions=dict(EVAL_FUNCTION_SETS[function_set]))
+    
+    def validate(self) -> None:
+        """Reject unsupported syntax and operators up front instead of on every evaluation"""
+        for node in ast.walk(self.tree):
+            if isinstance(node, (ast.expr_context, ast.boolop)):
+                continue
+            if isinstance(node, (ast.operator, ast.unaryop, ast.cmpop)):
+                if type(node) not in self.evaluator.operators:
+                    raise simpleeval.OperatorNotDefined(node, self.expression)
+            elif type(node) not in self.evaluator.nodes:
+                raise simpleeval.FeatureNotAvailable(f"Sorry, {type(node).__name__} is not available in this evaluator")
+    
+    def evaluate(self, names: Dict[str, Any]) -> Any:
+        """Evaluate the cached tree with the given variables"""
+        with self._lock:
+            self.evaluator.names = names
+            return self.evaluator.eval(self.expression, previously_parsed=self.tree)
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(expression: str, function_set: str = "default") -> CompiledExpression:
+    """Return the shared compiled expression for an expression text and function set"""
+    return CompiledExpression(expression, function_set)
+
+#---------------------------------------------------------------------------------------------------------------------#
+# Vectorized Expressions
+#---------------------------------------------------------------------------------------------------------------------#
+
+# 整数结果的保守上限：浮点估算超过该值时改用Python整数逐元素求值，避免int64静默溢出
+INT64_SAFE_LIMIT = 2.0 ** 62
+
+# 真除法的整数操作数超过该值时，float64无法与Python的精确舍入一致
+FLOAT64_EXACT_LIMIT = 2 ** 53
+
+class ScalarFallback(Exception):
+    """Raised when numpy cannot reproduce Python's scalar result, so the batch is evaluated element by element"""
+
+def check_vector_limits(a, b, max_a, max_b, symbol):
+    """Apply simpleeval's operand limits to every element"""
+    if numpy.any(numpy.abs(a) > max_a) or numpy.any(numpy.abs(b) > max_b):
+        raise simpleeval.NumberTooHigh(f"Sorry! I don't want to evaluate a {symbol} b with operands that large")
+
+def vector_operand(value) -> numpy.ndarray:
+    """Convert an operand to an array; booleans become int64 as in Python's int arithmetic on bools"""
+    array = numpy.asarray(value)
+    if array.dtype == numpy.bool_:
+        return array.astype(numpy.int64)
+    if array.dtype == object:
+        # 超出int64的常量或中间结果
+        raise ScalarFallback("operand does not fit in int64")
+    return array
+
+def is_integer(*arrays) -> bool:
+    """Whether the arrays combine to an integer dtype"""
+    return numpy.issubdtype(numpy.result_type(*arrays), numpy.integer)
+
+def check_int_range(estimate) -> None:
+    """Fall back to Python ints when a float64 estimate of an integer result may not fit in int64"""
+    # 用not <判断，NaN和inf也会触发回退
+    if not numpy.all(numpy.abs(estimate) < INT64_SAFE_LIMIT):
+        raise ScalarFallback("integer result may overflow int64")
+
+def check_nonzero(b) -> None:
+    """Python raises ZeroDivisionError for both int and float divisors, numpy returns inf/nan or 0"""
+    if numpy.any(b == 0):
+        raise ScalarFallback("division by zero")
+
+def as_float(array: numpy.ndarray) -> numpy.ndarray:
+    """float64 copy used to estimate results before the exact integer operation"""
+    return array.astype(numpy.float64)
+
+def vector_add(a, b):
+    """Element-wise a + b that refuses to wrap around int64"""
+    a, b = vector_operand(a), vector_operand(b)
+    if is_integer(a, b):
+        check_int_range(as_float(a) + as_float(b))
+    return numpy.add(a, b)
+
+def vector_sub(a, b):
+    """Element-wise a - b that refuses to wrap around int64"""
+    a, b = vector_operand(a), vector_operand(b)
+    if is_integer(a, b):
+        check_int_range(as_float(a) - as_float(b))
+    return numpy.subtract(a, b)
+
+def vector_mul(a, b):
+    """Element-wise a * b that refuses to wrap around int64"""
+    a, b = vector_operand(a), vector_operand(b)
+    if is_integer(a, b):
+        check_int_range(as_float(a) * as_float(b))
+    return numpy.multiply(a, b)
+
+def vector_truediv(a, b):
+    """Element-wise a / b with Python's zero division behaviour"""
+    a, b = vector_operand(a), vector_operand(b)
+    check_nonzero(b)
+    for operand in (a, b):
+        if is_integer(operand) and numpy.any(numpy.abs(as_float(operand)) > FLOAT64_EXACT_LIMIT):
+            raise ScalarFallback("integer operand too large for float64 division")
+    return numpy.true_divide(a, b)
+
+def vector_floordiv(a, b):
+    """Element-wise a // b with Python's zero division behaviour"""
+    a, b = vector_operand(a), vector_operand(b)
+    check_nonzero(b)
+    if is_integer(a, b):
+        # int64最小值 // -1 会溢出
+        check_int_range(as_float(a) / as_float(b))
+    return numpy.floor_divide(a, b)
+
+def vector_mod(a, b):
+    """Element-wise a % b with Python's zero division behaviour"""
+    a, b = vector_operand(a), vector_operand(b)
+    check_nonzero(b)
+    return numpy.remainder(a, b)
+
+def vector_power(a, b):
+    """Element-wise counterpart of simpleeval.safe_power"""
+    a, b = vector_operand(a), vector_operand(b)
+    check_vector_limits(a, b, simpleeval.MAX_POWER, simpleeval.MAX_POWER, "**")
+    # 0的负数次幂在Python中抛出ZeroDivisionError
+    if numpy.any((a == 0) & (b < 0)):
+        raise ScalarFallback("zero to a negative power")
+    # 与Python一致：整数的负整数次幂返回浮点数
+    if is_integer(a, b) and numpy.any(numpy.less(b, 0)):
+        a = as_float(a)
+    if is_integer(a, b):
+        check_int_range(numpy.power(as_float(a), as_float(b)))
+        return numpy.power(a, b)
+    result = numpy.power(a, b)
+    # Python对浮点溢出抛出OverflowError，对负数的非整数次幂返回复数
+    if not numpy.all(numpy.isfinite(result) | ~(numpy.isfinite(a) & numpy.isfinite(b))):
+        raise ScalarFallback("float power overflow or complex result")
+    return result
+
+def vector_lshift(a, b):
+    """Element-wise counterpart of simpleeval.safe_lshift"""
+    a, b = vector_operand(a), vector_operand(b)
+    check_vector_limits(a, b, simpleeval.MAX_SHIFT_BASE, simpleeval.MAX_SHIFT, "<<")
+    if is_integer(a, b):
+        check_int_range(as_float(a) * numpy.exp2(as_float(b)))
+    return numpy.left_shift(a, b)
+
+def vector_rshift(a, b):
+    """Element-wise counterpart of simpleeval.safe_rshift"""
+    a, b = vector_operand(a), vector_operand(b)
+    check_vector_limits(a, b, simpleeval.MAX_SHIFT_BASE, simpleeval.MAX_SHIFT, ">>")
+    return numpy.right_shift(a, b)
+
+def vector_neg(a):
+    """Element-wise -a that refuses to wrap around int64"""
+    a = vector_operand(a)
+    if is_integer(a):
+        check_int_range(as_float(a))
+    return numpy.negative(a)
+
+def vector_int(x):
+    """Element-wise int(): truncate toward zero and return int64"""
+    x = vector_operand(x)
+    if is_integer(x):
+        return x.astype(numpy.int64)
+    check_int_range(x)
+    return numpy.trunc(x).astype(numpy.int64)
+
+# 逐元素运算符：限制检查改为逐元素，去掉依赖len()的长度检查，成员/身份运算对数组无意义
+# 算术运算检查除零和int64溢出，numpy与Python结果不一致时抛出ScalarFallback
+VECTOR_OPERATORS: Mapping[type, Callable] = {
+    **{op: func for op, func in simpleeval.DEFAULT_OPERATORS.items() if op not in (ast.In, ast.NotIn, ast.Is, ast.IsNot)},
+    ast.Add: vector_add,
+    ast.Sub: vector_sub,
+    ast.Mult: vector_mul,
+    ast.Div: vector_truediv,
+    ast.FloorDiv: vector_floordiv,
+    ast.Mod: vector_mod,
+    ast.Pow: vector_power,
+    ast.LShift: vector_lshift,
+    ast.RShift: vector_rshift,
+    ast.USub: vector_neg,
+    ast.UAdd: lambda a: numpy.positive(vector_operand(a)),
+    ast.Invert: lambda a: numpy.invert(vector_operand(a)),
+    ast.Not: numpy.logical_not,
+}
+
+# 与标量函数集同名的逐元素函数（rand/randint由VectorEval按批量大小提供，str不支持）
+VECTOR_FUNCTION_SETS: Mapping[str, Mapping[str, Callable]] = {
+    "default": {
+        "int": vector_int,
+        "float": lambda x: numpy.asarray(x, dtype=numpy.float64),
+    },
+}
+
+class VectorEval(simpleeval.SimpleEval):
+    """SimpleEval variant that evaluates an expression element-wise over numpy arrays"""
+    
+    def __init__(self, functions=None, names=None):
+        super().__init__(operators=dict(VECTOR_OPERATORS), functions=functions, names=names)
+        self.size = 1
+        self.functions["rand"] = lambda: numpy.random.random(self.size)
+        self.functions["randint"] = lambda top: (numpy.random.random(self.size) * top).astype(numpy.int64)
+        # 数组的属性包含tofile等方法，禁止属性访问
+        self.nodes.pop(ast.Attribute, None)
+        self.nodes[ast.IfExp] = self._eval_ifexp
+        self.nodes[ast.Compare] = self._eval_compare
+        self.nodes[ast.BoolOp] = self._eval_boolop
+    
+    def _eval_ifexp(self, node):
+        return numpy.where(self._eval(node.test), self._eval(node.body), self._eval(node.orelse))
+    
+    def _eval_compare(self, node):
+        right = self._eval(node.left)
+        to_return = True
+        for operation, comp in zip(node.ops, node.comparators):
+            left = right
+            right = self._eval(comp)
+            to_return = numpy.logical_and(to_return, self.operators[type(operation)](left, right))
+        return to_return
+    
+    def _eval_boolop(self, node):
+        # 保持Python的取值语义：and/or返回操作数本身而不是布尔值
+        to_return = self._eval(node.values[0])
+        for value in node.values[1:]:
+            if isinstance(node.op, ast.And):
+                to_return = numpy.where(to_return, self._eval(value), to_return)
+            else:
+                to_return = numpy.where(to_return, to_return, self._eval(value))
+        return to_return
+
+class CompiledVectorExpression(CompiledExpression):
+    """Compiled expression evaluated once over whole arrays of a, b, c"""
+    
+    def create_evaluator(self, function_set: str) -> VectorEval:
+        """Build the element-wise evaluator bound to the named function set"""
+        return VectorEval(functions=dict(VECTOR_FUNCTION_SETS[function_set]))
+    
+    def evaluate(self, names: Dict[str, Any], size: int = 1) -> Any:
+        """Evaluate the cached tree over arrays broadcast to the given size"""
+        with self._lock, numpy.errstate(all="ignore"):
+            self.evaluator.size = size
+            self.evaluator.names = names
+            result = self.evaluator.eval(self.expression, previously_parsed=self.tree)
+        return numpy.broadcast_to(numpy.asarray(result), (size,))
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_vector_expression(expression: str, function_set: str = "default") -> CompiledVectorExpression:
+    """Return the shared vectorized expression for an expression text and function set"""
+    return CompiledVectorExpression(expression, function_set)
+
+def batch_to_array(value: Any, dtype) -> numpy.ndarray:
+    """Convert a scalar, list or 1-D tensor batch input into a numpy array"""
+    if isinstance(value, torch.Tensor):
+        value = value.detach().cpu().numpy()
+    array = numpy.asarray(value, dtype=dtype)
+    if array.ndim > 1:
+        raise ValueError(f"Batch inputs must be scalars, lists or 1-D tensors, got shape {array.shape}")
+    return array
+
+def evaluate_elements(expression: str, arrays: Dict[str, numpy.ndarray], size: int) -> numpy.ndarray:
+    """Evaluate the scalar expression element by element with Python numbers"""
+    compiled = compile_expression(expression)
+    columns = {name: numpy.broadcast_to(array, (size,)).tolist() for name, array in arrays.items()}
+    result = numpy.empty(size, dtype=object)
+    result[:] = [compiled.evaluate({name: column[i] for name, column in columns.items()}) for i in range(size)]
+    return result
+
+def evaluate_batch(expression: str, variables: Dict[str, Any], dtype, batch_output: str = "list") -> Tuple[Any, Any, str]:
+    """Evaluate an expression once over batched variables and return INT, FLOAT and STRING outputs"""
+    arrays = {}
+    for name, value in variables.items():
+        try:
+            arrays[name] = batch_to_array(value, dtype)
+        except OverflowError:
+            # 超出int64的输入保留为Python整数
+            arrays[name] = batch_to_array(value, object)
+    sizes = {array.size for array in arrays.values() if array.ndim == 1} - {1}
+    if len(sizes) > 1:
+        raise ValueError(f"Batch inputs have mismatched lengths: {sorted(sizes)}")
+    size = sizes.pop() if sizes else 1
+    
+    result = None
+    if all(array.dtype != object for array in arrays.values()):
+        try:
+            result = compile_vector_expression(expression).evaluate(arrays, size)
+        except (ScalarFallback, OverflowError):
+            result = None
+    if result is None or result.dtype == object:
+        # 除零、int64溢出等情况按标量路径逐元素求值，结果与错误都与标量模式一致
+        result = evaluate_elements(expression, arrays, size)
+        values = result.tolist()
+        int_values = [int(value) for value in values]
+        float_values = [float(value) for value in values]
+        if batch_output == "tensor":
+            return (torch.tensor(int_values, dtype=torch.int64), torch.tensor(float_values, dtype=torch.float32), str(values))
+        return (int_values, float_values, str(values))
+    
+    float_result = result.astype(numpy.float64)
+    if numpy.issubdtype(result.dtype, numpy.floating):
+        if not numpy.isfinite(float_result).all():
+            raise ValueError("cannot convert non-finite results to integer")
+        int_result = numpy.trunc(float_result).astype(numpy.int64)
+    else:
+        int_result = result.astype(numpy.int64)
+    
+    if batch_output == "tensor":
+        return (torch.from_numpy(int_result), torch.from_numpy(float_result.astype(numpy.float32)), str(result.tolist()))
+    return (int_result.tolist(), float_result.tolist(), str(result.tolist()))
+
 class BoolToInt_JK:
     """Convert boolean value to integer (True=1, False=0)"""
     
@@ -597,18 +935,33 @@ class EvaluateFloats_JK:
                     "step": 0.0001,
                     "tooltip": "Float variable c for expression"
                 }),
+                "a_batch": (any_type, {"tooltip": "List or 1-D tensor of values for a (enables batch mode)"}),
+                "b_batch": (any_type, {"tooltip": "List or 1-D tensor of values for b (enables batch mode)"}),
+                "c_batch": (any_type, {"tooltip": "List or 1-D tensor of values for c (enables batch mode)"}),
+                "batch_output": (["list", "tensor"], {
+                    "default": "list",
+                    "tooltip": "Batch mode output format: Python lists or tensors"
+                }),
             },
         }
 
     RETURN_TYPES = ("INT", "FLOAT", "STRING")
     FUNCTION = "evaluate"
     CATEGORY = icons.get("JK/Math")
-    DESCRIPTION = "Evaluate Python expressions with float variables and return results as INT, FLOAT, and STRING"
+    DESCRIPTION = "Evaluate Python expressions with float variables and return results as INT, FLOAT, and STRING. Connect a/b/c_batch lists or tensors to evaluate a whole schedule at once"
 
-    def evaluate(self, python_expression, a=0, b=0, c=0):
+    def evaluate(self, python_expression, a=0, b=0, c=0, a_batch=None, b_batch=None, c_batch=None, batch_output="list"):
         """Evaluate expression with float variables"""
         try:
-            result = simpleeval.simple_eval(python_expression, names={'a': a, 'b': b, 'c': c})
+            # 批量模式：任一批量输入连接时，对整个向量只求值一次
+            if a_batch is not None or b_batch is not None or c_batch is not None:
+                variables = {
+                    'a': a if a_batch is None else a_batch,
+                    'b': b if b_batch is None else b_batch,
+                    'c': c if c_batch is None else c_batch,
+                }
+                return evaluate_batch(python_expression, variables, numpy.float64, batch_output)
+            result = compile_expression(python_expression).evaluate({'a': a, 'b': b, 'c': c})
             int_result = int(result)
             float_result = float(result)
             string_result = str(result)
@@ -651,18 +1004,33 @@ class EvaluateInts_JK:
                     "step": 1,
                     "tooltip": "Integer variable c for expression"
                 }),
+                "a_batch": (any_type, {"tooltip": "List or 1-D tensor of values for a (enables batch mode)"}),
+                "b_batch": (any_type, {"tooltip": "List or 1-D tensor of values for b (enables batch mode)"}),
+                "c_batch": (any_type, {"tooltip": "List or 1-D tensor of values for c (enables batch mode)"}),
+                "batch_output": (["list", "tensor"], {
+                    "default": "list",
+                    "tooltip": "Batch mode output format: Python lists or tensors"
+                }),
             },
         }
 
     RETURN_TYPES = ("INT", "FLOAT", "STRING")
     FUNCTION = "evaluate"
     CATEGORY = icons.get("JK/Math")
-    DESCRIPTION = "Evaluate Python expressions with integer variables and return results as INT, FLOAT, and STRING"
+    DESCRIPTION = "Evaluate Python expressions with integer variables and return results as INT, FLOAT, and STRING. Connect a/b/c_batch lists or tensors to evaluate a whole schedule at once"
 
-    def evaluate(self, python_expression, a=0, b=0, c=0):
+    def evaluate(self, python_expression, a=0, b=0, c=0, a_batch=None, b_batch=None, c_batch=None, batch_output="list"):
         """Evaluate expression with integer variables"""
         try:
-            result = simpleeval.simple_eval(python_expression, names={'a': a, 'b': b, 'c': c})
+            # 批量模式：任一批量输入连接时，对整个向量只求值一次
+            if a_batch is not None or b_batch is not None or c_batch is not None:
+                variables = {
+                    'a': a if a_batch is None else a_batch,
+                    'b': b if b_batch is None else b_batch,
+                    'c': c if c_batch is None else c_batch,
+                }
+                return evaluate_batch(python_expression, variables, numpy.int64, batch_output)
+            result = compile_expression(python_expression).evaluate({'a': a, 'b': b, 'c': c})
             int_result = int(result)
             float_result = float(result)
             string_result = str(result)
@@ -711,9 +1079,7 @@ class EvaluateStrs_JK:
         """Evaluate expression with string variables"""
         try:
             variables = {'a': a, 'b': b, 'c': c}
-            functions = simpleeval.DEFAULT_FUNCTIONS.copy()
-            functions.update({"len": len})  # Add string functions
-            result = simpleeval.simple_eval(python_expression, names=variables, functions=functions)
+            result = compile_expression(python_expression, "string").evaluate(variables)
             return (str(result),)
         except Exception as e:
             raise ValueError(f"Error evaluating expression '{python_expression}': {str(e)}")
@@ -2,10 +2,56 @@ import random
 import json
 import os
 import re
-from typing import List, Dict, Any, Tuple
-from .jake_node_prompt_shared import PromptConfig, DataCleaner, FileLoader, get_data_cache, PromptUtils, ExpressionUtils, ShotScriptUtils
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Dict, Any, Tuple, Union
+from .jake_node_prompt_shared import PromptConfig, DataCleaner, FileLoader, get_data_cache, PromptUtils, ExpressionUtils, ShotScriptUtils, FeistelPermutation
 from ..categories import icons
 
+#---------------------------------------------------------------------------------------------------------------------#
+# 组合空间（唯一组合采样）
+#---------------------------------------------------------------------------------------------------------------------#
+class OptionSpace:
+    """单个选项列表（去重），索引直接对应选项"""
+    
+    def __init__(self, values: List[str]):
+        self.values = list(dict.fromkeys(values))
+        self.size = len(self.values)
+    
+    def decode(self, index: int) -> str:
+        return self.values[index]
+
+class UnionSpace:
+    """多个组合空间的并集，索引依次落入各子空间"""
+    
+    def __init__(self, spaces: List[Any]):
+        self.spaces = [space for space in spaces if space.size]
+        self.size = sum(space.size for space in self.spaces)
+    
+    def decode(self, index: int) -> Any:
+        for space in self.spaces:
+            if index < space.size:
+                return space.decode(index)
+            index -= space.size
+        raise IndexError(index)
+
+class ProductSpace:
+    """多个组合空间的笛卡尔积（混合进制），各位解码后由 combine 组合"""
+    
+    def __init__(self, spaces: List[Any], combine: Callable[[List[Any]], Any]):
+        self.spaces = spaces
+        self.combine = combine
+        self.size = 1
+        for space in spaces:
+            self.size *= space.size
+    
+    def decode(self, index: int) -> Any:
+        parts = []
+        for space in self.spaces:
+            index, digit = divmod(index, space.size)
+            parts.append(space.decode(digit))
+        return self.combine(parts)
+
 #---------------------------------------------------------------------------------------------------------------------#
 # 生成器类
 #---------------------------------------------------------------------------------------------------------------------#
@@ -153,35 +199,14 @@ class PromptComponentGenerator:
         if not self.data_cache['DESCRIPTION_STRUCTURED_OPTIONS']:
             return ""
         
-        # 按子类别分组
-        description_parts = {
-            'sensory': [],
-            'detail': [], 
-            'quality': [],
-            'composition': [],
-            'color': [],
-            'creativity': []
-        }
-        
-        # 将选项按子类别分组
-        for category in self.data_cache['DESCRIPTION_STRUCTURED_OPTIONS']:
-            category_name = category['category']
-            if category_name in description_parts:
-                for option in category['options']:
-                    # 如果该类别不需要添加前缀，那么option已经是原始值
-                    if category.get('should_add_prefix', True):
-                        clean_value = DataCleaner.remove_category_prefix(option)
-                    else:
-                        clean_value = option
-                    description_parts[category_name].append(clean_value)
-        
-        # 从每个子类别中随机选择一条
-        selected_parts = {}
-        for category, options in description_parts.items():
-            if options:
-                selected_parts[category] = self.rng.choice(options)
+        # 从每个子类别中随机选择一条（分组在数据加载时完成）
+        selected_parts = {category: self.rng.choice(options) for category, options in self.data_cache['DESCRIPTION_BUCKETS'].items()}
         
-        # 按规定的格式组合
+        return self._format_description(selected_parts)
+    
+    @staticmethod
+    def _format_description(selected_parts: Dict[str, str]) -> str:
+        """按规定的格式组合 description 各子类别"""
         sensory = selected_parts.get('sensory', 'masterpiece')
         detail = selected_parts.get('detail', 'insane detail')
         quality = selected_parts.get('quality', 'best quality')
@@ -190,6 +215,63 @@ class PromptComponentGenerator:
         creativity = selected_parts.get('creativity', 'groundbreaking concept')
         
         return f"a {sensory} of work with {detail} and {quality}, featuring a {composition} and {color}, presenting a {creativity}"
+    
+    @staticmethod
+    def _structured_values(category: Dict) -> List[str]:
+        """返回结构化选项中去除前缀后的内容"""
+        if category.get('should_add_prefix', True):
+            return [DataCleaner.remove_category_prefix(option) for option in category['options']]
+        return list(category['options'])
+    
+    def _with_extra_values(self, space: Any, custom_value: str, include_empty: bool = True) -> Any:
+        """在组合空间外追加空结果与 custom 值（各对应随机生成中的一条分支）"""
+        extra_values = [""] if include_empty else []
+        if custom_value and custom_value.strip():
+            extra_values.append(DataCleaner.clean_prompt_string(custom_value))
+        if isinstance(space, OptionSpace):
+            # 与已有选项相同的 custom 值不再单独占一个组合
+            return OptionSpace(space.values + extra_values)
+        return UnionSpace([space, OptionSpace(extra_values)])
+    
+    def single_file_space(self, structured_options: List[Dict], custom_value: str) -> Any:
+        """_generate_from_single_file 的全部可能结果：所有文件的全部选项"""
+        values = []
+        for category in structured_options:
+            values.extend(value for value in self._structured_values(category) if value)
+        return self._with_extra_values(OptionSpace(values), custom_value)
+    
+    def multiple_files_space(self, structured_options: List[Dict], custom_value: str) -> Any:
+        """_generate_from_multiple_files 的全部可能结果：每个文件不选或选择其中一条（全部不选即空结果）"""
+        file_spaces = []
+        for category in structured_options:
+            if category['options']:
+                values = [DataCleaner.clean_prompt_string(value) for value in self._structured_values(category)]
+                file_spaces.append(OptionSpace([""] + values))
+        return self._with_extra_values(ProductSpace(file_spaces, PromptUtils.smart_join), custom_value, include_empty=False)
+    
+    def expression_space(self, custom_expression_value: str) -> Any:
+        """随机 expression 的全部可能结果：exp_str（可为空）与 expression 的组合"""
+        expressions = []
+        for category in self.data_cache['EXPRESSION_STRUCTURED_OPTIONS']:
+            expressions.extend(DataCleaner.clean_prompt_string(value) for value in self._structured_values(category))
+        if custom_expression_value and custom_expression_value.strip():
+            expressions.append(DataCleaner.clean_prompt_string(custom_expression_value))
+        expressions = [value for value in expressions if value]
+        
+        exp_strs = [""] + [DataCleaner.clean_prompt_string(value) for value in self.data_cache['EXPRESSION_STR']]
+        combine = lambda parts: f"{parts[0]} {parts[1]}" if parts[0] else parts[1]
+        return self._with_extra_values(ProductSpace([OptionSpace(exp_strs), OptionSpace(expressions)], combine), "")
+    
+    def description_space(self, custom_description_value: str) -> Any:
+        """随机 description 的全部可能结果：每个子类别各选一条"""
+        buckets = self.data_cache['DESCRIPTION_BUCKETS']
+        categories = list(buckets.keys())
+        
+        combine = lambda parts: self._format_description(dict(zip(categories, parts)))
+        space = ProductSpace([OptionSpace(list(buckets[category])) for category in categories], combine)
+        if not self.data_cache['DESCRIPTION_STRUCTURED_OPTIONS']:
+            space = OptionSpace([])
+        return self._with_extra_values(space, custom_description_value)
 
 class PromptGenerator:
     """主提示词生成器"""
@@ -345,19 +427,15 @@ class PromptGenerator:
         
         return ""
     
-    def generate_prompt(self, **kwargs) -> str:
-        """生成提示词"""
-        prompt_priority = kwargs.get("prompt_priority", "subject + scene")
-        
-        # 收集所有组件
-        components_dict = {}
-        
+    def reseed(self, seed=None):
+        """重置随机数生成器，与 PromptGenerator(seed) 产生相同的随机序列"""
+        self.rng.seed(seed)
+    
+    def build_prompt_plan(self, **kwargs) -> Dict[str, Any]:
+        """预处理节点输入（主题清理、各分类的选项与生成函数），批量生成时只需构建一次"""
         # custom_subject - 总是使用
         custom_subject = kwargs.get("custom_subject", "")
-        if custom_subject:
-            cleaned_value = DataCleaner.clean_prompt_string(custom_subject)
-            if cleaned_value:
-                components_dict["subject"] = cleaned_value
+        cleaned_subject = DataCleaner.clean_prompt_string(custom_subject) if custom_subject else ""
         
         # 处理各个分类
         categories = [
@@ -372,20 +450,101 @@ class PromptGenerator:
             ("description", "custom_description", self.component_generator.generate_description, False)
         ]
         
+        category_steps = []
         for category_name, custom_field, generate_func, exp_mode in categories:
             choice = kwargs.get(category_name, "disable")
+            # disable 不消耗随机数，直接跳过
+            if choice.lower() == "disable":
+                continue
             custom_value = kwargs.get(custom_field, "")
             exp_str_value = kwargs.get("exp_str", "quite") if exp_mode else ""
-            
+            category_steps.append((category_name, choice, custom_value, generate_func, exp_mode, exp_str_value))
+        
+        return {
+            "prompt_priority": kwargs.get("prompt_priority", "subject + scene"),
+            "subject": cleaned_subject,
+            "category_steps": category_steps,
+        }
+    
+    def generate_from_plan(self, plan: Dict[str, Any]) -> str:
+        """按预处理结果生成一条提示词"""
+        # 收集所有组件
+        components_dict = {}
+        if plan["subject"]:
+            components_dict["subject"] = plan["subject"]
+        
+        for category_name, choice, custom_value, generate_func, exp_mode, exp_str_value in plan["category_steps"]:
             result = self._process_category(choice, custom_value, category_name, generate_func, exp_mode, exp_str_value)
             if result:
                 components_dict[category_name] = result
         
         # 根据优先级设置组合组件
-        components = self._arrange_components_by_priority(components_dict, prompt_priority)
+        components = self._arrange_components_by_priority(components_dict, plan["prompt_priority"])
         full_prompt_string = PromptUtils.smart_join(components, separator=", ")
         
         return full_prompt_string
+    
+    def generate_prompt(self, **kwargs) -> str:
+        """生成提示词"""
+        return self.generate_from_plan(self.build_prompt_plan(**kwargs))
+    
+    def build_combination_space(self, plan: Dict[str, Any]) -> ProductSpace:
+        """将预处理结果转换为组合空间：random 分类各占一位，其余分类的结果固定"""
+        component_generator = self.component_generator
+        data_cache = self.data_cache
+        multiple_file_categories = ("scene", "facial_action", "audio", "camera")
+        
+        category_names = []
+        category_spaces = []
+        for category_name, choice, custom_value, generate_func, exp_mode, exp_str_value in plan["category_steps"]:
+            if choice.lower() == "random":
+                if category_name == "expression":
+                    space = component_generator.expression_space(custom_value)
+                elif category_name == "description":
+                    space = component_generator.description_space(custom_value)
+                else:
+                    structured_options = data_cache[f"{category_name.upper()}_STRUCTURED_OPTIONS"]
+                    if category_name in multiple_file_categories:
+                        space = component_generator.multiple_files_space(structured_options, custom_value)
+                    else:
+                        space = component_generator.single_file_space(structured_options, custom_value)
+            else:
+                # 非 random 选项不消耗随机数，结果固定
+                space = OptionSpace([self._process_category(choice, custom_value, category_name, generate_func, exp_mode, exp_str_value)])
+            category_names.append(category_name)
+            category_spaces.append(space)
+        
+        return ProductSpace(category_spaces, lambda parts: {name: part for name, part in zip(category_names, parts) if part})
+    
+    def generate_unique_batch(self, permutation_seed: int, count: int, **kwargs) -> List[str]:
+        """
+        无放回批量生成：在所有 random 分类的组合空间中按种子置换依次取索引，
+        置换是双射，组合索引互不重复，无需记录已生成的提示词；
+        请求数量超过组合总数时最多生成组合总数条，并打印实际数量
+        """
+        plan = self.build_prompt_plan(**kwargs)
+        space = self.build_combination_space(plan)
+        if count > space.size:
+            print(f"⚠️ RandomPrompter: only {space.size} unique combinations are available for the selected categories, generating {space.size} of {count} prompts")
+            count = space.size
+        
+        permutation = FeistelPermutation(space.size, permutation_seed)
+        prompts = []
+        for i in range(count):
+            components_dict = {"subject": plan["subject"]} if plan["subject"] else {}
+            components_dict.update(space.decode(permutation[i]))
+            components = self._arrange_components_by_priority(components_dict, plan["prompt_priority"])
+            prompts.append(PromptUtils.smart_join(components, separator=", "))
+        return prompts
+    
+    def generate_batch(self, seeds: List[int], **kwargs) -> List[str]:
+        """批量生成：共享生成器与预处理结果，每条提示词使用各自的种子"""
+        plan = self.build_prompt_plan(**kwargs)
+        prompts = []
+        for seed in seeds:
+            self.reseed(seed)
+            prompts.append(self.generate_from_plan(plan))
+        return prompts
 
 class PromptGeneratorGeek:
     """Geek 版本提示词生成器"""
@@ -415,134 +574,42 @@ class PromptGeneratorGeek:
         return full_prompt
     
     def _replace_category_tags(self, prompt: str) -> str:
-        """替换分类标记为随机内容 - 使用ExpressionUtils"""
+        """替换分类标记为随机内容 - 使用预编译的标记模板"""
         if not prompt:
             return ""
         
-        category_mapping = self.data_cache['CATEGORY_MAPPING']
-        
-        # 正则表达式匹配 [category_name] 格式的标记
-        pattern = r'\[([^\[\]]+)\]'
-        
-        def replace_match(match):
-            category_name = match.group(1)
-            
-            # 检查是否是有效的分类名称
-            if category_name not in category_mapping:
-                print(f"Warning: Category '{category_name}' not found in mapping")
-                similar_keys = [k for k in category_mapping.keys() if category_name in k]
-                if similar_keys:
-                    print(f"  Similar keys: {similar_keys[:5]}")
-                return match.group(0)
-            
-            # 从分类对应的文件中获取文件路径
-            file_paths = category_mapping[category_name]
-            if not file_paths:
-                print(f"Warning: No files found for category '{category_name}'")
-                return match.group(0)
-            
-            # 处理expression相关标签 - 使用ExpressionUtils
-            if category_name == "all expression" or category_name in self._get_expression_category_names():
-                return self._generate_all_expression_with_utils(file_paths)
-            
-            # 处理 "all xxx" 选项 - 使用 RandomPrompter_JK 的随机策略
-            if category_name.startswith("all "):
-                base_category = category_name[4:]  # 移除 "all " 前缀
-                
-                if base_category in [PromptConfig.DIRECTORY_MAPPING["scene"], 
-                                    PromptConfig.DIRECTORY_MAPPING["facial_action"], 
-                                    PromptConfig.DIRECTORY_MAPPING["camera"],
-                                    PromptConfig.DIRECTORY_MAPPING["audio"]]:
-                    return self._generate_all_multiple_files(file_paths, base_category)
-                elif base_category in [PromptConfig.DIRECTORY_MAPPING["motion"], 
-                                    PromptConfig.DIRECTORY_MAPPING["lighting"], 
-                                    PromptConfig.DIRECTORY_MAPPING["style"]]:
-                    return self._generate_all_single_file(file_paths, base_category)
-                elif base_category in ["artist", "vision"]:
-                    return self._generate_all_single_file(file_paths, base_category)
-                else:
-                    return self._generate_all_single_file(file_paths, base_category)
+        template = TagTemplate.compile(prompt, self.data_cache)
+        parts = []
+        for segment in template.segments:
+            if isinstance(segment, str):
+                parts.append(segment)
             else:
-                # 原有逻辑：对于具体分类，通常只有一个文件
-                selected_file = self.component_generator.rng.choice(file_paths)
-                
-                # 加载文件内容
-                options = FileLoader.load_data_file(selected_file)
-                if not options:
-                    print(f"Warning: No content found in file '{selected_file}' for category '{category_name}'")
-                    return match.group(0)
-                
-                # 随机选择一条内容
-                selected_option = self.component_generator.rng.choice(options)
-                
-                # 清理内容中的子分类前缀
-                cleaned_option = DataCleaner.remove_category_prefix(selected_option)
-                
-                return DataCleaner.clean_prompt_string(cleaned_option)
-        
-        # 替换所有匹配的标记
-        result = re.sub(pattern, replace_match, prompt)
-        
-        return DataCleaner.clean_prompt_string(result)
-
-    def _generate_all_expression_with_utils(self, file_paths: List[str]) -> str:
-        """使用ExpressionUtils为所有expression分类生成内容"""
-        return self._generate_all_expression(file_paths)
-
-    def _get_expression_category_names(self) -> List[str]:
-        """获取所有 expression 分类名称"""
-        expression_categories = []
-        
-        # 从映射表中获取所有以 "expression" 开头的键
-        for key in self.data_cache['CATEGORY_MAPPING'].keys():
-            if key.startswith(PromptConfig.DIRECTORY_MAPPING["expression"] + os.path.sep) or (key in self.data_cache['EXPRESSION_CATEGORIES'] and key != "select" and key != "all expression"):
-                expression_categories.append(key)
-        
-        return expression_categories
-    
-    def _generate_all_multiple_files(self, file_paths: List[str], category_name: str) -> str:
-        """使用 PromptComponentGenerator._generate_from_multiple_files 策略"""
-        # 构建结构化选项格式
-        structured_options = []
-        for file_path in file_paths:
-            options = FileLoader.load_data_file(file_path)
-            if options:
-                # 模拟结构化选项的格式
-                structured_option = {
-                    'file': os.path.basename(file_path),
-                    'category': category_name,
-                    'should_add_prefix': True,
-                    'options': options
-                }
-                structured_options.append(structured_option)
+                parts.append(self._render_slot(segment))
         
-        # 使用 PromptComponentGenerator 的方法
-        return self.component_generator._generate_from_multiple_files(
-            structured_options, "", category_name
-        )
+        return DataCleaner.clean_prompt_string("".join(parts))
     
-    def _generate_all_single_file(self, file_paths: List[str], category_name: str) -> str:
-        """使用 PromptComponentGenerator._generate_from_single_file 策略"""
-        # 构建结构化选项格式
-        structured_options = []
-        for file_path in file_paths:
-            options = FileLoader.load_data_file(file_path)
-            if options:
-                # 模拟结构化选项的格式
-                structured_option = {
-                    'file': os.path.basename(file_path),
-                    'category': category_name,
-                    'should_add_prefix': True,
-                    'options': options
-                }
-                structured_options.append(structured_option)
-        
-        # 使用 PromptComponentGenerator 的方法
-        return self.component_generator._generate_from_single_file(
-            structured_options, "", category_name
-        )
+    def _render_slot(self, slot: "TagSlot") -> str:
+        """为一个已解析的分类标记生成随机内容（只做随机选择）"""
+        rng = self.component_generator.rng
+        
+        # 处理expression相关标签 - 使用ExpressionUtils
+        if slot.kind == TagSlot.EXPRESSION:
+            return self._generate_all_expression(slot.options, slot.structured_options)
+        
+        # 处理 "all xxx" 选项 - 使用 RandomPrompter_JK 的随机策略
+        if slot.kind == TagSlot.ALL_MULTIPLE:
+            return self.component_generator._generate_from_multiple_files(slot.structured_options, "", slot.base_category)
+        if slot.kind == TagSlot.ALL_SINGLE:
+            return self.component_generator._generate_from_single_file(slot.structured_options, "", slot.base_category)
+        
+        # 具体分类：随机选择文件，再从已清理的内容中随机选择一条
+        selected_file, options = rng.choice(slot.file_options)
+        if not options:
+            print(f"Warning: No content found in file '{selected_file}' for category '{slot.category_name}'")
+            return slot.tag
+        return rng.choice(options)
     
-    def _generate_all_expression(self, file_paths: List[str]) -> str:
+    def _generate_all_expression(self, options: List[str], structured_options: List[Dict]) -> str:
         """使用ExpressionUtils处理所有expression分类的生成"""
         # 获取exp_str选项
         exp_str_options = self.data_cache['EXPRESSION_STR']
@@ -553,30 +620,11 @@ class PromptGeneratorGeek:
             exp_str_value = ExpressionUtils.select_random_exp_str(exp_str_options, self.component_generator.rng)
         
         # 根据文件数量决定使用哪种策略
-        if len(file_paths) == 1:
+        if structured_options is None:
             # 单个文件 - 从该文件中随机选择
-            selected_file = file_paths[0]
-            options = FileLoader.load_data_file(selected_file)
-            if options:
-                expression_value = self.component_generator.rng.choice(options)
-            else:
-                expression_value = ""
+            expression_value = self.component_generator.rng.choice(options) if options else ""
         else:
             # 多个文件 - 使用单文件策略从所有文件中随机选择
-            structured_options = []
-            for file_path in file_paths:
-                options = FileLoader.load_data_file(file_path)
-                if options:
-                    # 模拟结构化选项的格式
-                    structured_option = {
-                        'file': os.path.basename(file_path),
-                        'category': PromptConfig.DIRECTORY_MAPPING["expression"],
-                        'should_add_prefix': True,
-                        'options': options
-                    }
-                    structured_options.append(structured_option)
-            
-            # 随机生成一个expression（使用单文件策略）
             expression_value = self.component_generator._generate_from_single_file(
                 structured_options, "", PromptConfig.DIRECTORY_MAPPING["expression"]
             )
@@ -590,6 +638,173 @@ class PromptGeneratorGeek:
             exp_str_prob=PromptConfig.EXP_STR_RANDOM_PROB
         )
 
+#---------------------------------------------------------------------------------------------------------------------#
+# 标记模板编译
+#---------------------------------------------------------------------------------------------------------------------#
+class TagSlot:
+    """模板中已解析的分类标记：分类类型、文件与选项在编译时确定"""
+    
+    EXPRESSION = "expression"
+    ALL_MULTIPLE = "all_multiple"
+    ALL_SINGLE = "all_single"
+    SPECIFIC = "specific"
+    
+    def __init__(self, kind: str, tag: str, category_name: str, base_category: str = "",
+                 options: List[str] = None, structured_options: List[Dict] = None, file_options: List[Tuple[str, List[str]]] = None):
+        self.kind = kind
+        self.tag = tag
+        self.category_name = category_name
+        self.base_category = base_category
+        self.options = options
+        self.structured_options = structured_options
+        self.file_options = file_options
+
+class TagTemplate:
+    """
+    预编译的标记模板
+    将 [category_name] 模板解析为文本片段与分类槽位的列表，分类解析和文件加载只做一次，
+    重复生成时只需随机选择。数据热重载后缓存自动失效。
+    """
+    
+    # 正则表达式匹配 [category_name] 格式的标记
+    TAG_PATTERN = re.compile(r'\[([^\[\]]+)\]')
+    
+    # 缓存的模板数量上限
+    CACHE_SIZE = 64
+    
+    _cache: "OrderedDict[str, TagTemplate]" = OrderedDict()
+    _cache_data = None
+    _cache_lock = threading.Lock()
+    
+    def __init__(self, segments: List[Union[str, TagSlot]]):
+        self.segments = segments
+    
+    @classmethod
+    def compile(cls, template: str, data_cache: Dict[str, Any]) -> "TagTemplate":
+        """返回模板的编译结果（按模板文本缓存，data_cache 变化时清空）"""
+        with cls._cache_lock:
+            if cls._cache_data is not data_cache:
+                cls._cache.clear()
+                cls._cache_data = data_cache
+            compiled = cls._cache.get(template)
+            if compiled is not None:
+                cls._cache.move_to_end(template)
+                return compiled
+        
+        compiled = cls._compile(template, data_cache)
+        with cls._cache_lock:
+            if cls._cache_data is data_cache:
+                cls._cache[template] = compiled
+                while len(cls._cache) > cls.CACHE_SIZE:
+                    cls._cache.popitem(last=False)
+        return compiled
+    
+    @classmethod
+    def _compile(cls, template: str, data_cache: Dict[str, Any]) -> "TagTemplate":
+        """解析模板并预先完成分类解析"""
+        category_mapping = data_cache['CATEGORY_MAPPING']
+        expression_categories = cls._get_expression_category_names(data_cache)
+        
+        segments = []
+        position = 0
+        for match in cls.TAG_PATTERN.finditer(template):
+            cls._append_literal(segments, template[position:match.start()])
+            position = match.end()
+            slot = cls._resolve_tag(match.group(0), match.group(1), category_mapping, expression_categories)
+            if slot is None:
+                # 无法解析的标记保持原样
+                cls._append_literal(segments, match.group(0))
+            else:
+                segments.append(slot)
+        cls._append_literal(segments, template[position:])
+        
+        return cls(segments)
+    
+    @staticmethod
+    def _append_literal(segments: List[Union[str, TagSlot]], text: str):
+        """追加文本片段，与前一个文本片段合并"""
+        if not text:
+            return
+        if segments and isinstance(segments[-1], str):
+            segments[-1] += text
+        else:
+            segments.append(text)
+    
+    @classmethod
+    def _resolve_tag(cls, tag: str, category_name: str, category_mapping: Dict[str, List[str]], expression_categories: set) -> TagSlot:
+        """解析单个分类标记，无效标记返回 None"""
+        # 检查是否是有效的分类名称
+        if category_name not in category_mapping:
+            print(f"Warning: Category '{category_name}' not found in mapping")
+            similar_keys = [k for k in category_mapping.keys() if category_name in k]
+            if similar_keys:
+                print(f"  Similar keys: {similar_keys[:5]}")
+            return None
+        
+        # 从分类对应的文件中获取文件路径
+        file_paths = category_mapping[category_name]
+        if not file_paths:
+            print(f"Warning: No files found for category '{category_name}'")
+            return None
+        
+        # expression相关标签
+        if category_name == "all expression" or category_name in expression_categories:
+            if len(file_paths) == 1:
+                return TagSlot(TagSlot.EXPRESSION, tag, category_name, options=FileLoader.load_data_file(file_paths[0]))
+            structured_options = cls._build_structured_options(file_paths, PromptConfig.DIRECTORY_MAPPING["expression"])
+            return TagSlot(TagSlot.EXPRESSION, tag, category_name, structured_options=structured_options)
+        
+        # "all xxx" 选项
+        if category_name.startswith("all "):
+            base_category = category_name[4:]  # 移除 "all " 前缀
+            structured_options = cls._build_structured_options(file_paths, base_category)
+            
+            if base_category in [PromptConfig.DIRECTORY_MAPPING["scene"], 
+                                PromptConfig.DIRECTORY_MAPPING["facial_action"], 
+                                PromptConfig.DIRECTORY_MAPPING["camera"],
+                                PromptConfig.DIRECTORY_MAPPING["audio"]]:
+                kind = TagSlot.ALL_MULTIPLE
+            else:
+                kind = TagSlot.ALL_SINGLE
+            return TagSlot(kind, tag, category_name, base_category=base_category, structured_options=structured_options)
+        
+        # 具体分类：预先清理每个文件中的内容（去除子分类前缀）
+        file_options = []
+        for file_path in file_paths:
+            options = FileLoader.load_data_file(file_path)
+            cleaned_options = [DataCleaner.clean_prompt_string(DataCleaner.remove_category_prefix(option)) for option in options]
+            file_options.append((file_path, cleaned_options))
+        return TagSlot(TagSlot.SPECIFIC, tag, category_name, file_options=file_options)
+    
+    @staticmethod
+    def _build_structured_options(file_paths: List[str], category_name: str) -> List[Dict]:
+        """构建与 PromptComponentGenerator 相同格式的结构化选项"""
+        structured_options = []
+        for file_path in file_paths:
+            options = FileLoader.load_data_file(file_path)
+            if options:
+                # 模拟结构化选项的格式
+                structured_option = {
+                    'file': os.path.basename(file_path),
+                    'category': category_name,
+                    'should_add_prefix': True,
+                    'options': options
+                }
+                structured_options.append(structured_option)
+        return structured_options
+    
+    @staticmethod
+    def _get_expression_category_names(data_cache: Dict[str, Any]) -> set:
+        """获取所有 expression 分类名称"""
+        expression_prefix = PromptConfig.DIRECTORY_MAPPING["expression"] + os.path.sep
+        expression_categories = data_cache['EXPRESSION_CATEGORIES']
+        
+        # 从映射表中获取所有以 "expression" 开头的键
+        return {
+            key for key in data_cache['CATEGORY_MAPPING'].keys()
+            if key.startswith(expression_prefix) or (key in expression_categories and key != "select" and key != "all expression")
+        }
+
 #---------------------------------------------------------------------------------------------------------------------#
 # 节点类
 #---------------------------------------------------------------------------------------------------------------------#
@@ -731,15 +946,27 @@ class RandomPrompter_JK:
                 "default": True,
                 "tooltip": "Remove emphasis symbols and weight markers from custom_subject (e.g., (word:1.5) -> word, [A:B:0.5] -> A-B)"
             }),
+            "batch_count": ("INT", {
+                "default": 1,
+                "min": 1,
+                "max": 10000,
+                "step": 1,
+                "tooltip": "Number of prompts to generate. Prompt i uses seed + i, so each item matches a single run with that seed."
+            }),
+            "unique_combinations": ("BOOLEAN", {
+                "default": False,
+                "tooltip": "Sample the batch without replacement so no two prompts share the same combination of random picks. Every combination is equally likely: the empty result and the custom value each count as one more option instead of using the configured empty/custom probabilities. Different combinations can still join to the same text in rare cases. If batch_count exceeds the number of unique combinations, only that many prompts are generated and a warning reports the shortfall."
+            }),
         }
         
         return {"required": required_inputs}
     
     RETURN_TYPES = ("STRING",)
     RETURN_NAMES = ("prompt",)
+    OUTPUT_IS_LIST = (True,)
     FUNCTION = "execute"
     CATEGORY = icons.get("JK/Prompt")
-    DESCRIPTION = "Random prompt generator with categorized options for scene, motion, facial actions, expressions, lighting, camera, style, and description. Supports manual selection, random generation, and image reference integration for comprehensive prompt creation."
+    DESCRIPTION = "Random prompt generator with categorized options for scene, motion, facial actions, expressions, lighting, camera, style, and description. Supports manual selection, random generation, and image reference integration for comprehensive prompt creation. Set batch_count to output a list of prompts with consecutive seeds."
     
     @classmethod
     # def IS_CHANGED(cls, **kwargs):
@@ -747,12 +974,19 @@ class RandomPrompter_JK:
     
     def execute(self, **kwargs):
         seed = kwargs.get('seed', 0)
+        batch_count = kwargs.get('batch_count', 1)
         remove_prompt_emphasis = kwargs.get('remove_prompt_emphasis', True)
+        
+        # 每条提示词的种子由基础种子派生，第一条与单次生成一致；唯一组合模式按种子置换组合索引
         prompt_generator = PromptGenerator(seed)
-        prompt = prompt_generator.generate_prompt(**kwargs)
+        if kwargs.get('unique_combinations', False):
+            prompts = prompt_generator.generate_unique_batch(seed, batch_count, **kwargs)
+        else:
+            seeds = [(seed + i) & 0xffffffffffffffff for i in range(batch_count)]
+            prompts = prompt_generator.generate_batch(seeds, **kwargs)
         if remove_prompt_emphasis:
-            prompt = PromptUtils.remove_prompt_emphasis(prompt)
-        return (prompt,)
+            prompts = [PromptUtils.remove_prompt_emphasis(prompt) for prompt in prompts]
+        return (prompts,)
 
 class RandomPrompterGeek_JK:
     """ComfyUI Geek 版本节点类 - 分类级别随机提示词生成器"""
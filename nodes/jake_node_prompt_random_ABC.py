@@ -2,8 +2,11 @@ import random
 import json
 import os
 import re
-from typing import List, Dict, Any, Tuple
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, NamedTuple, Tuple
 from abc import ABC, abstractmethod
+from .jake_node_prompt_shared import PromptConfig, DataCleaner, FileLoader, get_data_cache, PromptUtils, ExpressionUtils
 from ..categories import icons
 
 #---------------------------------------------------------------------------------------------------------------------#
@@ -33,6 +36,16 @@ class PromptGenerationStrategy(ABC):
         """判断是否应该使用自定义值"""
         return (custom_value and custom_value.strip() and 
                 rng.random() < self.config.get("custom_field_prob", PromptConfig.CUSTOM_FIELD_PROB))
+    
+    def _get_file_options(self, context: Dict[str, Any]) -> List[Tuple[str, List[str]]]:
+        """
+        返回 (文件路径, 选项列表)，优先使用执行计划中预先解析的结果
+        context 中 options_prepared 为 True 时，选项已去除前缀并清理
+        """
+        file_options = context.get('file_options')
+        if file_options is None:
+            file_options = [(file_path, FileLoader.load_data_file(file_path)) for file_path in context.get('file_paths', [])]
+        return file_options
 
 class SingleFileRandomStrategy(PromptGenerationStrategy):
     """单文件随机策略 - 用于 motion, lighting, style 等"""
@@ -55,14 +68,15 @@ class SingleFileRandomStrategy(PromptGenerationStrategy):
             return ""
         
         # 随机选择一个文件
-        selected_file = rng.choice(file_paths)
-        options = FileLoader.load_data_file(selected_file)
+        selected_file, options = rng.choice(self._get_file_options(context))
         
         if not options:
             return ""
         
         # 从选中的文件中随机选择一条
         choice = rng.choice(options)
+        if context.get('options_prepared'):
+            return choice
         clean_choice = DataCleaner.remove_category_prefix(choice)
         
         return DataCleaner.clean_prompt_string(clean_choice)
@@ -92,17 +106,16 @@ class MultipleFilesRandomStrategy(PromptGenerationStrategy):
         
         parts = []
         structured_select_prob = self.config.get("structured_select_prob", PromptConfig.STRUCTURED_SELECT_PROB)
+        options_prepared = context.get('options_prepared', False)
         
         # 所有文件几率选择，选择上的文件随机挑选一条，并按顺序组合
-        for file_path in file_paths:
-            options = FileLoader.load_data_file(file_path)
+        for file_path, options in self._get_file_options(context):
             if options and rng.random() < structured_select_prob:
                 choice = rng.choice(options)
-                clean_choice = DataCleaner.remove_category_prefix(choice)
-                parts.append(clean_choice)
+                parts.append(choice if options_prepared else DataCleaner.remove_category_prefix(choice))
         
         # 清理每个部分，避免多余的分隔符
-        cleaned_parts = [DataCleaner.clean_prompt_string(part) for part in parts]
+        cleaned_parts = parts if options_prepared else [DataCleaner.clean_prompt_string(part) for part in parts]
         
         return PromptUtils.smart_join(cleaned_parts)
     
@@ -141,8 +154,7 @@ class ExpressionCombinationStrategy(PromptGenerationStrategy):
         
         # 构建结构化选项格式（模拟 PromptComponentGenerator 的输入）
         structured_options = []
-        for file_path in file_paths:
-            options = FileLoader.load_data_file(file_path)
+        for file_path, options in self._get_file_options(context):
             if options:
                 structured_option = {
                     'file': os.path.basename(file_path),
@@ -297,7 +309,7 @@ class TagReplacementStrategy(PromptGenerationStrategy):
         else:
             # 直接使用策略，避免创建新的上下文
             strategy_type = PromptStrategyFactory.get_strategy_for_category(base_category)
-            strategy = PromptStrategyFactory.create_strategy(strategy_type)
+            strategy = PromptStrategyFactory.get_shared_strategy(strategy_type)
             
             context_data = {
                 'rng': rng,
@@ -331,8 +343,8 @@ class TagReplacementStrategy(PromptGenerationStrategy):
     def _generate_all_expression(self, file_paths: List[str], rng: random.Random, 
                                data_cache: Dict[str, Any]) -> str:
         """特殊处理 all expression：包含 exp_str 前缀"""
-        # 创建表达式组合策略
-        expression_strategy = ExpressionCombinationStrategy()
+        # 表达式组合策略
+        expression_strategy = PromptStrategyFactory.get_shared_strategy("expression_combination")
         
         context_data = {
             'rng': rng,
@@ -371,6 +383,9 @@ class PromptStrategyFactory:
         "vision": "single_file_random",  # style 子分类
     }
     
+    # 默认配置的共享策略实例（策略本身无状态，可跨生成复用）
+    _shared_strategies: Dict[str, PromptGenerationStrategy] = {}
+    
     @staticmethod
     def create_strategy(strategy_type: str, config: Dict[str, Any] = None) -> PromptGenerationStrategy:
         """根据类型创建策略实例"""
@@ -380,6 +395,15 @@ class PromptStrategyFactory:
         
         return strategy_class(config) if config else strategy_class()
     
+    @staticmethod
+    def get_shared_strategy(strategy_type: str) -> PromptGenerationStrategy:
+        """返回默认配置的共享策略实例，避免每个标记都创建新对象"""
+        strategy = PromptStrategyFactory._shared_strategies.get(strategy_type)
+        if strategy is None:
+            strategy = PromptStrategyFactory.create_strategy(strategy_type)
+            PromptStrategyFactory._shared_strategies[strategy_type] = strategy
+        return strategy
+    
     @staticmethod
     def get_strategy_for_category(category_name: str, is_all_option: bool = False) -> str:
         """根据分类名称和选项类型返回推荐的策略类型"""
@@ -402,7 +426,12 @@ class PromptGenerationContext:
         self.strategies: Dict[str, PromptGenerationStrategy] = {}
         
         # 配置参数
-        self.config = {
+        self.config = PromptGenerationContext.default_config()
+    
+    @staticmethod
+    def default_config() -> Dict[str, Any]:
+        """默认的策略配置参数"""
+        return {
             "random_empty_prob": PromptConfig.RANDOM_EMPTY_PROB,
             "custom_field_prob": PromptConfig.CUSTOM_FIELD_PROB,
             "structured_select_prob": PromptConfig.STRUCTURED_SELECT_PROB,
@@ -422,8 +451,10 @@ class PromptGenerationContext:
     
     def generate_with_strategy(self, strategy_type: str, context_data: Dict[str, Any]) -> str:
         """使用指定策略生成内容"""
-        strategy = self.get_strategy(strategy_type)
-        
+        return self.run_strategy(self.get_strategy(strategy_type), context_data)
+    
+    def run_strategy(self, strategy: PromptGenerationStrategy, context_data: Dict[str, Any]) -> str:
+        """使用给定的策略实例生成内容（执行计划中的策略已预先创建）"""
         # 注入公共上下文
         context_data.update({
             "rng": self.rng,
@@ -460,6 +491,129 @@ class PromptGenerationContext:
         
         return self.generate_with_strategy(strategy_type, context_data)
 
+#---------------------------------------------------------------------------------------------------------------------#
+# 执行计划
+#---------------------------------------------------------------------------------------------------------------------#
+class CategoryStep(NamedTuple):
+    """执行计划中的单个分类：选项、策略实例与预先解析的文件内容"""
+    category_name: str
+    choice: str
+    custom_value: str
+    strategy: PromptGenerationStrategy
+    file_paths: Tuple[str, ...]
+    file_options: Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+class PromptPlan(NamedTuple):
+    """不可变的提示词执行计划，生成时只需随机选择"""
+    prompt_priority: str
+    subject: str
+    category_steps: Tuple[CategoryStep, ...]
+    expression_choice: str
+    custom_expression: str
+    exp_str: str
+    description_choice: str
+    custom_description: str
+
+class PromptPlanCache:
+    """
+    执行计划缓存
+    以节点配置（不含种子）为键缓存 PromptPlan，数据热重载后自动失效。
+    """
+    
+    # 缓存的执行计划数量上限
+    CACHE_SIZE = 32
+    
+    # 不影响执行计划的配置项
+    IGNORED_KEYS = ("seed", "auto_fill", "remove_prompt_emphasis")
+    
+    # 处理各个分类 - 使用策略模式
+    CATEGORIES_CONFIG = [
+        ("scene", "custom_scene", "multiple_files_random"),
+        ("motion", "custom_motion", "single_file_random"),
+        ("facial_action", "custom_facial_action", "multiple_files_random"),
+        ("audio", "custom_audio", "multiple_files_random"),
+        ("lighting", "custom_lighting", "single_file_random"),
+        ("camera", "custom_camera", "multiple_files_random"),
+        ("style", "custom_style", "single_file_random"),
+    ]
+    
+    _cache: "OrderedDict[frozenset, PromptPlan]" = OrderedDict()
+    _cache_data = None
+    _cache_lock = threading.Lock()
+    
+    @classmethod
+    def get(cls, config: Dict[str, Any], data_cache: Dict[str, Any]) -> PromptPlan:
+        """返回配置对应的执行计划，未命中时构建"""
+        plan_config = dict(config)
+        for ignored_key in cls.IGNORED_KEYS:
+            plan_config.pop(ignored_key, None)
+        key = frozenset(plan_config.items())
+        with cls._cache_lock:
+            if cls._cache_data is not data_cache:
+                cls._cache.clear()
+                cls._cache_data = data_cache
+            plan = cls._cache.get(key)
+            if plan is not None:
+                cls._cache.move_to_end(key)
+                return plan
+        
+        plan = cls.build(config, data_cache)
+        with cls._cache_lock:
+            if cls._cache_data is data_cache:
+                cls._cache[key] = plan
+                while len(cls._cache) > cls.CACHE_SIZE:
+                    cls._cache.popitem(last=False)
+        return plan
+    
+    @classmethod
+    def build(cls, config: Dict[str, Any], data_cache: Dict[str, Any]) -> PromptPlan:
+        """解析配置：清理主题、创建策略实例并加载各分类的文件内容"""
+        # custom_subject - 总是使用
+        custom_subject = config.get("custom_subject", "")
+        cleaned_subject = DataCleaner.clean_prompt_string(custom_subject) if custom_subject else ""
+        
+        strategy_config = PromptGenerationContext.default_config()
+        category_steps = []
+        for category_name, custom_field, strategy_type in cls.CATEGORIES_CONFIG:
+            choice = config.get(category_name, "disable")
+            # disable 不消耗随机数，直接跳过
+            if choice.lower() == "disable":
+                continue
+            
+            # 直接从数据缓存的结构化选项中获取文件路径
+            file_paths = []
+            structured_options_key = f"{category_name.upper()}_STRUCTURED_OPTIONS"
+            for category_data in data_cache.get(structured_options_key, []):
+                file_relative_path = category_data.get('file_relative_path', '')
+                if file_relative_path:
+                    file_paths.append(file_relative_path)
+            # 单文件/多文件策略对选中的内容都是去除前缀后清理，可以预先完成
+            file_options = tuple(
+                (file_path, tuple(DataCleaner.clean_prompt_string(DataCleaner.remove_category_prefix(option))
+                                  for option in FileLoader.load_data_file(file_path)))
+                for file_path in file_paths
+            )
+            
+            category_steps.append(CategoryStep(
+                category_name=category_name,
+                choice=choice,
+                custom_value=config.get(custom_field, ""),
+                strategy=PromptStrategyFactory.create_strategy(strategy_type, strategy_config),
+                file_paths=tuple(file_paths),
+                file_options=file_options,
+            ))
+        
+        return PromptPlan(
+            prompt_priority=config.get("prompt_priority", "subject + scene"),
+            subject=cleaned_subject,
+            category_steps=tuple(category_steps),
+            expression_choice=config.get("expression", "disable"),
+            custom_expression=config.get("custom_expression", ""),
+            exp_str=config.get("exp_str", "quite"),
+            description_choice=config.get("description", "disable"),
+            custom_description=config.get("custom_description", ""),
+        )
+
 #---------------------------------------------------------------------------------------------------------------------#
 # 生成器类
 #---------------------------------------------------------------------------------------------------------------------#
@@ -622,33 +776,8 @@ class PromptComponentGenerator:
         if not self.data_cache['DESCRIPTION_STRUCTURED_OPTIONS']:
             return ""
         
-        # 按子类别分组
-        description_parts = {
-            'sensory': [],
-            'detail': [], 
-            'quality': [],
-            'composition': [],
-            'color': [],
-            'creativity': []
-        }
-        
-        # 将选项按子类别分组
-        for category in self.data_cache['DESCRIPTION_STRUCTURED_OPTIONS']:
-            category_name = category['category']
-            if category_name in description_parts:
-                for option in category['options']:
-                    # 如果该类别不需要添加前缀，那么option已经是原始值
-                    if category.get('should_add_prefix', True):
-                        clean_value = DataCleaner.remove_category_prefix(option)
-                    else:
-                        clean_value = option
-                    description_parts[category_name].append(clean_value)
-        
-        # 从每个子类别中随机选择一条
-        selected_parts = {}
-        for category, options in description_parts.items():
-            if options:
-                selected_parts[category] = self.rng.choice(options)
+        # 从每个子类别中随机选择一条（分组在数据加载时完成）
+        selected_parts = {category: self.rng.choice(options) for category, options in self.data_cache['DESCRIPTION_BUCKETS'].items()}
         
         # 按规定的格式组合
         sensory = selected_parts.get('sensory', 'masterpiece')
@@ -671,9 +800,9 @@ class PromptGenerator:
         # 保留原有的组件生成器用于兼容性
         self.component_generator = PromptComponentGenerator(self.rng)
     
-    def _process_category_with_strategy(self, choice: str, custom_value: str, category_name: str, 
-                                      file_paths: List[str], strategy_type: str) -> str:
-        """使用策略处理分类选项 - 修复版本"""
+    def _process_category_with_strategy(self, step: CategoryStep) -> str:
+        """使用执行计划中的策略处理分类选项"""
+        choice, custom_value, category_name = step.choice, step.custom_value, step.category_name
         if choice.lower() == "disable":
             return ""
         elif choice.lower() == "enable":
@@ -682,13 +811,15 @@ class PromptGenerator:
                 if cleaned_value:
                     return cleaned_value
         elif choice.lower() == "random":
-            # 修复：使用传入的 file_paths（来自 category_mapping）
-            if file_paths:
-                return self.context_manager.generate_with_strategy(
-                    strategy_type, 
+            # 使用计划中的 file_paths（来自结构化选项）与预先加载的文件内容
+            if step.file_paths:
+                return self.context_manager.run_strategy(
+                    step.strategy, 
                     {
                         "category_name": category_name,
-                        "file_paths": file_paths,
+                        "file_paths": step.file_paths,
+                        "file_options": step.file_options,
+                        "options_prepared": True,
                         "custom_value": custom_value,
                     }
                 )
@@ -796,67 +927,31 @@ class PromptGenerator:
         return arranged_components
     
     def generate_prompt(self, **kwargs) -> str:
-        """生成提示词 - 使用策略模式重构"""
-        prompt_priority = kwargs.get("prompt_priority", "subject + scene")
-        
+        """生成提示词 - 使用缓存的执行计划"""
+        return self.generate_from_plan(PromptPlanCache.get(kwargs, self.data_cache))
+    
+    def generate_from_plan(self, plan: PromptPlan) -> str:
+        """按执行计划生成提示词"""
         # 收集所有组件
         components_dict = {}
+        if plan.subject:
+            components_dict["subject"] = plan.subject
         
-        # custom_subject - 总是使用
-        custom_subject = kwargs.get("custom_subject", "")
-        if custom_subject:
-            cleaned_value = DataCleaner.clean_prompt_string(custom_subject)
-            if cleaned_value:
-                components_dict["subject"] = cleaned_value
-        
-        # 处理各个分类 - 使用策略模式
-        categories_config = [
-            ("scene", "custom_scene", "multiple_files_random"),
-            ("motion", "custom_motion", "single_file_random"),
-            ("facial_action", "custom_facial_action", "multiple_files_random"),
-            ("audio", "custom_audio", "multiple_files_random"),
-            ("lighting", "custom_lighting", "single_file_random"),
-            ("camera", "custom_camera", "multiple_files_random"),
-            ("style", "custom_style", "single_file_random"),
-        ]
-        
-        for category_name, custom_field, strategy_type in categories_config:
-            choice = kwargs.get(category_name, "disable")
-            custom_value = kwargs.get(custom_field, "")
-            
-            # 修复：直接从数据缓存的结构化选项中获取文件路径
-            data_cache = get_data_cache()
-            structured_options_key = f"{category_name.upper()}_STRUCTURED_OPTIONS"
-            
-            file_paths = []
-            if structured_options_key in data_cache:
-                structured_options = data_cache[structured_options_key]
-                # 直接使用存储的完整相对路径
-                for category_data in structured_options:
-                    file_relative_path = category_data.get('file_relative_path', '')
-                    if file_relative_path:
-                        file_paths.append(file_relative_path)
-            
-            result = self._process_category_with_strategy(
-                choice, custom_value, category_name, file_paths, strategy_type
-            )
+        for step in plan.category_steps:
+            result = self._process_category_with_strategy(step)
             if result:
-                components_dict[category_name] = result
+                components_dict[step.category_name] = result
         
         # 特殊处理 expression（使用 ExpressionUtils）
-        expression_choice = kwargs.get("expression", "disable")
-        custom_expression_value = kwargs.get("custom_expression", "")
-        exp_str_value = kwargs.get("exp_str", "quite")
-        
         expression_result = self._get_expression_combination(
-            exp_str_value, expression_choice, custom_expression_value
+            plan.exp_str, plan.expression_choice, plan.custom_expression
         )
         if expression_result:
             components_dict["expression"] = expression_result
         
         # 特殊处理 description（保持原有逻辑）
-        description_choice = kwargs.get("description", "disable")
-        custom_description_value = kwargs.get("custom_description", "")
+        description_choice = plan.description_choice
+        custom_description_value = plan.custom_description
         
         if description_choice.lower() == "disable":
             pass
@@ -880,7 +975,7 @@ class PromptGenerator:
                     components_dict["description"] = clean_value
         
         # 根据优先级设置组合组件
-        components = self._arrange_components_by_priority(components_dict, prompt_priority)
+        components = self._arrange_components_by_priority(components_dict, plan.prompt_priority)
         full_prompt_string = PromptUtils.smart_join(components, separator=", ")
         
         return full_prompt_string
@@ -918,7 +1013,7 @@ class PromptGeneratorGeek:
             return ""
         
         # 创建标记替换策略
-        tag_replacement_strategy = PromptStrategyFactory.create_strategy("tag_replacement")
+        tag_replacement_strategy = PromptStrategyFactory.get_shared_strategy("tag_replacement")
         
         # 准备上下文数据
         context_data = {
@@ -964,7 +1059,7 @@ class UnifiedPromptGenerator:
     
     def replace_category_tags(self, prompt_template: str) -> str:
         """替换模板中的分类标记"""
-        tag_replacement_strategy = PromptStrategyFactory.create_strategy("tag_replacement")
+        tag_replacement_strategy = PromptStrategyFactory.get_shared_strategy("tag_replacement")
         
         context_data = {
             'prompt_template': prompt_template,
@@ -1,7 +1,11 @@
 import random
 import json
 import os
+import hashlib
 import re
+import time
+import pickle
+import threading
 import configparser
 from functools import lru_cache
 from typing import List, Dict, Any, Tuple
@@ -133,6 +137,9 @@ class PromptConfig:
         DIRECTORY_MAPPING["style_form"]
     ]
     
+    # description 的子类别，按此顺序各随机选择一条
+    DESCRIPTION_SUBCATEGORIES = ['sensory', 'detail', 'quality', 'composition', 'color', 'creativity']
+    
     # 支持的文件格式
     SUPPORTED_FORMATS = {
         '.txt': 'Text', 
@@ -148,6 +155,9 @@ class PromptConfig:
     
     # Sys Prompter的预设文件名
     PRESET_FILE = "sys_prompt_preset.json"
+    
+    # prompt_data 修改检测的最小间隔（秒）
+    RELOAD_CHECK_INTERVAL = 2.0
 
 class DependencyManager:
     """依赖管理类"""
@@ -205,6 +215,40 @@ class DataCleaner:
         # 去重但保持顺序
         return list(dict.fromkeys(cleaned))
     
+    # 标点与空格组成的片段（空白已标准化为单个空格），清理规则只作用于这些片段内部
+    WHITESPACE_PATTERN = re.compile(r'\s+')
+    PUNCTUATION_CLUSTER_PATTERN = re.compile(r' ?[,.，。;；?？!！](?: ?[,.，。;；?？!！])* ?')
+    
+    # 连续标点合并规则：(模式, 标点类型)，按顺序执行
+    DUPLICATE_PUNCTUATION_PATTERNS = [
+        (re.compile(r'[,，]\s*[。，；？！.,;?!]'), 'comma'),
+        (re.compile(r'[.。]\s*[。，；？！.,;?!]'), 'period'),
+        (re.compile(r'[;；]\s*[。，；？！.,;?!]'), 'semicolon'),
+        (re.compile(r'[?？]\s*[。，；？！.,;?!]'), 'question_mark'),
+        (re.compile(r'[!！]\s*[。，；？！.,;?!]'), 'exclamation_mark'),
+    ]
+    
+    # 标点周围空格的标准化规则
+    CHINESE_SPACING_PATTERNS = [
+        (re.compile(r'\s*，\s*'), 'comma'),
+        (re.compile(r'\s*。\s*'), 'period'),
+        (re.compile(r'\s*；\s*'), 'semicolon'),
+        (re.compile(r'\s*？\s*'), 'question_mark'),
+        (re.compile(r'\s*！\s*'), 'exclamation_mark'),
+    ]
+    ENGLISH_SPACING_PATTERNS = [
+        (re.compile(r'\s*,\s*'), 'comma'),
+        (re.compile(r'\s*\.\s*'), 'period'),
+        (re.compile(r'\s*;\s*'), 'semicolon'),
+        (re.compile(r'\s*\?\s*'), 'question_mark'),
+        (re.compile(r'\s*!\s*'), 'exclamation_mark'),
+    ]
+    
+    PUNCTUATION_REPLACEMENTS = {
+        'chinese': {'comma': "，", 'period': "。", 'semicolon': "；", 'question_mark': "？", 'exclamation_mark': "！"},
+        'english': {'comma': ", ", 'period': ". ", 'semicolon': "; ", 'question_mark': "? ", 'exclamation_mark': "! "},
+    }
+    
     @staticmethod
     def clean_prompt_string(text: str, language: str = "english") -> str:
         """清理提示词字符串，根据语言处理标点"""
@@ -213,59 +257,51 @@ class DataCleaner:
         
         # 判断是否使用中文标点规则
         use_chinese = language in ["chinese", "japanese", "korean"]
-        comma = "，" if use_chinese else ", "
-        period = "。" if use_chinese else ". "
-        semicolon = "；" if use_chinese else "; "
-        question_mark = "？" if use_chinese else "? "
-        exclamation_mark = "！" if use_chinese else "! "
         
         # 标准化空白
-        text = re.sub(r'\s+', ' ', text)
+        text = DataCleaner.WHITESPACE_PATTERN.sub(' ', text)
+        
+        # 合并连续标点并标准化标点周围空格（每个标点片段独立处理，结果缓存）
+        text = DataCleaner.PUNCTUATION_CLUSTER_PATTERN.sub(
+            lambda match: DataCleaner._clean_punctuation_cluster(match.group(0), use_chinese), text
+        )
+        
+        # 扩展边界清理，包含所有标点
+        all_punctuation = ',.，。;；?？!！'
+        text = text.strip(all_punctuation + ' ')
+        
+        return text.strip()
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _clean_punctuation_cluster(cluster: str, use_chinese: bool) -> str:
+        """清理单个标点片段：循环合并连续标点（最多5次），再标准化标点周围空格"""
+        replacements = DataCleaner.PUNCTUATION_REPLACEMENTS['chinese' if use_chinese else 'english']
         
         # 使用循环处理连续标点，直到没有变化为止
         max_iterations = 5
         for i in range(max_iterations):
-            old_text = text
-            
-            # 一次性处理所有标点类型
-            patterns = [
-                (r'[,，]\s*[。，；？！.,;?!]', comma),
-                (r'[.。]\s*[。，；？！.,;?!]', period),
-                (r'[;；]\s*[。，；？！.,;?!]', semicolon),
-                (r'[?？]\s*[。，；？！.,;?!]', question_mark),
-                (r'[!！]\s*[。，；？！.,;?!]', exclamation_mark)
-            ]
-            
-            for pattern, replacement in patterns:
-                text = re.sub(pattern, replacement, text)
+            old_cluster = cluster
+            for pattern, punctuation in DataCleaner.DUPLICATE_PUNCTUATION_PATTERNS:
+                cluster = pattern.sub(replacements[punctuation], cluster)
             
             # 如果没有变化，提前退出
-            if text == old_text:
+            if cluster == old_cluster:
                 break
         
         # 标准化标点周围空格
         if use_chinese:
             # 中文：移除标点周围的所有空格
-            text = re.sub(r'\s*，\s*', comma, text)
-            text = re.sub(r'\s*。\s*', period, text)
-            text = re.sub(r'\s*；\s*', semicolon, text)
-            text = re.sub(r'\s*？\s*', question_mark, text)
-            text = re.sub(r'\s*！\s*', exclamation_mark, text)
+            for pattern, punctuation in DataCleaner.CHINESE_SPACING_PATTERNS:
+                cluster = pattern.sub(replacements[punctuation], cluster)
         else:
             # 英文：确保标点后有空格
-            text = re.sub(r'\s*,\s*', comma, text)
-            text = re.sub(r'\s*\.\s*', period, text)
-            text = re.sub(r'\s*;\s*', semicolon, text)
-            text = re.sub(r'\s*\?\s*', question_mark, text)
-            text = re.sub(r'\s*!\s*', exclamation_mark, text)
+            for pattern, punctuation in DataCleaner.ENGLISH_SPACING_PATTERNS:
+                cluster = pattern.sub(replacements[punctuation], cluster)
             # 确保单词间只有一个空格
-            text = re.sub(r' +', ' ', text)
-        
-        # 扩展边界清理，包含所有标点
-        all_punctuation = ',.，。;；?？!！'
-        text = text.strip(all_punctuation + ' ')
+            cluster = re.sub(r' +', ' ', cluster)
         
-        return text.strip()
+        return cluster
     
     @staticmethod
     def remove_category_prefix(value: str) -> str:
@@ -289,9 +325,18 @@ class FileLoader:
     """文件加载器"""
     
     @staticmethod
-    @lru_cache(maxsize=128)
     def load_data_file(file_path: str) -> List[str]:
-        """统一的数据文件加载器，支持多种格式（带缓存）"""
+        """统一的数据文件加载器，支持多种格式（优先使用快照中的解析结果）"""
+        # 重建期间，构建线程读取新的解析结果，其他线程仍读取当前数据
+        files = getattr(DataSnapshot.BUILDING, 'files', None)
+        snapshot_options = (files if files is not None else DataSnapshot.FILES).get(file_path)
+        if snapshot_options is not None:
+            return snapshot_options
+        return FileLoader.parse_data_file(file_path)
+    
+    @staticmethod
+    def parse_data_file(file_path: str) -> List[str]:
+        """从磁盘解析数据文件（不使用缓存）"""
         full_path = os.path.join(os.path.dirname(__file__), PromptConfig.PROMPT_DATA_DIR, file_path)
         
         # 添加调试信息
@@ -676,6 +721,25 @@ class DataManager:
         
         return options
 
+    @staticmethod
+    def build_description_buckets(structured_options: List[Dict[str, Any]]) -> Dict[str, Tuple[str, ...]]:
+        """将 description 的结构化选项按子类别分组（已去除前缀），只保留非空的子类别"""
+        description_parts = {category: [] for category in PromptConfig.DESCRIPTION_SUBCATEGORIES}
+        
+        # 将选项按子类别分组
+        for category in structured_options:
+            category_name = category['category']
+            if category_name in description_parts:
+                for option in category['options']:
+                    # 如果该类别不需要添加前缀，那么option已经是原始值
+                    if category.get('should_add_prefix', True):
+                        clean_value = DataCleaner.remove_category_prefix(option)
+                    else:
+                        clean_value = option
+                    description_parts[category_name].append(clean_value)
+        
+        return {category: tuple(options) for category, options in description_parts.items() if options}
+    
     @staticmethod
     def build_category_mapping() -> Dict[str, List[str]]:
         """构建分类名称到文件路径的映射表 - 确保与选项生成逻辑一致"""
@@ -773,10 +837,146 @@ class DataManager:
         
         return mapping
 
-# 预加载分类数据（使用缓存）
-@lru_cache(maxsize=1)
+class DataSnapshot:
+    """
+    prompt_data 编译快照
+    将整个 prompt_data 目录的解析结果序列化为单个 pickle 文件，
+    以文件路径、大小和修改时间组成的清单为键，清单变化时自动重建。
+    运行时轮询清单，只重新解析发生变化的文件。
+    """
+    
+    # 快照格式版本，数据结构变化时递增
+    VERSION = 2
+    
+    SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), "prompt_data_snapshot.pkl")
+    
+    # 快照中的单文件解析结果 {相对路径: 选项列表}，大小随实际文件数量变化
+    FILES: Dict[str, List[str]] = {}
+    
+    # 当前生效的清单
+    MANIFEST: Dict[str, Any] = None
+    
+    # 串行化加载、重建与数据切换
+    LOCK = threading.RLock()
+    
+    # 构建线程正在使用的单文件解析结果 (线程本地，未切换前对其他线程不可见)
+    BUILDING = threading.local()
+    
+    @staticmethod
+    def build_manifest() -> Dict[str, Any]:
+        """构建清单：所有数据文件的路径、大小、修改时间以及影响解析结果的配置"""
+        base_dir = os.path.join(os.path.dirname(__file__), PromptConfig.PROMPT_DATA_DIR)
+        files = []
+        for root, dirs, filenames in os.walk(base_dir):
+            for filename in filenames:
+                entry_path = os.path.join(root, filename)
+                stat = os.stat(entry_path)
+                files.append((os.path.normpath(os.path.relpath(entry_path, base_dir)), stat.st_size, stat.st_mtime_ns))
+        files.sort()
+        
+        return {
+            'version': DataSnapshot.VERSION,
+            'sep': os.path.sep,
+            'prompt_data_dir': PromptConfig.PROMPT_DATA_DIR,
+            'directory_mapping': sorted(PromptConfig.DIRECTORY_MAPPING.items()),
+            'exclusion_mark': PromptConfig.EXCLUSION_MARK,
+            'formats': DependencyManager.get_available_formats()['available'],
+            'files': files,
+        }
+    
+    @staticmethod
+    def build(manifest: Dict[str, Any] = None, reuse_unchanged: bool = False) -> Dict[str, Any]:
+        """
+        编译快照：解析数据文件并生成全部分类数据，写入快照文件
+        reuse_unchanged 为 True 时，大小和修改时间未变的文件沿用当前解析结果
+        """
+        if manifest is None:
+            manifest = DataSnapshot.build_manifest()
+        
+        previous_entries = {}
+        if reuse_unchanged and DataSnapshot.MANIFEST is not None:
+            previous_entries = {entry[0]: entry for entry in DataSnapshot.MANIFEST['files']}
+        
+        files = {}
+        for entry in manifest['files']:
+            file_relative_path = entry[0]
+            if os.path.splitext(file_relative_path)[1].lower() not in PromptConfig.SUPPORTED_FORMATS:
+                continue
+            if previous_entries.get(file_relative_path) == entry and file_relative_path in DataSnapshot.FILES:
+                files[file_relative_path] = DataSnapshot.FILES[file_relative_path]
+            else:
+                files[file_relative_path] = FileLoader.parse_data_file(file_relative_path)
+        
+        DataSnapshot.BUILDING.files = files
+        try:
+            data = build_all_data()
+        finally:
+            DataSnapshot.BUILDING.files = None
+        
+        # 全部生成成功后才切换；失败时清单保持不变，下次轮询会重试
+        DataSnapshot.publish(manifest, files, data)
+        
+        snapshot = {'manifest': manifest, 'files': files, 'data': data}
+        tmp_path = f"{DataSnapshot.SNAPSHOT_PATH}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, DataSnapshot.SNAPSHOT_PATH)
+        except Exception as e:
+            print(f"Warning: Failed to write prompt data snapshot {DataSnapshot.SNAPSHOT_PATH}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        return data
+    
+    @staticmethod
+    def publish(manifest: Dict[str, Any], files: Dict[str, List[str]], data: Dict[str, Any]) -> None:
+        """同时切换单文件解析结果、清单与全局数据缓存，读取方不会看到新旧混合的数据"""
+        global _DATA_CACHE
+        with DataSnapshot.LOCK:
+            DataSnapshot.FILES = files
+            DataSnapshot.MANIFEST = manifest
+            _DATA_CACHE = data
+    
+    @staticmethod
+    def load() -> Dict[str, Any]:
+        """加载快照，清单不一致或快照损坏时自动重建"""
+        manifest = DataSnapshot.build_manifest()
+        
+        if os.path.exists(DataSnapshot.SNAPSHOT_PATH):
+            try:
+                with open(DataSnapshot.SNAPSHOT_PATH, "rb") as f:
+                    snapshot = pickle.load(f)
+                if snapshot.get('manifest') == manifest:
+                    DataSnapshot.publish(manifest, snapshot['files'], snapshot['data'])
+                    return snapshot['data']
+            except Exception as e:
+                print(f"Warning: Prompt data snapshot unreadable, rebuilding: {e}")
+        
+        return DataSnapshot.build(manifest)
+    
+    @staticmethod
+    def reload_if_changed() -> Dict[str, Any]:
+        """轮询文件修改时间，有变化时增量重建并返回新数据，否则返回 None"""
+        manifest = DataSnapshot.build_manifest()
+        if manifest == DataSnapshot.MANIFEST:
+            return None
+        
+        with DataSnapshot.LOCK:
+            if manifest == DataSnapshot.MANIFEST:
+                return None
+            previous_files = set(DataSnapshot.MANIFEST['files']) if DataSnapshot.MANIFEST else set()
+            changed_files = {entry[0] for entry in previous_files.symmetric_difference(manifest['files'])}
+            data = DataSnapshot.build(manifest, reuse_unchanged=True)
+            print(f"🔶 Prompt data reloaded ({len(changed_files)} files changed)")
+            return data
+
 def load_all_data():
-    """预加载所有数据"""
+    """预加载所有数据（从编译快照读取）"""
+    return DataSnapshot.load()
+
+def build_all_data():
+    """遍历 prompt_data 目录生成所有数据"""
     
     data = {
         # RandomPrompter_JK的数据
@@ -815,16 +1015,31 @@ def load_all_data():
         'CATEGORY_MAPPING': DataManager.build_category_mapping()
     }
     
+    # 预先分组的 description 选项，生成时只需按子类别随机选择
+    data['DESCRIPTION_BUCKETS'] = DataManager.build_description_buckets(data['DESCRIPTION_STRUCTURED_OPTIONS'])
+    
     return data
 
 # 全局数据缓存
 _DATA_CACHE = None
+_LAST_RELOAD_CHECK = 0.0
 
 def get_data_cache():
-    """获取数据缓存"""
-    global _DATA_CACHE
+    """获取数据缓存，按 RELOAD_CHECK_INTERVAL 轮询 prompt_data 的修改并热重载"""
+    global _DATA_CACHE, _LAST_RELOAD_CHECK
+    now = time.monotonic()
     if _DATA_CACHE is None:
-        _DATA_CACHE = load_all_data()
+        with DataSnapshot.LOCK:
+            if _DATA_CACHE is None:
+                _DATA_CACHE = load_all_data()
+                _LAST_RELOAD_CHECK = now
+    elif now - _LAST_RELOAD_CHECK >= PromptConfig.RELOAD_CHECK_INTERVAL:
+        _LAST_RELOAD_CHECK = now
+        try:
+            # 重建成功时由 DataSnapshot.publish 替换 _DATA_CACHE
+            DataSnapshot.reload_if_changed()
+        except Exception as e:
+            print(f"Warning: Prompt data reload failed, keeping current data: {e}")
     return _DATA_CACHE
 
 #---------------------------------------------------------------------------------------------------------------------#
@@ -927,6 +1142,48 @@ class ExpressionUtils:
         selected = rng.choice(exp_str_options)
         return DataCleaner.clean_prompt_string(selected)
 
+class FeistelPermutation:
+    """
+    [0, size) 上由种子决定的伪随机双射
+    使用平衡 Feistel 网络加 cycle walking，按需计算第 i 个元素，不需要存储排列表，
+    内存与批量大小无关
+    """
+    
+    ROUNDS = 6
+    
+    def __init__(self, size: int, seed: int):
+        if size < 1:
+            raise ValueError(f"Permutation size must be positive, got {size}")
+        self.size = size
+        # 覆盖 [0, size) 的最小偶数位宽，每半边 half_bits 位
+        self.half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self.mask = (1 << self.half_bits) - 1
+        self.round_bytes = (self.half_bits + 7) // 8
+        self.key = hashlib.blake2b(str(seed).encode(), digest_size=16).digest()
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError(f"Permutation index {index} out of range [0, {self.size})")
+        # cycle walking：结果落在 [0, size) 之外时继续加密，域不超过 4 * size，期望步数很小
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+    
+    def _round(self, round_index: int, value: int) -> int:
+        """轮函数：以密钥、轮次和右半边为输入的哈希"""
+        data = self.key + bytes((round_index,)) + value.to_bytes(self.round_bytes, 'little')
+        return int.from_bytes(hashlib.shake_256(data).digest(self.round_bytes), 'little') & self.mask
+    
+    def _encrypt(self, value: int) -> int:
+        left, right = value >> self.half_bits, value & self.mask
+        for round_index in range(self.ROUNDS):
+            left, right = right, left ^ self._round(round_index, right)
+        return (left << self.half_bits) | right
+
 class ShotScriptUtils:
     """工具类，包含ShotScript节点的共用方法"""
     
@@ -1156,3 +1413,8 @@ class ShotScriptUtils:
                 if key_format in data:
                     return True
         return False
+
+if __name__ == "__main__":
+    # 构建步骤: python jake_node_prompt_shared.py
+    DataSnapshot.build()
+    print(f"Prompt data snapshot written to {DataSnapshot.SNAPSHOT_PATH} ({len(DataSnapshot.FILES)} files)")
@@ -5,6 +5,27 @@ import sys
 from typing import Any, Tuple
 from ..categories import icons
 
+#---------------------------------------------------------------------------------------------------------------------#
+# Lazy Switch Base
+#---------------------------------------------------------------------------------------------------------------------#
+
+class LazySwitch:
+    """
+    Base for two-input switch nodes whose branch inputs are declared lazy.
+    Only the input selected by boolean_value is requested, so the unselected
+    upstream branch is never executed.
+    """
+    
+    # (false input name, true input name)
+    SWITCH_INPUTS = ("", "")
+    
+    def check_lazy_status(self, boolean_value, **kwargs):
+        """Request only the branch that the switch will return"""
+        false_input, true_input = self.SWITCH_INPUTS
+        # Unconnected optional inputs are absent; connected but unevaluated lazy inputs are None
+        needed = true_input if boolean_value and true_input in kwargs else false_input
+        return [needed] if kwargs.get(needed) is None else []
+
 #---------------------------------------------------------------------------------------------------------------------#
 # Bool, Int, Float, and String Switch Nodes
 #---------------------------------------------------------------------------------------------------------------------#
@@ -34,7 +55,7 @@ class CR_Boolean_JK:
         numeric_value = 1 if boolean_value else 0
         return (boolean_value, float(numeric_value), numeric_value)
 
-class CR_IntInputSwitch_JK:
+class CR_IntInputSwitch_JK(LazySwitch):
     """Switch between two integer inputs based on boolean condition"""
     
     @classmethod
@@ -46,6 +67,7 @@ class CR_IntInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=int_true, False=int_false)"
                 }),
                 "int_false": ("INT", {
+                    "lazy": True,
                     "default": 0, 
                     "min": -18446744073709551615, 
                     "max": 18446744073709551615, 
@@ -55,6 +77,7 @@ class CR_IntInputSwitch_JK:
             },
             "optional": {
                 "int_true": ("INT", {
+                    "lazy": True,
                     "default": 0, 
                     "min": -18446744073709551615, 
                     "max": 18446744073709551615, 
@@ -67,6 +90,7 @@ class CR_IntInputSwitch_JK:
     RETURN_TYPES = ("INT", "BOOLEAN")
     RETURN_NAMES = ("int_output", "boolean")
     FUNCTION = "InputInt"
+    SWITCH_INPUTS = ("int_false", "int_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two integer inputs based on boolean condition"
 
@@ -77,7 +101,7 @@ class CR_IntInputSwitch_JK:
         else:
             return (int_false, boolean_value)
 
-class CR_FloatInputSwitch_JK:
+class CR_FloatInputSwitch_JK(LazySwitch):
     """Switch between two float inputs based on boolean condition"""
     
     @classmethod
@@ -89,6 +113,7 @@ class CR_FloatInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=float_true, False=float_false)"
                 }),
                 "float_false": ("FLOAT", {
+                    "lazy": True,
                     "default": 0, 
                     "min": -sys.float_info.max, 
                     "max": sys.float_info.max, 
@@ -98,6 +123,7 @@ class CR_FloatInputSwitch_JK:
             },
             "optional": {
                 "float_true": ("FLOAT", {
+                    "lazy": True,
                     "default": 0, 
                     "min": -sys.float_info.max, 
                     "max": sys.float_info.max, 
@@ -110,6 +136,7 @@ class CR_FloatInputSwitch_JK:
     RETURN_TYPES = ("FLOAT", "BOOLEAN")
     RETURN_NAMES = ("float_output", "boolean")
     FUNCTION = "InputFloat"
+    SWITCH_INPUTS = ("float_false", "float_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two float inputs based on boolean condition"
 
@@ -120,7 +147,7 @@ class CR_FloatInputSwitch_JK:
         else:
             return (float_false, boolean_value)
 
-class CR_TextInputSwitch_JK:
+class CR_TextInputSwitch_JK(LazySwitch):
     """Switch between two text inputs based on boolean condition"""
     
     @classmethod
@@ -132,12 +159,14 @@ class CR_TextInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=text_true, False=text_false)"
                 }),
                 "text_false": ("STRING", {
+                    "lazy": True,
                     "default": "",
                     "tooltip": "Text value to return when condition is False"
                 }),
             },
             "optional": {
                 "text_true": ("STRING", {
+                    "lazy": True,
                     "default": "",
                     "tooltip": "Text value to return when condition is True (optional)"
                 }),
@@ -147,6 +176,7 @@ class CR_TextInputSwitch_JK:
     RETURN_TYPES = ("STRING", "BOOLEAN")
     RETURN_NAMES = ("string_output", "boolean")
     FUNCTION = "text_input_switch"
+    SWITCH_INPUTS = ("text_false", "text_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two text inputs based on boolean condition"
 
@@ -161,7 +191,7 @@ class CR_TextInputSwitch_JK:
 # Image and Media Switch Nodes
 #---------------------------------------------------------------------------------------------------------------------#
 
-class CR_ImageInputSwitch_JK:
+class CR_ImageInputSwitch_JK(LazySwitch):
     """Switch between two image inputs based on boolean condition"""
     
     @classmethod
@@ -173,11 +203,13 @@ class CR_ImageInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=image_true, False=image_false)"
                 }),
                 "image_false": ("IMAGE", {
+                    "lazy": True,
                     "tooltip": "Image to return when condition is False"
                 }),
             },
             "optional": {
                 "image_true": ("IMAGE", {
+                    "lazy": True,
                     "tooltip": "Image to return when condition is True (optional)"
                 }),
             },
@@ -186,6 +218,7 @@ class CR_ImageInputSwitch_JK:
     RETURN_TYPES = ("IMAGE", "BOOLEAN")
     RETURN_NAMES = ("image_output", "boolean")
     FUNCTION = "InputImages"
+    SWITCH_INPUTS = ("image_false", "image_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two image inputs based on boolean condition"
 
@@ -196,7 +229,7 @@ class CR_ImageInputSwitch_JK:
         else:
             return (image_false, boolean_value)
 
-class CR_MaskInputSwitch_JK:
+class CR_MaskInputSwitch_JK(LazySwitch):
     """Switch between two mask inputs based on boolean condition"""
     
     @classmethod
@@ -208,11 +241,13 @@ class CR_MaskInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=mask_true, False=mask_false)"
                 }),
                 "mask_false": ("MASK", {
+                    "lazy": True,
                     "tooltip": "Mask to return when condition is False"
                 }),
             },
             "optional": {
                 "mask_true": ("MASK", {
+                    "lazy": True,
                     "tooltip": "Mask to return when condition is True (optional)"
                 })
             },
@@ -221,6 +256,7 @@ class CR_MaskInputSwitch_JK:
     RETURN_TYPES = ("MASK", "BOOLEAN")
     RETURN_NAMES = ("mask_output", "boolean")
     FUNCTION = "InputMasks"
+    SWITCH_INPUTS = ("mask_false", "mask_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two mask inputs based on boolean condition"
 
@@ -231,7 +267,7 @@ class CR_MaskInputSwitch_JK:
         else:
             return (mask_false, boolean_value)
 
-class CR_AudioInputSwitch_JK:
+class CR_AudioInputSwitch_JK(LazySwitch):
     """Switch between two mask inputs based on boolean condition"""
     
     @classmethod
@@ -243,11 +279,13 @@ class CR_AudioInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=audio_true, False=audio_false)"
                 }),
                 "audio_false": ("AUDIO", {
+                    "lazy": True,
                     "tooltip": "Audio to return when condition is False"
                 }),
             },
             "optional": {
                 "audio_true": ("AUDIO", {
+                    "lazy": True,
                     "tooltip": "Audio to return when condition is True (optional)"
                 })
             },
@@ -256,6 +294,7 @@ class CR_AudioInputSwitch_JK:
     RETURN_TYPES = ("AUDIO", "BOOLEAN")
     RETURN_NAMES = ("audio_output", "boolean")
     FUNCTION = "InputAudios"
+    SWITCH_INPUTS = ("audio_false", "audio_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two audio inputs based on boolean condition"
 
@@ -270,7 +309,7 @@ class CR_AudioInputSwitch_JK:
 # Model and Latent Switch Nodes
 #---------------------------------------------------------------------------------------------------------------------#
 
-class CR_LatentInputSwitch_JK:
+class CR_LatentInputSwitch_JK(LazySwitch):
     """Switch between two latent inputs based on boolean condition"""
     
     @classmethod
@@ -282,11 +321,13 @@ class CR_LatentInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=latent_true, False=latent_false)"
                 }),
                 "latent_false": ("LATENT", {
+                    "lazy": True,
                     "tooltip": "Latent to return when condition is False"
                 }),
             },
             "optional": {
                 "latent_true": ("LATENT", {
+                    "lazy": True,
                     "tooltip": "Latent to return when condition is True (optional)"
                 }),
             },
@@ -295,6 +336,7 @@ class CR_LatentInputSwitch_JK:
     RETURN_TYPES = ("LATENT", "BOOLEAN")
     RETURN_NAMES = ("latent_output", "boolean")
     FUNCTION = "InputLatents"
+    SWITCH_INPUTS = ("latent_false", "latent_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two latent inputs based on boolean condition"
 
@@ -305,7 +347,7 @@ class CR_LatentInputSwitch_JK:
         else:
             return (latent_false, boolean_value)
 
-class CR_ModelInputSwitch_JK:
+class CR_ModelInputSwitch_JK(LazySwitch):
     """Switch between two model inputs based on boolean condition"""
     
     @classmethod
@@ -317,11 +359,13 @@ class CR_ModelInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=model_true, False=model_false)"
                 }),
                 "model_false": ("MODEL", {
+                    "lazy": True,
                     "tooltip": "Model to return when condition is False"
                 }),
             },
             "optional": {
                 "model_true": ("MODEL", {
+                    "lazy": True,
                     "tooltip": "Model to return when condition is True (optional)"
                 }),
             },
@@ -330,6 +374,7 @@ class CR_ModelInputSwitch_JK:
     RETURN_TYPES = ("MODEL", "BOOLEAN")
     RETURN_NAMES = ("model_output", "boolean")
     FUNCTION = "InputModel"
+    SWITCH_INPUTS = ("model_false", "model_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two model inputs based on boolean condition"
 
@@ -340,7 +385,7 @@ class CR_ModelInputSwitch_JK:
         else:
             return (model_false, boolean_value)
 
-class CR_VAEInputSwitch_JK:
+class CR_VAEInputSwitch_JK(LazySwitch):
     """Switch between two VAE inputs based on boolean condition"""
     
     @classmethod
@@ -352,11 +397,13 @@ class CR_VAEInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=VAE_true, False=VAE_false)"
                 }),
                 "VAE_false": ("VAE", {
+                    "lazy": True,
                     "tooltip": "VAE to return when condition is False"
                 }),
             },
             "optional": {
                 "VAE_true": ("VAE", {
+                    "lazy": True,
                     "tooltip": "VAE to return when condition is True (optional)"
                 }),
             },
@@ -365,6 +412,7 @@ class CR_VAEInputSwitch_JK:
     RETURN_TYPES = ("VAE", "BOOLEAN")
     RETURN_NAMES = ("vae_output", "boolean")
     FUNCTION = "vae_switch"
+    SWITCH_INPUTS = ("VAE_false", "VAE_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two VAE inputs based on boolean condition"
 
@@ -379,7 +427,7 @@ class CR_VAEInputSwitch_JK:
 # Conditioning and CLIP Switch Nodes
 #---------------------------------------------------------------------------------------------------------------------#
 
-class CR_ConditioningInputSwitch_JK:
+class CR_ConditioningInputSwitch_JK(LazySwitch):
     """Switch between two conditioning inputs based on boolean condition"""
     
     @classmethod
@@ -391,11 +439,13 @@ class CR_ConditioningInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=conditioning_true, False=conditioning_false)"
                 }),
                 "conditioning_false": ("CONDITIONING", {
+                    "lazy": True,
                     "tooltip": "Conditioning to return when condition is False"
                 }),
             },
             "optional": {
                 "conditioning_true": ("CONDITIONING", {
+                    "lazy": True,
                     "tooltip": "Conditioning to return when condition is True (optional)"
                 }),
             },
@@ -404,6 +454,7 @@ class CR_ConditioningInputSwitch_JK:
     RETURN_TYPES = ("CONDITIONING", "BOOLEAN")
     RETURN_NAMES = ("conditioning_output", "boolean")
     FUNCTION = "InputConditioning"
+    SWITCH_INPUTS = ("conditioning_false", "conditioning_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two conditioning inputs based on boolean condition"
 
@@ -414,7 +465,7 @@ class CR_ConditioningInputSwitch_JK:
         else:
             return (conditioning_false, boolean_value)
 
-class CR_ClipInputSwitch_JK:
+class CR_ClipInputSwitch_JK(LazySwitch):
     """Switch between two CLIP inputs based on boolean condition"""
     
     @classmethod
@@ -426,11 +477,13 @@ class CR_ClipInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=clip_true, False=clip_false)"
                 }),
                 "clip_false": ("CLIP", {
+                    "lazy": True,
                     "tooltip": "CLIP to return when condition is False"
                 }),
             },
             "optional": {
                 "clip_true": ("CLIP", {
+                    "lazy": True,
                     "tooltip": "CLIP to return when condition is True (optional)"
                 }),
             },
@@ -439,6 +492,7 @@ class CR_ClipInputSwitch_JK:
     RETURN_TYPES = ("CLIP", "BOOLEAN")
     RETURN_NAMES = ("clip_output", "boolean")
     FUNCTION = "InputClip"
+    SWITCH_INPUTS = ("clip_false", "clip_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two CLIP inputs based on boolean condition"
 
@@ -453,7 +507,7 @@ class CR_ClipInputSwitch_JK:
 # ControlNet Switch Nodes
 #---------------------------------------------------------------------------------------------------------------------#
 
-class CR_ControlNetInputSwitch_JK:
+class CR_ControlNetInputSwitch_JK(LazySwitch):
     """Switch between two ControlNet inputs based on boolean condition"""
     
     @classmethod
@@ -465,11 +519,13 @@ class CR_ControlNetInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=control_net_true, False=control_net_false)"
                 }),
                 "control_net_false": ("CONTROL_NET", {
+                    "lazy": True,
                     "tooltip": "ControlNet to return when condition is False"
                 }),
             },
             "optional": {
                 "control_net_true": ("CONTROL_NET", {
+                    "lazy": True,
                     "tooltip": "ControlNet to return when condition is True (optional)"
                 }),
             },
@@ -478,6 +534,7 @@ class CR_ControlNetInputSwitch_JK:
     RETURN_TYPES = ("CONTROL_NET", "BOOLEAN")
     RETURN_NAMES = ("control_net_output", "boolean")
     FUNCTION = "InputControlNet"
+    SWITCH_INPUTS = ("control_net_false", "control_net_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two ControlNet inputs based on boolean condition"
 
@@ -488,7 +545,7 @@ class CR_ControlNetInputSwitch_JK:
         else:
             return (control_net_false, boolean_value)
 
-class CR_ControlNetStackInputSwitch_JK:
+class CR_ControlNetStackInputSwitch_JK(LazySwitch):
     """Switch between two ControlNet stack inputs based on boolean condition"""
     
     @classmethod
@@ -500,11 +557,13 @@ class CR_ControlNetStackInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=control_net_stack_true, False=control_net_stack_false)"
                 }),
                 "control_net_stack_false": ("CONTROL_NET_STACK", {
+                    "lazy": True,
                     "tooltip": "ControlNet stack to return when condition is False"
                 }),
             },
             "optional": {
                 "control_net_stack_true": ("CONTROL_NET_STACK", {
+                    "lazy": True,
                     "tooltip": "ControlNet stack to return when condition is True (optional)"
                 }),
             },
@@ -513,6 +572,7 @@ class CR_ControlNetStackInputSwitch_JK:
     RETURN_TYPES = ("CONTROL_NET_STACK", "BOOLEAN")
     RETURN_NAMES = ("control_net_stack_output", "boolean")
     FUNCTION = "InputControlNetStack"
+    SWITCH_INPUTS = ("control_net_stack_false", "control_net_stack_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two ControlNet stack inputs based on boolean condition"
 
@@ -527,7 +587,7 @@ class CR_ControlNetStackInputSwitch_JK:
 # Sampling and Noise Switch Nodes
 #---------------------------------------------------------------------------------------------------------------------#
 
-class CR_NoiseInputSwitch_JK:
+class CR_NoiseInputSwitch_JK(LazySwitch):
     """Switch between two noise inputs based on boolean condition"""
     
     @classmethod
@@ -539,11 +599,13 @@ class CR_NoiseInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=noise_true, False=noise_false)"
                 }),
                 "noise_false": ("NOISE", {
+                    "lazy": True,
                     "tooltip": "Noise to return when condition is False"
                 }),
             },
             "optional": {
                 "noise_true": ("NOISE", {
+                    "lazy": True,
                     "tooltip": "Noise to return when condition is True (optional)"
                 }),
             },
@@ -552,6 +614,7 @@ class CR_NoiseInputSwitch_JK:
     RETURN_TYPES = ("NOISE", "BOOLEAN")
     RETURN_NAMES = ("noise_output", "boolean")
     FUNCTION = "noise_switch"
+    SWITCH_INPUTS = ("noise_false", "noise_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two noise inputs based on boolean condition"
 
@@ -562,7 +625,7 @@ class CR_NoiseInputSwitch_JK:
         else:
             return (noise_false, boolean_value)
 
-class CR_GuiderInputSwitch_JK:
+class CR_GuiderInputSwitch_JK(LazySwitch):
     """Switch between two guider inputs based on boolean condition"""
     
     @classmethod
@@ -574,11 +637,13 @@ class CR_GuiderInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=guider_true, False=guider_false)"
                 }),
                 "guider_false": ("GUIDER", {
+                    "lazy": True,
                     "tooltip": "Guider to return when condition is False"
                 }),
             },
             "optional": {
                 "guider_true": ("GUIDER", {
+                    "lazy": True,
                     "tooltip": "Guider to return when condition is True (optional)"
                 }),
             },
@@ -587,6 +652,7 @@ class CR_GuiderInputSwitch_JK:
     RETURN_TYPES = ("GUIDER", "BOOLEAN")
     RETURN_NAMES = ("guider_output", "boolean")
     FUNCTION = "guider_switch"
+    SWITCH_INPUTS = ("guider_false", "guider_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two guider inputs based on boolean condition"
 
@@ -597,7 +663,7 @@ class CR_GuiderInputSwitch_JK:
         else:
             return (guider_false, boolean_value)
 
-class CR_SamplerInputSwitch_JK:
+class CR_SamplerInputSwitch_JK(LazySwitch):
     """Switch between two sampler inputs based on boolean condition"""
     
     @classmethod
@@ -609,11 +675,13 @@ class CR_SamplerInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=sampler_true, False=sampler_false)"
                 }),
                 "sampler_false": ("SAMPLER", {
+                    "lazy": True,
                     "tooltip": "Sampler to return when condition is False"
                 }),
             },
             "optional": {
                 "sampler_true": ("SAMPLER", {
+                    "lazy": True,
                     "tooltip": "Sampler to return when condition is True (optional)"
                 }),
             },
@@ -622,6 +690,7 @@ class CR_SamplerInputSwitch_JK:
     RETURN_TYPES = ("SAMPLER", "BOOLEAN")
     RETURN_NAMES = ("sampler_output", "boolean")
     FUNCTION = "sampler_switch"
+    SWITCH_INPUTS = ("sampler_false", "sampler_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two sampler inputs based on boolean condition"
 
@@ -632,7 +701,7 @@ class CR_SamplerInputSwitch_JK:
         else:
             return (sampler_false, boolean_value)
 
-class CR_SigmasInputSwitch_JK:
+class CR_SigmasInputSwitch_JK(LazySwitch):
     """Switch between two sigmas inputs based on boolean condition"""
     
     @classmethod
@@ -644,11 +713,13 @@ class CR_SigmasInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=sigmas_true, False=sigmas_false)"
                 }),
                 "sigmas_false": ("SIGMAS", {
+                    "lazy": True,
                     "tooltip": "Sigmas to return when condition is False"
                 }),
             },
             "optional": {
                 "sigmas_true": ("SIGMAS", {
+                    "lazy": True,
                     "tooltip": "Sigmas to return when condition is True (optional)"
                 }),
             },
@@ -657,6 +728,7 @@ class CR_SigmasInputSwitch_JK:
     RETURN_TYPES = ("SIGMAS", "BOOLEAN")
     RETURN_NAMES = ("sigmas_output", "boolean")
     FUNCTION = "sigmas_switch"
+    SWITCH_INPUTS = ("sigmas_false", "sigmas_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two sigmas inputs based on boolean condition"
 
@@ -671,7 +743,7 @@ class CR_SigmasInputSwitch_JK:
 # 3D and Mesh Switch Nodes
 #---------------------------------------------------------------------------------------------------------------------#
 
-class CR_MeshInputSwitch_JK:
+class CR_MeshInputSwitch_JK(LazySwitch):
     """Switch between two mesh inputs based on boolean condition"""
     
     @classmethod
@@ -683,11 +755,13 @@ class CR_MeshInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=mesh_true, False=mesh_false)"
                 }),
                 "mesh_false": ("MESH", {
+                    "lazy": True,
                     "tooltip": "Mesh to return when condition is False"
                 }),
             },
             "optional": {
                 "mesh_true": ("MESH", {
+                    "lazy": True,
                     "tooltip": "Mesh to return when condition is True (optional)"
                 }),
             },
@@ -696,6 +770,7 @@ class CR_MeshInputSwitch_JK:
     RETURN_TYPES = ("MESH", "BOOLEAN")
     RETURN_NAMES = ("mesh_output", "boolean")
     FUNCTION = "mesh_switch"
+    SWITCH_INPUTS = ("mesh_false", "mesh_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two mesh inputs based on boolean condition"
 
@@ -706,7 +781,7 @@ class CR_MeshInputSwitch_JK:
         else:
             return (mesh_false, boolean_value)
 
-class CR_PlyInputSwitch_JK:
+class CR_PlyInputSwitch_JK(LazySwitch):
     """Switch between two PLY (point cloud) inputs based on boolean condition"""
     
     @classmethod
@@ -718,11 +793,13 @@ class CR_PlyInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=ply_true, False=ply_false)"
                 }),
                 "ply_false": ("GS_PLY", {
+                    "lazy": True,
                     "tooltip": "PLY file to return when condition is False"
                 }),
             },
             "optional": {
                 "ply_true": ("GS_PLY", {
+                    "lazy": True,
                     "tooltip": "PLY file to return when condition is True (optional)"
                 }),
             },
@@ -731,6 +808,7 @@ class CR_PlyInputSwitch_JK:
     RETURN_TYPES = ("GS_PLY", "BOOLEAN")
     RETURN_NAMES = ("ply_output", "boolean")
     FUNCTION = "ply_switch"
+    SWITCH_INPUTS = ("ply_false", "ply_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two PLY (point cloud) inputs based on boolean condition"
 
@@ -741,7 +819,7 @@ class CR_PlyInputSwitch_JK:
         else:
             return (ply_false, boolean_value)
 
-class CR_TriMeshInputSwitch_JK:
+class CR_TriMeshInputSwitch_JK(LazySwitch):
     """Switch between two triangle mesh inputs based on boolean condition"""
     
     @classmethod
@@ -753,11 +831,13 @@ class CR_TriMeshInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=trimesh_true, False=trimesh_false)"
                 }),
                 "trimesh_false": ("TRIMESH", {
+                    "lazy": True,
                     "tooltip": "Triangle mesh to return when condition is False"
                 }),
             },
             "optional": {
                 "trimesh_true": ("TRIMESH", {
+                    "lazy": True,
                     "tooltip": "Triangle mesh to return when condition is True (optional)"
                 }),
             },
@@ -766,6 +846,7 @@ class CR_TriMeshInputSwitch_JK:
     RETURN_TYPES = ("TRIMESH", "BOOLEAN")
     RETURN_NAMES = ("trimesh_output", "boolean")
     FUNCTION = "trimesh_switch"
+    SWITCH_INPUTS = ("trimesh_false", "trimesh_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two triangle mesh inputs based on boolean condition"
 
@@ -776,7 +857,7 @@ class CR_TriMeshInputSwitch_JK:
         else:
             return (trimesh_false, boolean_value)
 
-class CR_OrbitPoseInputSwitch_JK:
+class CR_OrbitPoseInputSwitch_JK(LazySwitch):
     """Switch between two orbit camera pose inputs based on boolean condition"""
     
     @classmethod
@@ -788,11 +869,13 @@ class CR_OrbitPoseInputSwitch_JK:
                     "tooltip": "Condition to select between inputs (True=orbit_camposes_true, False=orbit_camposes_false)"
                 }),
                 "orbit_camposes_false": ("ORBIT_CAMPOSES", {
+                    "lazy": True,
                     "tooltip": "Orbit camera poses to return when condition is False"
                 }),
             },
             "optional": {
                 "orbit_camposes_true": ("ORBIT_CAMPOSES", {
+                    "lazy": True,
                     "tooltip": "Orbit camera poses to return when condition is True (optional)"
                 }),
             },
@@ -801,6 +884,7 @@ class CR_OrbitPoseInputSwitch_JK:
     RETURN_TYPES = ("ORBIT_CAMPOSES", "BOOLEAN")
     RETURN_NAMES = ("orbit_camposes_output", "boolean")
     FUNCTION = "orbit_switch"
+    SWITCH_INPUTS = ("orbit_camposes_false", "orbit_camposes_true")
     CATEGORY = icons.get("JK/Switch")
     DESCRIPTION = "Switch between two orbit camera pose inputs based on boolean condition"
 
@@ -815,21 +899,22 @@ class CR_OrbitPoseInputSwitch_JK:
 # Pipe Switch Nodes
 #---------------------------------------------------------------------------------------------------------------------#
 
-class CR_ImpactPipeInputSwitch_JK:
+class CR_ImpactPipeInputSwitch_JK(LazySwitch):
     @classmethod
     def INPUT_TYPES(cls):
         return {
             "required": {
                 "boolean_value": ("BOOLEAN", {"default": False}),
-                "pipe_false": ("BASIC_PIPE",),
+                "pipe_false": ("BASIC_PIPE", {"lazy": True}),
             },
             "optional": {
-                "pipe_true": ("BASIC_PIPE",),
+                "pipe_true": ("BASIC_PIPE", {"lazy": True}),
             },
         }
     
     RETURN_TYPES = ("BASIC_PIPE", "BOOLEAN",)   
     FUNCTION = "pipe_switch"
+    SWITCH_INPUTS = ("pipe_false", "pipe_true")
     CATEGORY = icons.get("JK/Switch")
     DEPRECATED = True
 
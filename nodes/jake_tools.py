@@ -2,14 +2,19 @@
 # Jake Upgrade Tools for JK Custom Workflow of ComfyUI
 #---------------------------------------------------------------------------------------------------------------------#
 import os
+import time
 import torch
 import numpy
 import hashlib
+import sqlite3
+import threading
 import math
 from PIL import Image
 from pathlib import Path
-from typing import Any, List, Tuple
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 #---------------------------------------------------------------------------------------------------------------------#
 # Core Tools
@@ -25,20 +30,25 @@ def parse_name(path_name: str) -> str:
     return filename
 
 def calculate_sha256(file_path: str) -> str:
-    """Calculate SHA256 hash of a file."""
+    """Calculate SHA256 hash of a file, served from the persistent hash cache when possible."""
     if not os.path.exists(file_path):
         print(f"Warning: File not found at {file_path}. Cannot calculate hash.")
         return None
     
-    sha256_hash = hashlib.sha256()
+    try:
+        cache_key = HashCache.make_key(file_path)
+    except OSError as e:
+        print(f"Error reading file {file_path} for hash calculation: {e}")
+        return None
+    
+    cached_hash = hash_cache.get(cache_key)
+    if cached_hash is not None:
+        return cached_hash
     
     try:
-        # Read file in binary mode, chunk by chunk for large files
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(8192), b""):
-                sha256_hash.update(byte_block)
-        
-        return sha256_hash.hexdigest()
+        file_hash = _hash_file(file_path)
+        hash_cache.put(cache_key, file_hash)
+        return file_hash
     except IOError as e:
         print(f"Error reading file {file_path} for hash calculation: {e}")
         return None
@@ -73,6 +83,336 @@ def make_filename(filename: str, seed: int, modelname: str, counter: int) -> str
     filename = make_pathname(filename, seed, modelname, counter)
     return get_timestamp("%Y-%m-%d") if filename == "" else filename
 
+#---------------------------------------------------------------------------------------------------------------------#
+# Hash Cache Tools
+#---------------------------------------------------------------------------------------------------------------------#
+
+# Stored next to config.ini so the cache survives ComfyUI restarts
+HASH_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sha256_cache.db")
+
+# Model folders hashed by the background warm-up
+HASH_WARMUP_FOLDERS = ("checkpoints", "diffusion_models", "vae", "loras", "controlnet", "embeddings", "upscale_models")
+
+class HashCache:
+    """
+    Persistent SHA256 store backed by SQLite.
+    
+    Entries are keyed on (absolute path, size, mtime_ns, inode), so any change to
+    a file invalidates its hash without explicit bookkeeping. Lookups hit an
+    in-memory dict first; the database is only read once per key per process.
+    """
+    
+    def __init__(self, db_path: str = HASH_CACHE_PATH):
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._memory = {}
+        self._conn = None
+        self._disabled = False
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(file_path: str) -> Tuple[str, int, int, int]:
+        """Build the cache key for a file from its stat result."""
+        stat = os.stat(file_path)
+        return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    
+    def _connect(self):
+        """Open the database lazily; fall back to memory-only on failure."""
+        if self._conn is None and not self._disabled:
+            try:
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS sha256 ("
+                    "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, inode INTEGER, hash TEXT)"
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: Hash cache unavailable at {self.db_path}, using memory only: {e}")
+                self._conn = None
+                self._disabled = True
+        return self._conn
+    
+    def _lookup(self, key: Tuple[str, int, int, int]) -> str:
+        """Find a hash in memory or on disk. Caller must hold the lock."""
+        file_hash = self._memory.get(key)
+        if file_hash is None:
+            conn = self._connect()
+            if conn is not None:
+                try:
+                    row = conn.execute(
+                        "SELECT hash FROM sha256 WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                        key,
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    print(f"Warning: Hash cache read failed: {e}")
+                    row = None
+                if row is not None:
+                    file_hash = row[0]
+                    self._memory[key] = file_hash
+        return file_hash
+    
+    def get(self, key: Tuple[str, int, int, int]) -> str:
+        """Return the cached hash for a key, or None on a miss."""
+        with self._lock:
+            file_hash = self._lookup(key)
+            if file_hash is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return file_hash
+    
+    def put(self, key: Tuple[str, int, int, int], file_hash: str) -> None:
+        """Store a hash, replacing any stale entry for the same path."""
+        with self._lock:
+            self._memory[key] = file_hash
+            conn = self._connect()
+            if conn is not None:
+                try:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO sha256 (path, size, mtime_ns, inode, hash) VALUES (?, ?, ?, ?, ?)",
+                        key + (file_hash,),
+                    )
+                    conn.commit()
+                except sqlite3.Error as e:
+                    print(f"Warning: Hash cache write failed: {e}")
+    
+    def contains(self, file_path: str) -> bool:
+        """Check whether a file has a valid cached hash without counting a hit or miss."""
+        try:
+            key = self.make_key(file_path)
+        except OSError:
+            return False
+        with self._lock:
+            return self._lookup(key) is not None
+
+hash_cache = HashCache()
+
+# Read buffer for hashing; large reads keep NVMe and network storage busy
+HASH_READ_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Upper bound on files hashed concurrently
+HASH_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+class FileHash(NamedTuple):
+    """Full SHA256 digest plus the A1111 AutoV2 short hash."""
+    sha256: str
+    autov2: str
+
+def _hash_file(file_path: str, buffer_size: int = HASH_READ_BUFFER_SIZE) -> str:
+    """Hash a file with a reusable large buffer. hashlib releases the GIL, so this runs in parallel across threads."""
+    sha256_hash = hashlib.sha256()
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            sha256_hash.update(view[:size])
+    return sha256_hash.hexdigest()
+
+def calculate_file_hashes(file_paths: Iterable[str], max_workers: int = HASH_MAX_WORKERS,
+                          progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Optional[FileHash]]:
+    """
+    Hash many files at once on a bounded thread pool.
+    
+    Args:
+        file_paths: Files to hash; duplicates and empty entries are skipped
+        max_workers: Maximum number of files read concurrently
+        progress_callback: Called as progress_callback(completed, total) after each file
+    
+    Returns:
+        Dict mapping each path to its FileHash, or None if it could not be hashed
+    """
+    unique_paths = list(dict.fromkeys(path for path in file_paths if path))
+    total = len(unique_paths)
+    results = {}
+    if total == 0:
+        return results
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total)), thread_name_prefix="JK-Hash") as executor:
+        futures = {executor.submit(calculate_sha256, path): path for path in unique_paths}
+        for completed, future in enumerate(as_completed(futures), 1):
+            file_hash = future.result()
+            results[futures[future]] = FileHash(file_hash, file_hash[:10]) if file_hash else None
+            if progress_callback is not None:
+                progress_callback(completed, total)
+    
+    return results
+
+def warmup_hash_cache(folder_names: Tuple[str, ...] = HASH_WARMUP_FOLDERS, delay: float = 10.0) -> threading.Thread:
+    """
+    Hash uncached model files in a background daemon thread.
+    
+    Args:
+        folder_names: ComfyUI model folder names to scan
+        delay: Seconds to wait before starting, so node loading is not slowed down
+    
+    Returns:
+        The started thread
+    """
+    def _worker():
+        time.sleep(delay)
+        try:
+            import folder_paths
+        except ImportError:
+            return
+        
+        hashed = 0
+        for folder_name in folder_names:
+            try:
+                filenames = folder_paths.get_filename_list(folder_name)
+            except Exception:
+                continue
+            for filename in filenames:
+                file_path = folder_paths.get_full_path(folder_name, filename)
+                if file_path and not hash_cache.contains(file_path):
+                    if calculate_sha256(file_path) is not None:
+                        hashed += 1
+        
+        if hashed:
+            print(f"🔶 Hash cache warm-up finished: {hashed} files hashed")
+    
+    thread = threading.Thread(target=_worker, name="JK-HashCacheWarmup", daemon=True)
+    thread.start()
+    return thread
+
+#---------------------------------------------------------------------------------------------------------------------#
+# Model Cache Tools
+#---------------------------------------------------------------------------------------------------------------------#
+
+# Byte budget for cached LoRA state dicts (kept in system memory)
+LORA_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# Byte budget for cached ControlNet models
+CONTROLNET_CACHE_MAX_BYTES = 6 * 1024 ** 3
+
+def state_dict_nbytes(state_dict: Dict[str, Any]) -> int:
+    """Total tensor bytes held by a state dict."""
+    return sum(t.numel() * t.element_size() for t in state_dict.values() if isinstance(t, torch.Tensor))
+
+def controlnet_nbytes(controlnet: Any) -> int:
+    """Approximate weight bytes held by a loaded ControlNet, T2I adapter or Control LoRA."""
+    patcher = getattr(controlnet, "control_model_wrapped", None)
+    if patcher is not None and hasattr(patcher, "model_size"):
+        return patcher.model_size()
+    model = getattr(controlnet, "control_model", None)
+    if isinstance(model, torch.nn.Module):
+        return sum(p.numel() * p.element_size() for p in model.parameters())
+    weights = getattr(controlnet, "control_weights", None)
+    if isinstance(weights, dict):
+        return state_dict_nbytes(weights)
+    return 0
+
+class ModelFileCache:
+    """
+    Process-wide LRU cache of objects loaded from model files.
+    
+    Entries are keyed on (absolute path, mtime_ns, size), so an edited or replaced
+    file is reloaded automatically. The least recently used entries are evicted
+    once the total size exceeds max_bytes; an object larger than the whole budget
+    is returned but not kept.
+    """
+    
+    def __init__(self, name: str, max_bytes: int, sizeof: Callable[[Any], int]):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(file_path: str) -> Tuple[str, int, int]:
+        """Build the cache key for a file from its stat result."""
+        stat = os.stat(file_path)
+        return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    
+    def _remove(self, key: Tuple[str, int, int]) -> None:
+        """Drop one entry. Caller must hold the lock."""
+        _, nbytes = self._entries.pop(key)
+        self.total_bytes -= nbytes
+    
+    def get(self, file_path: str, loader: Callable[[str], Any]) -> Any:
+        """
+        Return the cached object for a file, loading it with loader(file_path) on a miss.
+        
+        Args:
+            file_path: Model file to load
+            loader: Called with the file path when the file is not cached
+        
+        Returns:
+            The loaded object
+        """
+        key = self.make_key(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        
+        value = loader(file_path)
+        nbytes = self.sizeof(value)
+        
+        with self._lock:
+            # Forget older versions of the same file
+            for stale_key in [k for k in self._entries if k[0] == key[0]]:
+                self._remove(stale_key)
+            
+            if nbytes <= self.max_bytes:
+                self._entries[key] = (value, nbytes)
+                self.total_bytes += nbytes
+                while self.total_bytes > self.max_bytes:
+                    self._remove(next(iter(self._entries)))
+        
+        return value
+    
+    def evict(self, file_path: str) -> bool:
+        """Drop every cached version of a file. Returns True if anything was removed."""
+        abs_path = os.path.abspath(file_path)
+        with self._lock:
+            keys = [k for k in self._entries if k[0] == abs_path]
+            for key in keys:
+                self._remove(key)
+            return bool(keys)
+    
+    def clear(self) -> None:
+        """Drop all entries and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Current entry count, size and hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+lora_cache = ModelFileCache("LoRA", LORA_CACHE_MAX_BYTES, state_dict_nbytes)
+controlnet_cache = ModelFileCache("ControlNet", CONTROLNET_CACHE_MAX_BYTES, controlnet_nbytes)
+
+def load_controlnet_cached(controlnet_path: str) -> Any:
+    """
+    Load a ControlNet through the shared controlnet_cache.
+    
+    The cached object is shared between nodes; callers must copy() it before
+    changing it, as ComfyUI's own apply nodes already do.
+    """
+    import comfy.controlnet
+    return controlnet_cache.get(controlnet_path, comfy.controlnet.load_controlnet)
+
 #---------------------------------------------------------------------------------------------------------------------#
 # Resolution Tools
 #---------------------------------------------------------------------------------------------------------------------#
@@ -315,17 +315,21 @@ def pils_to_torch_imgs(pils: Union[Image.Image, List[Image.Image]], dtype=torch.
 
     return images
 
-def pil_split_image(image, rows=None, cols=None, crop_excess=True):
+def image_grid_layout(original_width, original_height, rows=None, cols=None, crop_excess=True):
     """
-    Split image into grid with proper error handling and validation
+    Compute the grid used to split an image, shared by the PIL and tensor split helpers
     
     Args:
-        image: PIL Image to split
+        original_width: Width of the grid image
+        original_height: Height of the grid image
         rows: Number of rows (None for auto)
-        cols: Number of columns (None for auto)  
-        crop_excess: Whether to crop excess pixels or raise error
+        cols: Number of columns (None for auto)
+        crop_excess: Whether excess pixels are allowed (cropped) or raise an error
+    
+    Returns:
+        (rows, cols, subimg_width, subimg_height); pixels beyond cols * subimg_width and
+        rows * subimg_height are excess and get cropped
     """
-    original_width, original_height = image.size
     
     # Validate input parameters
     if rows is not None and rows <= 0:
@@ -342,14 +346,7 @@ def pil_split_image(image, rows=None, cols=None, crop_excess=True):
         if subimg_width <= 0 or subimg_height <= 0:
             raise ValueError(f"Cannot split image {original_width}x{original_height} into {cols}x{rows} grid - subimage size would be {subimg_width}x{subimg_height}")
         
-        if crop_excess:
-            # Crop to make divisible
-            new_width = subimg_width * cols
-            new_height = subimg_height * rows
-            if new_width != original_width or new_height != original_height:
-                image = image.crop((0, 0, new_width, new_height))
-        else:
-            # Check if divisible
+        if not crop_excess:
             if subimg_width * cols != original_width or subimg_height * rows != original_height:
                 raise ValueError(
                     f"Image size {original_width}x{original_height} cannot be evenly divided into {cols}x{rows} grid. "
@@ -368,12 +365,7 @@ def pil_split_image(image, rows=None, cols=None, crop_excess=True):
         
         subimg_height = original_height // rows
         
-        if crop_excess:
-            new_width = subimg_width * cols
-            new_height = subimg_height * rows
-            if new_width != original_width or new_height != original_height:
-                image = image.crop((0, 0, new_width, new_height))
-        else:
+        if not crop_excess:
             if subimg_width * cols != original_width or subimg_height * rows != original_height:
                 raise ValueError(
                     f"Image size {original_width}x{original_height} cannot be evenly divided into {cols} columns. "
@@ -392,12 +384,7 @@ def pil_split_image(image, rows=None, cols=None, crop_excess=True):
         
         subimg_width = original_width // cols
         
-        if crop_excess:
-            new_width = subimg_width * cols
-            new_height = subimg_height * rows
-            if new_width != original_width or new_height != original_height:
-                image = image.crop((0, 0, new_width, new_height))
-        else:
+        if not crop_excess:
             if subimg_width * cols != original_width or subimg_height * rows != original_height:
                 raise ValueError(
                     f"Image size {original_width}x{original_height} cannot be evenly divided into {rows} rows. "
@@ -420,12 +407,7 @@ def pil_split_image(image, rows=None, cols=None, crop_excess=True):
         if cols <= 0 or rows <= 0:
             raise ValueError(f"Cannot auto-split image {original_width}x{original_height} - too small")
         
-        if crop_excess:
-            new_width = subimg_size * cols
-            new_height = subimg_size * rows
-            if new_width != original_width or new_height != original_height:
-                image = image.crop((0, 0, new_width, new_height))
-        else:
+        if not crop_excess:
             if subimg_size * cols != original_width or subimg_size * rows != original_height:
                 raise ValueError(
                     f"Image size {original_width}x{original_height} cannot be auto-split into square subimages. "
@@ -441,6 +423,26 @@ def pil_split_image(image, rows=None, cols=None, crop_excess=True):
     if subimg_width <= 0 or subimg_height <= 0:
         raise ValueError(f"Calculated invalid subimage size: {subimg_width}x{subimg_height}")
     
+    return rows, cols, subimg_width, subimg_height
+
+def pil_split_image(image, rows=None, cols=None, crop_excess=True):
+    """
+    Split image into grid with proper error handling and validation
+    
+    Args:
+        image: PIL Image to split
+        rows: Number of rows (None for auto)
+        cols: Number of columns (None for auto)  
+        crop_excess: Whether to crop excess pixels or raise error
+    """
+    rows, cols, subimg_width, subimg_height = image_grid_layout(image.width, image.height, rows, cols, crop_excess)
+    
+    # Crop to make divisible
+    new_width = subimg_width * cols
+    new_height = subimg_height * rows
+    if new_width != image.width or new_height != image.height:
+        image = image.crop((0, 0, new_width, new_height))
+    
     # Perform the actual splitting
     subimgs = []
     for i in range(rows):
@@ -495,19 +497,7 @@ def pil_make_image_grid(images, rows=None, cols=None):
 #---------------------------------------------------------------------------------------------------------------------#
 def image_gray_offset(image:Image, offset:int) -> Image:
     image = image.convert('L')
-    width = image.width
-    height = image.height
-    ret_image = Image.new('L', size=(width, height), color='black')
-    for x in range(width):
-        for y in range(height):
-                pixel = image.getpixel((x, y))
-                _pixel = pixel + offset
-                if _pixel > 255:
-                    _pixel = 255
-                if _pixel < 0:
-                    _pixel = 0
-                ret_image.putpixel((x, y), _pixel)
-    return ret_image
+    return image.point([min(max(pixel + offset, 0), 255) for pixel in range(256)])
 
 def RGB2RGBA(image:Image, mask:Image) -> Image:
     (R, G, B) = image.convert('RGB').split()
@@ -531,3 +521,238 @@ def image_channel_merge(channels:tuple, mode = 'RGB' ) -> Image:
     elif mode == 'HSV':
         ret_image = Image.merge('HSV', [channel1, channel2, channel3]).convert('RGB')
     return ret_image
+
+#---------------------------------------------------------------------------------------------------------------------#
+# Tensor Color Utilities
+#---------------------------------------------------------------------------------------------------------------------#
+LUMA_WEIGHTS = (0.299, 0.587, 0.114)
+
+def tensor_luma(rgb: torch.Tensor) -> torch.Tensor:
+    """
+    Compute ITU-R 601-2 luma, the same weights PIL uses for convert('L').
+    
+    Args:
+        rgb: Tensor [..., 3] in 0-1 range
+    
+    Returns:
+        Tensor [...] with the luma of every pixel
+    """
+    weights = torch.tensor(LUMA_WEIGHTS, dtype=rgb.dtype, device=rgb.device)
+    return torch.matmul(rgb, weights)
+
+def color_grading_tensor(
+    images: torch.Tensor,
+    brightness: float = 1.0,
+    contrast: float = 1.0,
+    saturation: float = 1.0,
+    rgb_offset: Tuple[int, int, int] = (0, 0, 0)
+) -> torch.Tensor:
+    """
+    Apply brightness, contrast, saturation and per-channel gray offset to a whole image batch.
+    
+    Follows the semantics of PIL ImageEnhance.Brightness/Contrast/Color and image_gray_offset,
+    clamping after every step, so results match the per-frame PIL path within quantization error.
+    
+    Args:
+        images: Tensor [B, H, W, C] in 0-1 range, C is 3 or 4
+        brightness: Brightness factor, 1.0 keeps the image unchanged
+        contrast: Contrast factor, 1.0 keeps the image unchanged
+        saturation: Saturation factor, 1.0 keeps the image unchanged
+        rgb_offset: Offsets for R, G, B channels in 0-255 units
+    
+    Returns:
+        Tensor [B, H, W, C] on the same device, alpha channel preserved
+    """
+    if len(images.shape) == 3:
+        images = images.unsqueeze(0)
+    
+    # Work on a float32 copy and update it in place to avoid a temporary per step
+    rgb = images[..., :3].to(torch.float32, copy=True)
+    
+    # Brightness: blend with black
+    if brightness != 1:
+        rgb.mul_(brightness).clamp_(0, 1)
+    
+    # Contrast: blend with the mean gray level of each frame (rounded like PIL)
+    if contrast != 1:
+        mean = tensor_luma(rgb.mean(dim=(1, 2)))
+        mean = torch.round(mean * 255.0) / 255.0
+        rgb.mul_(contrast).add_((mean * (1 - contrast)).view(-1, 1, 1, 1)).clamp_(0, 1)
+    
+    # Saturation: blend with the grayscale image
+    if saturation != 1:
+        gray = tensor_luma(rgb).unsqueeze(-1)
+        rgb.mul_(saturation).add_(gray, alpha=1 - saturation).clamp_(0, 1)
+    
+    # Per-channel gray offset
+    if any(rgb_offset):
+        offset = torch.tensor(rgb_offset, dtype=rgb.dtype, device=rgb.device) / 255.0
+        rgb.add_(offset).clamp_(0, 1)
+    
+    if images.shape[-1] > 3:
+        rgb = torch.cat((rgb, images[..., 3:].to(rgb.dtype)), dim=-1)
+    
+    return rgb.to(images.dtype)
+
+def hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
+    """
+    Parse a #RRGGBB (or #RGB) color string.
+    
+    Args:
+        hex_color: Color string, the leading # is optional
+    
+    Returns:
+        (R, G, B) in 0-255 range
+    """
+    value = hex_color.strip().lstrip("#")
+    if len(value) == 3:
+        value = "".join(c * 2 for c in value)
+    if len(value) != 6:
+        raise ValueError(f"Invalid hex color '{hex_color}', expected #RRGGBB")
+    try:
+        return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+    except ValueError:
+        raise ValueError(f"Invalid hex color '{hex_color}', expected #RRGGBB")
+
+def composite_alpha_tensor(
+    images: torch.Tensor,
+    mask: torch.Tensor = None,
+    background: Tuple[int, int, int] = (0, 0, 0),
+    premultiplied: bool = False,
+    chunk_size: int = 16
+) -> torch.Tensor:
+    """
+    Composite an image batch over a solid background color, returning RGB.
+    
+    Straight alpha: rgb * alpha + background * (1 - alpha)
+    Premultiplied alpha: rgb + background * (1 - alpha)
+    Frames are processed in chunks so temporaries stay bounded for long batches.
+    
+    Args:
+        images: Tensor [B, H, W, C] in 0-1 range, C is 3 or 4
+        mask: Optional ComfyUI mask [B, H, W] or [H, W], overrides the alpha channel with
+            alpha = 1 - mask (1 is transparent, as LoadImage outputs); a single mask is applied to every frame,
+            and a mask of another size (LoadImage outputs 64x64 for images without alpha) is resized bilinearly
+        background: Background color in 0-255 units
+        premultiplied: Whether the color channels are already multiplied by alpha
+        chunk_size: Number of frames composited at a time
+    
+    Returns:
+        Tensor [B, H, W, 3] with the dtype and device of images
+    """
+    if len(images.shape) == 3:
+        images = images.unsqueeze(0)
+    
+    if mask is None:
+        if images.shape[-1] < 4:
+            return images[..., :3].clone()
+        alpha = images[..., 3]
+    else:
+        alpha = mask.to(device=images.device)
+        if len(alpha.shape) == 2:
+            alpha = alpha.unsqueeze(0)
+        if alpha.shape[0] not in (1, images.shape[0]):
+            raise ValueError(f"Mask shape {tuple(alpha.shape)} does not match image batch {tuple(images.shape[:3])}")
+        if alpha.shape[1:] != images.shape[1:3]:
+            # Same resize as JoinImageWithAlpha applies to its mask
+            alpha = torch.nn.functional.interpolate(
+                alpha.to(torch.float32).unsqueeze(1), size=tuple(images.shape[1:3]), mode="bilinear"
+            ).squeeze(1)
+    
+    batch = images.shape[0]
+    output = images.new_empty((batch,) + tuple(images.shape[1:3]) + (3,))
+    background = torch.tensor(background, dtype=torch.float32, device=images.device) / 255.0
+    
+    for start in range(0, batch, chunk_size):
+        end = min(start + chunk_size, batch)
+        rgb = images[start:end, ..., :3].to(torch.float32)
+        chunk_alpha = alpha[start:end] if alpha.shape[0] > 1 else alpha.expand(end - start, -1, -1)
+        chunk_alpha = chunk_alpha.to(torch.float32).clamp(0, 1).unsqueeze(-1)
+        if mask is not None:
+            chunk_alpha = 1 - chunk_alpha
+        
+        # Background weight (1 - alpha) times the background color, then add the foreground in place
+        in_place = output.dtype == torch.float32
+        result = output[start:end] if in_place else torch.empty_like(rgb)
+        torch.mul(1 - chunk_alpha, background, out=result)
+        if premultiplied:
+            result.add_(rgb)
+        else:
+            result.addcmul_(rgb, chunk_alpha)
+        result.clamp_(0, 1)
+        if not in_place:
+            output[start:end] = result
+    
+    return output
+
+#---------------------------------------------------------------------------------------------------------------------#
+# Tensor Grid Utilities
+#---------------------------------------------------------------------------------------------------------------------#
+def tensor_make_image_grid(images: torch.Tensor, rows: int = None, cols: int = None) -> torch.Tensor:
+    """
+    Arrange an image batch into a single grid image, same layout as pil_make_image_grid.
+    
+    The grid is written in one copy through a strided view of the output, keeping dtype,
+    device and full precision. A ragged last row is padded with black.
+    
+    Args:
+        images: Tensor [N, H, W, C] or [H, W, C]
+        rows: Number of rows (None to derive from cols)
+        cols: Number of columns (None to derive from rows)
+    
+    Returns:
+        Tensor [1, rows * H, cols * W, C]
+    """
+    if len(images.shape) == 3:
+        images = images.unsqueeze(0)
+    
+    count, height, width, channels = images.shape
+    if rows is None and cols is None:
+        rows = 1
+        cols = count
+    if rows is None:
+        rows = math.ceil(count / cols)
+    if cols is None:
+        cols = math.ceil(count / rows)
+    
+    grid = images.new_empty((rows * height, cols * width, channels))
+    # [rows, H, cols, W, C] view of the grid, each [H, W] block is one cell
+    cells = grid.view(rows, height, cols, width, channels).permute(0, 2, 1, 3, 4)
+    
+    full_rows = min(count // cols, rows)
+    if full_rows:
+        cells[:full_rows] = images[:full_rows * cols].view(full_rows, cols, height, width, channels)
+    if full_rows < rows:
+        remainder = images[full_rows * cols:rows * cols]
+        cells[full_rows, :len(remainder)] = remainder
+        cells[full_rows, len(remainder):] = 0
+        cells[full_rows + 1:] = 0
+    
+    return grid.unsqueeze(0)
+
+def tensor_split_image(images: torch.Tensor, rows: int = None, cols: int = None, crop_excess: bool = True) -> torch.Tensor:
+    """
+    Split every grid image of a batch into its cells, same layout rules as pil_split_image.
+    
+    Cells are gathered with a single reshape/permute copy, keeping dtype, device and full precision.
+    
+    Args:
+        images: Tensor [B, H, W, C] or [H, W, C]
+        rows: Number of rows (None for auto)
+        cols: Number of columns (None for auto)
+        crop_excess: Whether to crop excess pixels or raise error
+    
+    Returns:
+        Tensor [B * rows * cols, H / rows, W / cols, C], cells of each image in row-major order
+    """
+    if len(images.shape) == 3:
+        images = images.unsqueeze(0)
+    
+    batch, height, width, channels = images.shape
+    rows, cols, subimg_width, subimg_height = image_grid_layout(width, height, rows, cols, crop_excess)
+    
+    # Crop to make divisible
+    images = images[:, :rows * subimg_height, :cols * subimg_width]
+    
+    cells = images.reshape(batch, rows, subimg_height, cols, subimg_width, channels).permute(0, 1, 3, 2, 4, 5)
+    return cells.reshape(batch * rows * cols, subimg_height, subimg_width, channels)
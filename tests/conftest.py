@@ -0,0 +1,79 @@
+#---------------------------------------------------------------------------------------------------------------------#
+# Test fixtures for JK Custom Workflow of ComfyUI
+#---------------------------------------------------------------------------------------------------------------------#
+"""
+Tests run without ComfyUI: the host modules the node files import (folder_paths,
+server, nodes, comfy.*) are replaced with minimal stand-ins, and node modules are
+imported as submodules of a stand-in package so the repo root __init__.py, which
+registers nodes with ComfyUI, is not executed.
+"""
+import importlib
+import importlib.util
+import os
+import sys
+import tempfile
+import types
+from unittest import mock
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = "jake_upgrade_test"
+LEGACY_NAME = "jake_upgrade_legacy"
+
+def install_host_stubs():
+    """Register stand-ins for the ComfyUI host modules, keeping real ones when present."""
+    if "folder_paths" not in sys.modules:
+        folder_paths = types.ModuleType("folder_paths")
+        folder_paths.models_dir = os.path.join(REPO_ROOT, "models")
+        folder_paths.folder_names_and_paths = {}
+        folder_paths.get_filename_list = lambda folder_name: []
+        folder_paths.get_full_path = lambda folder_name, filename: None
+        folder_paths.get_input_directory = lambda: tempfile.gettempdir()
+        folder_paths.get_output_directory = lambda: tempfile.gettempdir()
+        folder_paths.get_temp_directory = lambda: tempfile.gettempdir()
+        sys.modules["folder_paths"] = folder_paths
+
+    if "server" not in sys.modules:
+        server = types.ModuleType("server")
+        server.PromptServer = mock.MagicMock(name="PromptServer")
+        sys.modules["server"] = server
+
+    if "nodes" not in sys.modules:
+        nodes = types.ModuleType("nodes")
+        nodes.EXTENSION_WEB_DIRS = {}
+        nodes.MAX_RESOLUTION = 16384
+        nodes.ControlNetApplyAdvanced = type("ControlNetApplyAdvanced", (), {})
+        sys.modules["nodes"] = nodes
+
+    for name in ("comfy", "comfy.sd", "comfy.utils", "comfy.samplers", "comfy.model_management", "comfy.controlnet"):
+        sys.modules.setdefault(name, mock.MagicMock(name=name))
+
+def load_node_module(name: str) -> types.ModuleType:
+    """Import nodes/<name>.py as a package submodule without running the repo root __init__.py."""
+    install_host_stubs()
+    for package, path in ((PACKAGE_NAME, REPO_ROOT), (f"{PACKAGE_NAME}.nodes", os.path.join(REPO_ROOT, "nodes"))):
+        if package not in sys.modules:
+            module = types.ModuleType(package)
+            module.__path__ = [path]
+            sys.modules[package] = module
+    return importlib.import_module(f"{PACKAGE_NAME}.nodes.{name}")
+
+def load_legacy_module() -> types.ModuleType:
+    """Import benchmarks/legacy.py, the reference implementations shared with the benchmarks."""
+    if LEGACY_NAME not in sys.modules:
+        spec = importlib.util.spec_from_file_location(LEGACY_NAME, os.path.join(REPO_ROOT, "benchmarks", "legacy.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[LEGACY_NAME] = module
+        spec.loader.exec_module(module)
+    return sys.modules[LEGACY_NAME]
+
+@pytest.fixture(scope="session")
+def legacy():
+    """The benchmarks/legacy.py module: legacy.clean_prompt_string(...) and friends."""
+    return load_legacy_module()
+
+@pytest.fixture(scope="session")
+def node_module():
+    """Factory fixture: node_module("jake_utils") returns the imported module."""
+    return load_node_module
@@ -0,0 +1,67 @@
+"""color_grading_tensor against the per-frame PIL path ColorGrading_JK used before."""
+import pytest
+import torch
+from PIL import Image
+
+@pytest.fixture(scope="module")
+def utils(node_module):
+    return node_module("jake_utils")
+
+@pytest.fixture(scope="module")
+def tools(node_module):
+    return node_module("jake_tools")
+
+def quantized_batch(batch, height, width, channels, seed):
+    """Random images already on the 8-bit grid, as they arrive from LoadImage."""
+    generator = torch.Generator().manual_seed(seed)
+    return torch.randint(0, 256, (batch, height, width, channels), generator=generator).float() / 255.0
+
+@pytest.mark.parametrize("brightness, contrast, saturation, rgb_offset", [
+    (1.0, 1.0, 1.0, (0, 0, 0)),
+    (1.3, 1.0, 1.0, (0, 0, 0)),
+    (0.6, 1.0, 1.0, (0, 0, 0)),
+    (1.0, 1.8, 1.0, (0, 0, 0)),
+    (1.0, 0.4, 1.0, (0, 0, 0)),
+    (1.0, 1.0, 2.2, (0, 0, 0)),
+    (1.0, 1.0, 0.0, (0, 0, 0)),
+    (1.0, 1.0, 1.0, (40, -25, 255)),
+    (1.2, 1.4, 0.7, (10, 0, -10)),
+    (0.8, 0.7, 1.6, (-255, 5, 0)),
+])
+def test_matches_pil_path(utils, tools, legacy, brightness, contrast, saturation, rgb_offset):
+    images = quantized_batch(3, 24, 32, 3, seed=1)
+
+    expected = legacy.color_grading(utils, tools, images, brightness, contrast, saturation, rgb_offset)
+    result = utils.color_grading_tensor(images, brightness, contrast, saturation, rgb_offset)
+
+    difference = (result - expected).abs()
+    # PIL rounds to uint8 after every step; the tensor path rounds once
+    assert difference.max().item() <= 4 / 255 + 1e-6
+    assert difference.mean().item() <= 1 / 255
+
+def test_alpha_channel_is_preserved(utils, tools, legacy):
+    images = quantized_batch(2, 16, 16, 4, seed=2)
+
+    result = utils.color_grading_tensor(images, 1.2, 0.9, 1.1, (5, 0, 0))
+
+    assert result.shape == images.shape
+    assert torch.equal(result[..., 3], images[..., 3])
+    expected = legacy.color_grading(utils, tools, images, 1.2, 0.9, 1.1, (5, 0, 0))
+    assert (result - expected).abs().max().item() <= 4 / 255 + 1e-6
+
+def test_input_is_not_modified(utils):
+    images = quantized_batch(1, 8, 8, 3, seed=3)
+    original = images.clone()
+
+    utils.color_grading_tensor(images, 1.5, 1.5, 1.5, (10, 10, 10))
+
+    assert torch.equal(images, original)
+
+@pytest.mark.parametrize("offset", [-255, -37, 0, 1, 128, 255])
+def test_gray_offset_lut_matches_per_pixel_loop(utils, offset):
+    gray = Image.frombytes('L', (16, 16), bytes(range(256)))
+
+    result = utils.image_gray_offset(gray, offset)
+
+    expected = [min(max(gray.getpixel((x, y)) + offset, 0), 255) for y in range(16) for x in range(16)]
+    assert list(result.tobytes()) == expected
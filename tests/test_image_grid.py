@@ -0,0 +1,81 @@
+"""tensor_make_image_grid / tensor_split_image against the PIL grid helpers, and lossless round trips."""
+import pytest
+import torch
+
+@pytest.fixture(scope="module")
+def utils(node_module):
+    return node_module("jake_utils")
+
+@pytest.fixture(scope="module")
+def tools(node_module):
+    return node_module("jake_tools")
+
+def random_batch(count, height, width, channels, dtype=torch.float32, seed=0):
+    generator = torch.Generator().manual_seed(seed)
+    return torch.rand(count, height, width, channels, generator=generator, dtype=torch.float64).to(dtype)
+
+def layouts(count):
+    """(rows, cols) arguments as the nodes pass them: one side given, or neither."""
+    yield None, None
+    for side in range(1, 6):
+        yield side, None
+        yield None, side
+
+@pytest.mark.parametrize("count", range(1, 12))
+def test_grid_matches_pil_layout(utils, tools, count):
+    images = random_batch(count, 6, 5, 3, seed=count)
+    for rows, cols in layouts(count):
+        pil_grid = utils.pil_make_image_grid([tools.tensor2pil(image.unsqueeze(0)) for image in images], rows, cols)
+        grid = utils.tensor_make_image_grid(images, rows, cols)
+        expected = tools.pil2tensor(pil_grid)
+        assert grid.shape == expected.shape, (rows, cols)
+        assert (grid - expected).abs().max().item() <= 1 / 255 + 1e-6, (rows, cols)
+
+@pytest.mark.parametrize("dtype", [torch.float32, torch.float16, torch.float64])
+@pytest.mark.parametrize("channels", [1, 3, 4])
+def test_make_then_split_is_lossless(utils, dtype, channels):
+    for count in (1, 5, 7, 12):
+        images = random_batch(count, 9, 7, channels, dtype=dtype, seed=count)
+        for rows, cols in layouts(count):
+            grid = utils.tensor_make_image_grid(images, rows, cols)
+            grid_rows, grid_cols = grid.shape[1] // 9, grid.shape[2] // 7
+            cells = utils.tensor_split_image(grid, grid_rows, grid_cols)
+
+            assert grid.dtype == cells.dtype == dtype
+            assert cells.shape == (grid_rows * grid_cols, 9, 7, channels)
+            # Bit-exact for the real frames, black padding for the ragged tail
+            assert torch.equal(cells[:count], images)
+            assert not cells[count:].any()
+
+def test_split_then_make_is_lossless(utils):
+    grids = random_batch(3, 12, 20, 3, seed=3)
+    cells = utils.tensor_split_image(grids, rows=3, cols=4)
+    assert cells.shape == (3 * 12, 4, 5, 3)
+    for index, grid in enumerate(grids):
+        assert torch.equal(utils.tensor_make_image_grid(cells[index * 12:(index + 1) * 12], rows=3), grid.unsqueeze(0))
+
+def test_split_matches_pil_cells(utils, tools):
+    grid = random_batch(1, 23, 31, 3, seed=5)
+    for rows, cols in [(2, None), (None, 3), (3, 4), (5, 5)]:
+        pil_cells = utils.pil_split_image(tools.tensor2pil(grid), rows, cols)
+        cells = utils.tensor_split_image(grid, rows, cols)
+        expected = torch.cat([tools.pil2tensor(cell) for cell in pil_cells])
+        assert cells.shape == expected.shape
+        assert (cells - expected).abs().max().item() <= 1 / 255 + 1e-6
+
+def test_split_errors_match_pil(utils, tools):
+    grid = random_batch(1, 10, 10, 3)
+    for rows, cols, crop_excess in [(3, None, False), (None, 20, True), (0, None, True), (11, 11, True)]:
+        with pytest.raises(ValueError) as pil_error:
+            utils.pil_split_image(tools.tensor2pil(grid), rows, cols, crop_excess)
+        with pytest.raises(ValueError) as tensor_error:
+            utils.tensor_split_image(grid, rows, cols, crop_excess)
+        assert str(tensor_error.value) == str(pil_error.value)
+
+def test_grid_does_not_modify_input(utils):
+    images = random_batch(7, 8, 8, 3)
+    original = images.clone()
+    grid = utils.tensor_make_image_grid(images, cols=3)
+    assert torch.equal(images, original)
+    assert grid.shape == (1, 3 * 8, 3 * 8, 3)
+    assert grid.is_contiguous() and grid.untyped_storage().nbytes() == grid.numel() * grid.element_size()
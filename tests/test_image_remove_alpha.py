@@ -0,0 +1,126 @@
+"""ImageRemoveAlpha_JK against PIL compositing, with masks in the ComfyUI convention alpha = 1 - mask."""
+import numpy
+import pytest
+import torch
+from PIL import Image
+
+TOLERANCE = 1 / 255 + 1e-6
+BACKGROUNDS = ["#000000", "#ffffff", "#3a7fc0"]
+
+@pytest.fixture(scope="module")
+def node(node_module):
+    return node_module("jake_node_image").ImageRemoveAlpha_JK()
+
+@pytest.fixture(scope="module")
+def utils(node_module):
+    return node_module("jake_utils")
+
+def rgba_batch(batch=3, height=17, width=23, seed=0):
+    """Random 8-bit RGBA frames, with fully transparent and fully opaque pixels mixed in."""
+    generator = torch.Generator().manual_seed(seed)
+    pixels = torch.randint(0, 256, (batch, height, width, 4), generator=generator, dtype=torch.uint8)
+    pixels[:, ::5, :, 3] = 0
+    pixels[:, 1::5, :, 3] = 255
+    return pixels
+
+def to_float(pixels):
+    return pixels.float() / 255.0
+
+def pil_composite(utils, pixels, background_color):
+    """Image.alpha_composite of each straight-alpha frame over a solid background."""
+    background = Image.new("RGBA", (pixels.shape[2], pixels.shape[1]), utils.hex_to_rgb(background_color) + (255,))
+    frames = []
+    for frame in pixels.numpy():
+        composite = Image.alpha_composite(background, Image.fromarray(frame, "RGBA")).convert("RGB")
+        frames.append(torch.from_numpy(numpy.array(composite)))
+    return to_float(torch.stack(frames))
+
+def pil_premultiplied(pixels):
+    """The same frames as PIL premultiplies them (mode RGBa)."""
+    frames = [numpy.array(Image.fromarray(frame, "RGBA").convert("RGBa")) for frame in pixels.numpy()]
+    return to_float(torch.from_numpy(numpy.stack(frames)))
+
+def loadimage_mask(pixels):
+    """The MASK LoadImage outputs for these frames: 1 - alpha."""
+    return 1.0 - to_float(pixels[..., 3])
+
+def assert_close(result, expected):
+    assert result.shape == expected.shape
+    assert (result - expected).abs().max().item() <= TOLERANCE
+
+def test_discard_matches_pil_convert(node):
+    pixels = rgba_batch()
+    (result,) = node.image_remove_alpha(to_float(pixels), "discard")
+    expected = torch.stack([torch.from_numpy(numpy.array(Image.fromarray(frame, "RGBA").convert("RGB"))) for frame in pixels.numpy()])
+    assert torch.equal(result, to_float(expected))
+
+@pytest.mark.parametrize("background_color", BACKGROUNDS)
+def test_straight_alpha_channel_matches_pil(node, utils, background_color):
+    pixels = rgba_batch(seed=1)
+    (result,) = node.image_remove_alpha(to_float(pixels), "straight", background_color)
+    assert_close(result, pil_composite(utils, pixels, background_color))
+
+@pytest.mark.parametrize("background_color", BACKGROUNDS)
+def test_premultiplied_alpha_channel_matches_pil(node, utils, background_color):
+    pixels = rgba_batch(seed=2)
+    (result,) = node.image_remove_alpha(pil_premultiplied(pixels), "premultiplied", background_color)
+    assert_close(result, pil_composite(utils, pixels, background_color))
+
+@pytest.mark.parametrize("background_color", BACKGROUNDS)
+def test_loadimage_mask_matches_pil(node, utils, background_color):
+    # LoadImage splits an RGBA file into an RGB image and mask = 1 - alpha
+    pixels = rgba_batch(seed=3)
+    rgb, mask = to_float(pixels[..., :3]), loadimage_mask(pixels)
+    (result,) = node.image_remove_alpha(rgb, "straight", background_color, mask=mask)
+    assert_close(result, pil_composite(utils, pixels, background_color))
+
+    premultiplied = pil_premultiplied(pixels)[..., :3]
+    (result,) = node.image_remove_alpha(premultiplied, "premultiplied", background_color, mask=mask)
+    assert_close(result, pil_composite(utils, pixels, background_color))
+
+def test_mask_overrides_alpha_channel(node, utils):
+    pixels = rgba_batch(seed=4)
+    other = rgba_batch(seed=5)
+    # RGB of other with the alpha channel of pixels; the mask of other must win
+    image = to_float(torch.cat([other[..., :3], pixels[..., 3:]], dim=-1))
+    (result,) = node.image_remove_alpha(image, "straight", "#ffffff", mask=loadimage_mask(other))
+    assert_close(result, pil_composite(utils, other, "#ffffff"))
+
+def test_empty_mask_keeps_image_opaque(node):
+    # An all-zero mask is what LoadImage outputs for a file without alpha
+    pixels = rgba_batch(seed=6)
+    image = to_float(pixels)
+    (result,) = node.image_remove_alpha(image, "straight", "#ff00ff", mask=torch.zeros(pixels.shape[:3]))
+    assert torch.equal(result, image[..., :3])
+
+def test_loadimage_placeholder_mask_is_resized(node, utils):
+    # LoadImage outputs a 64x64 zero mask for a JPEG, whatever the image size
+    pixels = rgba_batch(batch=2, height=90, width=120, seed=9)
+    image = to_float(pixels[..., :3])
+    (result,) = node.image_remove_alpha(image, "straight", "#ff00ff", mask=torch.zeros(1, 64, 64))
+    assert torch.equal(result, image)
+
+    # A non-empty mask is resized like JoinImageWithAlpha resizes it
+    mask = loadimage_mask(rgba_batch(batch=2, height=30, width=40, seed=10))
+    resized = torch.nn.functional.interpolate(mask.unsqueeze(1), size=(90, 120), mode="bilinear").squeeze(1)
+    assert torch.equal(utils.composite_alpha_tensor(image, mask=mask, background=(255, 0, 255)),
+                       utils.composite_alpha_tensor(image, mask=resized, background=(255, 0, 255)))
+
+def test_single_mask_broadcasts_over_batch(node):
+    pixels = rgba_batch(batch=4, seed=7)
+    image, mask = to_float(pixels), loadimage_mask(pixels[:1])[0]
+    (result,) = node.image_remove_alpha(image, "straight", "#808080", mask=mask)
+    for index in range(4):
+        (frame,) = node.image_remove_alpha(image[index:index + 1], "straight", "#808080", mask=mask.unsqueeze(0))
+        assert torch.equal(result[index:index + 1], frame)
+
+def test_chunked_output_is_identical(utils):
+    pixels = rgba_batch(batch=7, seed=8)
+    image, mask = to_float(pixels[..., :3]), loadimage_mask(pixels)
+    whole = utils.composite_alpha_tensor(image, mask=mask, background=(10, 200, 30), chunk_size=16)
+    chunked = utils.composite_alpha_tensor(image, mask=mask, background=(10, 200, 30), chunk_size=2)
+    assert torch.equal(whole, chunked)
+
+def test_mismatched_mask_raises(utils):
+    with pytest.raises(ValueError, match="Mask shape"):
+        utils.composite_alpha_tensor(torch.zeros(2, 8, 8, 3), mask=torch.zeros(3, 8, 8))
@@ -0,0 +1,74 @@
+"""Input switch nodes request only the selected branch from the executor."""
+import inspect
+import itertools
+
+import pytest
+
+@pytest.fixture(scope="module")
+def switch_module(node_module):
+    return node_module("jake_node_switch")
+
+def switch_classes(module):
+    return [cls for _, cls in inspect.getmembers(module, inspect.isclass)
+            if issubclass(cls, module.LazySwitch) and cls is not module.LazySwitch]
+
+def run_with_mock_executor(node_class, boolean_value, linked, widget_values):
+    """
+    Execute a node the way ComfyUI handles lazy inputs: linked lazy inputs start as None and are
+    evaluated only when check_lazy_status names them; unlinked optional inputs are left out.
+    Returns (node output, names of the upstream branches that were evaluated).
+    """
+    upstream = {name: f"<{name} output>" for name in linked}
+    kwargs = {"boolean_value": boolean_value, **widget_values}
+    kwargs.update({name: None for name in linked})
+    evaluated = []
+
+    node = node_class()
+    for _ in range(4):
+        needed = [name for name in node.check_lazy_status(**kwargs) if name in linked and kwargs[name] is None]
+        if not needed:
+            break
+        for name in needed:
+            evaluated.append(name)
+            kwargs[name] = upstream[name]
+    else:
+        raise AssertionError("check_lazy_status kept requesting inputs")
+
+    return getattr(node, node_class.FUNCTION)(**kwargs), evaluated
+
+def test_every_input_switch_is_lazy(switch_module):
+    classes = switch_classes(switch_module)
+    assert len(classes) == 22
+    for node_class in classes:
+        false_input, true_input = node_class.SWITCH_INPUTS
+        spec = node_class.INPUT_TYPES()
+        assert spec["required"][false_input][1]["lazy"] is True
+        assert spec["optional"][true_input][1]["lazy"] is True
+
+@pytest.mark.parametrize("boolean_value, true_linked", list(itertools.product([False, True], [False, True])))
+def test_only_selected_branch_is_evaluated(switch_module, boolean_value, true_linked):
+    for node_class in switch_classes(switch_module):
+        false_input, true_input = node_class.SWITCH_INPUTS
+        linked = {false_input} | ({true_input} if true_linked else set())
+
+        output, evaluated = run_with_mock_executor(node_class, boolean_value, linked, {})
+
+        selected = true_input if boolean_value and true_linked else false_input
+        assert evaluated == [selected], node_class.__name__
+        assert output[0] == f"<{selected} output>", node_class.__name__
+
+@pytest.mark.parametrize("boolean_value", [False, True])
+def test_widget_false_input_is_not_requested(switch_module, boolean_value):
+    widget_types = {"INT", "FLOAT", "STRING", "BOOLEAN"}
+    checked = 0
+    for node_class in switch_classes(switch_module):
+        false_input, true_input = node_class.SWITCH_INPUTS
+        if node_class.INPUT_TYPES()["required"][false_input][0] not in widget_types:
+            continue
+        checked += 1
+
+        output, evaluated = run_with_mock_executor(node_class, boolean_value, {true_input}, {false_input: "widget value"})
+
+        assert evaluated == ([true_input] if boolean_value else []), node_class.__name__
+        assert output[0] == (f"<{true_input} output>" if boolean_value else "widget value"), node_class.__name__
+    assert checked > 0
@@ -0,0 +1,138 @@
+"""Batch mode of the Evaluate nodes must match the scalar path element by element."""
+import random
+
+import pytest
+import torch
+
+INT_EXPRESSIONS = [
+    "((a + b) - c) / 2",
+    "a + b * c",
+    "a - b - c",
+    "a // b",
+    "a % b",
+    "-a + (b << 3) - (c >> 1)",
+    "a ** 2 - b ** 3",
+    "a ** -1",
+    "a if a > b else b - c",
+    "(a > b) + (b > c)",
+    "a and b or c",
+    "~a ^ b & c",
+    "int(a / b)",
+    "float(a) * 0.5",
+]
+
+FLOAT_EXPRESSIONS = [
+    "((a + b) - c) / 2",
+    "a * 0.5 + b ** 2 - c",
+    "a // b + a % b",
+    "a if a < c else -b",
+    "int(a) + float(b)",
+    "(a > 0.5) * c",
+]
+
+@pytest.fixture(scope="module")
+def math_nodes(node_module):
+    return node_module("jake_node_math")
+
+def scalar_results(node, expression, columns):
+    """Evaluate each element through the scalar node path"""
+    results = [node.evaluate(expression, a=a, b=b, c=c) for a, b, c in zip(*columns)]
+    return [list(values) for values in zip(*results)]
+
+def batch_results(node, expression, columns, batch_output="list"):
+    a, b, c = columns
+    return node.evaluate(expression, a_batch=a, b_batch=b, c_batch=c, batch_output=batch_output)
+
+def assert_equivalent(node, expression, columns):
+    ints, floats, strings = scalar_results(node, expression, columns)
+    batch_ints, batch_floats, batch_string = batch_results(node, expression, columns)
+    assert batch_ints == ints, expression
+    assert batch_floats == pytest.approx(floats, rel=1e-15, abs=0), expression
+    assert batch_string == "[" + ", ".join(strings) + "]", expression
+
+@pytest.mark.parametrize("expression", INT_EXPRESSIONS)
+def test_int_batch_matches_scalar(math_nodes, expression):
+    rng = random.Random(expression)
+    size = 200
+    columns = [
+        [rng.randint(-1000, 1000) for _ in range(size)],
+        [rng.choice([-1, 1]) * rng.randint(1, 50) for _ in range(size)],
+        [rng.randint(0, 40) for _ in range(size)],
+    ]
+    assert_equivalent(math_nodes.EvaluateInts_JK(), expression, columns)
+
+@pytest.mark.parametrize("expression", FLOAT_EXPRESSIONS)
+def test_float_batch_matches_scalar(math_nodes, expression):
+    rng = random.Random(expression)
+    size = 200
+    columns = [
+        [rng.uniform(-100, 100) for _ in range(size)],
+        [rng.choice([-1, 1]) * rng.uniform(0.1, 10) for _ in range(size)],
+        [rng.uniform(-1, 1) for _ in range(size)],
+    ]
+    assert_equivalent(math_nodes.EvaluateFloats_JK(), expression, columns)
+
+@pytest.mark.parametrize("expression", ["a // b", "a % b", "a / b", "0 ** -b"])
+@pytest.mark.parametrize("dtype_name", ["int64", "float64"])
+def test_zero_divisor_raises(math_nodes, expression, dtype_name):
+    dtype = getattr(math_nodes.numpy, dtype_name)
+    with pytest.raises(ZeroDivisionError):
+        math_nodes.evaluate_batch(expression, {"a": [4, 5, 6], "b": [2, 0, 3], "c": 0}, dtype)
+
+def test_zero_divisor_node_error_matches_scalar(math_nodes):
+    node = math_nodes.EvaluateInts_JK()
+    with pytest.raises(ValueError) as scalar_error:
+        node.evaluate("a % b", a=5, b=0)
+    with pytest.raises(ValueError) as batch_error:
+        node.evaluate("a % b", a_batch=[4, 5], b_batch=[2, 0])
+    assert str(batch_error.value) == str(scalar_error.value)
+
+def test_guarded_division_is_not_an_error(math_nodes):
+    columns = [[4, 5, 6], [2, 0, 3], [0, 0, 0]]
+    assert_equivalent(math_nodes.EvaluateInts_JK(), "a // b if b != 0 else -1", columns)
+
+@pytest.mark.parametrize("expression, a, b", [
+    ("a * b", 2 ** 62, 4),
+    ("a + b", 2 ** 63 - 1, 1),
+    ("a - b", -(2 ** 63), 1),
+    ("a ** b", 3, 40),
+    ("a << b", 1, 70),
+    ("-a", -(2 ** 63), 0),
+    ("a // b", -(2 ** 63), -1),
+    ("a * b", 2 ** 70, 1),
+])
+def test_int64_overflow_matches_python(math_nodes, expression, a, b):
+    columns = [[a, 1], [b, 1], [0, 0]]
+    ints, _, _ = scalar_results(math_nodes.EvaluateInts_JK(), expression, columns)
+    assert not -(2 ** 63) <= ints[0] < 2 ** 63
+    assert_equivalent(math_nodes.EvaluateInts_JK(), expression, columns)
+
+def test_overflow_does_not_wrap(math_nodes):
+    ints, _, string = math_nodes.evaluate_batch("a * b", {"a": [2 ** 62], "b": [4], "c": 0}, math_nodes.numpy.int64)
+    assert ints == [2 ** 64]
+    assert string == str([2 ** 64])
+
+def test_overflow_tensor_output_is_an_error(math_nodes):
+    with pytest.raises(ValueError):
+        math_nodes.EvaluateInts_JK().evaluate("a * b", a_batch=[2 ** 62], b_batch=[4], batch_output="tensor")
+
+def test_tensor_output(math_nodes):
+    ints, floats, _ = batch_results(math_nodes.EvaluateFloats_JK(), "a / 2", ([1.0, 3.0, -5.0], [0.0] * 3, [0.0] * 3), "tensor")
+    assert ints.dtype == torch.int64 and ints.tolist() == [0, 1, -2]
+    assert floats.dtype == torch.float32 and floats.tolist() == [0.5, 1.5, -2.5]
+
+def test_broadcast_scalar_inputs(math_nodes):
+    ints, _, _ = math_nodes.EvaluateInts_JK().evaluate("a + b + c", a=10, b_batch=torch.arange(4), c=1)
+    assert ints == [11, 12, 13, 14]
+
+def test_mismatched_lengths(math_nodes):
+    with pytest.raises(ValueError, match="mismatched lengths"):
+        math_nodes.EvaluateInts_JK().evaluate("a + b", a_batch=[1, 2], b_batch=[1, 2, 3])
+
+def test_large_batch_stays_vectorized(math_nodes, monkeypatch):
+    def no_fallback(*args):
+        raise AssertionError("element-wise fallback used")
+    monkeypatch.setattr(math_nodes, "evaluate_elements", no_fallback)
+    values = list(range(100_000))
+    ints, _, _ = math_nodes.EvaluateInts_JK().evaluate("a * 2 - b // 3", a_batch=values, b_batch=values)
+    assert ints[-1] == 99_999 * 2 - 99_999 // 3
@@ -0,0 +1,141 @@
+"""MESH V2 and SMPL mesh sequence files: round trips, error bounds and size ratios."""
+import numpy as np
+import pytest
+
+@pytest.fixture(scope="module")
+def sam3dseq(node_module):
+    return node_module("jake_node_3d_sam3dseq")
+
+@pytest.fixture(scope="module")
+def sequence():
+    """Smoothly moving synthetic body: 75 frames of 3000 vertices, about 1.8 units tall, as a triangle strip."""
+    rng = np.random.default_rng(0)
+    base = rng.uniform([-0.3, 0.0, -0.2], [0.3, 1.8, 0.2], size=(3000, 3)).astype(np.float32)
+    # Real meshes number neighbouring vertices close together; sorting by height gives similar locality
+    base = base[np.argsort(base[:, 1])]
+    t = np.arange(75, dtype=np.float32)[:, None, None] / 30.0
+    sway = 0.05 * np.sin(2 * np.pi * (t + base[None, :, 1:2]))
+    walk = np.concatenate([0.4 * t, np.zeros_like(t), 0.1 * t], axis=-1)
+    vertices = base[None] + walk + sway * np.array([1.0, 0.2, 0.5], dtype=np.float32)
+    strip = np.arange(2998, dtype=np.uint32)
+    faces = np.stack([strip, strip + 1, strip + 2], axis=1)
+    return vertices.astype(np.float32), faces
+
+def raw_size(vertices, faces):
+    return vertices.size * 4 + faces.size * 4
+
+def quantization_bound(vertices):
+    """Half a quantization step of the widest frame: extent / 2 / QUANT_MAX / 2, plus float32 rounding."""
+    extent = (vertices.max(axis=1) - vertices.min(axis=1)).max(axis=0)
+    return extent / 2 / 32767 / 2 * 1.01 + 1e-6
+
+@pytest.mark.parametrize("quantize, delta, compression", [
+    (True, True, "zlib"),
+    (True, False, "zlib"),
+    (True, True, "none"),
+    (True, False, "none"),
+    (False, True, "zlib"),
+    (False, False, "none"),
+])
+def test_v2_round_trip_error_is_bounded(sam3dseq, sequence, tmp_path, quantize, delta, compression):
+    vertices, faces = sequence
+    path = tmp_path / "sequence.bin"
+
+    sam3dseq.MeshSequenceBinaryFormat.save_v2(vertices, faces, path, fps=24.0, coordinate_transform="none",
+                                               quantize=quantize, delta=delta, compression=compression)
+    loaded = sam3dseq.MeshSequenceBinaryFormat.load(path)
+
+    assert loaded["vertices"].shape == vertices.shape and loaded["vertices"].dtype == np.float32
+    assert np.array_equal(loaded["faces"], faces)
+    assert loaded["fps"] == 24.0
+    error = np.abs(loaded["vertices"] - vertices).max(axis=(0, 1))
+    if quantize:
+        assert np.all(error <= quantization_bound(vertices))
+    elif delta:
+        # Deltas are added back in float32, a few ulps at most
+        assert np.all(error <= 1e-6 * np.abs(vertices).max())
+    else:
+        assert np.all(error == 0)
+
+def test_delta_error_does_not_accumulate(sam3dseq, sequence, tmp_path):
+    vertices, faces = sequence
+    path = tmp_path / "sequence.bin"
+    sam3dseq.MeshSequenceBinaryFormat.save_v2(vertices, faces, path, coordinate_transform="none", keyframe_interval=75)
+
+    loaded = sam3dseq.MeshSequenceBinaryFormat.load(path)["vertices"]
+
+    per_frame_error = np.abs(loaded - vertices).max(axis=(1, 2))
+    assert per_frame_error[-10:].max() <= 1.5 * per_frame_error[:10].max() + 1e-7
+
+@pytest.mark.parametrize("quantize, delta, compression, min_ratio", [
+    (True, False, "none", 1.9),
+    (True, False, "zlib", 2.0),
+    (True, True, "zlib", 4.0),
+])
+def test_v2_size_ratio(sam3dseq, sequence, tmp_path, quantize, delta, compression, min_ratio):
+    vertices, faces = sequence
+    path = tmp_path / "sequence.bin"
+
+    info = sam3dseq.MeshSequenceBinaryFormat.save_v2(vertices, faces, path, coordinate_transform="none",
+                                                      quantize=quantize, delta=delta, compression=compression)
+
+    assert raw_size(vertices, faces) / path.stat().st_size >= min_ratio
+    assert info["compression_ratio"] == pytest.approx(raw_size(vertices, faces) / path.stat().st_size)
+
+def test_delta_encoding_shrinks_smooth_motion(sam3dseq, sequence, tmp_path):
+    vertices, faces = sequence
+    sizes = {}
+    for delta in (False, True):
+        path = tmp_path / f"delta_{delta}.bin"
+        sam3dseq.MeshSequenceBinaryFormat.save_v2(vertices, faces, path, coordinate_transform="none", delta=delta)
+        sizes[delta] = path.stat().st_size
+
+    assert sizes[True] < sizes[False]
+
+def test_reader_random_access_matches_sequential(sam3dseq, sequence, tmp_path):
+    vertices, faces = sequence
+    path = tmp_path / "sequence.bin"
+    sam3dseq.MeshSequenceBinaryFormat.save_v2(vertices, faces, path, coordinate_transform="none", keyframe_interval=10)
+
+    with sam3dseq.MeshSequenceReader(path) as reader:
+        sequential = reader.read_all()
+        for frame_idx in (74, 3, 41, 40, 39, 0, -1, 12, 13, 19):
+            assert np.array_equal(reader.read_frame(frame_idx), sequential[frame_idx])
+        with pytest.raises(IndexError):
+            reader.read_frame(75)
+
+def test_smpl_round_trip_is_exact(sam3dseq, sequence, tmp_path):
+    vertices, faces = sequence
+    path = tmp_path / "sequence.bin"
+
+    sam3dseq.MeshSequenceBinaryFormat.save_smpl_compatible(vertices, faces, path, fps=30.0, coordinate_transform="none")
+    loaded = sam3dseq.MeshSequenceBinaryFormat.load(path)
+
+    assert np.array_equal(loaded["vertices"], vertices)
+    assert np.array_equal(loaded["faces"], faces)
+    assert path.stat().st_size >= raw_size(vertices, faces)
+
+def test_lzma_is_not_offered_for_writing(sam3dseq, sequence, tmp_path):
+    vertices, faces = sequence
+    with pytest.raises(ValueError):
+        sam3dseq.MeshSequenceBinaryFormat.save_v2(vertices, faces, tmp_path / "sequence.bin", compression="lzma")
+
+def test_reader_rejects_unknown_flags(sam3dseq, sequence, tmp_path):
+    vertices, faces = sequence
+    path = tmp_path / "sequence.bin"
+    sam3dseq.MeshSequenceBinaryFormat.save_v2(vertices[:3], faces, path)
+
+    # Set bit 8, which the format does not define, in the header flags field
+    data = bytearray(path.read_bytes())
+    flags_offset = sam3dseq.struct.calcsize("<4sIIIIf")
+    flags = int.from_bytes(data[flags_offset:flags_offset + 4], "little")
+    data[flags_offset:flags_offset + 4] = (flags | 8).to_bytes(4, "little")
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="Unsupported flags"):
+        sam3dseq.MeshSequenceReader(path)
+
+def test_node_defaults_to_smpl(sam3dseq):
+    spec = sam3dseq.SAM3DMeshSequenceFromVideo_JK.INPUT_TYPES()
+    inputs = {**spec["required"], **spec.get("optional", {})}
+    assert inputs["binary_format"][1]["default"] == "smpl"
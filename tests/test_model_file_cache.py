@@ -0,0 +1,117 @@
+"""ModelFileCache with a stand-in loader: byte budget, mtime invalidation and hit/miss counters."""
+import os
+
+import pytest
+import torch
+
+@pytest.fixture(scope="module")
+def tools(node_module):
+    return node_module("jake_tools")
+
+class CountingLoader:
+    """Loader that returns a state dict of the requested size and records every call."""
+
+    def __init__(self, sizes):
+        self.sizes = sizes
+        self.calls = []
+
+    def __call__(self, file_path):
+        self.calls.append(os.path.basename(file_path))
+        return {"weight": torch.zeros(self.sizes[os.path.basename(file_path)], dtype=torch.uint8)}
+
+@pytest.fixture
+def model_files(tmp_path):
+    def make(name, content=b"x"):
+        path = tmp_path / name
+        path.write_bytes(content)
+        return str(path)
+    return make
+
+def bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+def test_hits_and_misses_are_counted(tools, model_files):
+    cache = tools.ModelFileCache("test", 1000, tools.state_dict_nbytes)
+    loader = CountingLoader({"a.safetensors": 100, "b.safetensors": 200})
+    a, b = model_files("a.safetensors"), model_files("b.safetensors")
+
+    first = cache.get(a, loader)
+    assert cache.get(a, loader) is first
+    cache.get(b, loader)
+    cache.get(a, loader)
+
+    assert loader.calls == ["a.safetensors", "b.safetensors"]
+    assert cache.stats() == {"entries": 2, "bytes": 300, "max_bytes": 1000, "hits": 2, "misses": 2}
+
+def test_least_recently_used_entries_are_evicted_over_budget(tools, model_files):
+    cache = tools.ModelFileCache("test", 500, tools.state_dict_nbytes)
+    loader = CountingLoader({"a.safetensors": 200, "b.safetensors": 200, "c.safetensors": 200})
+    a, b, c = (model_files(name) for name in ("a.safetensors", "b.safetensors", "c.safetensors"))
+
+    cache.get(a, loader)
+    cache.get(b, loader)
+    cache.get(a, loader)  # a is now more recent than b
+    cache.get(c, loader)  # 600 bytes > 500, evicts b
+
+    assert cache.stats()["bytes"] == 400
+    cache.get(a, loader)
+    cache.get(c, loader)
+    assert loader.calls == ["a.safetensors", "b.safetensors", "c.safetensors"]
+    cache.get(b, loader)
+    assert loader.calls[-1] == "b.safetensors"
+    assert cache.stats()["bytes"] <= 500
+
+def test_object_larger_than_budget_is_returned_but_not_kept(tools, model_files):
+    cache = tools.ModelFileCache("test", 100, tools.state_dict_nbytes)
+    loader = CountingLoader({"small.safetensors": 50, "huge.safetensors": 1000})
+    small, huge = model_files("small.safetensors"), model_files("huge.safetensors")
+
+    cache.get(small, loader)
+    value = cache.get(huge, loader)
+
+    assert value["weight"].numel() == 1000
+    assert cache.stats()["entries"] == 1 and cache.stats()["bytes"] == 50
+    cache.get(huge, loader)
+    assert loader.calls.count("huge.safetensors") == 2
+
+def test_changed_file_is_reloaded_and_old_version_dropped(tools, model_files):
+    cache = tools.ModelFileCache("test", 1000, tools.state_dict_nbytes)
+    loader = CountingLoader({"a.safetensors": 100})
+    a = model_files("a.safetensors")
+
+    first = cache.get(a, loader)
+    bump_mtime(a)
+    second = cache.get(a, loader)
+
+    assert second is not first
+    assert loader.calls == ["a.safetensors", "a.safetensors"]
+    assert cache.stats()["entries"] == 1 and cache.stats()["bytes"] == 100
+
+    # A replaced file with a different size is also a new key
+    with open(a, "wb") as f:
+        f.write(b"replaced")
+    cache.get(a, loader)
+    assert len(loader.calls) == 3
+
+def test_evict_and_clear(tools, model_files):
+    cache = tools.ModelFileCache("test", 1000, tools.state_dict_nbytes)
+    loader = CountingLoader({"a.safetensors": 100, "b.safetensors": 100})
+    a, b = model_files("a.safetensors"), model_files("b.safetensors")
+    cache.get(a, loader)
+    cache.get(b, loader)
+
+    assert cache.evict(a) is True
+    assert cache.evict(a) is False
+    assert cache.stats()["entries"] == 1 and cache.stats()["bytes"] == 100
+
+    cache.clear()
+    assert cache.stats() == {"entries": 0, "bytes": 0, "max_bytes": 1000, "hits": 0, "misses": 0}
+
+def test_missing_file_raises_without_calling_loader(tools, tmp_path):
+    cache = tools.ModelFileCache("test", 1000, tools.state_dict_nbytes)
+    loader = CountingLoader({})
+
+    with pytest.raises(OSError):
+        cache.get(str(tmp_path / "missing.safetensors"), loader)
+    assert loader.calls == []
@@ -0,0 +1,73 @@
+"""OpenDWPose_JK must keep the per-color numpy matching it replaced, including its exact float tolerance."""
+import pytest
+import torch
+
+@pytest.fixture(scope="module")
+def node(node_module):
+    return node_module("jake_node_image").OpenDWPose_JK()
+
+def render_pose(node, generator, batch=2, height=96, width=128):
+    """Limb-like bars in pose colors on black, with anti-aliased edges and per-pixel color jitter."""
+    colors = sorted(set(node.DWPOSE_REMOVE_COLORS) | set(node.OPENPOSE_RESERVE_COLORS) | {"#00ff00", "#0000ff", "#ffff00"})
+    palette = torch.tensor([node.hex_to_rgb(c) for c in colors], dtype=torch.float32) / 255.0
+    images = torch.zeros(batch, height, width, 3)
+    for b in range(batch):
+        for _ in range(14):
+            y, x = torch.randint(0, height - 8, (1,), generator=generator).item(), torch.randint(0, width - 30, (1,), generator=generator).item()
+            color = palette[torch.randint(0, len(colors), (1,), generator=generator)]
+            coverage = torch.ones(6, 28)
+            coverage[0], coverage[-1] = 0.5, 0.25
+            images[b, y:y + 6, x:x + 28] = coverage[..., None] * color
+    jitter = (torch.rand(images.shape, generator=generator) - 0.5) * (6.0 / 255.0)
+    return (images + jitter * (images > 0)).clamp(0, 1)
+
+def boundary_pixels(node):
+    """Values right at the edge of the 0.01 tolerance, past 8-bit rounding and outside [0, 1]."""
+    values = []
+    for hex_color in node.OPENPOSE_RESERVE_COLORS:
+        target = torch.tensor(node.hex_to_rgb(hex_color), dtype=torch.float32) / 255.0
+        for delta in (0.0, 0.0099, -0.0099, 0.01, 0.0101, 2.52 / 255.0, -2.52 / 255.0, 3.0 / 255.0, 0.02, -0.02):
+            for channel in range(3):
+                pixel = target.clone()
+                pixel[channel] += delta
+                values.append(pixel)
+    values.append(torch.tensor([float("nan"), 0.0, 0.6]))
+    values.append(torch.tensor([1.0, float("inf"), 1.0]))
+    pixels = torch.stack(values)
+    return pixels.view(1, 1, -1, 3)
+
+def test_synthetic_renders_match_legacy(node, legacy):
+    generator = torch.Generator().manual_seed(0)
+    for _ in range(5):
+        dwpose, openpose = render_pose(node, generator), render_pose(node, generator)
+        (result,) = node.add_images(dwpose, openpose)
+        assert torch.equal(result, torch.from_numpy(legacy.open_dwpose_add_images(node, dwpose, openpose)))
+
+def test_tolerance_boundary_matches_legacy(node, legacy):
+    pixels = boundary_pixels(node)
+    (result,) = node.add_images(pixels, pixels)
+    expected = torch.from_numpy(legacy.open_dwpose_add_images(node, pixels, pixels))
+    assert torch.equal(result.nan_to_num(-1.0), expected.nan_to_num(-1.0))
+
+def test_values_that_round_three_steps_away_still_match(node):
+    # 2.52 in 8-bit steps rounds to 3 but is within the 0.01 float tolerance
+    target = torch.tensor(node.hex_to_rgb("#ff0055"), dtype=torch.float32) / 255.0
+    pixel = target.clone()
+    pixel[2] += 2.52 / 255.0
+    assert node.color_mask(pixel.view(1, 1, 1, 3), ["#ff0055"]).item()
+    pixel[2] += 0.5 / 255.0
+    assert not node.color_mask(pixel.view(1, 1, 1, 3), ["#ff0055"]).item()
+
+def test_single_dwpose_broadcasts_over_openpose_batch(node, legacy):
+    generator = torch.Generator().manual_seed(1)
+    dwpose, openpose = render_pose(node, generator, batch=1), render_pose(node, generator, batch=3)
+    (result,) = node.add_images(dwpose, openpose)
+    assert result.shape == openpose.shape
+    assert torch.equal(result, torch.from_numpy(legacy.open_dwpose_add_images(node, dwpose, openpose)))
+
+def test_inputs_are_not_modified(node):
+    generator = torch.Generator().manual_seed(2)
+    dwpose, openpose = render_pose(node, generator), render_pose(node, generator)
+    dwpose_copy, openpose_copy = dwpose.clone(), openpose.clone()
+    node.add_images(dwpose, openpose)
+    assert torch.equal(dwpose, dwpose_copy) and torch.equal(openpose, openpose_copy)
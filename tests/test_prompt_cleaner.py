@@ -0,0 +1,77 @@
+"""DataCleaner.clean_prompt_string must keep the output of the multi-pass regex cleaner it replaced."""
+import random
+import re
+
+import pytest
+
+PUNCTUATION = ",.，。;；?？!！"
+SPACES = [" ", "  ", "\t", "\n", "\r\n", "　", "\xa0", " "]
+WORDS = ["a", "cat", "red dress", "soft light", "8k", "猫", "柔光", "(word:1.2)", "[tag]", "a-b", "x_y", "'quoted'"]
+LANGUAGES = ["english", "chinese", "japanese", "korean", "french"]
+
+@pytest.fixture(scope="module")
+def cleaner(node_module):
+    return node_module("jake_node_prompt_shared").DataCleaner
+
+def random_punctuation_run(rng, max_length):
+    return "".join(rng.choice(PUNCTUATION + " ") for _ in range(rng.randint(1, max_length)))
+
+def random_prompt(rng):
+    """Words separated by runs of punctuation and mixed whitespace, occasionally very long runs."""
+    parts = []
+    for _ in range(rng.randint(0, 12)):
+        roll = rng.random()
+        if roll < 0.45:
+            parts.append(rng.choice(WORDS))
+        elif roll < 0.75:
+            parts.append(rng.choice(SPACES))
+        elif roll < 0.97:
+            parts.append(random_punctuation_run(rng, 6))
+        else:
+            parts.append(random_punctuation_run(rng, 200))
+    return "".join(parts)
+
+def random_characters(rng):
+    """Arbitrary characters drawn from the classes the cleaner treats specially."""
+    alphabet = PUNCTUATION + "".join(SPACES) + "ab猫 \x0b\x0c "
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+
+@pytest.mark.parametrize("language", LANGUAGES)
+def test_matches_legacy_on_fuzz_corpus(cleaner, legacy, language):
+    rng = random.Random(language)
+    for _ in range(4000):
+        text = random_prompt(rng) if rng.random() < 0.7 else random_characters(rng)
+        assert cleaner.clean_prompt_string(text, language) == legacy.clean_prompt_string(text, language), repr(text)
+
+@pytest.mark.parametrize("language", ["english", "chinese"])
+def test_long_punctuation_runs_hit_the_iteration_cap_like_legacy(cleaner, legacy, language):
+    for run in [",,,,,,,,,,,,", ",.;?!" * 10, "。，；？！" * 20, ", . , . , . , . , . , . , .", "!" * 64]:
+        for text in [run, f"a{run}b", f"a {run} b {run} c", f"{run}a{run}"]:
+            assert cleaner.clean_prompt_string(text, language) == legacy.clean_prompt_string(text, language), repr(text)
+
+@pytest.mark.parametrize("language", ["english", "chinese"])
+def test_output_properties(cleaner, language):
+    rng = random.Random(f"properties-{language}")
+    for _ in range(2000):
+        result = cleaner.clean_prompt_string(random_prompt(rng), language)
+        # No whitespace or punctuation at the ends, and every whitespace run is a single space
+        assert result == result.strip(PUNCTUATION + " ")
+        assert not re.search(r"\s\s|[^\S ]", result), repr(result)
+
+def test_text_without_punctuation_only_normalizes_whitespace(cleaner):
+    rng = random.Random(1)
+    for _ in range(1000):
+        text = "".join(rng.choice(WORDS[:7] + SPACES) for _ in range(rng.randint(0, 10)))
+        assert cleaner.clean_prompt_string(text) == " ".join(text.split())
+
+def test_cluster_cache_does_not_change_results(cleaner):
+    rng = random.Random(2)
+    texts = [random_prompt(rng) for _ in range(500)]
+    warm = [cleaner.clean_prompt_string(text) for text in texts]
+    cleaner._clean_punctuation_cluster.cache_clear()
+    assert [cleaner.clean_prompt_string(text) for text in texts] == warm
+
+def test_empty_input(cleaner):
+    assert cleaner.clean_prompt_string("") == ""
+    assert cleaner.clean_prompt_string(None) == ""
+    assert cleaner.clean_prompt_string(" ,.; \n") == ""
@@ -0,0 +1,47 @@
+"""generate_description with precomputed DESCRIPTION_BUCKETS must match the per-call grouping it replaced."""
+import random
+
+import pytest
+
+@pytest.fixture(scope="module")
+def shared(node_module, tmp_path_factory):
+    """jake_node_prompt_shared with the compiled snapshot written to a temporary directory."""
+    module = node_module("jake_node_prompt_shared")
+    mp = pytest.MonkeyPatch()
+    mp.setattr(module.DataSnapshot, "SNAPSHOT_PATH", str(tmp_path_factory.mktemp("snapshot") / "snapshot.pkl"))
+    yield module
+    mp.undo()
+
+@pytest.fixture(scope="module", params=["jake_node_prompt_random", "jake_node_prompt_random_ABC"])
+def prompt_module(request, shared, node_module):
+    return node_module(request.param)
+
+def descriptions(generate, count, custom_values):
+    return [generate(custom_values[i % len(custom_values)]) for i in range(count)]
+
+@pytest.mark.parametrize("seed", [0, 1, 12345, 2 ** 63 + 7])
+def test_seeded_sequences_match_legacy(prompt_module, shared, legacy, seed):
+    custom_values = ["", "  ", "a custom description,, with noise ."]
+    current = prompt_module.PromptComponentGenerator(random.Random(seed))
+    reference = prompt_module.PromptComponentGenerator(random.Random(seed))
+
+    expected = descriptions(lambda value: legacy.generate_description(reference, value, shared.PromptConfig, shared.DataCleaner),
+                            2000, custom_values)
+    assert descriptions(current.generate_description, 2000, custom_values) == expected
+    # Same number of draws, so everything generated after the description is unchanged too
+    assert current.rng.getstate() == reference.rng.getstate()
+
+def test_buckets_keep_subcategory_order_and_skip_empty(shared):
+    structured_options = [
+        {'category': 'color', 'should_add_prefix': False, 'options': ['red', 'blue']},
+        {'category': 'sensory', 'should_add_prefix': False, 'options': ['vivid']},
+        {'category': 'unknown', 'should_add_prefix': False, 'options': ['ignored']},
+        {'category': 'color', 'should_add_prefix': False, 'options': ['green']},
+        {'category': 'detail', 'should_add_prefix': False, 'options': []},
+    ]
+    buckets = shared.DataManager.build_description_buckets(structured_options)
+    assert list(buckets.items()) == [('sensory', ('vivid',)), ('color', ('red', 'blue', 'green'))]
+
+def test_buckets_follow_the_loaded_data(shared):
+    data_cache = shared.get_data_cache()
+    assert data_cache['DESCRIPTION_BUCKETS'] == shared.DataManager.build_description_buckets(data_cache['DESCRIPTION_STRUCTURED_OPTIONS'])
@@ -0,0 +1,134 @@
+"""Compiled tag templates of PromptGeneratorGeek must render exactly like the per-call regex implementation."""
+import contextlib
+import io
+import os
+import random
+import re
+
+import pytest
+
+@pytest.fixture(scope="module")
+def prompt_random(node_module, tmp_path_factory):
+    """jake_node_prompt_random with the compiled snapshot written to a temporary directory."""
+    shared = node_module("jake_node_prompt_shared")
+    mp = pytest.MonkeyPatch()
+    mp.setattr(shared.DataSnapshot, "SNAPSHOT_PATH", str(tmp_path_factory.mktemp("snapshot") / "snapshot.pkl"))
+    yield node_module("jake_node_prompt_random")
+    mp.undo()
+
+@pytest.fixture(scope="module")
+def legacy_geek(prompt_random):
+    """PromptGeneratorGeek with the tag replacement it used before templates were precompiled."""
+    m = prompt_random
+    PromptConfig, DataCleaner, FileLoader, ExpressionUtils = m.PromptConfig, m.DataCleaner, m.FileLoader, m.ExpressionUtils
+
+    class LegacyGeek(m.PromptGeneratorGeek):
+        def _replace_category_tags(self, prompt):
+            if not prompt:
+                return ""
+            category_mapping = self.data_cache['CATEGORY_MAPPING']
+
+            def replace_match(match):
+                category_name = match.group(1)
+                if category_name not in category_mapping:
+                    return match.group(0)
+                file_paths = category_mapping[category_name]
+                if not file_paths:
+                    return match.group(0)
+                if category_name == "all expression" or category_name in self._get_expression_category_names():
+                    return self._legacy_all_expression(file_paths)
+                if category_name.startswith("all "):
+                    base_category = category_name[4:]
+                    structured_options = self._structured(file_paths, base_category)
+                    if base_category in [PromptConfig.DIRECTORY_MAPPING[key] for key in ("scene", "facial_action", "camera", "audio")]:
+                        return self.component_generator._generate_from_multiple_files(structured_options, "", base_category)
+                    return self.component_generator._generate_from_single_file(structured_options, "", base_category)
+                selected_file = self.component_generator.rng.choice(file_paths)
+                options = FileLoader.load_data_file(selected_file)
+                if not options:
+                    return match.group(0)
+                selected_option = self.component_generator.rng.choice(options)
+                return DataCleaner.clean_prompt_string(DataCleaner.remove_category_prefix(selected_option))
+
+            return DataCleaner.clean_prompt_string(re.sub(r'\[([^\[\]]+)\]', replace_match, prompt))
+
+        def _get_expression_category_names(self):
+            return [
+                key for key in self.data_cache['CATEGORY_MAPPING'].keys()
+                if key.startswith(PromptConfig.DIRECTORY_MAPPING["expression"] + os.path.sep)
+                or (key in self.data_cache['EXPRESSION_CATEGORIES'] and key != "select" and key != "all expression")
+            ]
+
+        @staticmethod
+        def _structured(file_paths, category_name):
+            structured_options = []
+            for file_path in file_paths:
+                options = FileLoader.load_data_file(file_path)
+                if options:
+                    structured_options.append({
+                        'file': os.path.basename(file_path),
+                        'category': category_name,
+                        'should_add_prefix': True,
+                        'options': options,
+                    })
+            return structured_options
+
+        def _legacy_all_expression(self, file_paths):
+            rng = self.component_generator.rng
+            exp_str_options = self.data_cache['EXPRESSION_STR']
+            exp_str_value = ""
+            if ExpressionUtils.should_include_exp_str(rng):
+                exp_str_value = ExpressionUtils.select_random_exp_str(exp_str_options, rng)
+            if len(file_paths) == 1:
+                options = FileLoader.load_data_file(file_paths[0])
+                expression_value = rng.choice(options) if options else ""
+            else:
+                expression_value = self.component_generator._generate_from_single_file(
+                    self._structured(file_paths, PromptConfig.DIRECTORY_MAPPING["expression"]), "",
+                    PromptConfig.DIRECTORY_MAPPING["expression"])
+            return ExpressionUtils.combine_expression(
+                exp_str_value=exp_str_value, expression_value=expression_value, rng=rng,
+                exp_str_options=exp_str_options, exp_str_prob=PromptConfig.EXP_STR_RANDOM_PROB)
+
+    return LegacyGeek
+
+@pytest.fixture(scope="module")
+def tag_names(prompt_random):
+    return sorted(prompt_random.get_data_cache()['CATEGORY_MAPPING'].keys())
+
+def make_template(rng, tag_names, count):
+    """A template of count tags mixing known categories, unknown tags and literal text."""
+    parts = []
+    for i in range(count):
+        if i % 17 == 16:
+            parts.append("[no such category]")
+        else:
+            parts.append(f"[{rng.choice(tag_names)}]")
+        parts.append(rng.choice([", ", " and ", " with ", ",  , "]))
+    return "".join(parts)
+
+def render(generator_class, seed, template):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return generator_class(seed).generate_prompt(template, "a cat")
+
+def test_every_category_matches_legacy(prompt_random, legacy_geek, tag_names):
+    for seed, name in enumerate(tag_names):
+        template = f"[{name}], detailed"
+        assert render(prompt_random.PromptGeneratorGeek, seed, template) == render(legacy_geek, seed, template), name
+
+@pytest.mark.parametrize("tag_count", [1, 8, 60])
+def test_templates_match_legacy_for_fixed_seeds(prompt_random, legacy_geek, tag_names, tag_count):
+    rng = random.Random(tag_count)
+    for seed in range(25):
+        template = make_template(rng, tag_names, tag_count)
+        assert render(prompt_random.PromptGeneratorGeek, seed, template) == render(legacy_geek, seed, template)
+
+def test_compiled_template_is_reused(prompt_random, tag_names):
+    data_cache = prompt_random.get_data_cache()
+    template = make_template(random.Random(0), tag_names, 60)
+    with contextlib.redirect_stdout(io.StringIO()):
+        compiled = prompt_random.TagTemplate.compile(template, data_cache)
+    slots = [segment for segment in compiled.segments if isinstance(segment, prompt_random.TagSlot)]
+
+    assert prompt_random.TagTemplate.compile(template, data_cache) is compiled
+    assert len(slots) == 60 - 60 // 17
@@ -0,0 +1,96 @@
+"""Cached PromptPlans of the ABC PromptGenerator must generate exactly like the per-call strategy path."""
+import contextlib
+import io
+import random
+
+import pytest
+
+SAMPLE_VALUES = ["", "  ", "a custom value,, with noise .", "red | blue | green"]
+
+@pytest.fixture(scope="module")
+def shared(node_module, tmp_path_factory):
+    """jake_node_prompt_shared with the compiled snapshot written to a temporary directory."""
+    module = node_module("jake_node_prompt_shared")
+    mp = pytest.MonkeyPatch()
+    mp.setattr(module.DataSnapshot, "SNAPSHOT_PATH", str(tmp_path_factory.mktemp("snapshot") / "snapshot.pkl"))
+    yield module
+    mp.undo()
+
+@pytest.fixture(scope="module")
+def abc(shared, node_module):
+    return node_module("jake_node_prompt_random_ABC")
+
+@pytest.fixture(scope="module")
+def input_types(abc):
+    return abc.RandomPrompter_JK.INPUT_TYPES()["required"]
+
+def random_config(rng, input_types):
+    """A node configuration with random, disable and enable picked more often than any specific option."""
+    config = {}
+    for name, (kind, _) in input_types.items():
+        if name == "seed":
+            continue
+        if kind == "STRING":
+            config[name] = rng.choice(SAMPLE_VALUES)
+        elif kind == "BOOLEAN":
+            config[name] = rng.random() < 0.5
+        elif "random" in kind and rng.random() < 0.6:
+            config[name] = rng.choice(["random", "random", "disable", "enable"])
+        else:
+            config[name] = rng.choice(kind)
+    return config
+
+def generate(generate_prompt, abc, seed, config):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return generate_prompt(abc.PromptGenerator(seed), config)
+
+def current(generator, config):
+    return generator.generate_prompt(**config)
+
+def reference(legacy, abc):
+    return lambda generator, config: legacy.abc_generate_prompt(generator, abc, **config)
+
+def test_random_configs_match_legacy(abc, legacy, input_types):
+    rng = random.Random(0)
+    for trial in range(300):
+        config = random_config(rng, input_types)
+        seed = rng.randrange(2 ** 64)
+        assert generate(current, abc, seed, config) == generate(reference(legacy, abc), abc, seed, config), (trial, config)
+
+def test_every_category_on_random_matches_legacy(abc, legacy, input_types):
+    for seed in range(40):
+        config = {name: "random" if "random" in kind else "" for name, (kind, _) in input_types.items()
+                  if name != "seed" and kind not in ("BOOLEAN", "INT")}
+        config["prompt_priority"] = "description + style + lighting + camera"
+        assert generate(current, abc, seed, config) == generate(reference(legacy, abc), abc, seed, config)
+
+def test_plan_ignores_seed_and_output_options(abc, shared, input_types):
+    config = random_config(random.Random(1), input_types)
+    data_cache = shared.get_data_cache()
+    plan = abc.PromptPlanCache.get(dict(config, seed=1), data_cache)
+
+    assert abc.PromptPlanCache.get(dict(config, seed=2, auto_fill=not config["auto_fill"],
+                                        remove_prompt_emphasis=not config["remove_prompt_emphasis"]), data_cache) is plan
+    assert abc.PromptPlanCache.get(dict(config, custom_scene="a different scene"), data_cache) is not plan
+
+def test_reloaded_data_invalidates_plans(abc, shared, legacy, input_types):
+    config = {name: "disable" if "disable" in kind else "" for name, (kind, _) in input_types.items()
+              if kind not in ("BOOLEAN", "INT")}
+    config["scene"] = "random"
+    data_cache = shared.get_data_cache()
+    plan = abc.PromptPlanCache.get(config, data_cache)
+    (scene_step,) = plan.category_steps
+    assert len(scene_step.file_paths) > 1
+
+    # Publish the data as a hot reload would, with a single scene file left
+    manifest, files = shared.DataSnapshot.MANIFEST, shared.DataSnapshot.FILES
+    reloaded = dict(data_cache, SCENE_STRUCTURED_OPTIONS=data_cache["SCENE_STRUCTURED_OPTIONS"][:1])
+    shared.DataSnapshot.publish(manifest, files, reloaded)
+    try:
+        (reloaded_step,) = abc.PromptPlanCache.get(config, shared.get_data_cache()).category_steps
+        assert reloaded_step.file_paths == scene_step.file_paths[:1]
+        for seed in range(20):
+            assert generate(current, abc, seed, config) == generate(reference(legacy, abc), abc, seed, config)
+    finally:
+        shared.DataSnapshot.publish(manifest, files, data_cache)
+    assert abc.PromptPlanCache.get(config, data_cache) is not plan
@@ -0,0 +1,90 @@
+"""Batch generation of RandomPrompter_JK."""
+import pytest
+
+@pytest.fixture(scope="module")
+def prompt_random(node_module, tmp_path_factory):
+    """jake_node_prompt_random with the compiled snapshot written to a temporary directory."""
+    shared = node_module("jake_node_prompt_shared")
+    mp = pytest.MonkeyPatch()
+    mp.setattr(shared.DataSnapshot, "SNAPSHOT_PATH", str(tmp_path_factory.mktemp("snapshot") / "snapshot.pkl"))
+    yield node_module("jake_node_prompt_random")
+    mp.undo()
+
+@pytest.fixture(scope="module")
+def random_inputs(prompt_random):
+    """Node defaults with every category that offers 'random' set to it."""
+    inputs = {}
+    for key, spec in prompt_random.RandomPrompter_JK.INPUT_TYPES()["required"].items():
+        widget, options = spec[0], spec[1] if len(spec) > 1 else {}
+        if isinstance(widget, list):
+            inputs[key] = "random" if "random" in widget else options.get("default", widget[0])
+        else:
+            inputs[key] = options.get("default")
+    inputs["custom_subject"] = "a cat sitting on a windowsill"
+    return inputs
+
+def test_batch_matches_single_calls(prompt_random, random_inputs):
+    node = prompt_random.RandomPrompter_JK()
+    seed = 12345
+
+    (batch,) = node.execute(**dict(random_inputs, seed=seed, batch_count=50))
+    singles = [node.execute(**dict(random_inputs, seed=seed + i, batch_count=1))[0][0] for i in range(50)]
+
+    assert len(set(batch)) > 1
+    assert batch == singles
+
+def test_batch_seeds_wrap_at_64_bits(prompt_random, random_inputs):
+    node = prompt_random.RandomPrompter_JK()
+    seed = 0xffffffffffffffff
+
+    (batch,) = node.execute(**dict(random_inputs, seed=seed, batch_count=2))
+
+    assert batch[1] == node.execute(**dict(random_inputs, seed=0, batch_count=1))[0][0]
+
+def only_random(inputs, *categories):
+    """Inputs with every category disabled except the given ones, which are set to random."""
+    keys = ("scene", "motion", "facial_action", "expression", "audio", "lighting", "camera", "style", "description")
+    return dict(inputs, **{key: "random" if key in categories else "disable" for key in keys})
+
+def combination_count(prompt_random, inputs):
+    generator = prompt_random.PromptGenerator(0)
+    return generator.build_combination_space(generator.build_prompt_plan(**inputs)).size
+
+def test_unique_batch_has_no_repeated_prompts(prompt_random, random_inputs):
+    node = prompt_random.RandomPrompter_JK()
+    inputs = dict(random_inputs, unique_combinations=True, batch_count=300)
+
+    (batch,) = node.execute(**dict(inputs, seed=7))
+
+    assert len(batch) == 300
+    assert len(set(batch)) == 300
+    assert node.execute(**dict(inputs, seed=7))[0] == batch
+    assert node.execute(**dict(inputs, seed=8))[0] != batch
+
+def test_unique_batch_covers_a_small_space_exactly_once(prompt_random, random_inputs):
+    inputs = only_random(dict(random_inputs, custom_lighting="", unique_combinations=True), "lighting")
+    size = combination_count(prompt_random, inputs)
+    assert 1 < size < 2000
+
+    (batch,) = prompt_random.RandomPrompter_JK().execute(**dict(inputs, seed=3, batch_count=size))
+
+    assert len(batch) == size
+    assert len(set(batch)) == size
+
+def test_unique_batch_reports_shortfall(prompt_random, random_inputs, capsys):
+    inputs = only_random(dict(random_inputs, custom_lighting="", unique_combinations=True), "lighting")
+    size = combination_count(prompt_random, inputs)
+
+    (batch,) = prompt_random.RandomPrompter_JK().execute(**dict(inputs, seed=3, batch_count=size + 10))
+
+    assert len(batch) == size
+    assert f"generating {size} of {size + 10} prompts" in capsys.readouterr().out
+
+def test_custom_value_matching_an_option_is_one_combination(prompt_random, random_inputs):
+    inputs = only_random(dict(random_inputs, custom_lighting="", unique_combinations=True), "lighting")
+    size = combination_count(prompt_random, inputs)
+    generator = prompt_random.PromptGenerator(0)
+    existing_option = generator.build_combination_space(generator.build_prompt_plan(**inputs)).decode(0)["lighting"]
+
+    assert combination_count(prompt_random, dict(inputs, custom_lighting=existing_option)) == size
+    assert combination_count(prompt_random, dict(inputs, custom_lighting="a brand new lighting option")) == size + 1
@@ -0,0 +1,72 @@
+"""Hot reload of the compiled prompt_data snapshot."""
+import os
+import shutil
+
+import pytest
+
+@pytest.fixture
+def shared(node_module, tmp_path, monkeypatch):
+    """jake_node_prompt_shared pointed at a private copy of prompt_data and a temporary snapshot path."""
+    module = node_module("jake_node_prompt_shared")
+    data_dir = tmp_path / "prompt_data"
+    shutil.copytree(os.path.join(os.path.dirname(module.__file__), "prompt_data"), data_dir)
+    monkeypatch.setattr(module.PromptConfig, "PROMPT_DATA_DIR", str(data_dir))
+    monkeypatch.setattr(module.DataSnapshot, "SNAPSHOT_PATH", str(tmp_path / "snapshot.pkl"))
+    monkeypatch.setattr(module.DataSnapshot, "FILES", {})
+    monkeypatch.setattr(module.DataSnapshot, "MANIFEST", None)
+    monkeypatch.setattr(module, "_DATA_CACHE", None)
+    monkeypatch.setattr(module.PromptConfig, "RELOAD_CHECK_INTERVAL", 0.0)
+    module.data_dir = data_dir
+    return module
+
+def touch_data_file(shared, text):
+    """Append an option to the first .txt data file and return its relative path."""
+    for root, _, filenames in os.walk(shared.data_dir):
+        for filename in sorted(filenames):
+            if filename.endswith(".txt"):
+                path = os.path.join(root, filename)
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write(f"\n{text}\n")
+                stat = os.stat(path)
+                os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+                return os.path.normpath(os.path.relpath(path, shared.data_dir))
+    raise AssertionError("no .txt data file found")
+
+def test_reload_picks_up_changed_file(shared):
+    shared.get_data_cache()
+    relative_path = touch_data_file(shared, "hot reload test option")
+
+    data = shared.get_data_cache()
+
+    assert "hot reload test option" in shared.DataSnapshot.FILES[relative_path]
+    assert data is shared._DATA_CACHE
+    assert shared.DataSnapshot.MANIFEST == shared.DataSnapshot.build_manifest()
+
+def test_failed_rebuild_keeps_current_state_and_retries(shared, monkeypatch):
+    data = shared.get_data_cache()
+    files, manifest = shared.DataSnapshot.FILES, shared.DataSnapshot.MANIFEST
+    relative_path = touch_data_file(shared, "retry test option")
+
+    build_all_data = shared.build_all_data
+    seen_during_build = {}
+
+    def failing_build_all_data():
+        # Other readers must still see the published files while the rebuild runs
+        seen_during_build["files"] = shared.DataSnapshot.FILES
+        seen_during_build["pending"] = shared.FileLoader.load_data_file(relative_path)
+        raise RuntimeError("simulated parse failure")
+
+    monkeypatch.setattr(shared, "build_all_data", failing_build_all_data)
+    assert shared.get_data_cache() is data
+    assert seen_during_build["files"] is files
+    assert "retry test option" in seen_during_build["pending"]
+    assert shared.DataSnapshot.FILES is files
+    assert shared.DataSnapshot.MANIFEST is manifest
+    assert shared.DataSnapshot.BUILDING.files is None
+
+    # The manifest was not advanced, so the next poll retries the rebuild
+    monkeypatch.setattr(shared, "build_all_data", build_all_data)
+    reloaded = shared.get_data_cache()
+    assert reloaded is not data
+    assert "retry test option" in shared.DataSnapshot.FILES[relative_path]
+    assert shared.DataSnapshot.MANIFEST == shared.DataSnapshot.build_manifest()
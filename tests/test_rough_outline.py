@@ -0,0 +1,80 @@
+"""RoughOutline_JK must give the same frames in the same order for any number of workers, and connect contours as before."""
+import cv2
+import numpy
+import pytest
+import torch
+
+SETTINGS = dict(blur_size=5, canny_low=50, canny_high=150, simplify_mode="dynamic",
+                simplify_tolerance=0.5, morph_kernel=9, thickness=4)
+
+@pytest.fixture(scope="module")
+def node(node_module):
+    return node_module("jake_node_image").RoughOutline_JK()
+
+def synthetic_frames(count, height=96, width=128, seed=0):
+    """Filled shapes on a noisy background, different on every frame."""
+    rng = numpy.random.default_rng(seed)
+    frames = []
+    for _ in range(count):
+        frame = rng.integers(0, 40, (height, width, 3), dtype=numpy.uint8)
+        for _ in range(4):
+            center = (int(rng.integers(10, width - 10)), int(rng.integers(10, height - 10)))
+            axes = (int(rng.integers(5, 30)), int(rng.integers(5, 30)))
+            color = tuple(int(c) for c in rng.integers(80, 256, 3))
+            cv2.ellipse(frame, center, axes, float(rng.integers(0, 180)), 0, 360, color, -1)
+        frames.append(frame)
+    return torch.from_numpy(numpy.stack(frames)).float() / 255.0
+
+@pytest.mark.parametrize("simplify_mode", ["dynamic", "fixed"])
+def test_workers_give_identical_frames(node, simplify_mode):
+    images = synthetic_frames(6)
+    settings = dict(SETTINGS, simplify_mode=simplify_mode)
+    expected = node.rough_outline(images, workers=1, **settings)
+    for workers in (0, 2, 4, 16):
+        result = node.rough_outline(images, workers=workers, **settings)
+        for output, reference in zip(result, expected):
+            assert output.dtype == reference.dtype
+            assert torch.equal(output, reference)
+
+def test_workers_use_one_cv2_thread_and_restore_the_count(node, monkeypatch):
+    thread_counts = []
+    process_frame = node.process_frame
+    def record(*args):
+        thread_counts.append(cv2.getNumThreads())
+        return process_frame(*args)
+    monkeypatch.setattr(node, "process_frame", record)
+
+    previous = cv2.getNumThreads()
+    cv2.setNumThreads(3)
+    try:
+        node.rough_outline(synthetic_frames(4), workers=2, **SETTINGS)
+        assert thread_counts == [1] * 4
+        assert cv2.getNumThreads() == 3
+    finally:
+        cv2.setNumThreads(previous)
+
+def random_contour(rng, length):
+    """A cv2-style (N, 1, 2) int32 contour mixing short steps, long jumps, straight runs and repeated points."""
+    steps = rng.integers(-3, 4, (length, 2))
+    jumps = rng.random(length) < 0.3
+    steps[jumps] = rng.integers(-60, 61, (int(jumps.sum()), 2))
+    steps[rng.random(length) < 0.1, 0] = 0
+    steps[rng.random(length) < 0.05] = 0
+    points = numpy.cumsum(steps, axis=0) + 500
+    return points.astype(numpy.int32).reshape(-1, 1, 2)
+
+@pytest.mark.parametrize("max_gap", [3, 5, 7])
+def test_connect_breakpoints_matches_linspace_loop(node, legacy, max_gap):
+    rng = numpy.random.default_rng(max_gap)
+    for length in [1, 2, 3] + [int(n) for n in rng.integers(4, 400, 60)]:
+        contour = random_contour(rng, length)
+        result = node.connect_breakpoints(contour, max_gap=max_gap)
+        expected = legacy.connect_breakpoints(contour, max_gap=max_gap)
+        assert result.dtype == expected.dtype
+        assert result.shape == expected.shape
+        assert numpy.array_equal(result, expected), length
+
+def test_connect_breakpoints_keeps_empty_contour(node, legacy):
+    contour = numpy.zeros((0, 1, 2), dtype=numpy.int32)
+    assert node.connect_breakpoints(contour) is contour
+    assert legacy.connect_breakpoints(contour) is contour
@@ -0,0 +1,130 @@
+"""In-memory, batched frame estimation for SAM3DMeshSequenceFromVideo_JK."""
+import builtins
+import io
+import os
+import tempfile
+
+import numpy as np
+import pytest
+import torch
+
+@pytest.fixture(scope="module")
+def sam3dseq(node_module):
+    return node_module("jake_node_3d_sam3dseq")
+
+@pytest.fixture
+def no_file_io(monkeypatch):
+    """Fail the test on any attempt to open or create a file."""
+    def forbidden(*args, **kwargs):
+        raise AssertionError(f"unexpected file I/O: {args!r}")
+    for target, name in ((builtins, "open"), (io, "open"), (os, "open"), (tempfile, "mkstemp"),
+                         (tempfile, "mkdtemp"), (tempfile, "NamedTemporaryFile")):
+        monkeypatch.setattr(target, name, forbidden)
+
+def frame_output(frame):
+    """Fake detection result that encodes the frame's first pixel so results can be matched to frames."""
+    value = float(frame[0, 0, 0])
+    return [{
+        "pred_vertices": torch.full((4, 3), value),
+        "pred_cam_t": torch.tensor([0.0, 0.0, value]),
+        "focal_length": torch.tensor(500.0),
+    }]
+
+class FakeFrameEstimator:
+    """FrameEstimator that records every batch it receives."""
+
+    def __init__(self, fail_frames=()):
+        self.batches = []
+        self.fail_frames = set(fail_frames)
+
+    def process_frames(self, frames, bboxes, masks, bbox_thr, inference_type):
+        self.batches.append({"frames": frames, "bboxes": bboxes, "masks": masks,
+                             "bbox_thr": bbox_thr, "inference_type": inference_type})
+        results = []
+        for frame in frames:
+            results.append(None if int(frame[0, 0, 0]) in self.fail_frames else frame_output(frame))
+        return results
+
+class FakeSAM3DBodyEstimator:
+    """Stand-in for SAM3DBodyEstimator, which only offers a per-image call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def process_one_image(self, image, bboxes=None, masks=None, bbox_thr=0.8, use_mask=False, inference_type="full"):
+        assert isinstance(image, np.ndarray), "frames must be passed as arrays, not file paths"
+        self.calls.append({"image": image, "bboxes": bboxes, "use_mask": use_mask})
+        return frame_output(image)
+
+def numbered_frames(count, height=6, width=5):
+    """IMAGE batch whose frame i has the value i/255 in every pixel."""
+    values = torch.arange(count, dtype=torch.float32).view(-1, 1, 1, 1) / 255.0
+    return values.expand(count, height, width, 3).contiguous()
+
+@pytest.mark.parametrize("num_frames, batch_size, expected_sizes", [
+    (10, 4, [4, 4, 2]),
+    (8, 8, [8]),
+    (3, 16, [3]),
+    (5, 1, [1, 1, 1, 1, 1]),
+])
+def test_frames_are_batched_in_memory(sam3dseq, no_file_io, num_frames, batch_size, expected_sizes):
+    estimator = FakeFrameEstimator()
+
+    frames_data, failed = sam3dseq.estimate_frame_sequence(
+        estimator, numbered_frames(num_frames), batch_size=batch_size, bbox_threshold=0.6, inference_type="body")
+
+    assert [len(batch["frames"]) for batch in estimator.batches] == expected_sizes
+    assert failed == 0
+    assert [frame["vertices"][0, 0] for frame in frames_data] == list(range(num_frames))
+    for batch in estimator.batches:
+        assert batch["bbox_thr"] == 0.6 and batch["inference_type"] == "body"
+        for frame in batch["frames"]:
+            assert frame.dtype == np.uint8 and frame.shape == (6, 5, 3) and frame.flags["C_CONTIGUOUS"]
+
+def test_masks_become_bboxes(sam3dseq, no_file_io):
+    image = numbered_frames(3, height=8, width=8)
+    mask = torch.zeros(2, 8, 8)
+    mask[0, 2:5, 1:7] = 1.0
+    estimator = FakeFrameEstimator()
+
+    sam3dseq.estimate_frame_sequence(estimator, image, mask, batch_size=3)
+
+    batch = estimator.batches[0]
+    assert batch["bboxes"][0].tolist() == [[1, 2, 6, 4]]
+    # An empty mask gives no bbox, and frames past the end of the mask batch get no mask
+    assert batch["bboxes"][1] is None and batch["masks"][1] is not None
+    assert batch["bboxes"][2] is None and batch["masks"][2] is None
+
+def test_failed_frames_are_counted(sam3dseq, no_file_io):
+    estimator = FakeFrameEstimator(fail_frames={1, 4})
+
+    frames_data, failed = sam3dseq.estimate_frame_sequence(estimator, numbered_frames(6), batch_size=4)
+
+    assert failed == 2
+    assert [frame["success"] for frame in frames_data] == [True, False, True, True, False, True]
+
+def test_estimator_error_fails_only_its_batch(sam3dseq, no_file_io):
+    class BrokenSecondBatch(FakeFrameEstimator):
+        def process_frames(self, frames, *args, **kwargs):
+            if self.batches:
+                self.batches.append(None)
+                raise RuntimeError("out of memory")
+            return super().process_frames(frames, *args, **kwargs)
+
+    frames_data, failed = sam3dseq.estimate_frame_sequence(BrokenSecondBatch(), numbered_frames(7), batch_size=4)
+
+    assert failed == 3
+    assert len(frames_data) == 7
+
+def test_sam3d_adapter_calls_estimator_once_per_frame(sam3dseq, no_file_io):
+    inner = FakeSAM3DBodyEstimator()
+    image = numbered_frames(5)
+    mask = torch.ones(5, 6, 5)
+
+    frames_data, failed = sam3dseq.estimate_frame_sequence(
+        sam3dseq.SAM3DFrameEstimator(inner), image, mask, batch_size=2)
+
+    assert failed == 0
+    assert len(inner.calls) == 5
+    assert all(call["use_mask"] for call in inner.calls)
+    assert [int(call["image"][0, 0, 0]) for call in inner.calls] == list(range(5))
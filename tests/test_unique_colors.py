@@ -0,0 +1,81 @@
+"""count_unique_colors must lead HintImageEnchance_JK to the same decisions as the exact get_unique_axis0 count."""
+import numpy
+import pytest
+
+LIMIT = 200
+
+@pytest.fixture(scope="module")
+def image_nodes(node_module):
+    return node_module("jake_node_image")
+
+def decision(count):
+    """The three cases high_quality_resize distinguishes."""
+    if count == 2:
+        return "binary candidate"
+    if 2 < count < LIMIT:
+        return "nearest"
+    return "area / cubic"
+
+def palette_pixels(rng, colors, channels, count, all_present=False):
+    palette = numpy.unique(rng.integers(0, 256, (colors * 2, channels), dtype=numpy.uint8), axis=0)[:colors]
+    rng.shuffle(palette)
+    index = numpy.arange(count) % len(palette) if all_present else rng.integers(0, len(palette), count)
+    return palette[index]
+
+def test_counts_match_get_unique_axis0(image_nodes):
+    rng = numpy.random.default_rng(0)
+    for trial in range(450):
+        colors = [1, 2, 3, 150, 199, 200, 201, 202, 5000][trial % 9]
+        channels = [3, 3, 3, 1, 2][trial % 5]
+        pixels = palette_pixels(rng, colors, channels, int(rng.integers(1, 5000)), all_present=trial % 7 == 0)
+        exact = len(image_nodes.get_unique_axis0(pixels))
+        assert image_nodes.count_unique_colors(pixels) == exact
+        for sample_stride in (1, 3, 16):
+            for chunk_size in (997, 1 << 20):
+                count = image_nodes.count_unique_colors(pixels, limit=LIMIT, sample_stride=sample_stride, chunk_size=chunk_size)
+                assert count == min(exact, LIMIT + 1), (trial, sample_stride, chunk_size)
+                assert decision(count) == decision(exact)
+
+def test_colors_around_the_limit(image_nodes):
+    rng = numpy.random.default_rng(1)
+    for colors in range(LIMIT - 3, LIMIT + 4):
+        palette = palette_pixels(rng, colors, 3, colors, all_present=True)
+        assert len(image_nodes.get_unique_axis0(palette)) == colors
+        # Most colors repeat through the image, the last few appear once at the very end, off the sample grid
+        body = palette[numpy.arange(100000) % (LIMIT - 5)]
+        pixels = numpy.concatenate([body, palette[LIMIT - 5:], body[:1]])
+        count = image_nodes.count_unique_colors(pixels, limit=LIMIT)
+        assert count == min(colors, LIMIT + 1)
+        assert decision(count) == decision(colors)
+
+def test_fallback_inputs(image_nodes):
+    rng = numpy.random.default_rng(2)
+    empty = numpy.zeros((0, 3), dtype=numpy.uint8)
+    assert image_nodes.count_unique_colors(empty, limit=LIMIT) == len(image_nodes.get_unique_axis0(empty)) == 0
+    floats = rng.random((300, 3))
+    assert image_nodes.count_unique_colors(floats, limit=LIMIT) == LIMIT + 1
+    assert image_nodes.count_unique_colors(floats) == 300
+    rgba = palette_pixels(rng, 10, 4, 500)
+    assert image_nodes.count_unique_colors(rgba, limit=LIMIT) == len(image_nodes.get_unique_axis0(rgba)) == 10
+
+def hint_images(rng):
+    """Binary lineart, thick binary shapes, a segmentation map and a photo-like image."""
+    lineart = numpy.zeros((90, 120, 3), dtype=numpy.uint8)
+    lineart[::9] = 255
+    lineart[:, ::11] = 255
+    shapes = numpy.zeros((90, 120, 3), dtype=numpy.uint8)
+    shapes[20:60, 30:100] = 255
+    segmentation = palette_pixels(rng, 40, 3, 15 * 20).reshape(15, 20, 3).repeat(6, 0).repeat(6, 1)
+    photo = rng.integers(0, 256, (90, 120, 3), dtype=numpy.uint8)
+    return [lineart, shapes, segmentation, photo]
+
+@pytest.mark.parametrize("size", [(60, 45), (240, 180), (121, 90)])
+def test_high_quality_resize_matches_exact_count(image_nodes, monkeypatch, size):
+    node = image_nodes.HintImageEnchance_JK()
+    images = hint_images(numpy.random.default_rng(3))
+    results = [node.high_quality_resize(image, size) for image in images]
+
+    # The same resize with the exact sort-based count it used before
+    monkeypatch.setattr(image_nodes, "count_unique_colors", lambda data, limit=None: len(image_nodes.get_unique_axis0(data)))
+    for image, result in zip(images, results):
+        assert numpy.array_equal(result, node.high_quality_resize(image, size))
@@ -7669,23 +7669,33 @@ const ADV3DVIEWER_HTML = `<!DOCTYPE html>
 			// load smpl
 			async loadSMPLBinFromBuffer(buffer) {
 				this.loadingProgress.update("Reading SMPL header...", 86);
-				const dv = new DataView(buffer);
-				let offset = 4;
-				
-				const numFrames = dv.getUint32(offset, true);
-				offset += 4;
-				const numVerts = dv.getUint32(offset, true);
-				offset += 4;
-				const numFaces = dv.getUint32(offset, true);
-				offset += 4;
-				this.state.playback.fps = dv.getFloat32(offset, true);
-				offset += 4;
-				
-				this.loadingProgress.update("Extracting vertex data...", 90);
-				const verts = new Float32Array(buffer, offset, numFrames * numVerts * 3);
-				offset += numFrames * numVerts * 3 * 4;
-				
-				const faces = new Uint32Array(buffer, offset, numFaces * 3);
+				let numFrames, numVerts, numFaces, verts, faces;
+				
+				if (this.convertArrayBufferToString(buffer, 0, 4) === 'MESH') {
+					// MESH V2 格式（量化、差分、压缩）
+					this.loadingProgress.update("Decoding MESH V2 vertex data...", 90);
+					let fps;
+					({ numFrames, numVerts, numFaces, fps, verts, faces } = this.decodeMeshV2Buffer(buffer));
+					this.state.playback.fps = fps;
+				} else {
+					const dv = new DataView(buffer);
+					let offset = 4;
+					
+					numFrames = dv.getUint32(offset, true);
+					offset += 4;
+					numVerts = dv.getUint32(offset, true);
+					offset += 4;
+					numFaces = dv.getUint32(offset, true);
+					offset += 4;
+					this.state.playback.fps = dv.getFloat32(offset, true);
+					offset += 4;
+					
+					this.loadingProgress.update("Extracting vertex data...", 90);
+					verts = new Float32Array(buffer, offset, numFrames * numVerts * 3);
+					offset += numFrames * numVerts * 3 * 4;
+					
+					faces = new Uint32Array(buffer, offset, numFaces * 3);
+				}
 				
 				this.state.smplData = {
 					vertices: verts,
@@ -7711,6 +7721,84 @@ const ADV3DVIEWER_HTML = `<!DOCTYPE html>
 				this.loadingProgress.update("SMPL mesh created", 96);
 			}
 
+			// 解码 MESH V2 网格序列（int16 量化、差分编码、zlib 压缩，平面布局 x.../y.../z...）
+			decodeMeshV2Buffer(buffer) {
+				const FLAG_QUANTIZED = 1, FLAG_DELTA = 2, FLAG_ZLIB = 4;
+				const dv = new DataView(buffer);
+				
+				const version = dv.getUint32(4, true);
+				if (version !== 2) {
+					throw new Error('Unsupported MESH version: ' + version);
+				}
+				const numFrames = dv.getUint32(8, true);
+				const numVerts = dv.getUint32(12, true);
+				const numFaces = dv.getUint32(16, true);
+				const fps = dv.getFloat32(20, true);
+				const flags = dv.getUint32(24, true);
+				const metadataSize = dv.getUint32(28, true);
+				
+				if (flags & ~(FLAG_QUANTIZED | FLAG_DELTA | FLAG_ZLIB)) {
+					throw new Error('Unsupported MESH flags: 0x' + flags.toString(16));
+				}
+				
+				let offset = 32;
+				const metadata = metadataSize ? JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, offset, metadataSize))) : {};
+				offset += metadataSize;
+				const keyframeInterval = Math.max(1, metadata.keyframe_interval || 30);
+				
+				// 读取并解压数据块，返回独立对齐的 ArrayBuffer
+				const readChunk = (start, size) => {
+					const bytes = new Uint8Array(buffer, start, size);
+					const data = (flags & FLAG_ZLIB) ? fflate.unzlibSync(bytes) : bytes.slice();
+					return (data.byteOffset === 0 && data.byteLength === data.buffer.byteLength) ? data.buffer : data.slice().buffer;
+				};
+				
+				const facesSize = dv.getUint32(offset, true);
+				offset += 4;
+				const faces = new Uint32Array(readChunk(offset, facesSize), 0, numFaces * 3);
+				offset += facesSize;
+				
+				const tableOffset = offset;
+				const frameOffset = (i) => Number(dv.getBigUint64(tableOffset + i * 8, true));
+				const frameSize = numVerts * 3;
+				const verts = new Float32Array(numFrames * frameSize);
+				
+				for (let f = 0; f < numFrames; f++) {
+					const start = frameOffset(f);
+					const chunk = readChunk(start, frameOffset(f + 1) - start);
+					const isKeyframe = !(flags & FLAG_DELTA) || f % keyframeInterval === 0;
+					const base = f * frameSize;
+					const prev = base - frameSize;
+					
+					let center = null, scale = null, bytes = null, values = null;
+					if (flags & FLAG_QUANTIZED) {
+						// int16 以低字节平面 + 高字节平面存储
+						center = new Float32Array(chunk, 0, 3);
+						scale = new Float32Array(chunk, 12, 3);
+						bytes = new Uint8Array(chunk, 24, frameSize * 2);
+					} else {
+						values = new Float32Array(chunk, 0, frameSize);
+					}
+					
+					for (let c = 0; c < 3; c++) {
+						const plane = c * numVerts;
+						for (let v = 0; v < numVerts; v++) {
+							let value;
+							if (bytes) {
+								const q = ((bytes[frameSize + plane + v] << 24) | (bytes[plane + v] << 16)) >> 16;
+								value = center[c] + q * scale[c];
+							} else {
+								value = values[plane + v];
+							}
+							const idx = base + v * 3 + c;
+							verts[idx] = isKeyframe ? value : verts[prev + v * 3 + c] + value;
+						}
+					}
+				}
+				
+				return { numFrames, numVerts, numFaces, fps, verts, faces };
+			}
+
 			// load glb
 			async loadGLBFromBuffer(buffer) {
 				this.loadingProgress.start("Parsing GLB data...", 95);